@@ -2,19 +2,29 @@
 Model Orchestrator Service
 
 Manages GPU memory and model lifecycle across multiple AI services.
-Provides explicit load/unload control for n8n workflows.
+Provides explicit load/unload control for n8n workflows; loads are admitted
+against a VRAM budget (see scheduler.py), evicting or queueing as needed.
 """
 
 import asyncio
 import logging
+import os
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Dict, Optional
 
 import httpx
-import pynvml
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from starlette.background import BackgroundTask
+
+from .monitor import HealthMonitor
+from .prefetch import Prefetcher
+from .proxy import ServiceRouter, forward_headers, parse_limits
+from .scheduler import AdmissionError, AdmissionScheduler, Resident, VramCostTable
+from .state import StateStore
+from .telemetry import GpuTelemetry, create_telemetry
 
 # Configure logging
 logging.basicConfig(
@@ -23,12 +33,69 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# VRAM kept free for activations/fragmentation when admitting models
+VRAM_RESERVE_MB = int(os.getenv("VRAM_RESERVE_MB", "1024"))
+# Budget used when NVML is unavailable (0 = unbounded)
+VRAM_CAPACITY_MB = int(os.getenv("VRAM_CAPACITY_MB", "0"))
+# Seconds a load request may wait in the admission queue
+ADMISSION_TIMEOUT = float(os.getenv("ADMISSION_TIMEOUT", "600"))
+# Order in which eviction candidates are unloaded (see scheduler.EVICTION_POLICIES)
+EVICTION_POLICY = os.getenv("EVICTION_POLICY", "priority-lru")
+
+# 'nvml' (real device) or 'simulated' (fake device for load tests without a GPU;
+# service load/unload calls are skipped and the fake device allocates instead)
+GPU_TELEMETRY = os.getenv("GPU_TELEMETRY", "nvml")
+SIMULATED_GPU_MB = int(os.getenv("SIMULATED_GPU_MB", "32768"))
+
+# Concurrent proxied requests per service ('service=N,...'; others get the default)
+SERVICE_CONCURRENCY = parse_limits(os.getenv("SERVICE_CONCURRENCY", ""))
+DEFAULT_SERVICE_CONCURRENCY = int(os.getenv("DEFAULT_SERVICE_CONCURRENCY", "1"))
+# Seconds a proxied request may take (generation can run for many minutes)
+PROXY_TIMEOUT = float(os.getenv("PROXY_TIMEOUT", "3600"))
+
+# Prefetch the likely next model of a workflow into free VRAM (see prefetch.py)
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+# Seconds a prefetched model may stay unused before it is unloaded again
+PREFETCH_TTL = float(os.getenv("PREFETCH_TTL", "300"))
+PREFETCH_MIN_PROBABILITY = float(os.getenv("PREFETCH_MIN_PROBABILITY", "0.6"))
+PREFETCH_MIN_SAMPLES = int(os.getenv("PREFETCH_MIN_SAMPLES", "3"))
+
+# Seconds between background samples of service health, loaded models and the GPU
+HEALTH_INTERVAL = float(os.getenv("HEALTH_INTERVAL", "10"))
+# Samples kept in memory for /health/history (360 x 10s = 1 hour)
+HEALTH_HISTORY = int(os.getenv("HEALTH_HISTORY", "360"))
+# SQLite file for admitted models, learned costs and the sample history ('' = in memory only)
+STATE_DB = os.getenv("STATE_DB", "")
+STATE_RETENTION_HOURS = float(os.getenv("STATE_RETENTION_HOURS", "168"))
+
+# Services whose loaded-model list uses the orchestrator's model names; admitted
+# models they no longer hold are dropped, and models they hold are adopted
+RECONCILED_SERVICES = {"whisperx", "vibevoice"}
+
+# How each service frees VRAM: (method, path, JSON body, scope); 'service'
+# scope drops every model the service holds. Other services are never evicted.
+UNLOAD_APIS = {
+    "whisperx": ("DELETE", "/models/pool/all", None, "service"),
+    "vibevoice": ("POST", "/api/models/{model}/unload", None, "model"),
+    "comfyui": ("POST", "/free", {"unload_models": True, "free_memory": True}, "service"),
+}
+
+# How a service loads a model ahead of its first request: (method, path, JSON body).
+# Only these services can be prefetched.
+LOAD_APIS = {
+    "vibevoice": ("POST", "/api/models/{model}/load", None),
+}
+
 
 class ModelLoadRequest(BaseModel):
     """Request to load a model"""
     model: str = Field(..., description="Model identifier (e.g., 'qwen3-vl-30b', 'whisperx')")
     service: str = Field(..., description="Service name (e.g., 'llama-cpp', 'whisperx')")
     priority: int = Field(default=5, ge=1, le=10, description="Priority (1=low, 10=high)")
+    workflow: Optional[str] = Field(
+        default=None,
+        description="Workflow or job tag; consecutive loads with the same tag train prefetching",
+    )
 
 
 class ModelUnloadRequest(BaseModel):
@@ -44,6 +111,8 @@ class ModelInfo(BaseModel):
     loaded_at: str
     vram_mb: Optional[int] = None
     status: str
+    priority: int = 5
+    last_used: Optional[str] = None
 
 
 class GPUStatus(BaseModel):
@@ -53,129 +122,274 @@ class GPUStatus(BaseModel):
     free_mb: int
     utilization_percent: float
     loaded_models: Dict[str, ModelInfo]
+    scheduler: Optional[dict] = None
+    vram_costs: Optional[dict] = None
+    proxy: Optional[dict] = None
+    prefetch: Optional[dict] = None
+    services: Optional[dict] = None
+    sampled_at: Optional[str] = None
 
 
 class ModelOrchestrator:
     """Manages model lifecycle and GPU memory"""
 
-    def __init__(self):
-        self.loaded_models: Dict[str, ModelInfo] = {}
+    def __init__(self, telemetry: Optional[GpuTelemetry] = None):
+        self.telemetry = telemetry or create_telemetry(GPU_TELEMETRY, SIMULATED_GPU_MB)
+        self.simulated = self.telemetry.name == "simulated"
         self.service_endpoints = {
             "llama-cpp": "http://llama-cpp:8000",
             "whisperx": "http://whisperx:8000",
+            "vibevoice": "http://vibevoice-api:8100",
+            "comfyui": "http://comfyui:8188",
             "ovi": "http://ovi:8300",
             "infinitetalk": "http://infinitetalk:8200",
             "wan": "http://wan:7860",
         }
         self.http_client: Optional[httpx.AsyncClient] = None
-
-        # Initialize NVML for GPU monitoring
-        try:
-            pynvml.nvmlInit()
-            self.gpu_handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-            logger.info("NVML initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize NVML: {e}")
-            self.gpu_handle = None
+        self.scheduler = AdmissionScheduler(
+            VramCostTable(),
+            memory=self.get_gpu_memory,
+            unload=self.unload_service_model,
+            eviction_scope={service: api[3] for service, api in UNLOAD_APIS.items()},
+            capacity_mb=VRAM_CAPACITY_MB,
+            reserve_mb=VRAM_RESERVE_MB,
+            queue_timeout=ADMISSION_TIMEOUT,
+            eviction_policy=EVICTION_POLICY,
+        )
+        self.router = ServiceRouter(SERVICE_CONCURRENCY, DEFAULT_SERVICE_CONCURRENCY)
+        self.prefetcher = Prefetcher(
+            self.scheduler,
+            warm=self.warm_service_model,
+            warmable=LOAD_APIS,
+            ttl=PREFETCH_TTL,
+            min_probability=PREFETCH_MIN_PROBABILITY,
+            min_samples=PREFETCH_MIN_SAMPLES,
+            enabled=PREFETCH_ENABLED,
+        )
+        self.store = StateStore(STATE_DB, STATE_RETENTION_HOURS)
+        self.monitor = HealthMonitor(
+            self.service_endpoints,
+            self.telemetry,
+            self.store,
+            interval=HEALTH_INTERVAL,
+            history=HEALTH_HISTORY,
+            probe_services=not self.simulated,
+            on_sample=self._on_sample,
+        )
 
     async def startup(self):
         """Initialize async resources"""
+        self.scheduler.restore_residents(self.store.get("residents", []))
+        self.scheduler.costs.restore(self.store.get("vram_costs", {}))
+        self.prefetcher.restore(self.store.get("prefetch", {}))
+        for resident in self.scheduler.residents.values():
+            self.telemetry.model_loaded(resident.model, resident.cost_mb)
+        if self.scheduler.residents:
+            logger.info(f"Restored {len(self.scheduler.residents)} admitted models")
+
         self.http_client = httpx.AsyncClient(timeout=30.0)
+        self.monitor.start(self.http_client)
         logger.info("Model Orchestrator started")
 
     async def shutdown(self):
         """Cleanup resources"""
+        await self.monitor.stop()
+        self.prefetcher.close()
+        self.store.put(**self._state())
+        self.store.close()
         if self.http_client:
             await self.http_client.aclose()
-        if self.gpu_handle:
-            pynvml.nvmlShutdown()
+        self.telemetry.close()
         logger.info("Model Orchestrator shutdown")
 
+    def _state(self) -> dict:
+        """What is persisted across restarts (copied on the event loop thread)"""
+        return {
+            "residents": self.scheduler.export_residents(),
+            "vram_costs": self.scheduler.costs.learned(),
+            "prefetch": self.prefetcher.export(),
+        }
+
+    async def _on_sample(self, snapshot: dict):
+        """Reconcile with the sampled services, then persist state with the sample"""
+        await self._reconcile(snapshot["services"], snapshot["ts"])
+        snapshot["scheduler"] = {
+            "residents": sorted(self.scheduler.residents),
+            "committed_mb": sum(r.cost_mb for r in self.scheduler.residents.values()),
+            "queue_depth": len(self.scheduler.stats()["queue"]),
+            "proxy_waiting": sum(s["waiting"] for s in self.router.stats().values()),
+        }
+        await asyncio.to_thread(self.store.put, **self._state())
+
+    async def _reconcile(self, services: Dict[str, dict], probed_at: float):
+        """
+        Match admitted models to what each service reports holding.
+
+        A model named after its service (the proxy default when no model is
+        given) stands for whatever the service holds: it is never dropped, and
+        while it is admitted the service's reported models are not adopted,
+        so the same VRAM is not counted twice. Residents used since the probe
+        started are left alone, since the sample may predate their load.
+        """
+        for service, state in services.items():
+            if service not in RECONCILED_SERVICES or not state["healthy"] or state["models"] is None:
+                continue
+            held = set(state["models"])
+
+            for resident in list(self.scheduler.residents.values()):
+                if resident.service != service or resident.model == service:
+                    continue
+                if resident.model in held:
+                    resident.status = "loaded"
+                elif resident.status == "loaded" and resident.last_used < probed_at:
+                    # Freed by the service itself (e.g. idle eviction or a restart)
+                    try:
+                        await self.scheduler.release(resident.model, unload=False)
+                    except AdmissionError:
+                        continue
+                    self.telemetry.model_unloaded(resident.model)
+                    logger.info(f"Model {resident.model} no longer held by {service}, dropped")
+
+            if service in self.scheduler.residents:
+                continue
+            for model in held - set(self.scheduler.residents):
+                async def held_already() -> str:
+                    return "loaded"
+
+                await self.scheduler.admit(model, service, 5, held_already, preloaded=True)
+                logger.info(f"Model {model} held by {service} but untracked, adopted")
+
     def get_gpu_memory(self) -> tuple[int, int, int]:
         """Get GPU memory usage in MB"""
-        if not self.gpu_handle:
-            return 0, 0, 0
-
-        try:
-            info = pynvml.nvmlDeviceGetMemoryInfo(self.gpu_handle)
-            total_mb = info.total // (1024 * 1024)
-            used_mb = info.used // (1024 * 1024)
-            free_mb = info.free // (1024 * 1024)
-            return total_mb, used_mb, free_mb
-        except Exception as e:
-            logger.error(f"Failed to get GPU memory: {e}")
-            return 0, 0, 0
+        return self.telemetry.memory()
 
     def get_gpu_utilization(self) -> float:
         """Get GPU utilization percentage"""
-        if not self.gpu_handle:
-            return 0.0
+        return self.telemetry.utilization()
+
+    @property
+    def loaded_models(self) -> Dict[str, ModelInfo]:
+        """Admitted models as API records"""
+        return {
+            model: self._model_info(resident)
+            for model, resident in self.scheduler.residents.items()
+        }
+
+    @staticmethod
+    def _model_info(resident: Resident) -> ModelInfo:
+        return ModelInfo(
+            model=resident.model,
+            service=resident.service,
+            loaded_at=datetime.utcfromtimestamp(resident.loaded_at).isoformat(),
+            vram_mb=resident.cost_mb,
+            status=resident.status,
+            priority=resident.priority,
+            last_used=datetime.utcfromtimestamp(resident.last_used).isoformat(),
+        )
 
+    async def unload_service_model(self, service: str, model: str):
+        """Ask a service to free a model's VRAM through its unload API"""
+        method, path, body, scope = UNLOAD_APIS[service]
+        if not self.simulated:
+            url = f"{self.service_endpoints[service]}{path.format(model=model)}"
+            response = await self.http_client.request(method, url, json=body, timeout=60.0)
+            response.raise_for_status()
+            logger.info(f"Unloaded {model} via {method} {url}")
+
+        if scope == "service":
+            for resident in list(self.scheduler.residents.values()):
+                if resident.service == service:
+                    self.telemetry.model_unloaded(resident.model)
+        self.telemetry.model_unloaded(model)
+
+    async def warm_service_model(self, service: str, model: str) -> str:
+        """Ask a service to load a model ahead of its first request"""
+        method, path, body = LOAD_APIS[service]
+        if not self.simulated:
+            url = f"{self.service_endpoints[service]}{path.format(model=model)}"
+            response = await self.http_client.request(method, url, json=body, timeout=600.0)
+            response.raise_for_status()
+            logger.info(f"Warmed {model} via {method} {url}")
+        self.telemetry.model_loaded(model, self.scheduler.costs.estimate(model, service))
+        return "loaded"
+
+    async def _verify_llama(self, endpoint: str) -> str:
+        """llama-cpp loads its model on container start; check it is serving"""
+        if self.simulated:
+            return "loaded"
+        sampled = self.monitor.service("llama-cpp")
+        if sampled is not None:
+            if not sampled["healthy"]:
+                raise HTTPException(status_code=503, detail="Service llama-cpp not ready")
+            return "loaded"
+
+        # No recent sample (e.g. just started): ask directly
         try:
-            util = pynvml.nvmlDeviceGetUtilizationRates(self.gpu_handle)
-            return float(util.gpu)
-        except Exception as e:
-            logger.error(f"Failed to get GPU utilization: {e}")
-            return 0.0
+            response = await self.http_client.get(f"{endpoint}/health", timeout=5.0)
+        except httpx.RequestError as e:
+            logger.error(f"Failed to verify llama-cpp: {e}")
+            raise HTTPException(status_code=503, detail="Service llama-cpp not reachable")
+        if response.status_code != 200:
+            raise HTTPException(status_code=503, detail="Service llama-cpp not ready")
+        return "loaded"
 
     async def load_model(self, request: ModelLoadRequest) -> ModelInfo:
-        """Load a model into GPU memory"""
+        """Admit a model into GPU memory, evicting or queueing until it fits"""
 
-        # Check if already loaded
-        if request.model in self.loaded_models:
+        if request.model in self.scheduler.residents:
             logger.info(f"Model {request.model} already loaded")
-            return self.loaded_models[request.model]
 
-        # Get current GPU memory
         total_mb, used_mb, free_mb = self.get_gpu_memory()
         logger.info(f"GPU Memory - Total: {total_mb}MB, Used: {used_mb}MB, Free: {free_mb}MB")
 
-        # For llama-cpp, model loads on container start - just verify it's ready
-        if request.service == "llama-cpp":
-            endpoint = self.service_endpoints.get(request.service)
-            if not endpoint:
-                raise HTTPException(status_code=400, detail=f"Unknown service: {request.service}")
-
-            try:
-                response = await self.http_client.get(f"{endpoint}/health", timeout=5.0)
-                if response.status_code == 200:
-                    model_info = ModelInfo(
-                        model=request.model,
-                        service=request.service,
-                        loaded_at=datetime.utcnow().isoformat(),
-                        status="loaded"
-                    )
-                    self.loaded_models[request.model] = model_info
-                    logger.info(f"Model {request.model} verified loaded in {request.service}")
-                    return model_info
-                else:
-                    raise HTTPException(status_code=503, detail=f"Service {request.service} not ready")
-            except httpx.RequestError as e:
-                logger.error(f"Failed to verify {request.service}: {e}")
-                raise HTTPException(status_code=503, detail=f"Service {request.service} not reachable")
-
-        # For other services, they auto-load on first request
-        # Just track that we expect them to be loaded
-        model_info = ModelInfo(
-            model=request.model,
-            service=request.service,
-            loaded_at=datetime.utcnow().isoformat(),
-            status="loading"
-        )
-        self.loaded_models[request.model] = model_info
-        logger.info(f"Model {request.model} marked for loading in {request.service}")
-
-        return model_info
+        self.prefetcher.claim(request.model)
+        try:
+            # For llama-cpp, model loads on container start - just verify it's ready
+            if request.service == "llama-cpp":
+                endpoint = self.service_endpoints.get(request.service)
+                if not endpoint:
+                    raise HTTPException(status_code=400, detail=f"Unknown service: {request.service}")
+                resident = await self.scheduler.admit(
+                    request.model,
+                    request.service,
+                    request.priority,
+                    lambda: self._verify_llama(endpoint),
+                    preloaded=True,
+                )
+                self.telemetry.model_loaded(request.model, resident.cost_mb)
+                logger.info(f"Model {request.model} verified loaded in {request.service}")
+                self.prefetcher.record(request.model, request.service, request.workflow)
+                return self._model_info(resident)
+
+            # Other services auto-load on first request: once admitted (room made),
+            # track that we expect them to be loaded
+            async def expect_loaded() -> str:
+                self.telemetry.model_loaded(
+                    request.model,
+                    self.scheduler.costs.estimate(request.model, request.service),
+                )
+                return "loading"
+
+            resident = await self.scheduler.admit(
+                request.model, request.service, request.priority, expect_loaded
+            )
+        except AdmissionError as e:
+            logger.warning(f"Model {request.model} not admitted: {e}")
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+
+        logger.info(f"Model {request.model} admitted for loading in {request.service}")
+        self.prefetcher.record(request.model, request.service, request.workflow)
+        return self._model_info(resident)
 
     async def unload_model(self, request: ModelUnloadRequest) -> dict:
         """Unload a model from GPU memory"""
 
-        if request.model not in self.loaded_models:
+        resident = self.scheduler.residents.get(request.model)
+        if resident is None:
             logger.warning(f"Model {request.model} not tracked as loaded")
             return {"status": "not_loaded", "model": request.model}
 
-        model_info = self.loaded_models[request.model]
-        service = model_info.service
+        service = resident.service
 
         # For llama-cpp, we need to stop the container to free VRAM
         # This will be handled by Docker orchestration
@@ -183,7 +397,11 @@ class ModelOrchestrator:
             logger.info(f"To unload {request.model}, stop the llama-cpp container")
             # Note: We don't actually stop the container here - that's done via Docker
             # This is just tracking state
-            del self.loaded_models[request.model]
+            try:
+                await self.scheduler.release(request.model, unload=False, force=request.force)
+            except AdmissionError as e:
+                raise HTTPException(status_code=e.status_code, detail=str(e))
+            self.telemetry.model_unloaded(request.model)
             return {
                 "status": "unload_requested",
                 "model": request.model,
@@ -191,9 +409,13 @@ class ModelOrchestrator:
                 "note": "Stop llama-cpp container to fully free VRAM"
             }
 
-        # For other services, we just remove from tracking
-        # They'll unload on their own when idle or explicitly via their APIs
-        del self.loaded_models[request.model]
+        # Services with an unload API free the VRAM now; the others are just
+        # removed from tracking and unload on their own when idle
+        try:
+            await self.scheduler.release(request.model, force=request.force)
+        except AdmissionError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        self.telemetry.model_unloaded(request.model)
         logger.info(f"Model {request.model} removed from tracking")
 
         return {
@@ -203,16 +425,109 @@ class ModelOrchestrator:
         }
 
     def get_status(self) -> GPUStatus:
-        """Get current GPU and model status"""
-        total_mb, used_mb, free_mb = self.get_gpu_memory()
-        utilization = self.get_gpu_utilization()
+        """Get current GPU and model status (GPU and services from the latest sample)"""
+        sample = self.monitor.fresh()
+        if sample is not None:
+            gpu = sample["gpu"]
+        else:
+            total_mb, used_mb, free_mb = self.get_gpu_memory()
+            gpu = {
+                "total_mb": total_mb,
+                "used_mb": used_mb,
+                "free_mb": free_mb,
+                "utilization_percent": self.get_gpu_utilization(),
+            }
 
         return GPUStatus(
-            total_mb=total_mb,
-            used_mb=used_mb,
-            free_mb=free_mb,
-            utilization_percent=utilization,
-            loaded_models=self.loaded_models
+            **gpu,
+            loaded_models=self.loaded_models,
+            scheduler=self.scheduler.stats(),
+            vram_costs=self.scheduler.costs.to_dict(),
+            proxy=self.router.stats(),
+            prefetch=self.prefetcher.stats(),
+            services=sample["services"] if sample else None,
+            sampled_at=datetime.utcfromtimestamp(sample["ts"]).isoformat() if sample else None,
+        )
+
+    async def proxy(self, service: str, path: str, request: Request) -> StreamingResponse:
+        """
+        Forward a request to a service once it has a slot and its model is admitted.
+
+        The model (X-Orchestrator-Model header, default: the service name) is
+        admitted like POST /models/load, evicting others if needed, and pinned
+        so it is not evicted until the response has been streamed back.
+        """
+        endpoint = self.service_endpoints.get(service)
+        if not endpoint:
+            raise HTTPException(status_code=404, detail=f"Unknown service: {service}")
+        try:
+            load_request = ModelLoadRequest(
+                model=request.headers.get("x-orchestrator-model", service),
+                service=service,
+                priority=request.headers.get("x-orchestrator-priority", 5),
+                workflow=request.headers.get("x-orchestrator-workflow"),
+            )
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        await self.router.acquire(service)
+        pinned = False
+        done = False
+
+        async def finish(ok: bool):
+            nonlocal done
+            if done:
+                return
+            done = True
+            self.router.release(service, ok)
+            if pinned:
+                await self.scheduler.unpin(load_request.model)
+
+        try:
+            await self.load_model(load_request)
+            self.scheduler.pin(load_request.model)
+            pinned = True
+
+            upstream_request = self.http_client.build_request(
+                request.method,
+                f"{endpoint}/{path}",
+                params=request.query_params,
+                headers=forward_headers(request.headers),
+                content=request.stream(),
+                timeout=PROXY_TIMEOUT,
+            )
+            upstream = await self.http_client.send(upstream_request, stream=True)
+        except httpx.RequestError as e:
+            await finish(False)
+            logger.error(f"Proxy to {service} failed: {e}")
+            raise HTTPException(status_code=502, detail=f"Service {service} not reachable")
+        except BaseException:
+            await finish(False)
+            raise
+
+        ok = upstream.status_code < 500
+        resident = self.scheduler.residents.get(load_request.model)
+        if ok and resident is not None and resident.status == "loading":
+            # Lazy services have loaded the model once they answered a request
+            resident.status = "loaded"
+
+        async def body():
+            try:
+                async for chunk in upstream.aiter_raw():
+                    yield chunk
+            finally:
+                await upstream.aclose()
+                await finish(ok)
+
+        async def cleanup():
+            await upstream.aclose()
+            await finish(ok)
+
+        return StreamingResponse(
+            body(),
+            status_code=upstream.status_code,
+            headers=forward_headers(upstream.headers),
+            background=BackgroundTask(cleanup),
         )
 
 
@@ -243,6 +558,18 @@ async def health_check():
     return {"status": "healthy", "service": "model-orchestrator"}
 
 
+@app.get("/health/history")
+async def health_history(since: float = 0.0, limit: int = 1000):
+    """
+    Sampled GPU, service and scheduler state since a Unix time, oldest first.
+
+    Recent samples come from memory; older ones from STATE_DB (kept for
+    STATE_RETENTION_HOURS).
+    """
+    samples = await orchestrator.monitor.samples(since, limit)
+    return {"interval": HEALTH_INTERVAL, "samples": samples}
+
+
 @app.get("/models/status", response_model=GPUStatus)
 async def get_model_status():
     """Get current GPU memory usage and loaded models"""
@@ -254,8 +581,16 @@ async def load_model(request: ModelLoadRequest):
     """
     Load a model into GPU memory.
 
+    The model is admitted against the VRAM budget first: if it does not fit,
+    lower-priority or least recently used models are unloaded through their
+    services' APIs; if it still does not fit, the request waits in a
+    priority queue (503 after ADMISSION_TIMEOUT, 409 if it can never fit).
+
     For llama-cpp, verifies the service is ready.
     For other services, marks the model for lazy loading.
+
+    With a workflow tag, the model most likely to be requested next by the
+    same workflow is prefetched into free VRAM.
     """
     return await orchestrator.load_model(request)
 
@@ -266,10 +601,28 @@ async def unload_model(request: ModelUnloadRequest):
     Unload a model from GPU memory.
 
     Note: For llama-cpp, you must stop the container to fully free VRAM.
+    Models serving proxied requests are only unloaded with force (409 otherwise).
     """
     return await orchestrator.unload_model(request)
 
 
+@app.api_route(
+    "/proxy/{service}/{path:path}",
+    methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+)
+async def proxy(service: str, path: str, request: Request):
+    """
+    Proxy a request to a GPU service.
+
+    Requests wait for one of the service's SERVICE_CONCURRENCY slots, then
+    the model named by X-Orchestrator-Model (default: the service) is
+    admitted at X-Orchestrator-Priority (default 5), evicting others if
+    needed, before the request is forwarded and the response streamed back.
+    X-Orchestrator-Workflow tags the request for prefetching.
+    """
+    return await orchestrator.proxy(service, path, request)
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -280,7 +633,9 @@ async def root():
             "status": "/models/status",
             "load": "POST /models/load",
             "unload": "POST /models/unload",
-            "health": "/health"
+            "proxy": "/proxy/{service}/{path}",
+            "health": "/health",
+            "history": "/health/history"
         }
     }
 
@@ -0,0 +1,175 @@
+"""
+Background Health Sampling
+
+Every HEALTH_INTERVAL seconds the monitor checks each service's health
+endpoint and, where the service has one, the endpoint listing the models
+it holds, and reads GPU memory and utilization. Samples go into a ring
+buffer (status queries read the latest one instead of calling NVML and the
+services on the request path) and are persisted for plotting.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .state import StateStore
+from .telemetry import GpuTelemetry
+
+logger = logging.getLogger(__name__)
+
+
+def _llama_models(body: dict) -> List[str]:
+    return [entry["id"] for entry in body.get("data", [])]
+
+
+def _whisperx_models(body: dict) -> List[str]:
+    # Whisper pool keys are (model, compute type, language)
+    entries = body.get("pools", {}).get("whisper", {}).get("entries", [])
+    return sorted({entry["key"][0] for entry in entries if entry.get("key")})
+
+
+def _vibevoice_models(body: dict) -> List[str]:
+    return [body["current_model"]] if body.get("current_model") else []
+
+
+# Service -> (health path, loaded-models path or None, parser of its JSON)
+SERVICE_PROBES: Dict[str, Tuple[str, Optional[str], Optional[Callable[[dict], List[str]]]]] = {
+    "llama-cpp": ("/health", "/v1/models", _llama_models),
+    "whisperx": ("/health", "/models/pool", _whisperx_models),
+    "vibevoice": ("/api/health", "/api/models/current", _vibevoice_models),
+    "comfyui": ("/system_stats", None, None),
+    "ovi": ("/api/health", None, None),
+    "infinitetalk": ("/api/health", None, None),
+    "wan": ("/", None, None),
+}
+
+
+class HealthMonitor:
+    """Samples service health, loaded models and GPU state at a fixed interval."""
+
+    def __init__(
+        self,
+        endpoints: Dict[str, str],
+        telemetry: GpuTelemetry,
+        store: StateStore,
+        interval: float = 10.0,
+        history: int = 360,
+        probe_services: bool = True,
+        on_sample: Optional[Callable[[dict], Awaitable[None]]] = None,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            endpoints: Service -> base URL
+            telemetry: GPU telemetry provider
+            store: Where samples are persisted
+            interval: Seconds between samples
+            history: Samples kept in memory
+            probe_services: Call the services (off for a simulated GPU)
+            on_sample: Coroutine given each sample before it is stored; it may
+                add fields (e.g. scheduler state)
+        """
+        self.endpoints = endpoints
+        self.telemetry = telemetry
+        self.store = store
+        self.interval = interval
+        self.probe_services = probe_services
+        self.on_sample = on_sample
+        self.history: deque = deque(maxlen=history)
+        self.latest: Optional[dict] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, client: httpx.AsyncClient):
+        """Start sampling in the background."""
+        self._client = client
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.monotonic()
+            try:
+                await self.sample()
+            except Exception as e:
+                logger.error(f"Health sampling failed: {e}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    async def _probe(self, service: str) -> dict:
+        """Health and loaded models of one service."""
+        health_path, models_path, parse = SERVICE_PROBES.get(service, ("/health", None, None))
+        base = self.endpoints[service]
+        timeout = min(5.0, self.interval)
+        result = {"healthy": False, "latency_ms": None, "models": None, "error": None}
+        start = time.perf_counter()
+        try:
+            response = await self._client.get(f"{base}{health_path}", timeout=timeout)
+            result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            result["healthy"] = response.status_code == 200
+            if not result["healthy"]:
+                result["error"] = f"HTTP {response.status_code}"
+            elif models_path:
+                response = await self._client.get(f"{base}{models_path}", timeout=timeout)
+                response.raise_for_status()
+                result["models"] = parse(response.json())
+        except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+            result["error"] = str(e) or type(e).__name__
+        return result
+
+    async def sample(self) -> dict:
+        """Take, store and return one sample."""
+        total_mb, used_mb, free_mb = self.telemetry.memory()
+        snapshot = {
+            "ts": round(time.time(), 3),
+            "gpu": {
+                "total_mb": total_mb,
+                "used_mb": used_mb,
+                "free_mb": free_mb,
+                "utilization_percent": self.telemetry.utilization(),
+            },
+            "services": {},
+        }
+        if self.probe_services:
+            services = list(self.endpoints)
+            results = await asyncio.gather(*(self._probe(service) for service in services))
+            snapshot["services"] = dict(zip(services, results))
+
+        if self.on_sample is not None:
+            await self.on_sample(snapshot)
+        self.history.append(snapshot)
+        self.latest = snapshot
+        await asyncio.to_thread(self.store.add_snapshot, snapshot)
+        return snapshot
+
+    def fresh(self) -> Optional[dict]:
+        """The latest sample if it is at most two intervals old."""
+        if self.latest is None or time.time() - self.latest["ts"] > 2 * self.interval:
+            return None
+        return self.latest
+
+    def service(self, name: str) -> Optional[dict]:
+        """A service's state from the latest fresh sample, or None."""
+        latest = self.fresh()
+        if latest is None:
+            return None
+        return latest["services"].get(name)
+
+    async def samples(self, since: float = 0.0, limit: int = 1000) -> List[dict]:
+        """Samples since a time, from memory when it covers the range, else the store."""
+        if self.history and (since >= self.history[0]["ts"] or not self.store.enabled):
+            selected = [s for s in self.history if s["ts"] >= since]
+            return selected[-limit:]
+        return await asyncio.to_thread(self.store.snapshots, since, None, limit)
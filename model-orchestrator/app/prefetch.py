@@ -0,0 +1,246 @@
+"""
+Predictive Model Prefetch
+
+Pipelines load their models in the same order every time (transcribe ->
+TTS -> portrait -> talking head). Consecutive load requests that carry the
+same workflow or job tag are recorded as transitions between models; once
+a transition is common enough, the likely next model is loaded as soon as
+the current one is admitted, so it is warm by the time the next stage asks
+for it.
+
+Prefetches only use free headroom (at most other unused prefetches are
+evicted for them, and they never wait in the admission queue), are the
+first to go when a real request needs room, and are unloaded again if
+unused after a TTL.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from .scheduler import AdmissionError, AdmissionScheduler
+
+logger = logging.getLogger(__name__)
+
+# Below any request's (1-10): prefetches only evict each other, and any
+# request may evict them
+PREFETCH_PRIORITY = 0
+
+
+class TransitionTable:
+    """Counts of which model was requested after which, learned per tag."""
+
+    def __init__(self, tag_ttl: float = 3600.0):
+        """
+        Initialize the table.
+
+        Args:
+            tag_ttl: Seconds after which an idle tag's last model is forgotten
+        """
+        self.tag_ttl = tag_ttl
+        # model -> next model -> count
+        self.counts: Dict[str, Dict[str, int]] = {}
+        # tag -> (last model, time)
+        self._last: Dict[str, Tuple[str, float]] = {}
+
+    def record(self, tag: str, model: str):
+        """Record that tag requested model, learning the transition from its previous one."""
+        now = time.time()
+        previous = self._last.get(tag)
+        if previous is not None and previous[0] != model and now - previous[1] <= self.tag_ttl:
+            following = self.counts.setdefault(previous[0], {})
+            following[model] = following.get(model, 0) + 1
+        self._last[tag] = (model, now)
+
+        if len(self._last) > 1024:
+            self._last = {
+                t: last for t, last in self._last.items() if now - last[1] <= self.tag_ttl
+            }
+
+    def predict(self, model: str, min_samples: int) -> Optional[Tuple[str, float]]:
+        """
+        Most likely next model after model.
+
+        Returns:
+            (model, probability), or None with fewer than min_samples observations
+        """
+        following = self.counts.get(model)
+        if not following:
+            return None
+        total = sum(following.values())
+        if total < min_samples:
+            return None
+        best = max(following, key=following.get)
+        return best, following[best] / total
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """Transition probabilities for the status endpoint."""
+        table = {}
+        for model, following in self.counts.items():
+            total = sum(following.values())
+            table[model] = {
+                nxt: round(count / total, 3)
+                for nxt, count in sorted(following.items(), key=lambda item: -item[1])
+            }
+        return table
+
+
+class Prefetcher:
+    """Loads the predicted next model of a workflow while the current stage runs."""
+
+    def __init__(
+        self,
+        scheduler: AdmissionScheduler,
+        warm: Callable[[str, str], Awaitable[str]],
+        warmable: Iterable[str],
+        ttl: float = 300.0,
+        min_probability: float = 0.6,
+        min_samples: int = 3,
+        enabled: bool = True,
+    ):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            scheduler: Admission scheduler prefetches are admitted through
+            warm: Coroutine loading (service, model); returns its status
+            warmable: Services that can load a model ahead of a request
+            ttl: Seconds a prefetched model may stay unused before it is unloaded
+            min_probability: Transition probability required to prefetch
+            min_samples: Observed transitions from a model required to prefetch
+            enabled: Learn transitions but never prefetch when False
+        """
+        self.scheduler = scheduler
+        self.warm = warm
+        self.warmable = set(warmable)
+        self.ttl = ttl
+        self.min_probability = min_probability
+        self.min_samples = min_samples
+        self.enabled = enabled
+
+        self.transitions = TransitionTable()
+        self.services: Dict[str, str] = {}
+        # Prefetched and not yet requested: model -> prefetch task
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._loading: set = set()
+        self.issued = 0
+        self.hits = 0
+        self.expired = 0
+        self.evicted = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def claim(self, model: str):
+        """Count a hit if model was prefetched; call before the request is admitted."""
+        task = self._pending.pop(model, None)
+        if task is None:
+            return
+        # A prefetch still loading finishes for this request
+        if model not in self._loading:
+            task.cancel()
+        if model in self.scheduler.residents:
+            self.hits += 1
+            logger.info(f"Prefetch hit: {model}")
+        else:
+            self.evicted += 1
+
+    def record(self, model: str, service: str, tag: Optional[str] = None):
+        """
+        Note an admitted load request: learn the transition from the tag's
+        previous model and start a prefetch of the likely next one.
+        """
+        self.services[model] = service
+        if tag is None:
+            return
+        self.transitions.record(tag, model)
+        if self.enabled:
+            self._maybe_prefetch(model)
+
+    def _maybe_prefetch(self, model: str):
+        prediction = self.transitions.predict(model, self.min_samples)
+        if prediction is None or prediction[1] < self.min_probability:
+            return
+        nxt = prediction[0]
+        service = self.services.get(nxt)
+        if service not in self.warmable or nxt in self.scheduler.residents or nxt in self._pending:
+            return
+
+        # Only free headroom, and never ahead of requests waiting for memory
+        need = self.scheduler.costs.estimate(nxt, service)
+        if self.scheduler.stats()["queue"] or self.scheduler.available_mb() < need:
+            self.skipped += 1
+            return
+
+        self.issued += 1
+        logger.info(f"Prefetching {nxt} after {model} (p={prediction[1]:.2f})")
+        self._pending[nxt] = asyncio.create_task(self._prefetch(nxt, service))
+
+    async def _prefetch(self, model: str, service: str):
+        """Load model, then unload it if nobody asked for it within the TTL."""
+        self._loading.add(model)
+        try:
+            await self.scheduler.admit(
+                model,
+                service,
+                PREFETCH_PRIORITY,
+                lambda: self.warm(service, model),
+                timeout=0,
+            )
+        except Exception as e:
+            logger.warning(f"Prefetch of {model} failed: {e}")
+            self.failed += 1
+            self._pending.pop(model, None)
+            return
+        finally:
+            self._loading.discard(model)
+
+        if model not in self._pending:
+            # Requested while loading
+            return
+        await asyncio.sleep(self.ttl)
+        self._pending.pop(model, None)
+        if model not in self.scheduler.residents:
+            self.evicted += 1
+            return
+        self.expired += 1
+        logger.info(f"Prefetched {model} unused after {self.ttl:.0f}s, unloading")
+        try:
+            await self.scheduler.release(model)
+        except AdmissionError as e:
+            logger.warning(f"Could not unload unused prefetch {model}: {e}")
+
+    def export(self) -> Dict:
+        """Learned transitions and model services, for persistence."""
+        return {
+            "transitions": {model: dict(nxt) for model, nxt in self.transitions.counts.items()},
+            "services": dict(self.services),
+        }
+
+    def restore(self, state: Dict):
+        """Reload what export() saved."""
+        for model, following in state.get("transitions", {}).items():
+            self.transitions.counts.setdefault(model, {}).update(following)
+        self.services.update(state.get("services", {}))
+
+    def close(self):
+        """Cancel pending prefetches (their models stay loaded)."""
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+
+    def stats(self) -> Dict:
+        """Prefetch counters, hit rate and learned transitions for the status endpoint."""
+        resolved = self.hits + self.expired + self.evicted
+        return {
+            "enabled": self.enabled,
+            "pending": sorted(self._pending),
+            "issued": self.issued,
+            "hits": self.hits,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "failed": self.failed,
+            "skipped_no_headroom": self.skipped,
+            "hit_rate": round(self.hits / resolved, 3) if resolved else None,
+            "transitions": self.transitions.to_dict(),
+        }
@@ -0,0 +1,139 @@
+"""
+Service Request Router
+
+Per-service concurrency limits for requests the orchestrator proxies to the
+GPU services. Each service gets a FIFO semaphore sized to how many requests
+it can run at once (usually 1 on a shared GPU); requests beyond that wait
+here instead of piling up inside the service, and the wait is visible in
+/models/status as queue depth and wait times.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe one hop and must not be forwarded
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+    "host",
+    "content-length",
+}
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """
+    Parse 'service=limit,...' (e.g. 'whisperx=2,comfyui=1').
+
+    Raises:
+        ValueError: On a malformed entry or a limit below 1
+    """
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        service, sep, value = item.partition("=")
+        if not sep or int(value) < 1:
+            raise ValueError(f"Invalid concurrency limit '{item}', expected service=N with N >= 1")
+        limits[service.strip()] = int(value)
+    return limits
+
+
+def forward_headers(headers) -> Dict[str, str]:
+    """Headers to pass on, without hop-by-hop and orchestrator control headers."""
+    return {
+        name: value
+        for name, value in headers.items()
+        if name.lower() not in HOP_BY_HOP_HEADERS and not name.lower().startswith("x-orchestrator-")
+    }
+
+
+class _ServiceSlots:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.served = 0
+        self.errors = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class ServiceRouter:
+    """Concurrency slots and queue metrics per proxied service."""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None, default_limit: int = 1):
+        """
+        Initialize the router.
+
+        Args:
+            limits: Service -> concurrent requests
+            default_limit: Limit for services not in limits
+        """
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self._services: Dict[str, _ServiceSlots] = {}
+
+    def _slots(self, service: str) -> _ServiceSlots:
+        slots = self._services.get(service)
+        if slots is None:
+            slots = _ServiceSlots(self.limits.get(service, self.default_limit))
+            self._services[service] = slots
+        return slots
+
+    async def acquire(self, service: str) -> float:
+        """
+        Wait for a slot on service (FIFO).
+
+        Returns:
+            Seconds waited
+        """
+        slots = self._slots(service)
+        start = time.monotonic()
+        slots.waiting += 1
+        try:
+            await slots.semaphore.acquire()
+        finally:
+            slots.waiting -= 1
+        waited = time.monotonic() - start
+        slots.active += 1
+        slots.wait_total += waited
+        slots.wait_max = max(slots.wait_max, waited)
+        if waited >= 1.0:
+            logger.info(f"Request to {service} waited {waited:.1f}s for a slot")
+        return waited
+
+    def release(self, service: str, ok: bool = True):
+        """Free a slot taken with acquire()."""
+        slots = self._services[service]
+        slots.active -= 1
+        if ok:
+            slots.served += 1
+        else:
+            slots.errors += 1
+        slots.semaphore.release()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-service slots, queue depth and wait times for the status endpoint."""
+        return {
+            service: {
+                "limit": slots.limit,
+                "active": slots.active,
+                "waiting": slots.waiting,
+                "served": slots.served,
+                "errors": slots.errors,
+                "mean_wait_seconds": round(
+                    slots.wait_total / max(1, slots.served + slots.errors + slots.active), 2
+                ),
+                "max_wait_seconds": round(slots.wait_max, 2),
+            }
+            for service, slots in sorted(self._services.items())
+        }
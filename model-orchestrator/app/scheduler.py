@@ -0,0 +1,626 @@
+"""
+VRAM Admission Scheduler
+
+Decides whether a model fits on the GPU before it is loaded. When it does
+not, lower-priority or least recently used models are evicted through their
+services' unload APIs to make room; when even that is not enough, the request
+waits in a priority queue until memory is released or it times out.
+
+Model sizes come from a cost table seeded with rough per-model estimates and
+refined from observed NVML deltas (used memory before/after each load and
+each unload), so the scheduler converges on what the services really use.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seed estimates (MB) used until a load or unload of the model has been measured
+DEFAULT_MODEL_COSTS_MB = {
+    "qwen3-vl-30b": 17000,
+    "large-v3": 6000,
+    "ovi-11b": 22000,
+    "wan2.1-14b": 28000,
+    "infinitetalk": 8000,
+}
+DEFAULT_SERVICE_COSTS_MB = {
+    "llama-cpp": 17000,
+    "whisperx": 6000,
+    "vibevoice": 10000,
+    "comfyui": 12000,
+    "ovi": 22000,
+    "wan": 28000,
+    "infinitetalk": 8000,
+}
+
+
+# Sort keys over an eviction unit (models unloaded together), first = evicted first.
+# Only models with a priority at or below the request's are ever candidates.
+EVICTION_POLICIES: Dict[str, Callable[[List["Resident"]], tuple]] = {
+    # Lowest priority first, then least recently used
+    "priority-lru": lambda unit: (max(r.priority for r in unit), max(r.last_used for r in unit)),
+    # Least recently used, regardless of priority
+    "lru": lambda unit: (max(r.last_used for r in unit),),
+    # Lowest priority first, then the largest (fewest unloads to make room)
+    "priority-largest": lambda unit: (
+        max(r.priority for r in unit),
+        -sum(r.cost_mb for r in unit),
+    ),
+}
+
+
+class AdmissionError(Exception):
+    """A model could not be admitted."""
+
+    status_code = 503
+
+
+class InsufficientVram(AdmissionError):
+    """The model is larger than the whole VRAM budget."""
+
+    status_code = 409
+
+
+class AdmissionTimeout(AdmissionError):
+    """The model did not fit before the queue timeout."""
+
+
+class EvictionFailed(AdmissionError):
+    """A service refused or failed to unload a model chosen for eviction."""
+
+
+class ModelInUse(AdmissionError):
+    """The model is serving a proxied request and may not be unloaded."""
+
+    status_code = 409
+
+
+class VramCostTable:
+    """
+    Per-model VRAM cost estimates, learned from observed memory deltas.
+    """
+
+    def __init__(
+        self,
+        defaults: Optional[Dict[str, int]] = None,
+        service_defaults: Optional[Dict[str, int]] = None,
+        fallback_mb: int = 8000,
+        alpha: float = 0.5,
+        min_delta_mb: int = 256,
+    ):
+        """
+        Initialize the table.
+
+        Args:
+            defaults: Model -> seed estimate (MB)
+            service_defaults: Service -> seed estimate for unknown models (MB)
+            fallback_mb: Estimate when neither model nor service is known
+            alpha: Weight of a new observation in the moving average
+            min_delta_mb: Smaller deltas are treated as noise (e.g. a lazy
+                service that has not loaded yet) and ignored
+        """
+        self.defaults = dict(DEFAULT_MODEL_COSTS_MB if defaults is None else defaults)
+        self.service_defaults = dict(
+            DEFAULT_SERVICE_COSTS_MB if service_defaults is None else service_defaults
+        )
+        self.fallback_mb = fallback_mb
+        self.alpha = alpha
+        self.min_delta_mb = min_delta_mb
+        # model -> [estimate MB, observations]
+        self._learned: Dict[str, List] = {}
+
+    def estimate(self, model: str, service: str) -> int:
+        """Current VRAM estimate for a model (MB)."""
+        if model in self._learned:
+            return int(self._learned[model][0])
+        if model in self.defaults:
+            return self.defaults[model]
+        return self.service_defaults.get(service, self.fallback_mb)
+
+    def observe(self, model: str, delta_mb: float) -> bool:
+        """
+        Record a measured load/unload delta.
+
+        Returns:
+            True if the observation was used
+        """
+        if delta_mb < self.min_delta_mb:
+            return False
+        entry = self._learned.get(model)
+        if entry is None:
+            self._learned[model] = [float(delta_mb), 1]
+        else:
+            entry[0] = (1 - self.alpha) * entry[0] + self.alpha * delta_mb
+            entry[1] += 1
+        logger.info(f"VRAM cost of {model}: {int(self._learned[model][0])}MB (observed {int(delta_mb)}MB)")
+        return True
+
+    def learned(self) -> Dict[str, List]:
+        """Learned estimates as model -> [MB, observations], for persistence."""
+        return {model: list(entry) for model, entry in self._learned.items()}
+
+    def restore(self, learned: Dict[str, List]):
+        """Reload estimates saved with learned()."""
+        self._learned.update({model: [float(mb), int(n)] for model, (mb, n) in learned.items()})
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Learned and seeded estimates for the status endpoint."""
+        table = {
+            model: {"mb": mb, "samples": 0, "source": "default"}
+            for model, mb in self.defaults.items()
+        }
+        for model, (mb, samples) in self._learned.items():
+            table[model] = {"mb": int(mb), "samples": samples, "source": "learned"}
+        return table
+
+
+@dataclass
+class Resident:
+    """A model the scheduler has admitted."""
+
+    model: str
+    service: str
+    priority: int
+    cost_mb: int
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    status: str = "loading"
+
+
+@dataclass(order=True)
+class _Waiter:
+    sort_key: Tuple[int, int]
+    model: str = field(compare=False)
+    service: str = field(compare=False)
+    priority: int = field(compare=False)
+    need_mb: int = field(compare=False)
+    since: float = field(compare=False, default_factory=time.time)
+
+
+class AdmissionScheduler:
+    """
+    Admits models against a VRAM budget, evicting and queueing as needed.
+
+    Free memory is the tighter of two views: the ledger (budget minus the
+    cost of every admitted model, which covers services that load lazily on
+    their first request) and the device (NVML free memory, which covers
+    memory held by processes the orchestrator does not track).
+
+    Requests are admitted in priority order (FIFO within a priority); a
+    request that does not fit blocks the ones behind it, so a large
+    high-priority model is not starved by a stream of small ones.
+    """
+
+    def __init__(
+        self,
+        costs: VramCostTable,
+        memory: Callable[[], Tuple[int, int, int]],
+        unload: Callable[[str, str], Awaitable[None]],
+        eviction_scope: Dict[str, str],
+        capacity_mb: int = 0,
+        reserve_mb: int = 1024,
+        queue_timeout: float = 600.0,
+        poll_interval: float = 5.0,
+        eviction_policy: str = "priority-lru",
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            costs: VRAM cost table
+            memory: Returns (total, used, free) MB; all zeros if unavailable
+            unload: Coroutine unloading (service, model); raises on failure
+            eviction_scope: Service -> 'model' (unloads one model) or 'service'
+                (unloads everything the service holds); services not listed
+                have no unload API and are never evicted
+            capacity_mb: VRAM budget when the device total is unknown (0 = unbounded)
+            reserve_mb: Headroom kept free for activations and fragmentation
+            queue_timeout: Seconds a request may wait for memory
+            poll_interval: Re-check period while waiting (services also free
+                memory on their own, e.g. idle eviction)
+            eviction_policy: Name in EVICTION_POLICIES
+        """
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(
+                f"Unknown eviction policy '{eviction_policy}', expected one of {list(EVICTION_POLICIES)}"
+            )
+        self.costs = costs
+        self.memory = memory
+        self.unload_fn = unload
+        self.eviction_scope = eviction_scope
+        self.capacity_mb = capacity_mb
+        self.reserve_mb = reserve_mb
+        self.queue_timeout = queue_timeout
+        self.poll_interval = poll_interval
+        self.eviction_policy = eviction_policy
+
+        self.residents: Dict[str, Resident] = {}
+        self._busy: set = set()
+        # model -> requests being served by it; pinned models are never evicted
+        self._pins: Dict[str, int] = {}
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._changed = asyncio.Condition()
+        self.admitted = 0
+        self.evictions = 0
+        self.timeouts = 0
+        # Loads/unloads in flight; deltas are only learned from isolated ones
+        self._io_active = 0
+        self._io_seq = 0
+
+    @asynccontextmanager
+    async def _measured(self):
+        """
+        Measure the used-memory delta of a load or unload.
+
+        Yields a dict that gets 'delta_mb' (used after - before) only if no
+        other load or unload overlapped, since their memory would be mixed in.
+        """
+        self._io_seq += 1
+        seq = self._io_seq
+        self._io_active += 1
+        alone = self._io_active == 1
+        result: Dict[str, float] = {}
+        used_before = self.memory()[1]
+        try:
+            yield result
+        finally:
+            self._io_active -= 1
+        if alone and self._io_seq == seq:
+            result["delta_mb"] = self.memory()[1] - used_before
+
+    def _budget(self) -> Tuple[float, float]:
+        """(ledger budget, device free) in MB after the reserve."""
+        total, _, free = self.memory()
+        capacity = total or self.capacity_mb
+        ledger = capacity - self.reserve_mb if capacity else float("inf")
+        device = free - self.reserve_mb if total else float("inf")
+        return ledger, device
+
+    def available_mb(self) -> float:
+        """VRAM the scheduler can still hand out."""
+        ledger, device = self._budget()
+        committed = sum(r.cost_mb for r in self.residents.values())
+        return min(ledger - committed, device)
+
+    def _eviction_units(self, priority: int) -> List[List[Resident]]:
+        """Groups that can be unloaded together, cheapest to lose first."""
+        units: Dict[str, List[Resident]] = {}
+        for resident in self.residents.values():
+            scope = self.eviction_scope.get(resident.service)
+            if scope is None:
+                continue
+            key = resident.service if scope == "service" else f"{resident.service}/{resident.model}"
+            units.setdefault(key, []).append(resident)
+
+        candidates = [
+            unit
+            for unit in units.values()
+            if not any(
+                r.model in self._busy or r.model in self._pins or r.priority > priority
+                for r in unit
+            )
+        ]
+        return sorted(candidates, key=EVICTION_POLICIES[self.eviction_policy])
+
+    def plan(self, need_mb: int, priority: int) -> Optional[List[Resident]]:
+        """
+        Residents to evict so need_mb fits.
+
+        Returns:
+            [] if it fits already, the victims if eviction makes it fit, else None
+        """
+        available = self.available_mb()
+        if available >= need_mb:
+            return []
+        victims: List[Resident] = []
+        for unit in self._eviction_units(priority):
+            victims.extend(unit)
+            available += sum(r.cost_mb for r in unit)
+            if available >= need_mb:
+                return victims
+        return None
+
+    async def admit(
+        self,
+        model: str,
+        service: str,
+        priority: int,
+        load: Callable[[], Awaitable[str]],
+        preloaded: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Resident:
+        """
+        Admit a model, evicting or queueing until it fits.
+
+        Args:
+            model: Model identifier
+            service: Service that hosts it
+            priority: 1 (low) to 10 (high)
+            load: Coroutine that loads (or verifies) the model and returns
+                its status ('loaded', or 'loading' for lazy services)
+            preloaded: The service holds the model already (e.g. loaded at
+                container start); it is tracked without a fit check
+            timeout: Seconds to wait for memory (default: queue_timeout;
+                0 = admit only if it fits now)
+
+        Returns:
+            The admitted Resident
+
+        Raises:
+            InsufficientVram: The model can never fit
+            AdmissionTimeout: It did not fit within queue_timeout
+            EvictionFailed: A victim could not be unloaded
+        """
+        if preloaded:
+            return await self._admit_preloaded(model, service, priority, load)
+
+        async with self._changed:
+            # A model being loaded, evicted or released is not usable yet: wait
+            # for the outcome, then look it up again (an evicted one is re-admitted)
+            while model in self._busy:
+                await self._changed.wait()
+            resident = self.residents.get(model)
+            if resident is not None:
+                return self._reuse(resident, priority)
+
+            need = self.costs.estimate(model, service)
+            ledger, _ = self._budget()
+            if need > ledger:
+                raise InsufficientVram(
+                    f"{model} needs ~{need}MB but the VRAM budget is {int(ledger)}MB"
+                )
+
+            waiter = _Waiter((-priority, next(self._seq)), model, service, priority, need)
+            heapq.heappush(self._queue, waiter)
+            timeout = self.queue_timeout if timeout is None else timeout
+            deadline = time.monotonic() + timeout
+            logged = False
+            try:
+                while True:
+                    # Admitted by a concurrent request for the same model meanwhile
+                    existing = self.residents.get(model)
+                    if existing is not None and model not in self._busy:
+                        return self._reuse(existing, priority)
+                    # ... or being loaded or evicted by one: wait for the outcome
+                    victims = (
+                        self.plan(need, priority)
+                        if self._queue[0] is waiter and model not in self._busy
+                        else None
+                    )
+                    if victims is not None:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise AdmissionTimeout(
+                            f"Timed out after {timeout:.0f}s waiting for "
+                            f"{need}MB of VRAM for {model}"
+                        )
+                    if self._queue[0] is waiter and not logged:
+                        logged = True
+                        logger.info(
+                            f"{model} queued: needs {need}MB, {int(self.available_mb())}MB available"
+                        )
+                    try:
+                        await asyncio.wait_for(
+                            self._changed.wait(), min(remaining, self.poll_interval)
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+                self._changed.notify_all()
+
+            # Reserve before releasing the lock so later plans account for it
+            resident = Resident(model, service, priority, need)
+            self.residents[model] = resident
+            self._busy.add(model)
+            self._busy.update(victim.model for victim in victims)
+
+        try:
+            await self._evict(victims)
+            async with self._measured() as measured:
+                resident.status = await load()
+            if resident.status == "loaded" and self.costs.observe(
+                model, measured.get("delta_mb", 0)
+            ):
+                resident.cost_mb = self.costs.estimate(model, service)
+            self.admitted += 1
+            return resident
+        except BaseException:
+            self.residents.pop(model, None)
+            raise
+        finally:
+            async with self._changed:
+                self._busy.discard(model)
+                self._busy.difference_update(victim.model for victim in victims)
+                self._changed.notify_all()
+
+    async def _admit_preloaded(
+        self, model: str, service: str, priority: int, load: Callable[[], Awaitable[str]]
+    ) -> Resident:
+        """Track a model the service already holds, verifying it outside the lock."""
+        async with self._changed:
+            while model in self._busy:
+                await self._changed.wait()
+            resident = self.residents.get(model)
+            if resident is not None:
+                return self._reuse(resident, priority)
+            self._busy.add(model)
+
+        resident = Resident(model, service, priority, self.costs.estimate(model, service))
+        try:
+            resident.status = await load()
+            async with self._changed:
+                self.residents[model] = resident
+                self.admitted += 1
+            return resident
+        finally:
+            async with self._changed:
+                self._busy.discard(model)
+                self._changed.notify_all()
+
+    def _reuse(self, resident: Resident, priority: int) -> Resident:
+        resident.last_used = time.time()
+        resident.priority = max(resident.priority, priority)
+        return resident
+
+    def pin(self, model: str):
+        """
+        Protect an admitted model from eviction while it serves a request.
+
+        Call right after admit() returns (without awaiting in between) so no
+        other request can evict the model first.
+        """
+        self._pins[model] = self._pins.get(model, 0) + 1
+        resident = self.residents.get(model)
+        if resident is not None:
+            resident.last_used = time.time()
+
+    async def unpin(self, model: str):
+        """Undo pin(); waiting requests may then evict the model."""
+        async with self._changed:
+            count = self._pins.get(model, 0) - 1
+            if count > 0:
+                self._pins[model] = count
+            else:
+                self._pins.pop(model, None)
+            resident = self.residents.get(model)
+            if resident is not None:
+                resident.last_used = time.time()
+            self._changed.notify_all()
+
+    async def _evict(self, victims: Iterable[Resident]):
+        """Unload victims (one call per eviction unit), learning their real size."""
+        done = set()
+        for victim in victims:
+            scope = self.eviction_scope.get(victim.service)
+            unit = victim.service if scope == "service" else f"{victim.service}/{victim.model}"
+            if unit in done:
+                continue
+            done.add(unit)
+            members = [
+                r
+                for r in victims
+                if r.service == victim.service and (scope == "service" or r is victim)
+            ]
+            logger.info(
+                f"Evicting {', '.join(r.model for r in members)} from {victim.service} "
+                f"(priority {victim.priority})"
+            )
+            try:
+                async with self._measured() as measured:
+                    await self.unload_fn(victim.service, victim.model)
+            except Exception as e:
+                raise EvictionFailed(f"Could not unload {victim.model} from {victim.service}: {e}")
+            if len(members) == 1:
+                self.costs.observe(victim.model, -measured.get("delta_mb", 0))
+            for member in members:
+                self.residents.pop(member.model, None)
+            self.evictions += len(members)
+
+    async def release(
+        self, model: str, unload: bool = True, force: bool = False
+    ) -> Optional[Resident]:
+        """
+        Remove a model (explicit unload), calling its service's unload API if it has one.
+
+        When the service unloads everything at once ('service' scope), its
+        other models are removed too.
+
+        Args:
+            model: Model identifier
+            unload: Call the service's unload API
+            force: Remove it even while it is serving requests
+
+        Returns:
+            The removed Resident, or None if it was not admitted
+
+        Raises:
+            ModelInUse: It is serving requests and force is not set
+        """
+        resident = self.residents.get(model)
+        if resident is None:
+            return None
+        if model in self._busy:
+            raise AdmissionError(f"{model} is being loaded or evicted")
+        scope = self.eviction_scope.get(resident.service) if unload else None
+        if not force:
+            # A 'service' scope unload also takes the service's other models
+            in_use = [
+                r.model
+                for r in self.residents.values()
+                if r.model in self._pins
+                and (r.model == model or (scope == "service" and r.service == resident.service))
+            ]
+            if in_use:
+                raise ModelInUse(f"{', '.join(in_use)} serving requests")
+        self._busy.add(model)
+        try:
+            if scope:
+                try:
+                    async with self._measured() as measured:
+                        await self.unload_fn(resident.service, model)
+                except Exception as e:
+                    raise EvictionFailed(f"Could not unload {model} from {resident.service}: {e}")
+                dropped = 0
+                if scope == "service":
+                    for other in list(self.residents.values()):
+                        if other.service == resident.service and other.model not in self._busy:
+                            self.residents.pop(other.model, None)
+                            dropped += 1
+                # The delta covers every model the service freed; only learn it
+                # when it was this model's alone
+                if dropped == 0:
+                    self.costs.observe(model, -measured.get("delta_mb", 0))
+            self.residents.pop(model, None)
+            return resident
+        finally:
+            async with self._changed:
+                self._busy.discard(model)
+                self._changed.notify_all()
+
+    def export_residents(self) -> List[Dict]:
+        """Admitted models as plain dicts, for persistence."""
+        return [asdict(resident) for resident in self.residents.values()]
+
+    def restore_residents(self, residents: Iterable[Dict]):
+        """Re-admit models saved with export_residents() (no fit check or load)."""
+        for data in residents:
+            resident = Resident(**data)
+            self.residents.setdefault(resident.model, resident)
+
+    def stats(self) -> Dict:
+        """Budget, queue and counters for the status endpoint."""
+        ledger, device = self._budget()
+        now = time.time()
+        return {
+            "budget_mb": None if ledger == float("inf") else int(ledger),
+            "reserve_mb": self.reserve_mb,
+            "committed_mb": sum(r.cost_mb for r in self.residents.values()),
+            "available_mb": None if self.available_mb() == float("inf") else int(self.available_mb()),
+            "queue": [
+                {
+                    "model": w.model,
+                    "service": w.service,
+                    "priority": w.priority,
+                    "need_mb": w.need_mb,
+                    "waiting_seconds": round(now - w.since, 1),
+                }
+                for w in sorted(self._queue)
+            ],
+            "in_use": dict(self._pins),
+            "eviction_policy": self.eviction_policy,
+            "admitted": self.admitted,
+            "evictions": self.evictions,
+            "timeouts": self.timeouts,
+        }
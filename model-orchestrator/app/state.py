@@ -0,0 +1,105 @@
+"""
+Persistent Orchestrator State
+
+SQLite store for what the orchestrator must not lose on restart: admitted
+models, the learned VRAM cost table and prefetch transitions (as JSON
+values by key), plus the time series of health samples taken by the
+monitor, kept for a retention window so it can be plotted.
+
+Calls block; the async code runs them in a worker thread.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StateStore:
+    """Key/value state and health snapshots in one SQLite file."""
+
+    def __init__(self, path: str = "", retention_hours: float = 168.0):
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite file ('' = persistence disabled, every call is a no-op)
+            retention_hours: Snapshots older than this are deleted
+        """
+        self.path = path
+        self.retention_hours = retention_hours
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots (ts REAL PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            self._conn.commit()
+            logger.info(f"Orchestrator state persisted to {path}")
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Stored JSON value, or default."""
+        if not self.enabled:
+            return default
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def put(self, **values: Any):
+        """Store JSON values by key, in one transaction."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in values.items()],
+            )
+            self._conn.commit()
+
+    def add_snapshot(self, snapshot: dict):
+        """Append a health sample (keyed by its 'ts') and drop expired ones."""
+        if not self.enabled:
+            return
+        cutoff = time.time() - self.retention_hours * 3600
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots (ts, data) VALUES (?, ?)",
+                (snapshot["ts"], json.dumps(snapshot)),
+            )
+            self._conn.execute("DELETE FROM snapshots WHERE ts < ?", (cutoff,))
+            self._conn.commit()
+
+    def snapshots(
+        self, since: float = 0.0, until: Optional[float] = None, limit: int = 1000
+    ) -> List[dict]:
+        """Samples with since <= ts <= until, oldest first (the most recent 'limit')."""
+        if not self.enabled:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM snapshots WHERE ts >= ? AND ts <= ? ORDER BY ts DESC LIMIT ?",
+                (since, until if until is not None else float("inf"), limit),
+            ).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+            self._conn = None
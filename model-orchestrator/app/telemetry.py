@@ -0,0 +1,178 @@
+"""
+GPU Telemetry Providers
+
+The orchestrator reads GPU memory and utilization through a small provider
+interface so the scheduling logic does not depend on NVML being present:
+
+- NvmlTelemetry: the real device via pynvml (zeros if NVML is unavailable)
+- SimulatedGpu: an in-process device that tracks allocations and frees by
+  owner, so admission and eviction can be exercised and benchmarked on
+  CPU-only machines
+
+GPU_TELEMETRY selects the provider ('nvml' or 'simulated').
+"""
+
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class GpuTelemetry:
+    """Provider interface: memory in MB and utilization in percent."""
+
+    name = "none"
+
+    def memory(self) -> Tuple[int, int, int]:
+        """(total, used, free) MB; all zeros if unknown."""
+        return 0, 0, 0
+
+    def utilization(self) -> float:
+        """GPU utilization percentage."""
+        return 0.0
+
+    def model_loaded(self, model: str, mb: int):
+        """Hook called after a model is admitted (simulated devices allocate here)."""
+
+    def model_unloaded(self, model: str):
+        """Hook called after a model is unloaded (simulated devices free here)."""
+
+    def close(self):
+        """Release provider resources."""
+
+
+class NvmlTelemetry(GpuTelemetry):
+    """Device 'index' read through NVML."""
+
+    name = "nvml"
+
+    def __init__(self, index: int = 0):
+        self._nvml = None
+        self.handle = None
+        try:
+            import pynvml
+
+            pynvml.nvmlInit()
+            self.handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+            self._nvml = pynvml
+            logger.info("NVML initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize NVML: {e}")
+
+    def memory(self) -> Tuple[int, int, int]:
+        if not self.handle:
+            return 0, 0, 0
+
+        try:
+            info = self._nvml.nvmlDeviceGetMemoryInfo(self.handle)
+            return (
+                info.total // (1024 * 1024),
+                info.used // (1024 * 1024),
+                info.free // (1024 * 1024),
+            )
+        except Exception as e:
+            logger.error(f"Failed to get GPU memory: {e}")
+            return 0, 0, 0
+
+    def utilization(self) -> float:
+        if not self.handle:
+            return 0.0
+
+        try:
+            return float(self._nvml.nvmlDeviceGetUtilizationRates(self.handle).gpu)
+        except Exception as e:
+            logger.error(f"Failed to get GPU utilization: {e}")
+            return 0.0
+
+    def close(self):
+        if self.handle:
+            self._nvml.nvmlShutdown()
+            self.handle = None
+
+
+class SimulatedGpu(GpuTelemetry):
+    """
+    Fake device that models allocations and frees.
+
+    Allocations beyond the total are still recorded (a real device would
+    OOM) and counted in 'ooms', so a benchmark can tell how often a policy
+    would have crashed a service.
+    """
+
+    name = "simulated"
+
+    def __init__(self, total_mb: int = 32768, baseline_mb: int = 500):
+        """
+        Initialize the device.
+
+        Args:
+            total_mb: Device memory
+            baseline_mb: Memory in use before any model (driver, display, ...)
+        """
+        self.total_mb = total_mb
+        self.baseline_mb = baseline_mb
+        self._lock = threading.Lock()
+        self._allocations: Dict[str, int] = {}
+        # Footprint actually used per model (may differ from the scheduler's estimate)
+        self.actual_mb: Dict[str, int] = {}
+        self.ooms = 0
+        self.peak_used_mb = baseline_mb
+
+    def used_mb(self) -> int:
+        with self._lock:
+            return self.baseline_mb + sum(self._allocations.values())
+
+    def allocate(self, owner: str, mb: int) -> bool:
+        """
+        Allocate mb for owner (replacing its previous allocation).
+
+        Returns:
+            False if the device would be over capacity (counted as an OOM)
+        """
+        with self._lock:
+            self._allocations[owner] = mb
+            used = self.baseline_mb + sum(self._allocations.values())
+            self.peak_used_mb = max(self.peak_used_mb, used)
+            if used > self.total_mb:
+                self.ooms += 1
+                return False
+            return True
+
+    def free(self, owner: str) -> int:
+        """Free owner's allocation; returns the MB released."""
+        with self._lock:
+            return self._allocations.pop(owner, 0)
+
+    def allocations(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._allocations)
+
+    def memory(self) -> Tuple[int, int, int]:
+        used = self.used_mb()
+        return self.total_mb, used, max(0, self.total_mb - used)
+
+    def utilization(self) -> float:
+        return 100.0 if self.allocations() else 0.0
+
+    def model_loaded(self, model: str, mb: int):
+        self.allocate(model, self.actual_mb.get(model, mb))
+
+    def model_unloaded(self, model: str):
+        self.free(model)
+
+
+def create_telemetry(kind: str = "nvml", total_mb: Optional[int] = None) -> GpuTelemetry:
+    """
+    Build a telemetry provider.
+
+    Args:
+        kind: 'nvml' or 'simulated'
+        total_mb: Simulated device memory (simulated only)
+    """
+    if kind == "simulated":
+        logger.info(f"Using simulated GPU telemetry ({total_mb or 32768}MB)")
+        return SimulatedGpu(total_mb or 32768)
+    if kind != "nvml":
+        raise ValueError(f"Unknown GPU telemetry '{kind}', expected 'nvml' or 'simulated'")
+    return NvmlTelemetry()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Benchmark: VRAM admission scheduler on a simulated GPU with a replayable trace
+
+Replays a trace of model load/unload requests against AdmissionScheduler
+backed by SimulatedGpu, once per eviction policy, without a GPU or any
+service running. Loads take simulated time and allocate each model's actual
+footprint on the fake device (seed cost estimates are deliberately off, so
+the cost table has to learn); evictions free it again.
+
+A trace is JSON Lines, one request per line:
+    {"t": 12.5, "op": "load", "model": "large-v3", "service": "whisperx", "priority": 6}
+    {"t": 80.0, "op": "unload", "model": "large-v3"}
+t is in trace seconds. Without --trace a synthetic trace is generated from
+--jobs video pipelines (whisperx -> vibevoice -> comfyui -> infinitetalk)
+with Poisson arrivals plus occasional llama-cpp chat sessions; --write-trace
+saves it so the exact same requests can be replayed later.
+
+Reported per policy: admissions, evictions, queue timeouts, simulated OOMs
+(allocations beyond the device), peak memory, admission wait percentiles
+(trace seconds) and cost-table error; plus raw scheduler throughput (trace
+replayed back to back with no simulated latency).
+
+Usage:
+    python3 benchmarks/bench_scheduler.py --jobs 50 --write-trace trace.jsonl
+    python3 benchmarks/bench_scheduler.py --trace trace.jsonl --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.scheduler import (  # noqa: E402
+    EVICTION_POLICIES,
+    AdmissionError,
+    AdmissionScheduler,
+    VramCostTable,
+)
+from app.telemetry import SimulatedGpu  # noqa: E402
+
+# Simulated services: model -> (service, actual MB, load seconds, stage seconds, priority)
+MODELS = {
+    "large-v3": ("whisperx", 5400, 8, 90, 6),
+    "vibevoice-7b": ("vibevoice", 18500, 20, 60, 5),
+    "sdxl": ("comfyui", 9800, 12, 40, 4),
+    "infinitetalk": ("infinitetalk", 9200, 25, 180, 7),
+    "qwen3-vl-30b": ("llama-cpp", 17300, 30, 120, 8),
+}
+PIPELINE = ("large-v3", "vibevoice-7b", "sdxl", "infinitetalk")
+EVICTION_SCOPE = {"whisperx": "service", "vibevoice": "model", "comfyui": "service"}
+
+
+def generate_trace(
+    jobs: int, interarrival: float, unload_prob: float, chat_prob: float, seed: int
+) -> list:
+    """Synthetic load/unload requests of overlapping video pipelines, sorted by time."""
+    rng = random.Random(seed)
+    events = []
+    t = 0.0
+    for job in range(jobs):
+        t += rng.expovariate(1 / interarrival)
+        stage_t = t
+        for model in PIPELINE:
+            service, _, _, stage_seconds, priority = MODELS[model]
+            events.append(
+                {"t": round(stage_t, 2), "op": "load", "model": model,
+                 "service": service, "priority": priority, "job": f"job-{job}"}
+            )
+            stage_t += stage_seconds * rng.uniform(0.5, 1.5)
+            if rng.random() < unload_prob:
+                events.append({"t": round(stage_t, 2), "op": "unload", "model": model})
+
+        if rng.random() < chat_prob:
+            chat_t = t + rng.uniform(0, interarrival)
+            service, _, _, stage_seconds, priority = MODELS["qwen3-vl-30b"]
+            events.append(
+                {"t": round(chat_t, 2), "op": "load", "model": "qwen3-vl-30b",
+                 "service": service, "priority": priority, "job": f"chat-{job}"}
+            )
+            events.append(
+                {"t": round(chat_t + stage_seconds, 2), "op": "unload", "model": "qwen3-vl-30b"}
+            )
+    return sorted(events, key=lambda e: e["t"])
+
+
+def read_trace(path: str) -> list:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_trace(path: str, events: list):
+    with open(path, "w") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+def percentile(values: list, q: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def build(policy: str, args, scale: float) -> tuple:
+    """Fake device plus a scheduler wired to it."""
+    gpu = SimulatedGpu(total_mb=args.gpu_mb, baseline_mb=args.baseline_mb)
+    scheduler = None
+
+    async def unload(service: str, model: str):
+        if scale:
+            await asyncio.sleep(2 * scale)
+        if EVICTION_SCOPE.get(service) == "service":
+            for resident in list(scheduler.residents.values()):
+                if resident.service == service:
+                    gpu.free(resident.model)
+        gpu.free(model)
+
+    scheduler = AdmissionScheduler(
+        VramCostTable(),
+        memory=gpu.memory,
+        unload=unload,
+        eviction_scope=EVICTION_SCOPE,
+        reserve_mb=args.reserve_mb,
+        queue_timeout=args.queue_timeout * scale if scale else 0.001,
+        poll_interval=max(5 * scale, 0.001),
+        eviction_policy=policy,
+    )
+    return gpu, scheduler
+
+
+async def request(event: dict, gpu: SimulatedGpu, scheduler, scale: float, waits: list, outcome: dict):
+    """Apply one trace event."""
+    model = event["model"]
+    if event["op"] == "unload":
+        try:
+            resident = await scheduler.release(model)
+        except AdmissionError:
+            outcome["unload_skipped"] += 1
+            return
+        if resident is not None:
+            gpu.free(model)
+        return
+
+    service, actual_mb, load_seconds, _, _ = MODELS.get(
+        model, (event["service"], 8000, 10, 60, event["priority"])
+    )
+
+    async def load() -> str:
+        if scale:
+            await asyncio.sleep(load_seconds * scale)
+        gpu.allocate(model, actual_mb)
+        return "loaded"
+
+    start = time.perf_counter()
+    try:
+        await scheduler.admit(model, event["service"], event["priority"], load)
+    except AdmissionError as e:
+        outcome[type(e).__name__] = outcome.get(type(e).__name__, 0) + 1
+        return
+    if scale:
+        waits.append((time.perf_counter() - start) / scale - load_seconds)
+
+
+async def replay(events: list, policy: str, args) -> dict:
+    """Replay the trace in (scaled) real time."""
+    scale = args.time_scale
+    gpu, scheduler = build(policy, args, scale)
+    waits: list = []
+    outcome = {"unload_skipped": 0}
+
+    async def at(event):
+        await asyncio.sleep(event["t"] * scale)
+        await request(event, gpu, scheduler, scale, waits, outcome)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(at(event) for event in events))
+    wall = time.perf_counter() - start
+
+    learned = scheduler.costs.to_dict()
+    cost_error = {
+        model: learned[model]["mb"] - actual
+        for model, (_, actual, _, _, _) in MODELS.items()
+        if learned.get(model, {}).get("source") == "learned"
+    }
+    stats = scheduler.stats()
+    return {
+        "requests": sum(1 for e in events if e["op"] == "load"),
+        "admitted": stats["admitted"],
+        "evictions": stats["evictions"],
+        "timeouts": stats["timeouts"],
+        "errors": {k: v for k, v in outcome.items() if k != "unload_skipped"},
+        "unload_skipped": outcome["unload_skipped"],
+        "simulated_ooms": gpu.ooms,
+        "peak_used_mb": gpu.peak_used_mb,
+        "wait_seconds": {
+            "p50": round(percentile(waits, 0.5) or 0, 2),
+            "p95": round(percentile(waits, 0.95) or 0, 2),
+            "max": round(max(waits, default=0), 2),
+        },
+        "cost_error_mb": cost_error,
+        "wall_seconds": round(wall, 3),
+    }
+
+
+async def throughput(events: list, policy: str, args) -> dict:
+    """Scheduler decisions per second: events back to back, no simulated latency."""
+    gpu, scheduler = build(policy, args, 0.0)
+    outcome = {"unload_skipped": 0}
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        for event in events:
+            await request(event, gpu, scheduler, 0.0, [], outcome)
+    seconds = time.perf_counter() - start
+    total = len(events) * args.repeats
+    return {"events": total, "seconds": round(seconds, 4), "events_per_second": round(total / seconds)}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args) -> dict:
+    if args.trace:
+        events = read_trace(args.trace)
+    else:
+        events = generate_trace(
+            args.jobs, args.interarrival, args.unload_prob, args.chat_prob, args.seed
+        )
+    if args.write_trace:
+        write_trace(args.write_trace, events)
+
+    report = {
+        "benchmark": "scheduler",
+        "commit": git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "config": {
+            "trace": args.trace or "synthetic",
+            "events": len(events),
+            "gpu_mb": args.gpu_mb,
+            "reserve_mb": args.reserve_mb,
+            "queue_timeout": args.queue_timeout,
+            "time_scale": args.time_scale,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+    for policy in args.policies:
+        report["results"][policy] = asyncio.run(replay(events, policy, args))
+        report["results"][policy]["throughput"] = asyncio.run(throughput(events, policy, args))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--trace", type=str, default=None, help="JSON Lines trace to replay")
+    parser.add_argument("--write-trace", type=str, default=None, help="Save the trace used")
+    parser.add_argument("--jobs", type=int, default=30, help="Synthetic pipeline jobs")
+    parser.add_argument("--interarrival", type=float, default=120.0, help="Mean seconds between jobs")
+    parser.add_argument("--unload-prob", type=float, default=0.3, help="Chance a stage unloads its model")
+    parser.add_argument("--chat-prob", type=float, default=0.3, help="Chance of a chat session per job")
+    parser.add_argument(
+        "--policies", nargs="+", default=list(EVICTION_POLICIES), choices=list(EVICTION_POLICIES)
+    )
+    parser.add_argument("--gpu-mb", type=int, default=32768)
+    parser.add_argument("--baseline-mb", type=int, default=500)
+    parser.add_argument("--reserve-mb", type=int, default=1024)
+    parser.add_argument("--queue-timeout", type=float, default=600.0, help="Trace seconds")
+    parser.add_argument(
+        "--time-scale", type=float, default=0.001, help="Real seconds per trace second"
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Throughput passes over the trace")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Tests for predictive model prefetch."""
+
+import asyncio
+
+from app.prefetch import PREFETCH_PRIORITY, Prefetcher, TransitionTable
+from app.scheduler import AdmissionScheduler, VramCostTable
+from app.telemetry import SimulatedGpu
+
+COSTS = {"asr": 6000, "tts": 8000}
+
+
+def make_prefetcher(total_mb: int = 32000, ttl: float = 5.0):
+    gpu = SimulatedGpu(total_mb=total_mb, baseline_mb=0)
+
+    async def unload(service: str, model: str):
+        gpu.free(model)
+
+    scheduler = AdmissionScheduler(
+        VramCostTable(defaults=COSTS),
+        memory=gpu.memory,
+        unload=unload,
+        eviction_scope={"vibevoice": "model", "whisperx": "service"},
+        reserve_mb=0,
+        poll_interval=0.01,
+    )
+
+    async def warm(service: str, model: str) -> str:
+        gpu.allocate(model, COSTS[model])
+        return "loaded"
+
+    prefetcher = Prefetcher(
+        scheduler, warm, warmable={"vibevoice"}, ttl=ttl, min_probability=0.6, min_samples=3
+    )
+    return gpu, scheduler, prefetcher
+
+
+def train(prefetcher: Prefetcher, jobs: int = 3):
+    """Record asr -> tts for a number of tagged jobs."""
+    for job in range(jobs):
+        prefetcher.record("asr", "whisperx", f"job-{job}")
+        prefetcher.record("tts", "vibevoice", f"job-{job}")
+
+
+async def admit_asr(scheduler: AdmissionScheduler, gpu: SimulatedGpu):
+    async def load() -> str:
+        gpu.allocate("asr", COSTS["asr"])
+        return "loaded"
+
+    await scheduler.admit("asr", "whisperx", 5, load)
+
+
+def test_transition_table_predicts_most_common_next_model() -> None:
+    """Test predictions need enough samples and report the transition probability."""
+    table = TransitionTable()
+    for tag, nxt in (("a", "tts"), ("b", "tts"), ("c", "chat")):
+        table.record(tag, "asr")
+        table.record(tag, nxt)
+
+    assert table.predict("asr", min_samples=4) is None
+    model, probability = table.predict("asr", min_samples=3)
+    assert model == "tts"
+    assert round(probability, 3) == 0.667
+
+
+def test_prefetch_hit_when_next_stage_requests_model() -> None:
+    """Test the predicted model is loaded ahead and counted as a hit when claimed."""
+    gpu, scheduler, prefetcher = make_prefetcher()
+    train(prefetcher)
+
+    async def main():
+        await admit_asr(scheduler, gpu)
+        prefetcher.record("asr", "whisperx", "job-new")
+        await asyncio.sleep(0.02)
+        assert scheduler.residents["tts"].priority == PREFETCH_PRIORITY
+        assert gpu.allocations()["tts"] == 8000
+
+        prefetcher.claim("tts")
+        prefetcher.close()
+
+    asyncio.run(main())
+
+    stats = prefetcher.stats()
+    assert stats["issued"] == 1
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == 1.0
+
+
+def test_unused_prefetch_is_unloaded_after_ttl() -> None:
+    """Test a prefetched model nobody requests is released once the TTL passes."""
+    gpu, scheduler, prefetcher = make_prefetcher(ttl=0.05)
+    train(prefetcher)
+
+    async def main():
+        await admit_asr(scheduler, gpu)
+        prefetcher.record("asr", "whisperx", "job-new")
+        await asyncio.sleep(0.2)
+
+    asyncio.run(main())
+
+    assert "tts" not in scheduler.residents
+    assert "tts" not in gpu.allocations()
+    stats = prefetcher.stats()
+    assert stats["expired"] == 1
+    assert stats["hit_rate"] == 0.0
+
+
+def test_no_prefetch_without_headroom() -> None:
+    """Test nothing is evicted for a prefetch; it is skipped when the model does not fit."""
+    gpu, scheduler, prefetcher = make_prefetcher(total_mb=10000)
+    train(prefetcher)
+
+    async def main():
+        await admit_asr(scheduler, gpu)
+        prefetcher.record("asr", "whisperx", "job-new")
+        await asyncio.sleep(0.02)
+
+    asyncio.run(main())
+
+    assert set(scheduler.residents) == {"asr"}
+    assert prefetcher.stats()["skipped_no_headroom"] == 1
+    assert prefetcher.stats()["issued"] == 0
@@ -0,0 +1,94 @@
+"""Tests for per-service concurrency limits of proxied requests."""
+
+import asyncio
+
+import pytest
+
+from app.proxy import ServiceRouter, forward_headers, parse_limits
+
+
+def test_parse_limits() -> None:
+    """Test 'service=N' lists parse and invalid limits are rejected."""
+    assert parse_limits("whisperx=2, comfyui=1,") == {"whisperx": 2, "comfyui": 1}
+    assert parse_limits("") == {}
+    with pytest.raises(ValueError):
+        parse_limits("whisperx=0")
+    with pytest.raises(ValueError):
+        parse_limits("whisperx")
+
+
+def test_forward_headers_drops_hop_by_hop_and_control_headers() -> None:
+    """Test hop-by-hop and X-Orchestrator-* headers are not forwarded."""
+    headers = {
+        "Content-Type": "audio/wav",
+        "Connection": "keep-alive",
+        "Host": "orchestrator",
+        "X-Orchestrator-Model": "large-v3",
+        "Authorization": "Bearer token",
+    }
+
+    assert forward_headers(headers) == {
+        "Content-Type": "audio/wav",
+        "Authorization": "Bearer token",
+    }
+
+
+def test_router_limits_concurrent_requests_per_service() -> None:
+    """Test at most 'limit' requests run per service and waiters are served in order."""
+    router = ServiceRouter({"whisperx": 2}, default_limit=1)
+    running = {"whisperx": 0, "comfyui": 0}
+    peak = {"whisperx": 0, "comfyui": 0}
+    order = []
+
+    async def request(service: str, name: str):
+        await router.acquire(service)
+        running[service] += 1
+        peak[service] = max(peak[service], running[service])
+        order.append(name)
+        await asyncio.sleep(0.02)
+        running[service] -= 1
+        router.release(service)
+
+    async def main():
+        await asyncio.gather(
+            *(request("whisperx", f"w{i}") for i in range(5)),
+            *(request("comfyui", f"c{i}") for i in range(3)),
+        )
+
+    asyncio.run(main())
+
+    assert peak == {"whisperx": 2, "comfyui": 1}
+    assert [name for name in order if name.startswith("w")] == [f"w{i}" for i in range(5)]
+    assert [name for name in order if name.startswith("c")] == ["c0", "c1", "c2"]
+
+    stats = router.stats()
+    assert stats["whisperx"]["limit"] == 2
+    assert stats["whisperx"]["served"] == 5
+    assert stats["comfyui"]["limit"] == 1
+    assert stats["comfyui"]["max_wait_seconds"] > 0
+
+
+def test_router_reports_waiting_requests_and_errors() -> None:
+    """Test queue depth is visible while waiting and failed requests free their slot."""
+    router = ServiceRouter(default_limit=1)
+
+    async def main():
+        await router.acquire("ovi")
+        waiter = asyncio.create_task(router.acquire("ovi"))
+        await asyncio.sleep(0.01)
+        waiting = router.stats()["ovi"]
+
+        router.release("ovi", ok=False)
+        await asyncio.wait_for(waiter, 1)
+        router.release("ovi")
+        return waiting
+
+    waiting = asyncio.run(main())
+
+    assert waiting["active"] == 1
+    assert waiting["waiting"] == 1
+    stats = router.stats()["ovi"]
+    assert stats["active"] == 0
+    assert stats["waiting"] == 0
+    assert stats["errors"] == 1
+    assert stats["served"] == 1
@@ -0,0 +1,90 @@
+"""Tests for reconciling admitted models with what the services report."""
+
+import asyncio
+import time
+
+from app.main import ModelOrchestrator
+from app.telemetry import SimulatedGpu
+
+
+def held(models: list, healthy: bool = True) -> dict:
+    return {"healthy": healthy, "latency_ms": 1.0, "models": models, "error": None}
+
+
+async def admit(orchestrator: ModelOrchestrator, model: str, service: str, status: str):
+    async def load() -> str:
+        return status
+
+    await orchestrator.scheduler.admit(model, service, 5, load)
+
+
+def make_orchestrator() -> ModelOrchestrator:
+    return ModelOrchestrator(telemetry=SimulatedGpu(total_mb=32000))
+
+
+def test_reconcile_drops_adopts_and_marks_loaded() -> None:
+    """Test freed models are dropped, untracked ones adopted and lazy ones marked loaded."""
+    orchestrator = make_orchestrator()
+
+    async def main():
+        await admit(orchestrator, "gone", "vibevoice", "loaded")
+        await admit(orchestrator, "large-v3", "whisperx", "loading")
+        probed_at = time.time()
+        await orchestrator._reconcile(
+            {"vibevoice": held(["other-voice"]), "whisperx": held(["large-v3"])}, probed_at
+        )
+
+    asyncio.run(main())
+
+    residents = orchestrator.scheduler.residents
+    assert set(residents) == {"large-v3", "other-voice"}
+    assert residents["large-v3"].status == "loaded"
+    assert residents["other-voice"].status == "loaded"
+
+
+def test_reconcile_keeps_service_default_model_without_double_counting() -> None:
+    """Test a proxy default model named after its service is kept and nothing is adopted beside it."""
+    orchestrator = make_orchestrator()
+
+    async def main():
+        await admit(orchestrator, "whisperx", "whisperx", "loaded")
+        await orchestrator._reconcile({"whisperx": held(["large-v3"])}, time.time())
+
+    asyncio.run(main())
+
+    assert set(orchestrator.scheduler.residents) == {"whisperx"}
+
+
+def test_reconcile_ignores_stale_samples_and_pinned_models() -> None:
+    """Test models used after the probe, or serving requests, are not dropped."""
+    orchestrator = make_orchestrator()
+
+    async def main():
+        probed_at = time.time()
+        await asyncio.sleep(0.01)
+        await admit(orchestrator, "fresh", "vibevoice", "loaded")
+        await admit(orchestrator, "busy", "vibevoice", "loaded")
+        orchestrator.scheduler.pin("busy")
+        orchestrator.scheduler.residents["busy"].last_used = probed_at - 10
+        await orchestrator._reconcile({"vibevoice": held([])}, probed_at)
+
+    asyncio.run(main())
+
+    assert set(orchestrator.scheduler.residents) == {"fresh", "busy"}
+
+
+def test_reconcile_skips_unhealthy_and_unreconciled_services() -> None:
+    """Test nothing changes for unhealthy services or services with other model names."""
+    orchestrator = make_orchestrator()
+
+    async def main():
+        await admit(orchestrator, "voice", "vibevoice", "loaded")
+        await admit(orchestrator, "qwen3-vl-30b", "llama-cpp", "loaded")
+        probed_at = time.time() + 1
+        await orchestrator._reconcile(
+            {"vibevoice": held([], healthy=False), "llama-cpp": held(["qwen.gguf"])}, probed_at
+        )
+
+    asyncio.run(main())
+
+    assert set(orchestrator.scheduler.residents) == {"voice", "qwen3-vl-30b"}
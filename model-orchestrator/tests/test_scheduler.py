@@ -0,0 +1,270 @@
+"""Tests for the VRAM admission scheduler on a simulated GPU."""
+
+import asyncio
+
+import pytest
+
+from app.scheduler import (
+    AdmissionScheduler,
+    AdmissionTimeout,
+    InsufficientVram,
+    ModelInUse,
+    VramCostTable,
+)
+from app.telemetry import SimulatedGpu
+
+SCOPE = {"vibevoice": "model", "whisperx": "service"}
+
+
+def make_scheduler(total_mb: int, costs: dict, unload_delay: float = 0.0, **kwargs):
+    """Scheduler on a fake device whose unload frees like the real services."""
+    gpu = SimulatedGpu(total_mb=total_mb, baseline_mb=0)
+    scheduler = None
+
+    async def unload(service: str, model: str):
+        if unload_delay:
+            await asyncio.sleep(unload_delay)
+        if SCOPE[service] == "service":
+            for resident in list(scheduler.residents.values()):
+                if resident.service == service:
+                    gpu.free(resident.model)
+        gpu.free(model)
+
+    kwargs.setdefault("queue_timeout", 2.0)
+    scheduler = AdmissionScheduler(
+        VramCostTable(defaults=costs),
+        memory=gpu.memory,
+        unload=unload,
+        eviction_scope=SCOPE,
+        reserve_mb=0,
+        poll_interval=0.01,
+        **kwargs,
+    )
+    return gpu, scheduler
+
+
+def loader(gpu: SimulatedGpu, model: str, mb: int, order: list = None):
+    async def load() -> str:
+        if order is not None:
+            order.append(model)
+        gpu.allocate(model, mb)
+        return "loaded"
+
+    return load
+
+
+def test_admits_without_eviction_when_model_fits() -> None:
+    """Test a model that fits is admitted and allocated directly."""
+    gpu, scheduler = make_scheduler(16000, {"a": 6000, "b": 6000})
+
+    async def main():
+        await scheduler.admit("a", "vibevoice", 5, loader(gpu, "a", 6000))
+        await scheduler.admit("b", "vibevoice", 5, loader(gpu, "b", 6000))
+
+    asyncio.run(main())
+
+    assert set(scheduler.residents) == {"a", "b"}
+    assert scheduler.evictions == 0
+    assert gpu.used_mb() == 12000
+
+
+def test_evicts_lowest_priority_first() -> None:
+    """Test the lowest-priority resident is evicted to make room."""
+    gpu, scheduler = make_scheduler(13000, {"a": 6000, "b": 6000, "c": 6000})
+
+    async def main():
+        await scheduler.admit("a", "vibevoice", 3, loader(gpu, "a", 6000))
+        await scheduler.admit("b", "vibevoice", 4, loader(gpu, "b", 6000))
+        await scheduler.admit("c", "vibevoice", 5, loader(gpu, "c", 6000))
+
+    asyncio.run(main())
+
+    assert set(scheduler.residents) == {"b", "c"}
+    assert scheduler.evictions == 1
+    assert gpu.allocations() == {"b": 6000, "c": 6000}
+
+
+def test_evicts_least_recently_used_within_a_priority() -> None:
+    """Test ties on priority evict the model used longest ago."""
+    gpu, scheduler = make_scheduler(13000, {"a": 6000, "b": 6000, "c": 6000})
+
+    async def main():
+        await scheduler.admit("a", "vibevoice", 5, loader(gpu, "a", 6000))
+        await scheduler.admit("b", "vibevoice", 5, loader(gpu, "b", 6000))
+        await asyncio.sleep(0.01)
+        # Using 'a' again makes 'b' the least recently used
+        await scheduler.admit("a", "vibevoice", 5, loader(gpu, "a", 6000))
+        await scheduler.admit("c", "vibevoice", 5, loader(gpu, "c", 6000))
+
+    asyncio.run(main())
+
+    assert set(scheduler.residents) == {"a", "c"}
+
+
+def test_never_evicts_higher_priority_models() -> None:
+    """Test a request waits instead of evicting a model above its priority."""
+    gpu, scheduler = make_scheduler(10000, {"a": 8000, "b": 8000}, queue_timeout=0.05)
+
+    async def main():
+        await scheduler.admit("a", "vibevoice", 8, loader(gpu, "a", 8000))
+        with pytest.raises(AdmissionTimeout):
+            await scheduler.admit("b", "vibevoice", 5, loader(gpu, "b", 8000))
+
+    asyncio.run(main())
+
+    assert set(scheduler.residents) == {"a"}
+    assert scheduler.timeouts == 1
+    assert scheduler.stats()["queue"] == []
+
+
+def test_queue_admits_by_priority_then_arrival() -> None:
+    """Test waiting requests are admitted highest priority first, FIFO within a priority."""
+    gpu, scheduler = make_scheduler(
+        10000, {"x": 10000, "low": 3000, "high-1": 3000, "high-2": 3000}
+    )
+    order = []
+
+    async def main():
+        await scheduler.admit("x", "vibevoice", 5, loader(gpu, "x", 10000))
+        scheduler.pin("x")
+        tasks = []
+        for model, priority in (("low", 2), ("high-1", 8), ("high-2", 8)):
+            tasks.append(
+                asyncio.create_task(
+                    scheduler.admit(model, "vibevoice", priority, loader(gpu, model, 3000, order))
+                )
+            )
+            await asyncio.sleep(0.02)
+        assert [w["model"] for w in scheduler.stats()["queue"]] == ["high-1", "high-2", "low"]
+        await scheduler.unpin("x")
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+    assert order == ["high-1", "high-2", "low"]
+    assert set(scheduler.residents) == {"high-1", "high-2", "low"}
+
+
+def test_model_larger_than_budget_is_rejected_at_once() -> None:
+    """Test a model that can never fit raises InsufficientVram (409) without queueing."""
+    gpu, scheduler = make_scheduler(8000, {"huge": 9000})
+
+    async def main():
+        await scheduler.admit("huge", "vibevoice", 10, loader(gpu, "huge", 9000))
+
+    with pytest.raises(InsufficientVram) as excinfo:
+        asyncio.run(main())
+
+    assert excinfo.value.status_code == 409
+    assert scheduler.residents == {}
+    assert scheduler.timeouts == 0
+
+
+def test_pinned_model_is_not_evicted_until_unpinned() -> None:
+    """Test a pinned model blocks eviction, and admission resumes once it is unpinned."""
+    gpu, scheduler = make_scheduler(15000, {"a": 9000, "b": 9000})
+
+    async def main():
+        await scheduler.admit("a", "vibevoice", 5, loader(gpu, "a", 9000))
+        scheduler.pin("a")
+        waiting = asyncio.create_task(scheduler.admit("b", "vibevoice", 9, loader(gpu, "b", 9000)))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        assert "a" in scheduler.residents
+
+        await scheduler.unpin("a")
+        await asyncio.wait_for(waiting, 1)
+
+    asyncio.run(main())
+
+    assert set(scheduler.residents) == {"b"}
+    assert gpu.ooms == 0
+
+
+def test_release_of_pinned_model_needs_force() -> None:
+    """Test an explicit unload of a model serving requests fails unless forced."""
+    gpu, scheduler = make_scheduler(15000, {"a": 9000})
+
+    async def main():
+        await scheduler.admit("a", "vibevoice", 5, loader(gpu, "a", 9000))
+        scheduler.pin("a")
+        with pytest.raises(ModelInUse):
+            await scheduler.release("a")
+        assert "a" in scheduler.residents
+        await scheduler.release("a", force=True)
+
+    asyncio.run(main())
+
+    assert scheduler.residents == {}
+    assert gpu.allocations() == {}
+
+
+def test_readmit_during_own_eviction_waits_for_it() -> None:
+    """Test a model requested while being evicted is admitted again, not handed out half-gone."""
+    gpu, scheduler = make_scheduler(15000, {"a": 9000, "b": 9000}, unload_delay=0.05)
+
+    async def main():
+        await scheduler.admit("a", "vibevoice", 5, loader(gpu, "a", 9000))
+        evicting = asyncio.create_task(scheduler.admit("b", "vibevoice", 5, loader(gpu, "b", 9000)))
+        await asyncio.sleep(0.01)
+        assert "a" in scheduler._busy
+
+        readmit = asyncio.create_task(scheduler.admit("a", "vibevoice", 5, loader(gpu, "a", 9000)))
+        await evicting
+        resident = await asyncio.wait_for(readmit, 1)
+        scheduler.pin("a")
+        return resident
+
+    resident = asyncio.run(main())
+
+    assert resident is scheduler.residents["a"]
+    assert resident.status == "loaded"
+    assert scheduler.stats()["in_use"] == {"a": 1}
+    # Every allocation on the device is accounted for in the ledger
+    assert set(gpu.allocations()) == set(scheduler.residents)
+
+
+def test_service_wide_release_does_not_learn_shared_delta() -> None:
+    """Test a release that frees several models of a service is not learned as one model's cost."""
+    gpu, scheduler = make_scheduler(20000, {"small": 1000, "medium": 3000})
+
+    async def main():
+        await scheduler.admit("small", "whisperx", 5, loader(gpu, "small", 1000))
+        await scheduler.admit("medium", "whisperx", 5, loader(gpu, "medium", 3000))
+        await scheduler.release("small")
+
+    asyncio.run(main())
+
+    assert scheduler.residents == {}
+    assert scheduler.costs.estimate("small", "whisperx") == 1000
+
+
+def test_preloaded_check_does_not_block_other_admissions() -> None:
+    """Test verifying a preloaded model runs outside the scheduler lock."""
+    gpu, scheduler = make_scheduler(16000, {"held": 4000, "a": 4000})
+    checking = asyncio.Event()
+    finish = asyncio.Event()
+
+    async def held_already() -> str:
+        checking.set()
+        await finish.wait()
+        return "loaded"
+
+    async def main():
+        preloaded = asyncio.create_task(
+            scheduler.admit("held", "vibevoice", 5, held_already, preloaded=True)
+        )
+        await checking.wait()
+        await asyncio.wait_for(scheduler.admit("a", "vibevoice", 5, loader(gpu, "a", 4000)), 1)
+        assert "held" not in scheduler.residents
+
+        # A second admit of the model being checked waits for that check
+        again = asyncio.create_task(scheduler.admit("held", "vibevoice", 7, held_already))
+        finish.set()
+        first = await preloaded
+        assert await again is first
+
+    asyncio.run(main())
+
+    assert scheduler.residents["held"].priority == 7
+    assert scheduler.admitted == 2
@@ -0,0 +1,67 @@
+"""Tests for persisted orchestrator state and health samples."""
+
+import asyncio
+import time
+
+from app.monitor import HealthMonitor
+from app.state import StateStore
+from app.telemetry import SimulatedGpu
+
+
+def test_state_values_survive_reopen(tmp_path) -> None:
+    """Test stored values are read back by a new store on the same file."""
+    path = str(tmp_path / "state" / "orchestrator.db")
+    store = StateStore(path)
+    store.put(residents=[{"model": "large-v3", "service": "whisperx"}], costs={"large-v3": 4500})
+    store.close()
+
+    reopened = StateStore(path)
+    assert reopened.get("residents") == [{"model": "large-v3", "service": "whisperx"}]
+    assert reopened.get("costs") == {"large-v3": 4500}
+    assert reopened.get("missing", {}) == {}
+    reopened.close()
+
+
+def test_snapshots_are_ranged_and_expire(tmp_path) -> None:
+    """Test snapshot queries by time range and deletion past the retention window."""
+    store = StateStore(str(tmp_path / "orchestrator.db"), retention_hours=1)
+    now = time.time()
+    store.add_snapshot({"ts": now - 7200, "gpu": {}})
+    for offset in (30, 20, 10):
+        store.add_snapshot({"ts": now - offset, "gpu": {}})
+
+    assert [s["ts"] for s in store.snapshots()] == [now - 30, now - 20, now - 10]
+    assert [s["ts"] for s in store.snapshots(since=now - 25)] == [now - 20, now - 10]
+    assert [s["ts"] for s in store.snapshots(limit=2)] == [now - 20, now - 10]
+    store.close()
+
+
+def test_disabled_store_is_a_no_op() -> None:
+    """Test a store without a path keeps nothing."""
+    store = StateStore("")
+    store.put(costs={"a": 1})
+    store.add_snapshot({"ts": time.time()})
+
+    assert not store.enabled
+    assert store.get("costs") is None
+    assert store.snapshots() == []
+
+
+def test_monitor_samples_gpu_into_history_and_store(tmp_path) -> None:
+    """Test a sample records GPU memory, runs the hook and is persisted."""
+    gpu = SimulatedGpu(total_mb=10000, baseline_mb=0)
+    gpu.allocate("large-v3", 4000)
+    store = StateStore(str(tmp_path / "orchestrator.db"))
+
+    async def on_sample(snapshot: dict):
+        snapshot["scheduler"] = {"residents": 1}
+
+    monitor = HealthMonitor({}, gpu, store, probe_services=False, on_sample=on_sample)
+    snapshot = asyncio.run(monitor.sample())
+
+    assert snapshot["gpu"]["used_mb"] == 4000
+    assert snapshot["scheduler"] == {"residents": 1}
+    assert monitor.fresh() is snapshot
+    assert asyncio.run(monitor.samples()) == [snapshot]
+    assert store.snapshots()[0]["gpu"]["free_mb"] == 6000
+    store.close()
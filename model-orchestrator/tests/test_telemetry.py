@@ -0,0 +1,80 @@
+"""Tests for the GPU telemetry providers."""
+
+import sys
+
+import pytest
+
+from app.telemetry import NvmlTelemetry, SimulatedGpu, create_telemetry
+
+
+def test_simulated_gpu_tracks_allocations_and_frees() -> None:
+    """Test memory() reflects the baseline plus per-owner allocations."""
+    gpu = SimulatedGpu(total_mb=10000, baseline_mb=500)
+
+    assert gpu.allocate("a", 3000)
+    assert gpu.allocate("b", 2000)
+    assert gpu.memory() == (10000, 5500, 4500)
+
+    assert gpu.free("a") == 3000
+    assert gpu.free("a") == 0
+    assert gpu.memory() == (10000, 2500, 7500)
+    assert gpu.allocations() == {"b": 2000}
+
+
+def test_simulated_gpu_reallocation_replaces_previous_size() -> None:
+    """Test allocating again for the same owner replaces, not adds to, its memory."""
+    gpu = SimulatedGpu(total_mb=10000, baseline_mb=0)
+
+    gpu.allocate("a", 3000)
+    gpu.allocate("a", 1000)
+
+    assert gpu.used_mb() == 1000
+    assert gpu.peak_used_mb == 3000
+
+
+def test_simulated_gpu_counts_overcommit_as_oom() -> None:
+    """Test allocations past the total are recorded but counted as OOMs."""
+    gpu = SimulatedGpu(total_mb=4000, baseline_mb=0)
+
+    assert gpu.allocate("a", 3000)
+    assert not gpu.allocate("b", 2000)
+
+    assert gpu.ooms == 1
+    assert gpu.memory() == (4000, 5000, 0)
+    assert gpu.peak_used_mb == 5000
+
+
+def test_simulated_gpu_model_hooks_use_actual_footprint() -> None:
+    """Test model_loaded allocates the model's actual size when it differs from the estimate."""
+    gpu = SimulatedGpu(total_mb=10000, baseline_mb=0)
+    gpu.actual_mb["large-v3"] = 4500
+
+    gpu.model_loaded("large-v3", 3000)
+    gpu.model_loaded("small", 800)
+    assert gpu.allocations() == {"large-v3": 4500, "small": 800}
+    assert gpu.utilization() == 100.0
+
+    gpu.model_unloaded("large-v3")
+    gpu.model_unloaded("small")
+    assert gpu.used_mb() == 0
+    assert gpu.utilization() == 0.0
+
+
+def test_create_telemetry_selects_provider() -> None:
+    """Test the factory builds the simulated device and rejects unknown kinds."""
+    gpu = create_telemetry("simulated", total_mb=8000)
+
+    assert isinstance(gpu, SimulatedGpu)
+    assert gpu.memory()[0] == 8000
+    with pytest.raises(ValueError):
+        create_telemetry("rocm")
+
+
+def test_nvml_telemetry_without_nvml_reports_zeros(monkeypatch) -> None:
+    """Test NVML telemetry degrades to zeros when pynvml cannot be loaded."""
+    monkeypatch.setitem(sys.modules, "pynvml", None)
+    telemetry = NvmlTelemetry()
+
+    assert telemetry.memory() == (0, 0, 0)
+    assert telemetry.utilization() == 0.0
+    telemetry.close()
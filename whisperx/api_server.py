@@ -7,21 +7,65 @@ Enhanced with chunking support for large files and video processing.
 
 import os
 import gc
+import copy
+import json
 import torch
 import whisperx
+from faster_whisper.tokenizer import Tokenizer
 import uvicorn
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
-from fastapi.responses import JSONResponse
-from typing import Optional, List
+from fastapi import FastAPI, File, UploadFile, Form, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import (
+    FileResponse,
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from typing import Callable, Iterable, Optional, List, Tuple
 from pathlib import Path
 from pydantic import BaseModel, Field
 import logging
 import time
-import requests
+import queue
+import sys
+import threading
+import numpy as np
+import pandas as pd
+from contextlib import nullcontext
 
 # Import our custom modules
-from ffmpeg_processor import FFmpegProcessor
+from ffmpeg_processor import FFmpegProcessor, probe_cache
 from video_segmenter import VideoSegmenter, AudioSegment
+from model_pool import ModelPool
+from audio_buffer import AudioBuffer
+from chunk_batcher import build_batch_windows, group_window_results, plan_chunk_batches
+from segment_merger import OverlapMerger, dedupe_overlapping_words
+from upload_stream import save_upload_streaming
+from job_queue import Job, JobCancelled, JobQueue, JobStatus, QueueFullError
+from result_cache import ResultCache, hash_file, make_key
+from stage_pipeline import END, StageThread, StageTimer
+from progress_events import ProgressCallbackSender, format_ndjson, format_sse
+from warmup import Preloader, parse_preload_list
+from transcript_formats import (
+    OUTPUT_FORMATS,
+    IncrementalTranscript,
+    compress_body,
+    encode_response,
+    format_timestamp,
+    parse_outputs,
+    render_transcript,
+    select_outputs,
+)
+from artifact_store import ArtifactStore
+from speaker_diarizer import SpeakerEmbedder, SpeakerProfile
+from metrics import (
+    BYTES_BUCKETS,
+    SECONDS_BUCKETS,
+    MetricsRegistry,
+    ResourceMonitor,
+    process_rss_bytes,
+)
 
 
 # Pydantic models for API documentation
@@ -71,18 +115,33 @@ class TranscriptionResponse(BaseModel):
 
     filename: str = Field(..., description="Original filename")
     language: str = Field(..., description="Detected or specified language code")
-    segments: List[TranscriptionSegment] = Field(
-        ..., description="Array of transcription segments with word-level timing"
+    segments: Optional[List[TranscriptionSegment]] = Field(
+        None, description="Array of transcription segments with word-level timing"
     )
-    srt: str = Field(
-        ...,
+    srt: Optional[str] = Field(
+        None,
         description="Pre-formatted word-level SRT subtitles (one word per entry, for karaoke/animations)",
     )
-    segments_srt: str = Field(
-        ...,
+    segments_srt: Optional[str] = Field(
+        None,
         description="Pre-formatted segment-level SRT subtitles (one phrase per entry, ideal for AI analysis)",
     )
-    txt: str = Field(..., description="Plain text transcript without timestamps")
+    txt: Optional[str] = Field(None, description="Plain text transcript without timestamps")
+    cache: Optional[dict] = Field(
+        None,
+        description="Result cache status per stage (asr/alignment/diarization: hit or miss)",
+    )
+    artifact_id: Optional[str] = Field(
+        None, description="Artifact directory id (delivery=store only)"
+    )
+    artifacts: Optional[dict] = Field(
+        None,
+        description="Stored formats with url, shared-volume path and bytes (delivery=store only)",
+    )
+    metrics: Optional[dict] = Field(
+        None,
+        description="Per-stage wall time and peak RSS/GPU memory (include_metrics=true only)",
+    )
 
     class Config:
         json_schema_extra = {
@@ -131,6 +190,20 @@ class LargeTranscriptionResponse(TranscriptionResponse):
         ...,
         description="Processing speed relative to audio duration (higher is faster)",
     )
+    chunk_batch_size: int = Field(
+        1, description="Chunks packed into each inference call"
+    )
+    chunks_per_second: float = Field(
+        0.0, description="ASR throughput in chunks per second"
+    )
+    overlap_merge: Optional[dict] = Field(
+        None,
+        description="Chunk-overlap deduplication stats (words/seconds removed, alignment time)",
+    )
+    stage_timing: Optional[dict] = Field(
+        None,
+        description="Per-stage start/end/busy seconds and how much the pipeline stages overlapped",
+    )
 
     class Config:
         json_schema_extra = {
@@ -143,6 +216,8 @@ class LargeTranscriptionResponse(TranscriptionResponse):
                 "chunking_strategy": "vad",
                 "processing_time": 89.3,
                 "realtime_factor": 20.5,
+                "chunk_batch_size": 8,
+                "chunks_per_second": 1.9,
                 "segments": [],
                 "srt": "1\n00:00:00,031 --> 00:00:00,432\nHello,\n\n",
                 "segments_srt": "1\n00:00:00,031 --> 00:00:05,381\nHello, this is a test.\n\n",
@@ -216,6 +291,24 @@ DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 COMPUTE_TYPE = os.getenv("COMPUTE_TYPE", "float16" if DEVICE == "cuda" else "int8")
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", "16"))
 
+# Large-file mode: chunks packed into one inference call (1 = one call per chunk)
+CHUNK_BATCH_SIZE = int(os.getenv("CHUNK_BATCH_SIZE", "8"))
+# Audio-seconds budget per packed call (bounds window memory and call latency)
+CHUNK_BATCH_MAX_SECONDS = float(os.getenv("CHUNK_BATCH_MAX_SECONDS", "600"))
+
+# Large-file diarization: 'pipeline' runs the full pyannote pipeline over the
+# whole file; 'regions' embeds only the VAD speech regions and clusters them
+DIARIZATION_MODES = ("pipeline", "regions")
+DIARIZATION_MODE = os.getenv("DIARIZATION_MODE", "pipeline")
+SPEAKER_EMBEDDING_MODEL = os.getenv(
+    "SPEAKER_EMBEDDING_MODEL", "pyannote/wespeaker-voxceleb-resnet34-LM"
+)
+SPEAKER_EMBEDDING_BATCH_SIZE = int(os.getenv("SPEAKER_EMBEDDING_BATCH_SIZE", "32"))
+SPEAKER_WINDOW_SECONDS = float(os.getenv("SPEAKER_WINDOW_SECONDS", "2.0"))
+SPEAKER_STEP_SECONDS = float(os.getenv("SPEAKER_STEP_SECONDS", "1.0"))
+# Cosine similarity above which two speaker clusters are merged
+SPEAKER_CLUSTER_THRESHOLD = float(os.getenv("SPEAKER_CLUSTER_THRESHOLD", "0.6"))
+
 # Enable TF32 for RTX 5090 Blackwell optimization (20-40% speedup on 5th-gen Tensor Cores)
 # TF32 provides significant performance boost with minimal accuracy loss
 if DEVICE == "cuda":
@@ -226,18 +319,370 @@ if DEVICE == "cuda":
 # Initialize processors
 # Enable hw_accel for RTX 5090's 9th-gen NVENC/NVDEC - provides significant speedup for video processing
 ffmpeg_processor = FFmpegProcessor(use_hw_accel=True, enhance_speech=True)
-video_segmenter = VideoSegmenter(chunk_duration=30, overlap_duration=10)
+# VAD engine: 'torch' (torch.hub Silero) or 'onnx' (bundled model, batched, offline)
+video_segmenter = VideoSegmenter(
+    chunk_duration=30,
+    overlap_duration=10,
+    vad_engine=os.getenv("VAD_ENGINE", "torch"),
+    vad_onnx_path=os.getenv("VAD_ONNX_MODEL") or None,
+    vad_threads=int(os.getenv("VAD_THREADS", "4")),
+    vad_batch_size=int(os.getenv("VAD_BATCH_SIZE", "64")),
+)
 
 # Shared directory for file processing
 SHARED_DIR = Path("/app/shared")
 TEMP_DIR = SHARED_DIR / "temp"
 TEMP_DIR.mkdir(parents=True, exist_ok=True)
 
+# delivery=store writes transcript formats here and returns URLs (pruned after the TTL)
+ARTIFACT_DIR = Path(os.getenv("ARTIFACT_DIR", str(SHARED_DIR / "output" / "transcripts")))
+ARTIFACT_TTL_HOURS = float(os.getenv("ARTIFACT_TTL_HOURS", "72"))
+ARTIFACT_BASE_URL = os.getenv("ARTIFACT_BASE_URL", "")
+
+# Responses at least this large are gzip/zstd compressed if the client accepts it
+RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+
+# Uploads are streamed to disk; reject anything larger than this (0 = unlimited)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024**3)))
+
+# Decoded PCM is streamed from ffmpeg into a memory-mapped buffer on local disk
+# (never the NAS-backed shared volume); set AUDIO_BUFFER_DIR="" to keep it in RAM
+AUDIO_BUFFER_DIR = os.getenv("AUDIO_BUFFER_DIR", "/tmp/whisperx-audio") or None
+
+# Content-addressed stage result cache (0 = disabled); lives on the persistent cache volume
+RESULT_CACHE_DIR = Path(os.getenv("RESULT_CACHE_DIR", "/root/.cache/whisperx/results"))
+RESULT_CACHE_MAX_MB = int(os.getenv("RESULT_CACHE_MAX_MB", "2048"))
+
+# Inputs with these extensions have their audio track extracted first
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov", ".webm")
+
+# GPU job queue: jobs waiting beyond this are rejected with 429
+JOB_QUEUE_MAX_SIZE = int(os.getenv("JOB_QUEUE_MAX_SIZE", "16"))
+# Finished jobs kept for GET /jobs/{id} and /jobs/{id}/result
+JOB_HISTORY_SIZE = int(os.getenv("JOB_HISTORY_SIZE", "100"))
+
+# Stage metrics: memory is sampled at this period (s) while a stage is running
+METRICS_SAMPLE_INTERVAL = float(os.getenv("METRICS_SAMPLE_INTERVAL", "0.1"))
+
+# Warm start: loaded in the background at startup; /ready reports when done
+# Whisper models as 'name' or 'name:language' (comma-separated)
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "")
+PRELOAD_ALIGN_LANGUAGES = os.getenv("PRELOAD_ALIGN_LANGUAGES", "")
+PRELOAD_VAD = os.getenv("PRELOAD_VAD", "false").lower() == "true"
+PRELOAD_DIARIZATION = os.getenv("PRELOAD_DIARIZATION", "false").lower() == "true"
+
 logger.info(
     f"Starting WhisperX API Server on {DEVICE} with compute type {COMPUTE_TYPE}"
 )
 
 
+def cuda_memory_used_mb() -> float:
+    """Device-wide GPU memory in use (MB), including CTranslate2 allocations."""
+    if DEVICE != "cuda":
+        return 0.0
+    free, total = torch.cuda.mem_get_info()
+    return (total - free) / (1024 * 1024)
+
+
+def release_cuda_cache():
+    """Return cached CUDA blocks to the driver after a model is dropped."""
+    if DEVICE == "cuda":
+        torch.cuda.empty_cache()
+
+
+# Resident Whisper model pool shared by all endpoints
+# Keyed by (model, compute_type, language) so each model is initialized once
+# and reused until LRU/idle eviction instead of being reloaded per request
+whisper_pool = ModelPool(
+    name="whisper",
+    max_memory_mb=float(os.getenv("MODEL_POOL_MAX_MB", "0")),
+    max_entries=int(os.getenv("MODEL_POOL_MAX_MODELS", "2")),
+    idle_ttl=float(os.getenv("MODEL_POOL_IDLE_TTL", "900")),
+    memory_probe=cuda_memory_used_mb,
+    on_evict=release_cuda_cache,
+)
+whisper_pool.start_reaper()
+
+
+def get_whisper_model(model: str, language: Optional[str] = None):
+    """
+    Get a Whisper model from the resident pool, loading it on first use.
+
+    Args:
+        model: Whisper model name (e.g. 'large-v3')
+        language: Optional language code the model is configured for
+
+    Returns:
+        Loaded WhisperX model instance
+    """
+    return whisper_pool.get(
+        (model, COMPUTE_TYPE, language),
+        lambda: whisperx.load_model(
+            model, device=DEVICE, compute_type=COMPUTE_TYPE, language=language
+        ),
+    )
+
+
+# Alignment models (one wav2vec2 model per language) and the pyannote
+# diarization pipeline stay resident too instead of being rebuilt per request
+align_pool = ModelPool(
+    name="alignment",
+    max_memory_mb=float(os.getenv("ALIGN_POOL_MAX_MB", "0")),
+    max_entries=int(os.getenv("ALIGN_POOL_MAX_MODELS", "3")),
+    idle_ttl=float(os.getenv("ALIGN_POOL_IDLE_TTL", "900")),
+    memory_probe=cuda_memory_used_mb,
+    on_evict=release_cuda_cache,
+)
+align_pool.start_reaper()
+
+diarization_pool = ModelPool(
+    name="diarization",
+    max_entries=int(os.getenv("DIARIZATION_POOL_MAX_MODELS", "2")),
+    idle_ttl=float(os.getenv("DIARIZATION_POOL_IDLE_TTL", "900")),
+    memory_probe=cuda_memory_used_mb,
+    on_evict=release_cuda_cache,
+)
+diarization_pool.start_reaper()
+
+MODEL_POOLS = {
+    "whisper": whisper_pool,
+    "alignment": align_pool,
+    "diarization": diarization_pool,
+}
+
+
+def get_align_model(language: str):
+    """
+    Get the alignment model for a language from the resident pool.
+
+    Args:
+        language: Language code of the segments to align
+
+    Returns:
+        (alignment model, alignment metadata)
+    """
+    return align_pool.get(
+        (language, DEVICE),
+        lambda: whisperx.load_align_model(language_code=language, device=DEVICE),
+    )
+
+
+def get_diarization_pipeline(hf_token: str):
+    """
+    Get the resident diarization pipeline, building it on first use.
+
+    Args:
+        hf_token: HuggingFace token (only needed to download the pipeline)
+
+    Returns:
+        whisperx DiarizationPipeline
+    """
+    return diarization_pool.get(
+        ("pyannote", DEVICE),
+        lambda: whisperx.DiarizationPipeline(use_auth_token=hf_token, device=DEVICE),
+    )
+
+
+def get_speaker_embedding(hf_token: str):
+    """
+    Get the resident speaker embedding model (diarization_mode='regions').
+
+    Args:
+        hf_token: HuggingFace token (only needed to download the model)
+
+    Returns:
+        pyannote PretrainedSpeakerEmbedding
+    """
+
+    def load():
+        from pyannote.audio.pipelines.speaker_verification import (
+            PretrainedSpeakerEmbedding,
+        )
+
+        return PretrainedSpeakerEmbedding(
+            SPEAKER_EMBEDDING_MODEL, device=torch.device(DEVICE), use_auth_token=hf_token
+        )
+
+    return diarization_pool.get(("embedding", SPEAKER_EMBEDDING_MODEL, DEVICE), load)
+
+
+# Repeat requests for the same audio are served per stage from disk
+result_cache = ResultCache(RESULT_CACHE_DIR, max_bytes=RESULT_CACHE_MAX_MB * 1024 * 1024)
+
+artifact_store = ArtifactStore(
+    ARTIFACT_DIR,
+    base_url=f"{ARTIFACT_BASE_URL.rstrip('/')}/artifacts",
+    ttl_seconds=ARTIFACT_TTL_HOURS * 3600,
+)
+
+
+# All GPU work runs on one dedicated worker thread fed by a bounded priority
+# queue, so the event loop (and /health) stays responsive during transcription
+job_queue = JobQueue(max_size=JOB_QUEUE_MAX_SIZE, history_size=JOB_HISTORY_SIZE)
+
+# Progress callbacks are posted off the GPU worker thread
+callback_sender = ProgressCallbackSender()
+
+# Per-stage wall time and peak memory, exported on GET /metrics
+resource_probes = {"rss_bytes": process_rss_bytes}
+if DEVICE == "cuda":
+    resource_probes["cuda_bytes"] = lambda: cuda_memory_used_mb() * 1024**2
+resource_monitor = ResourceMonitor(resource_probes, interval=METRICS_SAMPLE_INTERVAL)
+
+metrics = MetricsRegistry()
+stage_seconds = metrics.histogram(
+    "whisperx_stage_seconds",
+    "Wall time of one unit of stage work (upload, decode, probe, vad, asr batch, ...)",
+    SECONDS_BUCKETS,
+    ["stage"],
+)
+stage_peak_rss = metrics.histogram(
+    "whisperx_stage_peak_rss_bytes",
+    "Peak process RSS while a unit of stage work ran",
+    BYTES_BUCKETS,
+    ["stage"],
+)
+stage_peak_cuda = metrics.histogram(
+    "whisperx_stage_peak_cuda_bytes",
+    "Peak device memory in use while a unit of stage work ran",
+    BYTES_BUCKETS,
+    ["stage"],
+)
+metrics.gauge("process_resident_memory_bytes", "Resident memory size", process_rss_bytes)
+metrics.gauge(
+    "whisperx_cuda_memory_used_bytes",
+    "Device-wide GPU memory in use",
+    lambda: cuda_memory_used_mb() * 1024**2,
+)
+metrics.gauge(
+    "whisperx_queue_jobs",
+    "Jobs waiting for or running on the GPU worker",
+    lambda: {
+        (("state", "queued"),): job_queue.stats()["queued"],
+        (("state", "running"),): 1 if job_queue.stats()["running"] else 0,
+    },
+)
+metrics.gauge(
+    "whisperx_jobs_total",
+    "Finished jobs by outcome",
+    lambda: {
+        (("status", status),): job_queue.stats()[status]
+        for status in ("completed", "failed", "cancelled", "rejected")
+    },
+    kind="counter",
+)
+
+
+def observe_stage(stage: str, seconds: float, peaks: dict):
+    stage_seconds.observe(seconds, stage=stage)
+    if "rss_bytes" in peaks:
+        stage_peak_rss.observe(peaks["rss_bytes"], stage=stage)
+    if "cuda_bytes" in peaks:
+        stage_peak_cuda.observe(peaks["cuda_bytes"], stage=stage)
+
+
+def new_stage_timer() -> StageTimer:
+    """Per-request stage timer feeding the /metrics histograms."""
+    return StageTimer(monitor=resource_monitor, on_stage=observe_stage)
+
+
+def with_stage_metrics(run: Callable, timer: StageTimer, include_metrics: bool) -> Callable:
+    """Wrap a job function so its response carries the stage report when requested."""
+
+    def wrapped(job):
+        response = run(job)
+        if include_metrics:
+            response["metrics"] = timer.report()
+        return response
+
+    return wrapped
+
+
+def load_vad_model():
+    """Load the Silero VAD model into the shared segmenter (raises if unavailable)."""
+    video_segmenter.load_vad_model()
+    if video_segmenter.vad_model is None:
+        raise RuntimeError("Silero VAD model could not be loaded")
+
+
+def build_preloader() -> Preloader:
+    """Preload list from PRELOAD_* settings, in the order models are first needed."""
+    preloader = Preloader()
+    for name, language in parse_preload_list(PRELOAD_MODELS):
+        preloader.add(
+            "whisper",
+            f"{name}:{language}" if language else name,
+            lambda name=name, language=language: get_whisper_model(name, language),
+        )
+    if PRELOAD_VAD:
+        preloader.add("vad", f"silero-{video_segmenter.vad_engine}", load_vad_model)
+    for language, _ in parse_preload_list(PRELOAD_ALIGN_LANGUAGES):
+        preloader.add(
+            "alignment", language, lambda language=language: get_align_model(language)
+        )
+    if PRELOAD_DIARIZATION:
+        hf_token = os.getenv("HF_TOKEN")
+        if hf_token and DIARIZATION_MODE == "regions":
+            preloader.add(
+                "diarization",
+                SPEAKER_EMBEDDING_MODEL,
+                lambda: get_speaker_embedding(hf_token),
+            )
+        elif hf_token:
+            preloader.add(
+                "diarization", "pyannote", lambda: get_diarization_pipeline(hf_token)
+            )
+        else:
+            logger.warning("PRELOAD_DIARIZATION is set but HF_TOKEN is missing; skipping")
+    return preloader
+
+
+preloader = build_preloader()
+
+
+@app.on_event("startup")
+async def start_gpu_worker():
+    job_queue.start()
+    callback_sender.start()
+    preloader.start()
+
+
+@app.on_event("shutdown")
+async def stop_gpu_worker():
+    job_queue.stop()
+    callback_sender.stop()
+
+
+def remove_files(*paths: Optional[Path]):
+    """Build a job cleanup callback that deletes the job's input files."""
+
+    def cleanup():
+        for path in paths:
+            if path and path.exists():
+                path.unlink()
+
+    return cleanup
+
+
+async def run_on_gpu(fn, kind: str, params: dict, cleanup=None, priority: int = 5):
+    """
+    Run a pipeline on the GPU worker and await its result.
+
+    Raises:
+        HTTPException: 429 when the queue is full, 409 if the job was cancelled
+    """
+    try:
+        return await job_queue.run(
+            fn, kind, priority=priority, params=params, cleanup=cleanup
+        )
+    except QueueFullError as e:
+        if cleanup:
+            cleanup()
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    except JobCancelled:
+        raise HTTPException(status_code=409, detail="Job was cancelled")
+
+
 def format_timestamp_srt(seconds: float) -> str:
     """
     Convert seconds to SRT timestamp format (HH:MM:SS,mmm).
@@ -248,14 +693,10 @@ def format_timestamp_srt(seconds: float) -> str:
     Returns:
         Formatted timestamp string
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+    return format_timestamp(seconds)
 
 
-def generate_srt_from_segments(segments: list) -> str:
+def generate_srt_from_segments(segments: list, start_index: int = 1) -> str:
     """
     Generate SRT subtitle content from transcription segments.
 
@@ -264,42 +705,15 @@ def generate_srt_from_segments(segments: list) -> str:
 
     Args:
         segments: List of segment dictionaries with 'words' arrays
+        start_index: Number of the first subtitle (continues a streamed SRT)
 
     Returns:
         SRT formatted string
     """
-    srt_lines = []
-    counter = 1
+    return render_transcript(segments, ("srt",), word_start_index=start_index)["srt"]
 
-    for segment in segments:
-        words = segment.get("words", [])
 
-        for word_obj in words:
-            word_text = word_obj.get("word", "").strip()
-            start = word_obj.get("start")
-            end = word_obj.get("end")
-
-            if not word_text or start is None or end is None:
-                continue
-
-            # SRT format:
-            # Counter
-            # Start --> End
-            # Text
-            # (blank line)
-            srt_lines.append(f"{counter}")
-            srt_lines.append(
-                f"{format_timestamp_srt(start)} --> {format_timestamp_srt(end)}"
-            )
-            srt_lines.append(word_text)
-            srt_lines.append("")  # Blank line between entries
-
-            counter += 1
-
-    return "\n".join(srt_lines)
-
-
-def generate_segment_srt(segments: list) -> str:
+def generate_segment_srt(segments: list, start_index: int = 1) -> str:
     """
     Generate SRT subtitle content from segments (not words).
     Creates segment-level subtitles where each subtitle shows
@@ -307,31 +721,14 @@ def generate_segment_srt(segments: list) -> str:
 
     Args:
         segments: List of segment dictionaries with 'start', 'end', and 'text' fields
+        start_index: Number of the first subtitle (continues a streamed SRT)
 
     Returns:
         SRT formatted string with segment-level subtitles
     """
-    srt_lines = []
-    counter = 1
-
-    for segment in segments:
-        text = segment.get("text", "").strip()
-        start = segment.get("start")
-        end = segment.get("end")
-
-        if not text or start is None or end is None:
-            continue
-
-        srt_lines.append(f"{counter}")
-        srt_lines.append(
-            f"{format_timestamp_srt(start)} --> {format_timestamp_srt(end)}"
-        )
-        srt_lines.append(text)
-        srt_lines.append("")  # Blank line between entries
-
-        counter += 1
-
-    return "\n".join(srt_lines)
+    return render_transcript(
+        segments, ("segments_srt",), segment_start_index=start_index
+    )["segments_srt"]
 
 
 def generate_txt_from_segments(segments: list) -> str:
@@ -346,14 +743,69 @@ def generate_txt_from_segments(segments: list) -> str:
     Returns:
         Plain text transcript
     """
-    text_lines = []
+    return render_transcript(segments, ("txt",))["txt"]
+
+
+DELIVERY_MODES = ("inline", "store")
+
+
+def delivery_options(outputs: Optional[str], delivery: str) -> Tuple[str, ...]:
+    """Validate the outputs/delivery parameters before any work is done."""
+    if delivery not in DELIVERY_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown delivery '{delivery}', expected one of {DELIVERY_MODES}",
+        )
+    try:
+        return parse_outputs(outputs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def check_diarization_mode(diarization_mode: str):
+    """Validate the diarization_mode parameter before any work is done."""
+    if diarization_mode not in DIARIZATION_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown diarization_mode '{diarization_mode}', expected one of {DIARIZATION_MODES}",
+        )
+
+
+async def transcript_response(
+    content: dict,
+    accept: Optional[str] = None,
+    accept_encoding: Optional[str] = None,
+    outputs: Tuple[str, ...] = OUTPUT_FORMATS,
+    delivery: str = "inline",
+    artifact_id: Optional[str] = None,
+    timer: Optional[StageTimer] = None,
+) -> Response:
+    """
+    Serialize a transcript response.
 
-    for segment in segments:
-        text = segment.get("text", "").strip()
-        if text:
-            text_lines.append(text)
+    Keeps only the requested output formats (or stores them on the shared
+    volume and returns URLs), encodes with orjson (msgpack if the client
+    accepts it) and compresses with zstd/gzip per Accept-Encoding. Runs off
+    the event loop: multi-hour transcripts are tens of MB.
+    """
+
+    def build():
+        with timer.busy("serialize") if timer else nullcontext():
+            if delivery == "store":
+                body_content = artifact_store.store(content, outputs, artifact_id)
+            else:
+                body_content = select_outputs(content, outputs)
+            body, media_type = encode_response(body_content, accept)
+            body, encoding = compress_body(
+                body, accept_encoding, RESPONSE_COMPRESS_MIN_BYTES
+            )
+            return body, media_type, encoding
 
-    return " ".join(text_lines)
+    body, media_type, encoding = await run_in_threadpool(build)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
 
 
 def send_progress_callback(
@@ -366,32 +818,87 @@ def send_progress_callback(
 ):
     """
     Send progress update to callback URL.
-    Fails silently if callback fails to not interrupt transcription.
+    Queued for the background sender, so a slow callback endpoint never
+    delays transcription; failures are logged and ignored.
     """
     if not callback_url or not job_id:
         return
 
-    try:
-        payload = {
-            "job_id": job_id,
-            "status": "processing",
-            "progress": progress,
-            "stage": stage,
-            "message": message,
-        }
+    payload = {
+        "job_id": job_id,
+        "status": "processing",
+        "progress": progress,
+        "stage": stage,
+        "message": message,
+    }
 
-        if segment_info:
-            payload["segment_info"] = segment_info
+    if segment_info:
+        payload["segment_info"] = segment_info
 
-        response = requests.post(callback_url, json=payload, timeout=5)
-        if response.status_code == 200:
-            logger.debug(f"Progress callback sent: {progress}% - {message}")
-        else:
-            logger.warning(
-                f"Progress callback failed with status {response.status_code}"
-            )
-    except Exception as e:
-        logger.warning(f"Failed to send progress callback: {e}")
+    callback_sender.send(callback_url, payload)
+
+
+def report_progress(
+    job: Optional[Job],
+    callback_url: Optional[str],
+    job_id: Optional[str],
+    progress: int,
+    stage: str,
+    message: str,
+    segment_info: dict = None,
+):
+    """
+    Record progress on the queued job (GET /jobs/{id}) and notify the callback URL.
+
+    Also the cooperative cancellation point: raises JobCancelled if the job
+    was cancelled since the last report.
+    """
+    if job:
+        job.update(progress, stage, message)
+        job.check_cancelled()
+
+    send_progress_callback(
+        callback_url=callback_url,
+        job_id=job_id,
+        progress=progress,
+        stage=stage,
+        message=message,
+        segment_info=segment_info,
+    )
+
+
+def segment_publisher(job: Job) -> Callable[[List[dict]], None]:
+    """
+    Build an on_segments callback that publishes finalized segments to the job's event stream.
+
+    Each event carries the segments (with words) plus SRT/TXT fragments whose
+    subtitle numbering continues from the previous event, and which start
+    with the entry separator after the first non-empty one, so concatenating
+    the fragments gives the complete files. "offset" is the number of
+    segments published before this event.
+    """
+    transcript = IncrementalTranscript()
+    counters = {"published": 0}
+
+    def publish(segments: List[dict]):
+        if not segments:
+            return
+        # Snapshot: diarization later adds speakers to these dicts in place
+        segments = copy.deepcopy(segments)
+        fragments = transcript.render(segments)
+        event = {
+            "offset": counters["published"],
+            "start": segments[0].get("start"),
+            "end": segments[-1].get("end"),
+            "segments": segments,
+            "srt": fragments["srt"],
+            "segments_srt": fragments["segments_srt"],
+            "txt": fragments["txt"],
+        }
+        counters["published"] += len(segments)
+        job.events.publish("segments", event)
+
+    return publish
 
 
 @app.get("/")
@@ -413,145 +920,189 @@ async def health_check():
         "status": "healthy",
         "device": DEVICE,
         "gpu_available": torch.cuda.is_available(),
+        "queue": job_queue.stats(),
+        "callbacks": callback_sender.stats(),
+        "probe_cache": probe_cache.stats(),
+        "artifacts": artifact_store.stats(),
     }
 
 
-@app.post("/transcribe", response_model=TranscriptionResponse)
-async def transcribe(
-    file: UploadFile = File(...),
-    model: str = Form(default="large-v3"),
-    language: Optional[str] = Form(default=None),
-    enable_diarization: bool = Form(default=True),
-    min_speakers: Optional[int] = Form(default=None),
-    max_speakers: Optional[int] = Form(default=None),
-    hf_token: Optional[str] = Form(default=None),
-):
+@app.get("/ready")
+async def readiness_check():
     """
-    Transcribe audio file with word-level timestamps and optional speaker diarization.
+    Readiness check: 200 once the configured preload list has finished, 503 before.
 
-    **Example Request (curl):**
-    ```bash
-    curl -X POST https://whisper.lan/transcribe \\
-      -F "file=@audio.wav" \\
-      -F "model=large-v3" \\
-      -F "enable_diarization=false" \\
-      --insecure
-    ```
+    Unlike /health (process is up), this gates traffic until the server is
+    warm. Reports per-model load state and load duration; a model that
+    failed to preload reports 'degraded' but is still loaded on first use.
+    """
+    status = preloader.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
 
-    **Parameters:**
-    - file: Audio file (mp3, wav, m4a, etc.)
-    - model: Whisper model size (tiny, base, small, medium, large-v2, large-v3, large-v3-turbo)
-    - language: Language code (auto-detect if None)
-    - enable_diarization: Enable speaker diarization (requires hf_token)
-    - min_speakers: Minimum number of speakers (for diarization)
-    - max_speakers: Maximum number of speakers (for diarization)
-    - hf_token: HuggingFace token for diarization models
 
-    **Returns JSON with four ready-to-use formats:**
-    - segments: Array of segments with word-level timing (segments[].words[])
-    - srt: Pre-formatted word-level subtitles (one word per entry, for karaoke/animations)
-    - segments_srt: Pre-formatted segment-level subtitles (one phrase per entry, ideal for AI analysis)
-    - txt: Plain text transcript (no timestamps)
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """
+    Prometheus metrics.
 
-    **Example Response:**
-    ```json
-    {
-      "filename": "audio.wav",
-      "language": "en",
-      "segments": [
-        {
-          "start": 0.031,
-          "end": 3.381,
-          "text": " Hello, this is a test.",
-          "words": [
-            {"word": "Hello,", "start": 0.031, "end": 0.432, "score": 0.894},
-            {"word": "this", "start": 0.693, "end": 0.833, "score": 0.999}
-          ]
-        }
-      ],
-      "srt": "1\\n00:00:00,031 --> 00:00:00,432\\nHello,\\n\\n2\\n...",
-      "segments_srt": "1\\n00:00:00,031 --> 00:00:03,381\\nHello, this is a test.\\n\\n",
-      "txt": "Hello, this is a test."
-    }
-    ```
+    Histograms of per-stage wall time (whisperx_stage_seconds) and of peak
+    RSS / GPU memory while each stage ran, plus process memory and queue gauges.
     """
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
-    temp_file = None
 
-    try:
-        # Save uploaded file
-        temp_file = UPLOAD_DIR / file.filename
-        logger.info(f"Processing file: {file.filename}")
+def run_transcription(
+    input_path: Path,
+    filename: str,
+    model: str = "large-v3",
+    language: Optional[str] = None,
+    enable_diarization: bool = True,
+    min_speakers: Optional[int] = None,
+    max_speakers: Optional[int] = None,
+    hf_token: Optional[str] = None,
+    job: Optional[Job] = None,
+    content_hash: Optional[str] = None,
+    use_cache: bool = True,
+    timer: Optional[StageTimer] = None,
+) -> dict:
+    """
+    Standard (single-pass) transcription pipeline operating on a file path.
 
-        with open(temp_file, "wb") as f:
-            content = await file.read()
-            f.write(content)
+    Blocking GPU work; runs on the job queue worker. ASR, alignment and
+    diarization results are looked up in the result cache first.
 
-        # Load model
-        logger.info(f"Loading Whisper model: {model}")
-        model_obj = whisperx.load_model(
-            model, device=DEVICE, compute_type=COMPUTE_TYPE, language=language
+    Args:
+        input_path: Audio file on disk
+        filename: Original filename reported in the response
+        model: Whisper model name
+        language: Language code (auto-detect if None)
+        enable_diarization: Enable speaker diarization
+        min_speakers: Minimum number of speakers (for diarization)
+        max_speakers: Maximum number of speakers (for diarization)
+        hf_token: HuggingFace token for diarization
+        job: Queued job for progress reporting and cancellation
+        content_hash: SHA-256 of input_path (computed if missing and caching is on)
+        use_cache: Read and write the result cache
+        timer: Stage timer for metrics (created if None)
+
+    Returns:
+        Response dictionary for TranscriptionResponse
+    """
+    timer = timer or new_stage_timer()
+    audio = None
+
+    def get_audio():
+        nonlocal audio
+        if audio is None:
+            with timer.busy("decode"):
+                audio = whisperx.load_audio(str(input_path))
+        return audio
+
+    # Stage keys chain: each covers the audio content and every upstream parameter
+    asr_key = align_key = diarize_key = None
+    cache_status = None
+    if use_cache and result_cache.enabled:
+        content_hash = content_hash or hash_file(input_path)
+        asr_key = make_key(
+            "asr",
+            content_hash,
+            model=model,
+            compute_type=COMPUTE_TYPE,
+            language=language,
+            batch_size=BATCH_SIZE,
+        )
+        align_key = make_key("aligned", asr_key)
+        diarize_key = make_key(
+            "diarized", align_key, min_speakers=min_speakers, max_speakers=max_speakers
         )
+        cache_status = {}
 
-        # Transcribe with whisperx
-        logger.info("Starting transcription...")
-        audio = whisperx.load_audio(str(temp_file))
-        result = model_obj.transcribe(audio, batch_size=BATCH_SIZE)
+    try:
+        result = result_cache.get("asr", asr_key)
+        if cache_status is not None:
+            cache_status["asr"] = "hit" if result else "miss"
+
+        if result is None:
+            # Get resident model from the pool (loaded once, reused across requests)
+            logger.info(f"Getting Whisper model: {model}")
+            model_obj = get_whisper_model(model, language)
+
+            # Transcribe with whisperx
+            logger.info("Starting transcription...")
+            if job:
+                job.update(10, "transcription", "Transcribing...")
+            audio = get_audio()
+            with timer.busy("asr"):
+                result = model_obj.transcribe(audio, batch_size=BATCH_SIZE)
+            del model_obj
+            result_cache.put("asr", asr_key, result)
 
-        # Cleanup model to free VRAM
-        del model_obj
-        gc.collect()
-        torch.cuda.empty_cache()
-
-        # Align whisper output for word-level timestamps
-        logger.info("Aligning timestamps...")
         detected_language = result.get("language", language)
 
-        try:
-            model_a, metadata = whisperx.load_align_model(
-                language_code=detected_language, device=DEVICE
-            )
-            result = whisperx.align(
-                result["segments"],
-                model_a,
-                metadata,
-                audio,
-                DEVICE,
-                return_char_alignments=False,
-            )
+        aligned = result_cache.get("aligned", align_key)
+        if cache_status is not None:
+            cache_status["alignment"] = "hit" if aligned else "miss"
 
-            # Cleanup alignment model
-            del model_a
-            gc.collect()
-            torch.cuda.empty_cache()
+        if aligned:
+            result = aligned
+        else:
+            if job:
+                job.update(60, "alignment", "Aligning timestamps...")
+                job.check_cancelled()
+
+            # Align whisper output for word-level timestamps
+            logger.info("Aligning timestamps...")
+
+            try:
+                model_a, metadata = get_align_model(detected_language)
+                audio = get_audio()
+                with timer.busy("alignment"):
+                    result = whisperx.align(
+                        result["segments"],
+                        model_a,
+                        metadata,
+                        audio,
+                        DEVICE,
+                        return_char_alignments=False,
+                    )
+                result_cache.put("aligned", align_key, result)
 
-        except Exception as e:
-            logger.warning(
-                f"Alignment failed: {e}. Continuing without word-level timestamps."
-            )
+            except Exception as e:
+                logger.warning(
+                    f"Alignment failed: {e}. Continuing without word-level timestamps."
+                )
+                # Never cache diarization built on unaligned segments
+                diarize_key = None
 
         # Speaker diarization (optional)
         if enable_diarization:
+            if job:
+                job.update(80, "diarization", "Identifying speakers...")
+                job.check_cancelled()
+
             if not hf_token:
                 hf_token = os.getenv("HF_TOKEN")
 
-            if hf_token:
+            diarized = result_cache.get("diarized", diarize_key) if hf_token else None
+            if cache_status is not None and hf_token:
+                cache_status["diarization"] = "hit" if diarized else "miss"
+
+            if diarized:
+                result = diarized
+            elif hf_token:
                 logger.info("Running speaker diarization...")
                 try:
-                    diarize_model = whisperx.DiarizationPipeline(
-                        use_auth_token=hf_token, device=DEVICE
-                    )
+                    diarize_model = get_diarization_pipeline(hf_token)
 
-                    diarize_segments = diarize_model(
-                        audio, min_speakers=min_speakers, max_speakers=max_speakers
-                    )
-
-                    result = whisperx.assign_word_speakers(diarize_segments, result)
-
-                    # Cleanup diarization model
-                    del diarize_model
-                    gc.collect()
-                    torch.cuda.empty_cache()
+                    audio = get_audio()
+                    with timer.busy("diarization"):
+                        diarize_segments = diarize_model(
+                            audio, min_speakers=min_speakers, max_speakers=max_speakers
+                        )
+                        result = whisperx.assign_word_speakers(diarize_segments, result)
+                    result_cache.put("diarized", diarize_key, result)
 
                 except Exception as e:
                     logger.warning(
@@ -583,39 +1134,155 @@ async def transcribe(
         # Note: word-level timestamps are in segments[].words[] after alignment
         segments = result.get("segments", [])
 
-        # Generate SRT subtitle content and plain text
-        srt_content = generate_srt_from_segments(segments)
-        segment_srt_content = generate_segment_srt(segments)
-        txt_content = generate_txt_from_segments(segments)
+        # Generate SRT subtitle content and plain text in one pass
+        rendered = render_transcript(segments)
+        srt_content = rendered["srt"]
+        segment_srt_content = rendered["segments_srt"]
+        txt_content = rendered["txt"]
 
         response = {
-            "filename": file.filename,
+            "filename": filename,
             "language": detected_language,
             "segments": segments,
             "srt": srt_content,
             "segments_srt": segment_srt_content,
             "txt": txt_content,
+            "cache": cache_status,
         }
 
-        logger.info(f"Transcription completed for {file.filename}")
-        return JSONResponse(content=response)
-
-    except Exception as e:
-        logger.error(f"Transcription error: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
+        logger.info(f"Transcription completed for {filename}")
+        return response
 
     finally:
-        # Cleanup temp file
-        if temp_file and temp_file.exists():
-            temp_file.unlink()
-
-        # Final cleanup
         gc.collect()
         torch.cuda.empty_cache()
 
 
+@app.post("/transcribe", response_model=TranscriptionResponse)
+async def transcribe(
+    file: UploadFile = File(...),
+    model: str = Form(default="large-v3"),
+    language: Optional[str] = Form(default=None),
+    enable_diarization: bool = Form(default=True),
+    min_speakers: Optional[int] = Form(default=None),
+    max_speakers: Optional[int] = Form(default=None),
+    hf_token: Optional[str] = Form(default=None),
+    use_cache: bool = Form(default=True),
+    outputs: Optional[str] = Form(default=None),
+    delivery: str = Form(default="inline"),
+    include_metrics: bool = Form(default=False),
+    accept: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
+):
+    """
+    Transcribe audio file with word-level timestamps and optional speaker diarization.
+
+    **Example Request (curl):**
+    ```bash
+    curl -X POST https://whisper.lan/transcribe \\
+      -F "file=@audio.wav" \\
+      -F "model=large-v3" \\
+      -F "enable_diarization=false" \\
+      --insecure
+    ```
+
+    **Parameters:**
+    - file: Audio file (mp3, wav, m4a, etc.)
+    - model: Whisper model size (tiny, base, small, medium, large-v2, large-v3, large-v3-turbo)
+    - language: Language code (auto-detect if None)
+    - enable_diarization: Enable speaker diarization (requires hf_token)
+    - min_speakers: Minimum number of speakers (for diarization)
+    - max_speakers: Maximum number of speakers (for diarization)
+    - hf_token: HuggingFace token for diarization models
+    - use_cache: Serve repeat requests from the result cache (default true)
+    - outputs: Comma-separated formats to return (segments,srt,segments_srt,txt; default all)
+    - delivery: 'inline' (default) or 'store' to write the formats to the shared
+      volume and return their URLs/paths under 'artifacts'
+
+    - include_metrics: Add per-stage wall time and peak RSS/GPU memory under 'metrics'
+
+    Responses are gzip/zstd compressed per Accept-Encoding, and msgpack
+    encoded with Accept: application/msgpack.
+
+    **Returns JSON with four ready-to-use formats:**
+    - segments: Array of segments with word-level timing (segments[].words[])
+    - srt: Pre-formatted word-level subtitles (one word per entry, for karaoke/animations)
+    - segments_srt: Pre-formatted segment-level subtitles (one phrase per entry, ideal for AI analysis)
+    - txt: Plain text transcript (no timestamps)
+
+    **Example Response:**
+    ```json
+    {
+      "filename": "audio.wav",
+      "language": "en",
+      "segments": [
+        {
+          "start": 0.031,
+          "end": 3.381,
+          "text": " Hello, this is a test.",
+          "words": [
+            {"word": "Hello,", "start": 0.031, "end": 0.432, "score": 0.894},
+            {"word": "this", "start": 0.693, "end": 0.833, "score": 0.999}
+          ]
+        }
+      ],
+      "srt": "1\\n00:00:00,031 --> 00:00:00,432\\nHello,\\n\\n2\\n...",
+      "segments_srt": "1\\n00:00:00,031 --> 00:00:03,381\\nHello, this is a test.\\n\\n",
+      "txt": "Hello, this is a test."
+    }
+    ```
+    """
+    output_formats = delivery_options(outputs, delivery)
+    temp_file = None
+
+    try:
+        # Save uploaded file (unique name so concurrent uploads never collide)
+        temp_file = UPLOAD_DIR / f"{time.time()}_{file.filename}"
+        logger.info(f"Processing file: {file.filename}")
+
+        timer = new_stage_timer()
+        with timer.busy("upload"):
+            _, content_hash = await save_upload_streaming(
+                file, temp_file, max_bytes=MAX_UPLOAD_BYTES
+            )
+
+        # Runs on the GPU worker; the upload is deleted when the job finishes
+        response = await run_on_gpu(
+            with_stage_metrics(
+                lambda job: run_transcription(
+                    temp_file,
+                    file.filename,
+                    model=model,
+                    language=language,
+                    enable_diarization=enable_diarization,
+                    min_speakers=min_speakers,
+                    max_speakers=max_speakers,
+                    hf_token=hf_token,
+                    job=job,
+                    content_hash=content_hash,
+                    use_cache=use_cache,
+                    timer=timer,
+                ),
+                timer,
+                include_metrics,
+            ),
+            "transcribe",
+            params={"filename": file.filename, "model": model},
+            cleanup=remove_files(temp_file),
+        )
+        return await transcript_response(
+            response, accept, accept_encoding, output_formats, delivery, timer=timer
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Transcription error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
+
+
 def transcribe_audio_segment(
-    audio_path: str,
+    audio: AudioBuffer,
     segment: AudioSegment,
     model,  # Pre-loaded model instance
     language: Optional[str] = None,
@@ -624,7 +1291,7 @@ def transcribe_audio_segment(
     Transcribe a single audio segment using a pre-loaded model.
 
     Args:
-        audio_path: Path to full audio file
+        audio: Job-wide decoded audio buffer (decoded once, sliced per segment)
         segment: AudioSegment object with start/end times
         model: Pre-loaded WhisperX model instance (avoids reloading)
         language: Optional language code (if known, skips auto-detection)
@@ -633,14 +1300,8 @@ def transcribe_audio_segment(
         Dictionary with transcription results
     """
     try:
-        # Load full audio
-        audio = whisperx.load_audio(audio_path)
-
-        # Extract segment
-        sample_rate = 16000
-        start_sample = int(segment.start * sample_rate)
-        end_sample = int(segment.end * sample_rate)
-        segment_audio = audio[start_sample:end_sample]
+        # Zero-copy view into the shared buffer (no per-segment ffmpeg decode)
+        segment_audio = audio.slice(segment.start, segment.end)
 
         # Transcribe with pre-loaded model (no model loading overhead!)
         result = model.transcribe(
@@ -671,6 +1332,756 @@ def transcribe_audio_segment(
         }
 
 
+def transcribe_chunk_batch(
+    audio: AudioBuffer,
+    batch: List[AudioSegment],
+    model,  # Pre-loaded model instance
+    language: Optional[str] = None,
+) -> List[dict]:
+    """
+    Transcribe several chunks in one batched inference call.
+
+    Each chunk is cut into <=30s Whisper windows and all windows of the batch
+    are fed to the pipeline together, so GPU batches stay full even when the
+    chunks are short. model.transcribe drops the pipeline tokenizer after
+    each call when no language was preset, so one is set up for `language`
+    for the duration of the call.
+
+    Args:
+        audio: Job-wide decoded audio buffer
+        batch: Chunks to transcribe together
+        model: Pre-loaded WhisperX model instance
+        language: Language code used for the batch
+
+    Returns:
+        One result dictionary per chunk (same shape as transcribe_audio_segment)
+    """
+    inputs, windows = build_batch_windows(audio, batch)
+    previous_tokenizer = model.tokenizer
+
+    try:
+        if previous_tokenizer is None or previous_tokenizer.language_code != language:
+            model.tokenizer = Tokenizer(
+                model.model.hf_tokenizer,
+                model.model.model.is_multilingual,
+                task="transcribe",
+                language=language,
+            )
+
+        texts = []
+        for out in model(
+            ({"inputs": window_audio} for window_audio in inputs),
+            batch_size=BATCH_SIZE,
+            num_workers=0,
+        ):
+            text = out["text"]
+            if BATCH_SIZE in [0, 1, None]:
+                text = text[0]
+            texts.append(text)
+
+        results = group_window_results(windows, texts)
+        for result in results:
+            result["language"] = language
+        return results
+
+    except Exception as e:
+        logger.warning(
+            f"Batched inference failed for {len(batch)} chunks ({e}), falling back to one call per chunk"
+        )
+        model.tokenizer = previous_tokenizer
+        return [
+            transcribe_audio_segment(audio, chunk, model, language=language)
+            for chunk in batch
+        ]
+    finally:
+        model.tokenizer = previous_tokenizer
+
+
+def run_pipelined_asr(
+    input_path: Path,
+    audio_buffer: AudioBuffer,
+    model: str,
+    language: Optional[str],
+    chunking_strategy: str,
+    chunk_batch_size: int,
+    merge_overlaps: bool,
+    timer: StageTimer,
+    on_segments: Optional[Callable[[List[dict]], None]] = None,
+    callback_url: Optional[str] = None,
+    job_id: Optional[str] = None,
+    job: Optional[Job] = None,
+    speech_queue: Optional["queue.Queue"] = None,
+) -> Tuple[dict, Optional[dict]]:
+    """
+    ASR and alignment stages of the large-file pipeline, run as overlapping stages.
+
+    VAD runs on its own thread and emits chunks as it finds them; this thread
+    batches whichever chunks are ready and transcribes them; overlap-merged
+    segments are aligned incrementally on a third thread as soon as they are
+    finalized. GPU stages overlap and the first aligned segments exist long
+    before the last chunk is transcribed.
+
+    Args:
+        input_path: Audio or video file (silence-based chunking reads it directly)
+        audio_buffer: Decoded audio of the same file (VAD, ASR and alignment)
+        timer: Stage timer for the job
+        on_segments: Called from the alignment thread with each batch of
+            finalized (aligned when possible) segments
+        speech_queue: Receives each VAD speech region (start, end) as it is
+            found, then END (region-based diarization reuses them)
+        (remaining arguments as in run_large_transcription)
+
+    Returns:
+        (ASR stage result, aligned stage result or None if alignment failed)
+    """
+    duration = audio_buffer.duration
+    logger.info(f"Audio duration: {duration:.1f}s")
+
+    stop = threading.Event()
+    chunk_queue: "queue.Queue" = queue.Queue()
+    align_queue: "queue.Queue" = queue.Queue()
+
+    # Stage 1: VAD producer (chunks appear while later audio is still scanned)
+    def vad_stage():
+        with timer.busy("vad"):
+            for chunk in video_segmenter.iter_chunks(
+                str(input_path),
+                strategy=chunking_strategy,
+                audio=audio_buffer,
+                on_speech=speech_queue.put if speech_queue else None,
+            ):
+                if stop.is_set():
+                    return
+                chunk_queue.put(chunk)
+
+    # Stage 3: incremental alignment of finalized segments
+    aligned_segments: List[dict] = []
+    align_state = {"ok": True}
+
+    def align_stage():
+        model_a = metadata = None
+        while True:
+            item = align_queue.get()
+            if item is END:
+                break
+            if stop.is_set():
+                continue
+
+            segment_language, segments = item
+            if align_state["ok"]:
+                with timer.busy("alignment"):
+                    try:
+                        if model_a is None:
+                            model_a, metadata = get_align_model(segment_language or "en")
+                        result = whisperx.align(
+                            segments,
+                            model_a,
+                            metadata,
+                            audio_buffer.samples,
+                            DEVICE,
+                            return_char_alignments=False,
+                        )
+                        segments = result.get("segments", segments)
+                    except Exception as e:
+                        logger.warning(
+                            f"Alignment failed: {e}. Continuing without word-level timestamps."
+                        )
+                        align_state["ok"] = False
+
+            aligned_segments.extend(segments)
+            timer.mark("first_segment")
+            if on_segments:
+                on_segments(segments)
+
+    def vad_done():
+        chunk_queue.put(END)
+        if speech_queue:
+            speech_queue.put(END)
+
+    vad = StageThread("vad", vad_stage, on_exit=vad_done)
+    aligner = StageThread("alignment", align_stage)
+
+    # Stage 2 (this thread): batched ASR + overlap merge
+    asr_segments: List[dict] = []
+    merger = OverlapMerger() if merge_overlaps else None
+    detected_language = language
+    chunk_batch_size = max(1, chunk_batch_size)
+    num_chunks = 0
+
+    def emit(results: List[dict]):
+        for result in results:
+            finalized = merger.add(result) if merger else result.get("segments", [])
+            if finalized:
+                # Copies: alignment annotates its input segments in place
+                asr_segments.extend(dict(seg) for seg in finalized)
+                align_queue.put((detected_language, finalized))
+
+    try:
+        vad.start()
+        aligner.start()
+
+        # Get the resident Whisper model and reuse it for all segments (major optimization!)
+        # The pool keeps it loaded across requests, so steady traffic skips init entirely
+        logger.info(f"Getting Whisper model: {model}")
+        with timer.busy("asr"):
+            model_obj = get_whisper_model(model, language)
+
+        # Chunks taken from VAD but not yet transcribed, in timeline order
+        pending: List[AudioSegment] = []
+        finished = False
+        while pending or not finished:
+            if not pending:
+                chunk = chunk_queue.get()
+                if chunk is END:
+                    break
+                pending.append(chunk)
+
+            # The first chunk detects the language once (reused for all chunks)
+            # and primes the model tokenizer for the batched path
+            first_pass = num_chunks == 0 and (
+                not detected_language or chunk_batch_size > 1
+            )
+
+            # Add whatever chunks VAD has already produced, then pack the next call
+            while not first_pass and not finished and len(pending) < chunk_batch_size:
+                try:
+                    nxt = chunk_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is END:
+                    finished = True
+                    break
+                pending.append(nxt)
+
+            batch = plan_chunk_batches(
+                pending,
+                max_chunks=1 if first_pass else chunk_batch_size,
+                max_seconds=CHUNK_BATCH_MAX_SECONDS,
+            )[0]
+            pending = pending[len(batch):]
+
+            first, last = batch[0], batch[-1]
+            logger.info(
+                f"Transcribing segments {num_chunks + 1}-{num_chunks + len(batch)} "
+                f"({first.start:.1f}s - {last.end:.1f}s of {duration:.1f}s)"
+            )
+
+            # Report progress (and honour cancellation) before processing the batch;
+            # the total chunk count is unknown while VAD runs, so use audio position
+            report_progress(
+                job,
+                callback_url=callback_url,
+                job_id=job_id,
+                progress=20 + int(min(1.0, first.start / duration if duration else 0) * 60),
+                stage="transcription",
+                message=f"Transcribing segment {num_chunks + 1}",
+                segment_info={
+                    "current": num_chunks + 1,
+                    "batch_size": len(batch),
+                    "time_range": f"{first.start:.1f}s - {last.end:.1f}s",
+                },
+            )
+
+            with timer.busy("asr"):
+                if first_pass:
+                    logger.info("Transcribing first segment (language detection)...")
+                    results = [
+                        transcribe_audio_segment(
+                            audio_buffer, first, model_obj, language=detected_language
+                        )
+                    ]
+                    detected_language = (
+                        results[0].get("language") or detected_language or "en"
+                    )
+                    logger.info(f"Detected language: {detected_language}")
+                elif len(batch) == 1:
+                    results = [
+                        transcribe_audio_segment(
+                            audio_buffer, first, model_obj, language=detected_language
+                        )
+                    ]
+                else:
+                    results = transcribe_chunk_batch(
+                        audio_buffer, batch, model_obj, language=detected_language
+                    )
+
+            num_chunks += len(batch)
+            emit(results)
+
+        # Surface VAD errors, then flush the last merged segments
+        vad.wait()
+        if merger:
+            tail = merger.flush()
+            if tail:
+                asr_segments.extend(dict(seg) for seg in tail)
+                align_queue.put((detected_language, tail))
+
+        # Drop local reference; the model stays resident in the pool
+        del model_obj
+
+    finally:
+        # On error/cancellation stop the other stages instead of leaving them running
+        if sys.exc_info()[0] is not None:
+            stop.set()
+        align_queue.put(END)
+        aligner.join()
+        vad.join()
+
+    aligner.wait()
+
+    asr_time = timer.busy_seconds("asr")
+    chunks_per_second = num_chunks / asr_time if asr_time > 0 else 0
+    logger.info(
+        f"ASR finished: {num_chunks} chunks in {asr_time:.1f}s ({chunks_per_second:.2f} chunks/s)"
+    )
+
+    merge_stats = merger.stats.to_dict() if merger else {}
+    asr = {
+        "language": detected_language,
+        "duration": duration,
+        "num_chunks": num_chunks,
+        "chunks_per_second": chunks_per_second,
+        "segments": asr_segments,
+        "merge_stats": merge_stats,
+    }
+
+    if not align_state["ok"]:
+        return asr, None
+
+    align_stats = {}
+    all_segments = aligned_segments
+    # Safety net for duplicates the text-level merge could not resolve
+    if merge_overlaps:
+        all_segments, words_removed = dedupe_overlapping_words(all_segments)
+        align_stats["post_align_words_removed"] = words_removed
+    align_stats["alignment_time"] = round(timer.busy_seconds("alignment"), 3)
+
+    return asr, {"segments": all_segments, "merge_stats": align_stats}
+
+
+def align_all_segments(
+    segments: List[dict],
+    language: Optional[str],
+    audio: np.ndarray,
+    merge_overlaps: bool,
+    timer: StageTimer,
+) -> Optional[dict]:
+    """
+    Align cached ASR segments in one pass (ASR stage served from the cache).
+
+    Returns:
+        Aligned stage result, or None if alignment failed
+    """
+    align_stats = {}
+    try:
+        with timer.busy("alignment"):
+            model_a, metadata = get_align_model(language or "en")
+            result = whisperx.align(
+                segments,
+                model_a,
+                metadata,
+                audio,
+                DEVICE,
+                return_char_alignments=False,
+            )
+            segments = result.get("segments", segments)
+
+        # Safety net for duplicates the text-level merge could not resolve
+        if merge_overlaps:
+            segments, words_removed = dedupe_overlapping_words(segments)
+            align_stats["post_align_words_removed"] = words_removed
+
+    except Exception as e:
+        logger.warning(f"Alignment failed: {e}")
+        return None
+
+    align_stats["alignment_time"] = round(timer.busy_seconds("alignment"), 3)
+    return {"segments": segments, "merge_stats": align_stats}
+
+
+def run_diarization(
+    audio: np.ndarray,
+    hf_token: str,
+    timer: StageTimer,
+    min_speakers: Optional[int] = None,
+    max_speakers: Optional[int] = None,
+):
+    """Diarization stage; only needs the audio, so it runs alongside ASR."""
+    with timer.busy("diarization"):
+        return get_diarization_pipeline(hf_token)(
+            audio, min_speakers=min_speakers, max_speakers=max_speakers
+        )
+
+
+def run_region_diarization(
+    audio: np.ndarray,
+    regions: Optional[Iterable[Tuple[float, float]]],
+    hf_token: str,
+    timer: StageTimer,
+    min_speakers: Optional[int] = None,
+    max_speakers: Optional[int] = None,
+    profile_key: Optional[str] = None,
+    cache_status: Optional[dict] = None,
+):
+    """
+    Region-based diarization stage (diarization_mode='regions').
+
+    Speaker embeddings are extracted in batches for the speech regions only:
+    the regions streamed by the pipelined VAD stage when it runs, otherwise
+    a VAD pass here. The per-audio SpeakerProfile is cached under
+    profile_key, so a repeat with other speaker bounds only re-clusters.
+
+    Returns:
+        Diarization DataFrame (start, end, speaker) for whisperx.assign_word_speakers
+    """
+    cached = result_cache.get("speakers", profile_key)
+    if cache_status is not None:
+        cache_status["speakers"] = "hit" if cached else "miss"
+
+    if cached:
+        profile = SpeakerProfile.from_dict(cached)
+    else:
+        if regions is None:
+            with timer.busy("vad"):
+                regions = list(video_segmenter.iter_speech_segments(audio))
+        model = get_speaker_embedding(hf_token)
+
+        def embed(waveforms: np.ndarray, masks: np.ndarray) -> np.ndarray:
+            with timer.busy("diarization"), torch.inference_mode():
+                return model(
+                    torch.from_numpy(waveforms[:, None, :]), masks=torch.from_numpy(masks)
+                )
+
+        embedder = SpeakerEmbedder(
+            embed,
+            window=SPEAKER_WINDOW_SECONDS,
+            step=SPEAKER_STEP_SECONDS,
+            batch_size=SPEAKER_EMBEDDING_BATCH_SIZE,
+        )
+        profile = embedder.profile(audio, regions)
+        result_cache.put("speakers", profile_key, profile.to_dict())
+
+    with timer.busy("diarization"):
+        turns = profile.diarize(min_speakers, max_speakers, SPEAKER_CLUSTER_THRESHOLD)
+    return pd.DataFrame(turns, columns=["start", "end", "speaker"])
+
+
+def run_large_transcription(
+    input_path: Path,
+    filename: str,
+    model: str = "large-v3",
+    language: Optional[str] = None,
+    chunking_strategy: str = "auto",
+    enable_diarization: bool = True,
+    hf_token: Optional[str] = None,
+    callback_url: Optional[str] = None,
+    job_id: Optional[str] = None,
+    chunk_batch_size: int = CHUNK_BATCH_SIZE,
+    merge_overlaps: bool = True,
+    start_time: Optional[float] = None,
+    job: Optional[Job] = None,
+    content_hash: Optional[str] = None,
+    use_cache: bool = True,
+    is_video: Optional[bool] = None,
+    on_segments: Optional[Callable[[List[dict]], None]] = None,
+    timer: Optional[StageTimer] = None,
+    diarization_mode: str = DIARIZATION_MODE,
+    min_speakers: Optional[int] = None,
+    max_speakers: Optional[int] = None,
+) -> dict:
+    """
+    Shared large-file transcription pipeline operating on a file path.
+
+    Used by /transcribe-large and /process-video so media is never passed
+    around as in-memory bytes. Each stage (ASR, alignment, diarization) is
+    looked up in the result cache first; audio is only decoded when a stage
+    actually has to run. VAD, ASR and alignment run as overlapping stages,
+    and diarization runs alongside them.
+
+    Args:
+        input_path: Audio or video file on disk
+        filename: Original filename reported in the response
+        model: Whisper model name
+        language: Language code (auto-detect if None)
+        chunking_strategy: 'auto', 'vad', 'time', or 'silence'
+        enable_diarization: Enable speaker diarization
+        hf_token: HuggingFace token for diarization
+        callback_url: Optional URL to POST progress updates
+        job_id: Optional job ID for progress tracking
+        chunk_batch_size: Chunks packed into one inference call
+        merge_overlaps: Deduplicate speech transcribed twice in chunk overlaps
+        start_time: Request start timestamp (defaults to now)
+        job: Queued job for progress reporting and cancellation (checked between batches)
+        content_hash: SHA-256 of input_path (computed if missing and caching is on)
+        use_cache: Read and write the result cache
+        is_video: Input is a video; its soundtrack is decoded with speech enhancement
+            (detected from the file extension if None)
+        on_segments: Called with each batch of finalized segments as the
+            pipeline produces them (before diarization)
+        timer: Stage timer for metrics (created if None); its report is
+            returned as stage_timing
+        diarization_mode: 'pipeline' (full pyannote pipeline) or 'regions'
+            (embeddings on the VAD speech regions, clustered per request)
+        min_speakers: Minimum number of speakers (for diarization)
+        max_speakers: Maximum number of speakers (for diarization)
+
+    Returns:
+        Response dictionary for LargeTranscriptionResponse
+    """
+    start_time = start_time or time.time()
+    chunk_batch_size = max(1, chunk_batch_size)
+    if on_segments is None and job is not None:
+        on_segments = segment_publisher(job)
+    if is_video is None:
+        is_video = input_path.suffix.lower() in VIDEO_EXTENSIONS
+
+    timer = timer or new_stage_timer()
+    audio_buffer = None
+    diarizer = None
+    speech_queue = None
+
+    def get_audio_buffer() -> AudioBuffer:
+        # Decode once, streaming PCM from ffmpeg straight into a shared buffer
+        # (video audio is extracted and enhanced in the same pass, no temp WAV);
+        # VAD, every chunk, alignment and diarization slice it. Only decoded
+        # when a stage actually has to run.
+        nonlocal audio_buffer
+        if audio_buffer is None:
+            with timer.busy("decode"):
+                audio_buffer = AudioBuffer.decode(
+                    str(input_path), AUDIO_BUFFER_DIR, ffmpeg_processor, enhance=is_video
+                )
+        return audio_buffer
+
+    # Stage keys chain: each covers the audio content and every upstream parameter
+    asr_key = align_key = diarize_key = speakers_key = None
+    cache_status = None
+    if use_cache and result_cache.enabled:
+        content_hash = content_hash or hash_file(input_path)
+        asr_key = make_key(
+            "large-asr",
+            content_hash,
+            model=model,
+            compute_type=COMPUTE_TYPE,
+            language=language,
+            chunking_strategy=chunking_strategy,
+            chunk_batch_size=chunk_batch_size,
+            chunk_batch_max_seconds=CHUNK_BATCH_MAX_SECONDS,
+            merge_overlaps=merge_overlaps,
+            is_video=is_video,
+        )
+        align_key = make_key("aligned", asr_key)
+        diarize_key = make_key(
+            "diarized",
+            align_key,
+            diarization_mode=diarization_mode,
+            min_speakers=min_speakers,
+            max_speakers=max_speakers,
+        )
+        # Speaker embeddings depend on the audio only, not on ASR or speaker bounds
+        speakers_key = make_key(
+            "speakers",
+            content_hash,
+            model=SPEAKER_EMBEDDING_MODEL,
+            window=SPEAKER_WINDOW_SECONDS,
+            step=SPEAKER_STEP_SECONDS,
+            vad_engine=video_segmenter.vad_engine,
+            is_video=is_video,
+        )
+        cache_status = {}
+
+    try:
+        asr = result_cache.get("asr", asr_key)
+        aligned = None
+        if cache_status is not None:
+            cache_status["asr"] = "hit" if asr else "miss"
+
+        # Diarization only needs the audio: start it first so it overlaps ASR
+        diarized = None
+        if enable_diarization:
+            if not hf_token:
+                hf_token = os.getenv("HF_TOKEN")
+
+            if hf_token:
+                diarized = result_cache.get("diarized", diarize_key)
+                if cache_status is not None:
+                    cache_status["diarization"] = "hit" if diarized else "miss"
+                if diarized is None:
+                    logger.info(
+                        f"Running speaker diarization ({diarization_mode}) alongside transcription..."
+                    )
+                    audio = get_audio_buffer()
+                    samples = audio.samples
+                    if diarization_mode == "regions":
+                        # Reuse the speech regions of the VAD stage when ASR runs it
+                        regions = None
+                        strategy = chunking_strategy
+                        if strategy == "auto":
+                            strategy = video_segmenter.get_optimal_strategy(audio.duration)
+                        if asr is None and strategy == "vad":
+                            speech_queue = queue.Queue()
+                            regions = iter(speech_queue.get, END)
+
+                        def diarize():
+                            return run_region_diarization(
+                                samples,
+                                regions,
+                                hf_token,
+                                timer,
+                                min_speakers=min_speakers,
+                                max_speakers=max_speakers,
+                                profile_key=speakers_key,
+                                cache_status=cache_status,
+                            )
+
+                    else:
+
+                        def diarize():
+                            return run_diarization(
+                                samples, hf_token, timer, min_speakers, max_speakers
+                            )
+
+                    diarizer = StageThread("diarization", diarize)
+                    diarizer.start()
+
+        if asr is None:
+            asr, aligned = run_pipelined_asr(
+                input_path,
+                get_audio_buffer(),
+                model=model,
+                language=language,
+                chunking_strategy=chunking_strategy,
+                chunk_batch_size=chunk_batch_size,
+                merge_overlaps=merge_overlaps,
+                timer=timer,
+                on_segments=on_segments,
+                callback_url=callback_url,
+                job_id=job_id,
+                job=job,
+                speech_queue=speech_queue,
+            )
+            result_cache.put("asr", asr_key, asr)
+            if cache_status is not None:
+                cache_status["alignment"] = "miss"
+        else:
+            aligned = result_cache.get("aligned", align_key)
+            if cache_status is not None:
+                cache_status["alignment"] = "hit" if aligned else "miss"
+
+            if aligned is None:
+                logger.info("Aligning timestamps across all segments...")
+                report_progress(
+                    job,
+                    callback_url=callback_url,
+                    job_id=job_id,
+                    progress=80,
+                    stage="alignment",
+                    message="Aligning word-level timestamps...",
+                )
+                aligned = align_all_segments(
+                    asr["segments"],
+                    asr["language"],
+                    get_audio_buffer().samples,
+                    merge_overlaps,
+                    timer,
+                )
+            # Nothing was streamed while ASR came from the cache: publish the
+            # aligned segments in one batch (failed alignment publishes below)
+            if aligned and on_segments:
+                on_segments(aligned["segments"])
+
+        duration = asr["duration"]
+        detected_language = asr["language"]
+        merge_stats = asr["merge_stats"]
+
+        # Failed alignments are not cached (and neither is anything built on them)
+        if aligned:
+            all_segments = aligned["segments"]
+            merge_stats.update(aligned["merge_stats"])
+            if cache_status is None or cache_status["alignment"] == "miss":
+                result_cache.put("aligned", align_key, aligned)
+        else:
+            all_segments = asr["segments"]
+            diarize_key = None
+            if on_segments and cache_status and cache_status["asr"] == "hit":
+                on_segments(all_segments)
+
+        # Diarization (optional): join the stage started above
+        if diarized:
+            all_segments = diarized["segments"]
+        elif diarizer:
+            report_progress(
+                job,
+                callback_url=callback_url,
+                job_id=job_id,
+                progress=85,
+                stage="diarization",
+                message="Identifying speakers...",
+            )
+
+            try:
+                diarize_segments = diarizer.wait()
+                all_segments = whisperx.assign_word_speakers(
+                    diarize_segments, {"segments": all_segments}
+                )["segments"]
+                result_cache.put("diarized", diarize_key, {"segments": all_segments})
+            except Exception as e:
+                logger.warning(f"Diarization failed: {e}")
+            finally:
+                diarizer = None
+                gc.collect()
+                torch.cuda.empty_cache()
+
+        processing_time = time.time() - start_time
+        realtime_factor = duration / processing_time if processing_time > 0 else 0
+
+        # Generate SRT subtitle content and plain text in one pass
+        rendered = render_transcript(all_segments)
+        srt_content = rendered["srt"]
+        segment_srt_content = rendered["segments_srt"]
+        txt_content = rendered["txt"]
+
+        response = {
+            "filename": filename,
+            "duration": duration,
+            "language": detected_language,
+            "num_segments": len(all_segments),
+            "num_chunks": asr["num_chunks"],
+            "chunking_strategy": chunking_strategy,
+            "processing_time": processing_time,
+            "realtime_factor": realtime_factor,
+            "chunk_batch_size": chunk_batch_size,
+            "chunks_per_second": asr["chunks_per_second"],
+            "overlap_merge": merge_stats,
+            "cache": cache_status,
+            "stage_timing": timer.report(),
+            "segments": all_segments,
+            "srt": srt_content,
+            "segments_srt": segment_srt_content,
+            "txt": txt_content,
+        }
+
+        logger.info(
+            f"Large file transcription completed in {processing_time:.1f}s ({realtime_factor:.1f}x realtime)"
+        )
+        return response
+
+    finally:
+        # Never leave diarization running against a buffer we are about to close
+        # (or waiting for speech regions that will never come)
+        if speech_queue:
+            speech_queue.put(END)
+        if diarizer:
+            diarizer.join()
+
+        # The input file belongs to the caller; only the decoded buffer is ours
+        if audio_buffer:
+            audio_buffer.close()
+
+        gc.collect()
+        torch.cuda.empty_cache()
+
+
 @app.post("/transcribe-large", response_model=LargeTranscriptionResponse)
 async def transcribe_large(
     file: UploadFile = File(...),
@@ -678,9 +2089,20 @@ async def transcribe_large(
     language: Optional[str] = Form(default=None),
     chunking_strategy: str = Form(default="auto"),
     enable_diarization: bool = Form(default=True),
+    diarization_mode: str = Form(default=DIARIZATION_MODE),
+    min_speakers: Optional[int] = Form(default=None),
+    max_speakers: Optional[int] = Form(default=None),
     hf_token: Optional[str] = Form(default=None),
     callback_url: Optional[str] = Form(default=None),
     job_id: Optional[str] = Form(default=None),
+    chunk_batch_size: int = Form(default=CHUNK_BATCH_SIZE),
+    merge_overlaps: bool = Form(default=True),
+    use_cache: bool = Form(default=True),
+    outputs: Optional[str] = Form(default=None),
+    delivery: str = Form(default="inline"),
+    include_metrics: bool = Form(default=False),
+    accept: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
 ):
     """
     Transcribe large audio/video files with automatic chunking.
@@ -705,9 +2127,25 @@ async def transcribe_large(
     - language: Language code (auto-detect if None)
     - chunking_strategy: 'auto', 'vad', 'time', or 'silence'
     - enable_diarization: Enable speaker diarization
+    - diarization_mode: 'pipeline' (full pyannote pipeline over the file) or
+      'regions' (speaker embeddings on the VAD speech regions only; a repeat
+      with other min/max_speakers only re-clusters the cached embeddings)
+    - min_speakers: Minimum number of speakers (for diarization)
+    - max_speakers: Maximum number of speakers (for diarization)
     - hf_token: HuggingFace token for diarization
     - callback_url: Optional URL to POST progress updates
     - job_id: Optional job ID for progress tracking
+    - chunk_batch_size: Chunks packed into one inference call (1 = sequential)
+    - merge_overlaps: Deduplicate speech transcribed twice in chunk overlaps
+    - use_cache: Serve repeat requests from the result cache (default true)
+    - outputs: Comma-separated formats to return (segments,srt,segments_srt,txt; default all)
+    - delivery: 'inline' (default) or 'store' to write the formats to the shared
+      volume and return their URLs/paths under 'artifacts'
+
+    - include_metrics: Add per-stage wall time and peak RSS/GPU memory under 'metrics'
+
+    Responses are gzip/zstd compressed per Accept-Encoding, and msgpack
+    encoded with Accept: application/msgpack.
 
     **Returns JSON with four ready-to-use formats:**
     - segments: Array of stitched segments with word-level timing (segments[].words[])
@@ -715,7 +2153,8 @@ async def transcribe_large(
     - segments_srt: Pre-formatted segment-level subtitles (one phrase per entry, ideal for AI analysis)
     - txt: Plain text transcript (no timestamps)
 
-    Plus metadata: duration, processing_time, realtime_factor, num_chunks, chunking_strategy
+    Plus metadata: duration, processing_time, realtime_factor, num_chunks, chunking_strategy,
+    chunk_batch_size, chunks_per_second
 
     **Example Response:**
     ```json
@@ -728,6 +2167,8 @@ async def transcribe_large(
       "chunking_strategy": "vad",
       "processing_time": 89.3,
       "realtime_factor": 20.5,
+      "chunk_batch_size": 8,
+      "chunks_per_second": 1.9,
       "segments": [...],
       "srt": "1\\n00:00:00,031 --> 00:00:00,432\\nHello,\\n\\n...",
       "segments_srt": "1\\n00:00:00,031 --> 00:00:05,381\\nHello, this is a test.\\n\\n...",
@@ -735,208 +2176,210 @@ async def transcribe_large(
     }
     ```
     """
+    output_formats = delivery_options(outputs, delivery)
+    check_diarization_mode(diarization_mode)
     temp_file = None
-    audio_file = None
 
     try:
         start_time = time.time()
 
-        # Save uploaded file
+        # Stream upload to disk (constant memory regardless of file size)
         temp_file = TEMP_DIR / f"{time.time()}_{file.filename}"
         logger.info(f"Processing large file: {file.filename}")
+        timer = new_stage_timer()
+        with timer.busy("upload"):
+            _, content_hash = await save_upload_streaming(
+                file, temp_file, max_bytes=MAX_UPLOAD_BYTES
+            )
 
-        with open(temp_file, "wb") as f:
-            content = await file.read()
-            f.write(content)
-
-        # Extract audio if video file
-        if temp_file.suffix.lower() in [".mp4", ".avi", ".mkv", ".mov", ".webm"]:
-            logger.info("Detected video file, extracting audio...")
-            audio_file = TEMP_DIR / f"{temp_file.stem}.wav"
-            ffmpeg_processor.extract_audio_optimized(str(temp_file), str(audio_file))
-        else:
-            audio_file = temp_file
-
-        # Get audio duration
-        info = ffmpeg_processor.get_video_info(str(audio_file))
-        duration = info.get("duration", 0)
-        logger.info(f"Audio duration: {duration:.1f}s")
-
-        # Segment audio
-        segments = video_segmenter.segment_audio(
-            str(audio_file), strategy=chunking_strategy
-        )
-        logger.info(
-            f"Created {len(segments)} segments using '{chunking_strategy}' strategy"
+        # Runs on the GPU worker; the upload is deleted when the job finishes
+        response = await run_on_gpu(
+            with_stage_metrics(
+                lambda job: run_large_transcription(
+                    temp_file,
+                    file.filename,
+                    model=model,
+                    language=language,
+                    chunking_strategy=chunking_strategy,
+                    enable_diarization=enable_diarization,
+                    diarization_mode=diarization_mode,
+                    min_speakers=min_speakers,
+                    max_speakers=max_speakers,
+                    hf_token=hf_token,
+                    callback_url=callback_url,
+                    job_id=job_id,
+                    chunk_batch_size=chunk_batch_size,
+                    merge_overlaps=merge_overlaps,
+                    start_time=start_time,
+                    job=job,
+                    content_hash=content_hash,
+                    use_cache=use_cache,
+                    timer=timer,
+                ),
+                timer,
+                include_metrics,
+            ),
+            "transcribe-large",
+            params={"filename": file.filename, "model": model},
+            cleanup=remove_files(temp_file),
         )
-
-        # Load Whisper model ONCE and reuse for all segments (major optimization!)
-        # Best practice from 2025: "Most time is taken by model initialization"
-        logger.info(f"Loading Whisper model: {model}")
-        model_obj = whisperx.load_model(
-            model,
-            device=DEVICE,
-            compute_type=COMPUTE_TYPE,
-            language=language,  # Pre-set language if provided
+        return await transcript_response(
+            response, accept, accept_encoding, output_formats, delivery, timer=timer
         )
 
-        # Detect language once from first segment if not provided (optimization)
-        # Whisper design: language detected once, reused for all segments
-        all_segments = []
-        detected_language = language
-
-        if not detected_language and len(segments) > 0:
-            logger.info("Detecting language from first segment...")
-            first_result = transcribe_audio_segment(
-                str(audio_file), segments[0], model_obj, language=None
-            )
-            detected_language = first_result.get("language", "en")
-            all_segments.extend(first_result.get("segments", []))
-            logger.info(f"Detected language: {detected_language}")
-            start_idx = 1  # Skip first segment since we already processed it
-        else:
-            start_idx = 0
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Large file transcription error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
 
-        # Transcribe remaining segments with cached model and detected language
-        for i in range(start_idx, len(segments)):
-            seg = segments[i]
-            logger.info(
-                f"Transcribing segment {i + 1}/{len(segments)} ({seg.start:.1f}s - {seg.end:.1f}s)"
-            )
 
-            # Calculate progress: 20-80% range for transcription phase
-            segment_progress = 20 + int((i / len(segments)) * 60)
+STREAM_FORMATS = {
+    "sse": ("text/event-stream", format_sse),
+    "ndjson": ("application/x-ndjson", format_ndjson),
+}
 
-            # Send progress callback before processing segment
-            send_progress_callback(
-                callback_url=callback_url,
-                job_id=job_id,
-                progress=segment_progress,
-                stage="transcription",
-                message=f"Transcribing segment {i + 1}/{len(segments)}",
-                segment_info={
-                    "current": i + 1,
-                    "total": len(segments),
-                    "time_range": f"{seg.start:.1f}s - {seg.end:.1f}s",
-                },
-            )
+# Idle seconds between keep-alives on event streams (keeps proxies from closing them)
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
 
-            # Reuse model and detected language (no reload, no re-detection!)
-            result = transcribe_audio_segment(
-                str(audio_file), seg, model_obj, language=detected_language
-            )
-            all_segments.extend(result.get("segments", []))
 
-        # Cleanup model after all segments processed
-        del model_obj
-        gc.collect()
-        torch.cuda.empty_cache()
+def stream_job_events(job: Job, stream_format: str, after: int = 0) -> StreamingResponse:
+    """
+    Stream a job's events as SSE or NDJSON.
 
-        # Align for word-level timestamps
-        logger.info("Aligning timestamps across all segments...")
-        send_progress_callback(
-            callback_url=callback_url,
-            job_id=job_id,
-            progress=80,
-            stage="alignment",
-            message="Aligning word-level timestamps...",
+    Events: 'status', 'progress', 'segments' (finalized segments with words
+    and SRT/TXT fragments), then 'result' (the full response, with speakers)
+    or 'error'. The job keeps running if the client disconnects.
+    """
+    if stream_format not in STREAM_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown format '{stream_format}', expected one of {list(STREAM_FORMATS)}",
         )
+    media_type, formatter = STREAM_FORMATS[stream_format]
+
+    async def body():
+        async for entry in job.events.subscribe(
+            after=after, heartbeat=STREAM_HEARTBEAT_SECONDS
+        ):
+            yield formatter(entry)
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={
+            "X-Job-Id": job.id,
+            "Cache-Control": "no-cache",
+            # Disable proxy buffering so events arrive as they are produced
+            "X-Accel-Buffering": "no",
+        },
+    )
 
-        audio = whisperx.load_audio(str(audio_file))
-
-        try:
-            model_a, metadata = whisperx.load_align_model(
-                language_code=detected_language or "en", device=DEVICE
-            )
-            result = whisperx.align(
-                all_segments,
-                model_a,
-                metadata,
-                audio,
-                DEVICE,
-                return_char_alignments=False,
-            )
-            all_segments = result.get("segments", all_segments)
-
-            del model_a
-            gc.collect()
-            torch.cuda.empty_cache()
-
-        except Exception as e:
-            logger.warning(f"Alignment failed: {e}")
-
-        # Diarization (optional)
-        if enable_diarization:
-            if not hf_token:
-                hf_token = os.getenv("HF_TOKEN")
-
-            if hf_token:
-                logger.info("Running speaker diarization...")
-                send_progress_callback(
-                    callback_url=callback_url,
-                    job_id=job_id,
-                    progress=85,
-                    stage="diarization",
-                    message="Identifying speakers...",
-                )
-
-                try:
-                    diarize_model = whisperx.DiarizationPipeline(
-                        use_auth_token=hf_token, device=DEVICE
-                    )
-                    diarize_segments = diarize_model(audio)
-                    all_segments = whisperx.assign_word_speakers(
-                        diarize_segments, {"segments": all_segments}
-                    )["segments"]
-
-                    del diarize_model
-                    gc.collect()
-                    torch.cuda.empty_cache()
-
-                except Exception as e:
-                    logger.warning(f"Diarization failed: {e}")
 
-        processing_time = time.time() - start_time
-        realtime_factor = duration / processing_time if processing_time > 0 else 0
+@app.post("/transcribe-large/stream")
+async def transcribe_large_stream(
+    file: UploadFile = File(...),
+    model: str = Form(default="large-v3"),
+    language: Optional[str] = Form(default=None),
+    chunking_strategy: str = Form(default="auto"),
+    enable_diarization: bool = Form(default=True),
+    diarization_mode: str = Form(default=DIARIZATION_MODE),
+    min_speakers: Optional[int] = Form(default=None),
+    max_speakers: Optional[int] = Form(default=None),
+    hf_token: Optional[str] = Form(default=None),
+    chunk_batch_size: int = Form(default=CHUNK_BATCH_SIZE),
+    merge_overlaps: bool = Form(default=True),
+    use_cache: bool = Form(default=True),
+    priority: int = Form(default=5),
+    format: str = Form(default="sse"),
+):
+    """
+    Transcribe a large file and stream partial results as they are finalized.
 
-        # Generate SRT subtitle content
-        srt_content = generate_srt_from_segments(all_segments)
-        segment_srt_content = generate_segment_srt(all_segments)
-        txt_content = generate_txt_from_segments(all_segments)
+    Same pipeline and parameters as /transcribe-large, but the response is an
+    event stream instead of one JSON body at the end. Segments are emitted as
+    soon as they are merged and aligned, so downstream steps can start on the
+    first minutes of a long video while the rest is still transcribing.
 
-        response = {
-            "filename": file.filename,
-            "duration": duration,
-            "language": detected_language,
-            "num_segments": len(all_segments),
-            "num_chunks": len(segments),
-            "chunking_strategy": chunking_strategy,
-            "processing_time": processing_time,
-            "realtime_factor": realtime_factor,
-            "segments": all_segments,
-            "srt": srt_content,
-            "segments_srt": segment_srt_content,
-            "txt": txt_content,
-        }
+    **Example Request (curl):**
+    ```bash
+    curl -N -X POST https://whisper.lan/transcribe-large/stream \\
+      -F "file=@long-video.mp4" \\
+      -F "format=ndjson" \\
+      --insecure
+    ```
 
-        logger.info(
-            f"Large file transcription completed in {processing_time:.1f}s ({realtime_factor:.1f}x realtime)"
+    **Parameters:**
+    - format: 'sse' (text/event-stream, default) or 'ndjson' (one JSON event per line)
+    - priority: 1 (low) to 10 (high) queue priority
+    - Remaining parameters as in /transcribe-large
+
+    **Events:**
+    - job: job_id and queue position (reconnect with GET /jobs/{id}/events)
+    - status / progress: stage and percentage
+    - segments: {offset, start, end, segments[] (with words[]), srt, segments_srt, txt};
+      SRT numbering continues across events
+    - result: the full /transcribe-large response (includes speaker labels)
+    - error: {status, error} if the job failed or was cancelled
+
+    The job keeps running if the client disconnects.
+    """
+    if format not in STREAM_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown format '{format}', expected one of {list(STREAM_FORMATS)}",
+        )
+    if not 1 <= priority <= 10:
+        raise HTTPException(status_code=400, detail="priority must be between 1 and 10")
+    check_diarization_mode(diarization_mode)
+
+    start_time = time.time()
+    temp_file = TEMP_DIR / f"{time.time()}_{file.filename}"
+    logger.info(f"Streaming transcription of large file: {file.filename}")
+    timer = new_stage_timer()
+    with timer.busy("upload"):
+        _, content_hash = await save_upload_streaming(
+            file, temp_file, max_bytes=MAX_UPLOAD_BYTES
         )
-        return JSONResponse(content=response)
 
-    except Exception as e:
-        logger.error(f"Large file transcription error: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
+    def run(job):
+        return run_large_transcription(
+            temp_file,
+            file.filename,
+            model=model,
+            language=language,
+            chunking_strategy=chunking_strategy,
+            enable_diarization=enable_diarization,
+            diarization_mode=diarization_mode,
+            min_speakers=min_speakers,
+            max_speakers=max_speakers,
+            hf_token=hf_token,
+            chunk_batch_size=chunk_batch_size,
+            merge_overlaps=merge_overlaps,
+            start_time=start_time,
+            job=job,
+            content_hash=content_hash,
+            use_cache=use_cache,
+            timer=timer,
+        )
 
-    finally:
-        # Cleanup temp files
-        if temp_file and temp_file.exists():
-            temp_file.unlink()
-        if audio_file and audio_file != temp_file and audio_file.exists():
-            audio_file.unlink()
+    try:
+        job = job_queue.submit(
+            run,
+            "transcribe-large",
+            priority=priority,
+            params={"filename": file.filename, "model": model, "stream": format},
+            cleanup=remove_files(temp_file),
+        )
+    except QueueFullError as e:
+        temp_file.unlink(missing_ok=True)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
 
-        gc.collect()
-        torch.cuda.empty_cache()
+    # Tells the client which job to reconnect to (also in the X-Job-Id header)
+    job.events.publish(
+        "job", {"job_id": job.id, "position": job_queue.position(job.id)}
+    )
+    return stream_job_events(job, format)
 
 
 @app.post("/process-video", response_model=VideoTranscriptionResponse)
@@ -947,6 +2390,12 @@ async def process_video(
     enhance_audio: bool = Form(default=True),
     enable_diarization: bool = Form(default=True),
     hf_token: Optional[str] = Form(default=None),
+    use_cache: bool = Form(default=True),
+    outputs: Optional[str] = Form(default=None),
+    delivery: str = Form(default="inline"),
+    include_metrics: bool = Form(default=False),
+    accept: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
 ):
     """
     Process video file: extract audio, enhance, and transcribe.
@@ -969,6 +2418,15 @@ async def process_video(
     - enhance_audio: Apply speech enhancement filters
     - enable_diarization: Enable speaker diarization
     - hf_token: HuggingFace token
+    - use_cache: Serve repeat requests from the result cache (default true)
+    - outputs: Comma-separated formats to return (segments,srt,segments_srt,txt; default all)
+    - delivery: 'inline' (default) or 'store' to write the formats to the shared
+      volume and return their URLs/paths under 'artifacts'
+
+    - include_metrics: Add per-stage wall time and peak RSS/GPU memory under 'metrics'
+
+    Responses are gzip/zstd compressed per Accept-Encoding, and msgpack
+    encoded with Accept: application/msgpack.
 
     **Returns JSON with four ready-to-use formats:**
     - segments: Array of segments with word-level timing (segments[].words[])
@@ -998,94 +2456,454 @@ async def process_video(
     }
     ```
     """
+    output_formats = delivery_options(outputs, delivery)
     temp_video = None
-    temp_audio = None
 
     try:
-        # Save video
+        start_time = time.time()
+
+        # Stream video to disk (constant memory regardless of file size)
         temp_video = TEMP_DIR / f"{time.time()}_{file.filename}"
         logger.info(f"Processing video: {file.filename}")
+        timer = new_stage_timer()
+        with timer.busy("upload"):
+            _, content_hash = await save_upload_streaming(
+                file, temp_video, max_bytes=MAX_UPLOAD_BYTES
+            )
 
-        with open(temp_video, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        # Runs on the GPU worker; the upload is deleted when the job finishes
+        transcription_data = await run_on_gpu(
+            with_stage_metrics(
+                lambda job: run_video_processing(
+                    temp_video,
+                    model=model,
+                    language=language,
+                    enhance_audio=enhance_audio,
+                    enable_diarization=enable_diarization,
+                    hf_token=hf_token,
+                    start_time=start_time,
+                    job=job,
+                    content_hash=content_hash,
+                    use_cache=use_cache,
+                    timer=timer,
+                ),
+                timer,
+                include_metrics,
+            ),
+            "process-video",
+            params={"filename": file.filename, "model": model},
+            cleanup=remove_files(temp_video),
+        )
+        return await transcript_response(
+            transcription_data,
+            accept,
+            accept_encoding,
+            output_formats,
+            delivery,
+            timer=timer,
+        )
 
-        # Get video info
-        video_info = ffmpeg_processor.get_video_info(str(temp_video))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Video processing error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"Video processing failed: {str(e)}"
+        )
 
-        # Extract and enhance audio
-        temp_audio = TEMP_DIR / f"{temp_video.stem}.wav"
 
-        if enhance_audio:
-            logger.info("Extracting and enhancing audio...")
-            ffmpeg_processor.extract_audio_optimized(str(temp_video), str(temp_audio))
-        else:
-            # Basic extraction without enhancement
-            ffmpeg_processor.extract_audio_optimized(
-                str(temp_video), str(temp_audio), sample_rate=16000, channels=1
-            )
+def run_video_processing(
+    video_path: Path,
+    model: str = "large-v3",
+    language: Optional[str] = None,
+    enhance_audio: bool = True,
+    enable_diarization: bool = True,
+    hf_token: Optional[str] = None,
+    start_time: Optional[float] = None,
+    job: Optional[Job] = None,
+    content_hash: Optional[str] = None,
+    use_cache: bool = True,
+    timer: Optional[StageTimer] = None,
+) -> dict:
+    """
+    Video pipeline: probe, extract (and enhance) audio, run large-file transcription.
+
+    Blocking GPU work; runs on the job queue worker. Audio extraction happens
+    inside the large-file pipeline, so it is skipped entirely when every
+    stage is served from the result cache.
+
+    Returns:
+        Response dictionary for VideoTranscriptionResponse
+    """
+    timer = timer or new_stage_timer()
+
+    # Get video info
+    with timer.busy("probe"):
+        video_info = ffmpeg_processor.get_video_info(str(video_path))
+
+    # Extraction applies the processor's speech enhancement filters
+    # (enhance_audio only selects the log message, output format is the same)
+    if enhance_audio:
+        logger.info("Extracting and enhancing audio...")
+    if job:
+        job.update(5, "extraction", "Extracting audio...")
+
+    logger.info("Transcribing extracted audio...")
+    transcription_data = run_large_transcription(
+        video_path,
+        f"{video_path.stem}.wav",
+        model=model,
+        language=language,
+        chunking_strategy="auto",
+        enable_diarization=enable_diarization,
+        hf_token=hf_token,
+        start_time=start_time,
+        job=job,
+        content_hash=content_hash,
+        use_cache=use_cache,
+        is_video=True,
+        timer=timer,
+    )
 
-        # Use the large file endpoint for transcription
-        # (This reuses the chunking logic)
-        logger.info("Transcribing extracted audio...")
+    # Add video metadata to response
+    transcription_data["video_info"] = {
+        "format": video_info.get("format", ""),
+        "duration": video_info.get("duration", 0),
+        "size_bytes": video_info.get("size_bytes", 0),
+        "video_codec": video_info.get("video_codec", ""),
+        "resolution": f"{video_info.get('video_width', 0)}x{video_info.get('video_height', 0)}",
+        "audio_codec": video_info.get("audio_codec", ""),
+    }
+
+    return transcription_data
+
+
+JOB_TASKS = ("transcribe", "transcribe-large", "process-video")
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    file: UploadFile = File(...),
+    task: str = Form(default="transcribe-large"),
+    priority: int = Form(default=5),
+    model: str = Form(default="large-v3"),
+    language: Optional[str] = Form(default=None),
+    chunking_strategy: str = Form(default="auto"),
+    enable_diarization: bool = Form(default=True),
+    min_speakers: Optional[int] = Form(default=None),
+    max_speakers: Optional[int] = Form(default=None),
+    diarization_mode: str = Form(default=DIARIZATION_MODE),
+    enhance_audio: bool = Form(default=True),
+    hf_token: Optional[str] = Form(default=None),
+    callback_url: Optional[str] = Form(default=None),
+    job_id: Optional[str] = Form(default=None),
+    chunk_batch_size: int = Form(default=CHUNK_BATCH_SIZE),
+    merge_overlaps: bool = Form(default=True),
+    use_cache: bool = Form(default=True),
+    outputs: Optional[str] = Form(default=None),
+    delivery: str = Form(default="inline"),
+    include_metrics: bool = Form(default=False),
+):
+    """
+    Queue a transcription job and return immediately with a job id.
 
-        # Create a mock UploadFile for internal processing
-        with open(temp_audio, "rb") as audio_file:
-            audio_content = audio_file.read()
+    The upload is streamed to disk, then the job waits in a bounded priority
+    queue for the GPU worker. Poll GET /jobs/{id} for progress and fetch the
+    transcript from GET /jobs/{id}/result.
 
-            # Process through large file transcription
-            class MockUploadFile:
-                def __init__(self, filename, content):
-                    self.filename = filename
-                    self._content = content
+    **Example Request (curl):**
+    ```bash
+    curl -X POST https://whisper.lan/jobs \\
+      -F "file=@long-video.mp4" \\
+      -F "task=transcribe-large" \\
+      -F "priority=8" \\
+      --insecure
+    ```
 
-                async def read(self):
-                    return self._content
+    **Parameters:**
+    - file: Audio or video file
+    - task: 'transcribe', 'transcribe-large' (default) or 'process-video'
+    - priority: 1 (low) to 10 (high); higher priority jobs run first
+    - outputs/delivery: Defaults for GET /jobs/{id}/result (which can override them)
+    - include_metrics: Add per-stage wall time and peak memory to the result
+    - Remaining parameters are those of the matching synchronous endpoint
+
+    **Returns (202):** job_id, status, queue position and status/result URLs.
+    Responds 429 with Retry-After when the queue is full.
+    """
+    if task not in JOB_TASKS:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown task '{task}', expected one of {JOB_TASKS}"
+        )
+    if not 1 <= priority <= 10:
+        raise HTTPException(status_code=400, detail="priority must be between 1 and 10")
+    delivery_options(outputs, delivery)
+    check_diarization_mode(diarization_mode)
+
+    start_time = time.time()
+    temp_file = TEMP_DIR / f"{time.time()}_{file.filename}"
+    logger.info(f"Queueing {task} job for {file.filename}")
+    timer = new_stage_timer()
+    with timer.busy("upload"):
+        _, content_hash = await save_upload_streaming(
+            file, temp_file, max_bytes=MAX_UPLOAD_BYTES
+        )
 
-            mock_file = MockUploadFile(temp_audio.name, audio_content)
+    if task == "transcribe":
 
-            # Transcribe using large file endpoint logic
-            transcription_result = await transcribe_large(
-                file=mock_file,
+        def run(job):
+            return run_transcription(
+                temp_file,
+                file.filename,
                 model=model,
                 language=language,
-                chunking_strategy="auto",
                 enable_diarization=enable_diarization,
+                min_speakers=min_speakers,
+                max_speakers=max_speakers,
                 hf_token=hf_token,
+                job=job,
+                content_hash=content_hash,
+                use_cache=use_cache,
+                timer=timer,
             )
 
-            # Add video metadata to response
-            result_data = transcription_result.body.decode("utf-8")
-            import json
+    elif task == "transcribe-large":
 
-            transcription_data = json.loads(result_data)
+        def run(job):
+            return run_large_transcription(
+                temp_file,
+                file.filename,
+                model=model,
+                language=language,
+                chunking_strategy=chunking_strategy,
+                enable_diarization=enable_diarization,
+                diarization_mode=diarization_mode,
+                min_speakers=min_speakers,
+                max_speakers=max_speakers,
+                hf_token=hf_token,
+                callback_url=callback_url,
+                job_id=job_id,
+                chunk_batch_size=chunk_batch_size,
+                merge_overlaps=merge_overlaps,
+                start_time=start_time,
+                job=job,
+                content_hash=content_hash,
+                use_cache=use_cache,
+                timer=timer,
+            )
 
-            transcription_data["video_info"] = {
-                "format": video_info.get("format", ""),
-                "duration": video_info.get("duration", 0),
-                "size_bytes": video_info.get("size_bytes", 0),
-                "video_codec": video_info.get("video_codec", ""),
-                "resolution": f"{video_info.get('video_width', 0)}x{video_info.get('video_height', 0)}",
-                "audio_codec": video_info.get("audio_codec", ""),
-            }
+    else:
+
+        def run(job):
+            return run_video_processing(
+                temp_file,
+                model=model,
+                language=language,
+                enhance_audio=enhance_audio,
+                enable_diarization=enable_diarization,
+                hf_token=hf_token,
+                start_time=start_time,
+                job=job,
+                content_hash=content_hash,
+                use_cache=use_cache,
+                timer=timer,
+            )
 
-            return JSONResponse(content=transcription_data)
+    try:
+        job = job_queue.submit(
+            with_stage_metrics(run, timer, include_metrics),
+            task,
+            priority=priority,
+            params={
+                "filename": file.filename,
+                "model": model,
+                "outputs": outputs,
+                "delivery": delivery,
+            },
+            cleanup=remove_files(temp_file),
+        )
+    except QueueFullError as e:
+        temp_file.unlink(missing_ok=True)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
 
-    except Exception as e:
-        logger.error(f"Video processing error: {str(e)}", exc_info=True)
+    return {
+        "job_id": job.id,
+        "status": job.status.value,
+        "position": job_queue.position(job.id),
+        "status_url": f"/jobs/{job.id}",
+        "result_url": f"/jobs/{job.id}/result",
+        "events_url": f"/jobs/{job.id}/events",
+    }
+
+
+@app.get("/jobs")
+async def list_jobs():
+    """Queue counters and status of tracked jobs (newest first)"""
+    return {"stats": job_queue.stats(), "jobs": job_queue.list_jobs()}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status, progress, stage and queue position"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    status = job.to_dict()
+    status["position"] = job_queue.position(job_id)
+    return status
+
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    outputs: Optional[str] = None,
+    delivery: Optional[str] = None,
+    accept: Optional[str] = Header(default=None),
+    accept_encoding: Optional[str] = Header(default=None),
+):
+    """
+    Transcript of a finished job.
+
+    Returns the same JSON as the synchronous endpoint once completed, 202 with
+    the job status while queued/running, 409 if cancelled, 500 if failed and
+    410 for jobs of synchronous requests (their result is not kept).
+    outputs/delivery default to the values the job was submitted with; stored
+    artifacts use the job id as their artifact id.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    if job.released:
         raise HTTPException(
-            status_code=500, detail=f"Video processing failed: {str(e)}"
+            status_code=410, detail=f"Result of job {job_id} was returned to its request and not kept"
+        )
+    if job.status == JobStatus.COMPLETED:
+        outputs = outputs if outputs is not None else job.params.get("outputs")
+        delivery = delivery or job.params.get("delivery") or "inline"
+        output_formats = delivery_options(outputs, delivery)
+        return await transcript_response(
+            job.result, accept, accept_encoding, output_formats, delivery, artifact_id=job.id
         )
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=f"Job failed: {job.error}")
+    if job.status == JobStatus.CANCELLED:
+        raise HTTPException(status_code=409, detail="Job was cancelled")
+    return JSONResponse(status_code=202, content=job.to_dict())
 
-    finally:
-        # Cleanup
-        if temp_video and temp_video.exists():
-            temp_video.unlink()
-        if temp_audio and temp_audio.exists():
-            temp_audio.unlink()
 
-        gc.collect()
-        torch.cuda.empty_cache()
+@app.get("/jobs/{job_id}/events")
+async def get_job_events(
+    job_id: str,
+    format: str = "sse",
+    after: int = 0,
+    last_event_id: Optional[int] = Header(default=None),
+):
+    """
+    Stream a job's progress, finalized segments and result (SSE or NDJSON).
+
+    Replays everything published so far, then follows the job live until it
+    finishes. SSE clients resume from the Last-Event-ID header on reconnect;
+    others pass after=<last event id>.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return stream_job_events(job, format, after=last_event_id or after)
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued job, or stop a running one at its next checkpoint"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if not job_queue.cancel(job_id):
+        raise HTTPException(
+            status_code=409, detail=f"Job {job_id} already {job.status.value}"
+        )
+    return job.to_dict()
+
+
+@app.get("/cache")
+async def cache_status():
+    """Result cache size and per-stage hit/miss counters"""
+    return result_cache.stats()
+
+
+@app.delete("/cache")
+async def clear_cache():
+    """Drop all cached stage results"""
+    return {"removed": result_cache.clear()}
+
+
+@app.get("/artifacts/{artifact_id}/{filename}")
+async def get_artifact(artifact_id: str, filename: str):
+    """Download a transcript format stored with delivery=store"""
+    path = artifact_store.path(artifact_id, filename)
+    if path is None:
+        raise HTTPException(
+            status_code=404, detail=f"Artifact {artifact_id}/{filename} not found"
+        )
+    media_type = "application/json" if path.suffix == ".json" else "text/plain"
+    return FileResponse(path, media_type=media_type)
+
+
+@app.get("/models/pool")
+async def model_pool_status():
+    """
+    Resident models per pool (Whisper, alignment, diarization) with VRAM accounting.
+
+    Each pool reports hits/misses/evictions and load time saved; entries are
+    listed least recently used first with their measured size. 'vram'
+    compares the sum accounted to the pools with device-wide usage.
+    """
+    pools = {
+        name: {"stats": pool.stats(), "entries": pool.entries()}
+        for name, pool in MODEL_POOLS.items()
+    }
+    return {
+        "pools": pools,
+        "vram": {
+            "accounted_mb": round(sum(pool.used_mb for pool in MODEL_POOLS.values()), 1),
+            "device_used_mb": round(cuda_memory_used_mb(), 1),
+        },
+    }
+
+
+@app.delete("/models/pool/{pool_name}")
+async def evict_pool_models(pool_name: str, key: Optional[str] = None):
+    """
+    Force-evict resident models.
+
+    Evicts the whole pool, or a single entry when key is given as the JSON
+    key listed by GET /models/pool (e.g. key=["en","cuda"]). Use pool_name
+    'all' to clear every pool. Models in use by a running job are released
+    once that job drops them.
+    """
+    if pool_name == "all":
+        pools = list(MODEL_POOLS.values())
+    elif pool_name in MODEL_POOLS:
+        pools = [MODEL_POOLS[pool_name]]
+    else:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown pool '{pool_name}', expected one of {list(MODEL_POOLS)} or 'all'",
+        )
+
+    if key is None:
+        return {"evicted": {pool.name: pool.clear() for pool in pools}}
+
+    try:
+        pool_key = json.loads(key)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="key must be JSON as listed by GET /models/pool")
+
+    evicted = {pool.name: int(pool.evict(pool_key)) for pool in pools}
+    if not any(evicted.values()):
+        raise HTTPException(status_code=404, detail=f"No resident model with key {key}")
+    return {"evicted": evicted}
 
 
 @app.get("/models")
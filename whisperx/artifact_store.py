@@ -0,0 +1,149 @@
+"""
+Transcript Artifact Store for WhisperX
+Writes transcript formats to the shared volume and returns URLs instead
+
+For "store" delivery the large transcript fields (segments, SRTs, TXT) are
+written as files under one directory per artifact id, and the response
+carries a small manifest with a download URL, the shared-volume path and the
+size of each file. Services mounting the shared volume read the files
+directly; others fetch them from GET /artifacts/{id}/{name}. Artifact
+directories older than the TTL are pruned on write.
+"""
+
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from transcript_formats import OUTPUT_FORMATS, encode_json
+
+logger = logging.getLogger(__name__)
+
+# File written for each transcript format
+ARTIFACT_FILES = {
+    "segments": "segments.json",
+    "srt": "words.srt",
+    "segments_srt": "segments.srt",
+    "txt": "transcript.txt",
+}
+
+_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class ArtifactStore:
+    """
+    Directory of stored transcript artifacts with time-based expiry.
+    """
+
+    def __init__(self, root: Path, base_url: str = "/artifacts", ttl_seconds: float = 0):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding one subdirectory per artifact id
+            base_url: URL prefix the artifacts are served under
+            ttl_seconds: Remove artifacts older than this on write (0 = keep)
+        """
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._stored = 0
+        self._pruned = 0
+
+    def store(
+        self,
+        content: dict,
+        outputs: Iterable[str] = OUTPUT_FORMATS,
+        artifact_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Write the selected transcript formats and replace them with a manifest.
+
+        Storing the same artifact id again reuses the existing files.
+
+        Args:
+            content: Transcript response (segments, srt, segments_srt, txt, ...)
+            outputs: Formats to store; other formats are dropped
+            artifact_id: Directory name (e.g. the job id); random if None
+
+        Returns:
+            Copy of content without transcript fields, plus 'artifact_id' and
+            'artifacts' mapping each format to its url, path and bytes
+        """
+        artifact_id = artifact_id or uuid.uuid4().hex
+        if not _ID_PATTERN.match(artifact_id):
+            raise ValueError(f"Invalid artifact id: {artifact_id!r}")
+
+        self.prune()
+        directory = self.root / artifact_id
+        directory.mkdir(parents=True, exist_ok=True)
+
+        artifacts = {}
+        for name in outputs:
+            value = content.get(name)
+            if value is None:
+                continue
+            filename = ARTIFACT_FILES[name]
+            path = directory / filename
+            if not path.exists():
+                data = value.encode("utf-8") if isinstance(value, str) else encode_json(value)
+                tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+            artifacts[name] = {
+                "url": f"{self.base_url}/{artifact_id}/{filename}",
+                "path": str(path),
+                "bytes": path.stat().st_size,
+            }
+
+        with self._lock:
+            self._stored += 1
+
+        response = {key: value for key, value in content.items() if key not in OUTPUT_FORMATS}
+        response["artifact_id"] = artifact_id
+        response["artifacts"] = artifacts
+        return response
+
+    def path(self, artifact_id: str, filename: str) -> Optional[Path]:
+        """Path of a stored artifact file, or None if it doesn't exist."""
+        if not _ID_PATTERN.match(artifact_id) or filename not in ARTIFACT_FILES.values():
+            return None
+        path = self.root / artifact_id / filename
+        return path if path.is_file() else None
+
+    def prune(self) -> int:
+        """Remove artifact directories older than the TTL. Returns the number removed."""
+        if self.ttl_seconds <= 0 or not self.root.is_dir():
+            return 0
+
+        cutoff = time.time() - self.ttl_seconds
+        removed = 0
+        for directory in self.root.iterdir():
+            try:
+                if directory.is_dir() and directory.stat().st_mtime < cutoff:
+                    shutil.rmtree(directory, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                continue
+
+        if removed:
+            logger.info(f"Pruned {removed} expired transcript artifacts")
+            with self._lock:
+                self._pruned += removed
+        return removed
+
+    def stats(self) -> Dict:
+        """Store location and counters"""
+        with self._lock:
+            return {
+                "root": str(self.root),
+                "ttl_seconds": self.ttl_seconds,
+                "stored": self._stored,
+                "pruned": self._pruned,
+            }
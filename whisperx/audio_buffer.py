@@ -0,0 +1,167 @@
+"""
+Shared Audio Buffer for WhisperX
+Decode a file once per job and slice chunks zero-copy
+
+The decoded 16kHz mono float32 samples are streamed from an ffmpeg pipe
+into a memory-mapped raw PCM file on local disk (or kept in memory), so VAD,
+chunk transcription, alignment and diarization all read from the same
+buffer instead of re-decoding the file or going through a temp WAV.
+"""
+
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+
+class AudioBuffer:
+    """
+    Memory-mapped mono float32 audio.
+
+    Slices are views into the mapping (no copy, no decode), so the cost of
+    taking 200+ chunks is independent of the file length.
+    """
+
+    def __init__(self, path: Optional[str], sample_rate: int = SAMPLE_RATE):
+        """
+        Open an existing raw f32le PCM file.
+
+        Args:
+            path: Path to raw float32 PCM file (None for an empty buffer)
+            sample_rate: Sample rate of the PCM data
+        """
+        self.path = path
+        self.sample_rate = sample_rate
+
+        if path and os.path.getsize(path) > 0:
+            # Copy-on-write mapping: readers get writable views (torch.from_numpy
+            # warns on read-only arrays) without ever touching the file
+            self.samples = np.memmap(path, dtype=np.float32, mode="c")
+        else:
+            self.samples = np.zeros(0, dtype=np.float32)
+
+    @classmethod
+    def from_stream(
+        cls,
+        chunks: Iterable[bytes],
+        buffer_dir: Optional[str] = None,
+        sample_rate: int = SAMPLE_RATE,
+    ) -> "AudioBuffer":
+        """
+        Build a buffer from raw f32le PCM byte chunks (e.g. an ffmpeg pipe).
+
+        Args:
+            chunks: Iterable of raw float32 PCM bytes
+            buffer_dir: Directory for the memory-mapped PCM file (None = keep in memory)
+            sample_rate: Sample rate of the PCM data
+
+        Returns:
+            AudioBuffer holding the streamed samples
+        """
+        if buffer_dir is None:
+            data = bytearray()
+            for chunk in chunks:
+                data += chunk
+
+            buffer = cls(None, sample_rate=sample_rate)
+            usable = len(data) - len(data) % 4
+            buffer.samples = np.frombuffer(data, dtype=np.float32, count=usable // 4)
+            return buffer
+
+        Path(buffer_dir).mkdir(parents=True, exist_ok=True)
+        pcm_path = str(Path(buffer_dir) / f"{uuid.uuid4().hex}.f32")
+        try:
+            with open(pcm_path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        except BaseException:
+            Path(pcm_path).unlink(missing_ok=True)
+            raise
+
+        return cls(pcm_path, sample_rate=sample_rate)
+
+    @classmethod
+    def decode(
+        cls,
+        media_path: str,
+        buffer_dir: Optional[str],
+        ffmpeg_processor,
+        sample_rate: int = SAMPLE_RATE,
+        enhance: bool = False,
+    ) -> "AudioBuffer":
+        """
+        Decode a media file once, streaming PCM from ffmpeg into the buffer.
+
+        Video files are decoded directly (no intermediate WAV extraction).
+
+        Args:
+            media_path: Input audio or video file
+            buffer_dir: Directory for the raw PCM file (prefer local disk; None = in memory)
+            ffmpeg_processor: FFmpegProcessor used for decoding
+            sample_rate: Target sample rate
+            enhance: Apply the speech enhancement filters while decoding
+
+        Returns:
+            AudioBuffer with the decoded samples
+        """
+        buffer = cls.from_stream(
+            ffmpeg_processor.stream_pcm(
+                media_path, sample_rate=sample_rate, enhance=enhance
+            ),
+            buffer_dir,
+            sample_rate=sample_rate,
+        )
+        logger.info(
+            f"Decoded {media_path} once into shared buffer ({buffer.duration:.1f}s, {buffer.nbytes / 1e6:.1f}MB)"
+        )
+        return buffer
+
+    @property
+    def duration(self) -> float:
+        """Buffer duration in seconds."""
+        return len(self.samples) / self.sample_rate
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the decoded samples in bytes."""
+        return int(self.samples.nbytes)
+
+    def slice(self, start: float, end: float) -> np.ndarray:
+        """
+        Zero-copy view of the samples between start and end seconds.
+
+        Args:
+            start: Start time in seconds
+            end: End time in seconds
+
+        Returns:
+            float32 array view into the buffer
+        """
+        start_sample = max(0, int(start * self.sample_rate))
+        end_sample = min(len(self.samples), int(end * self.sample_rate))
+        return np.asarray(self.samples[start_sample:end_sample])
+
+    def close(self):
+        """Release the mapping and delete the backing PCM file."""
+        # The mapping is unmapped once the last view is garbage collected;
+        # unlinking first is safe on POSIX (pages stay valid until then)
+        self.samples = np.zeros(0, dtype=np.float32)
+
+        if self.path and os.path.exists(self.path):
+            try:
+                os.unlink(self.path)
+            except OSError as e:
+                logger.warning(f"Failed to remove audio buffer {self.path}: {e}")
+
+    def __enter__(self) -> "AudioBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark: overlap-aware segment merging for large-file mode
+
+Builds synthetic per-chunk transcripts for a long recording split into
+overlapping chunks (same layout as VideoSegmenter.create_time_based_chunks),
+then measures how much duplicated text/audio the merge removes, what that
+would have cost in alignment time, and how much smaller the output gets.
+
+Usage:
+    python3 benchmarks/bench_overlap_merge.py --minutes 120 --align-rate 0.03
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from segment_merger import merge_chunk_results  # noqa: E402
+
+VOCAB = "the a we you they said really think going know about just like time".split()
+
+
+def make_words(duration: float, rng: random.Random) -> list:
+    """Continuous speech: ~2.5 words/s with small gaps."""
+    words, t = [], 0.0
+    while t < duration:
+        length = rng.uniform(0.15, 0.45)
+        words.append(
+            {
+                "word": rng.choice(VOCAB),
+                "start": round(t, 3),
+                "end": round(t + length, 3),
+                "score": round(rng.uniform(0.6, 1.0), 3),
+            }
+        )
+        t += length + rng.uniform(0.02, 0.15)
+    return words
+
+
+def make_chunk_results(words, duration, chunk, overlap, timed, rng):
+    """Transcribe each overlapping chunk independently (8-word segments)."""
+    results, pos, chunk_id = [], 0.0, 0
+    while pos < duration:
+        start, end = pos, min(pos + chunk, duration)
+        chunk_words = [
+            dict(w, score=round(min(1.0, w["score"] + rng.uniform(-0.1, 0.1)), 3))
+            for w in words
+            if w["start"] >= start and w["end"] <= end
+        ]
+        segments = []
+        for i in range(0, len(chunk_words), 8):
+            group = chunk_words[i : i + 8]
+            seg = {
+                "text": " " + " ".join(w["word"] for w in group),
+                "start": group[0]["start"],
+                "end": group[-1]["end"],
+            }
+            if timed:
+                seg["words"] = group
+            segments.append(seg)
+        results.append(
+            {"segment_id": chunk_id, "start": start, "end": end, "segments": segments}
+        )
+        chunk_id += 1
+        pos += chunk - overlap
+    return results
+
+
+def run(args) -> dict:
+    rng = random.Random(args.seed)
+    duration = args.minutes * 60
+    words = make_words(duration, rng)
+    report = {
+        "benchmark": "overlap_merge",
+        "audio_seconds": duration,
+        "reference_words": len(words),
+        "chunk_seconds": args.chunk,
+        "overlap_seconds": args.overlap,
+        "align_rate": args.align_rate,
+        "modes": {},
+    }
+
+    for mode, timed in (("pre_align_text", False), ("post_align_words", True)):
+        results = make_chunk_results(
+            words, duration, args.chunk, args.overlap, timed, rng
+        )
+        naive = [seg for r in results for seg in r["segments"]]
+        naive_words = sum(len(s["text"].split()) for s in naive)
+        naive_seconds = sum(s["end"] - s["start"] for s in naive)
+
+        t0 = time.perf_counter()
+        merged, stats = merge_chunk_results(results)
+        merge_time = time.perf_counter() - t0
+
+        merged_words = sum(len(s["text"].split()) for s in merged)
+        merged_seconds = sum(s["end"] - s["start"] for s in merged)
+        naive_bytes = len(json.dumps(naive))
+        merged_bytes = len(json.dumps(merged))
+
+        report["modes"][mode] = {
+            "merge_time": round(merge_time, 4),
+            "words_naive": naive_words,
+            "words_merged": merged_words,
+            "word_error_vs_reference": merged_words - len(words),
+            "aligned_seconds_naive": round(naive_seconds, 1),
+            "aligned_seconds_merged": round(merged_seconds, 1),
+            "wasted_alignment_time_saved": round(
+                (naive_seconds - merged_seconds) * args.align_rate, 2
+            ),
+            "json_bytes_naive": naive_bytes,
+            "json_bytes_merged": merged_bytes,
+            "size_reduction": round(1 - merged_bytes / naive_bytes, 4),
+            "stats": stats,
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--minutes", type=float, default=120)
+    parser.add_argument("--chunk", type=float, default=30)
+    parser.add_argument("--overlap", type=float, default=10)
+    parser.add_argument(
+        "--align-rate",
+        type=float,
+        default=0.03,
+        help="Alignment seconds per audio second (measure on your GPU)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
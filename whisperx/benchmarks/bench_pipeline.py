@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Benchmark: large-file pipeline stages on a synthetic corpus with stubbed ASR
+
+Generates speech-like recordings (see corpus.py) and runs the CPU-side
+stages of large-file mode on each: shared audio buffer, segmentation
+(VideoSegmenter), chunk slicing into Whisper windows (chunk_batcher),
+overlap merge (segment_merger), SRT/TXT rendering and JSON encoding
+(transcript_formats). The Whisper model is replaced by a stub that returns
+the corpus ground truth for each window, so no GPU, model download or
+network access is needed and the numbers isolate the pipeline's own cost.
+
+The report records the commit, environment and configuration together with
+per-stage times (best of --repeats) and output sizes/checksums, so results
+from different commits can be compared; --compare prints the time ratio of
+every stage against an earlier report.
+
+Usage:
+    python3 benchmarks/bench_pipeline.py --minutes 10 60 --output results.json
+    python3 benchmarks/bench_pipeline.py --minutes 60 --compare results.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from audio_buffer import AudioBuffer  # noqa: E402
+from chunk_batcher import build_batch_windows, group_window_results  # noqa: E402
+from corpus import SR, Recording, make_corpus  # noqa: E402
+from segment_merger import OverlapMerger, dedupe_overlapping_words  # noqa: E402
+from transcript_formats import encode_json, render_transcript  # noqa: E402
+from video_segmenter import VideoSegmenter  # noqa: E402
+
+STAGES = ("buffer", "segmentation", "slicing", "asr_stub", "merge", "srt", "serialize")
+
+
+class StubASR:
+    """
+    Stands in for the batched Whisper model.
+
+    Each window is "transcribed" as the ground-truth words starting inside
+    it, and each segment is "aligned" by attaching those words' timings.
+    """
+
+    def __init__(self, recording: Recording):
+        self.recording = recording
+
+    def transcribe(self, inputs, windows) -> list:
+        return [
+            " " + " ".join(w["word"] for w in self.recording.words_between(win.start, win.end))
+            for win in windows
+        ]
+
+    def align(self, chunk_results: list) -> list:
+        for result in chunk_results:
+            for segment in result["segments"]:
+                segment["words"] = [
+                    dict(w)
+                    for w in self.recording.words_between(segment["start"], segment["end"])
+                ]
+        return chunk_results
+
+
+def pcm_stream(samples: np.ndarray, chunk_bytes: int = 1 << 20):
+    """Raw f32le bytes in pipe-sized chunks, as ffmpeg would deliver them."""
+    data = samples.astype(np.float32).tobytes()
+    for offset in range(0, len(data), chunk_bytes):
+        yield data[offset : offset + chunk_bytes]
+
+
+def run_once(recording: Recording, strategy: str, args) -> tuple:
+    """Run every stage once; returns (stage seconds, output stats)."""
+    times = {}
+    asr = StubASR(recording)
+
+    t0 = time.perf_counter()
+    audio = AudioBuffer.from_stream(pcm_stream(recording.samples), None, sample_rate=SR)
+    times["buffer"] = time.perf_counter() - t0
+
+    segmenter = VideoSegmenter(
+        chunk_duration=args.chunk_duration,
+        overlap_duration=args.overlap,
+        vad_engine="onnx",
+        vad_onnx_path=args.vad_model,
+    )
+    t0 = time.perf_counter()
+    chunks = segmenter.segment_audio(None, strategy, audio=audio)
+    times["segmentation"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batches = [
+        build_batch_windows(audio, chunks[i : i + args.chunk_batch_size])
+        for i in range(0, len(chunks), args.chunk_batch_size)
+    ]
+    times["slicing"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    chunk_results = []
+    for inputs, windows in batches:
+        chunk_results.extend(group_window_results(windows, asr.transcribe(inputs, windows)))
+    asr.align(chunk_results)
+    times["asr_stub"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    merger = OverlapMerger()
+    segments = []
+    for result in chunk_results:
+        segments.extend(merger.add(result))
+    segments.extend(merger.flush())
+    segments, words_removed = dedupe_overlapping_words(segments)
+    times["merge"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    rendered = render_transcript(segments)
+    times["srt"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    body = encode_json(
+        {
+            "segments": segments,
+            "srt": rendered["srt"],
+            "segments_srt": rendered["segments_srt"],
+            "txt": rendered["txt"],
+        }
+    )
+    times["serialize"] = time.perf_counter() - t0
+
+    stats = {
+        "chunks": len(chunks),
+        "windows": sum(len(windows) for _, windows in batches),
+        "segments": len(segments),
+        "words": rendered["word_cues"],
+        "words_removed": words_removed + merger.stats.to_dict().get("words_removed", 0),
+        "srt_bytes": len(rendered["srt"]),
+        "response_bytes": len(body),
+        "srt_sha256": hashlib.sha256(rendered["srt"].encode("utf-8")).hexdigest()[:16],
+    }
+    audio.close()
+    return times, stats
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """Current/baseline time ratio per recording, strategy and stage (<1 = faster)."""
+    ratios = {}
+    for name, strategies in report["results"].items():
+        for strategy, result in strategies.items():
+            base = baseline.get("results", {}).get(name, {}).get(strategy)
+            if not base:
+                continue
+            ratios.setdefault(name, {})[strategy] = {
+                stage: round(result["stages"][stage] / base["stages"][stage], 3)
+                for stage in result["stages"]
+                if base["stages"].get(stage)
+            }
+    return {"baseline_commit": baseline.get("commit"), "ratios": ratios}
+
+
+def run(args) -> dict:
+    report = {
+        "benchmark": "pipeline",
+        "commit": git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "config": {
+            "minutes": args.minutes,
+            "strategies": args.strategies,
+            "chunk_duration": args.chunk_duration,
+            "overlap": args.overlap,
+            "chunk_batch_size": args.chunk_batch_size,
+            "repeats": args.repeats,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+
+    for recording in make_corpus(args.minutes, args.seed):
+        results = report["results"].setdefault(recording.name, {})
+        for strategy in args.strategies:
+            best = {stage: float("inf") for stage in STAGES}
+            for _ in range(args.repeats):
+                times, stats = run_once(recording, strategy, args)
+                best = {stage: min(best[stage], times[stage]) for stage in STAGES}
+
+            total = sum(best.values())
+            results[strategy] = {
+                "audio_seconds": round(recording.duration, 1),
+                "stages": {stage: round(seconds, 4) for stage, seconds in best.items()},
+                "total": round(total, 4),
+                "realtime_factor": round(recording.duration / total, 1) if total else None,
+                "output": stats,
+            }
+
+    if args.compare:
+        report["comparison"] = compare(report, json.loads(Path(args.compare).read_text()))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--minutes", type=float, nargs="+", default=[10, 60], help="Corpus lengths"
+    )
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        default=["silence", "time"],
+        choices=["silence", "time", "vad"],
+        help="Chunking strategies ('vad' needs onnxruntime and the Silero ONNX model)",
+    )
+    parser.add_argument("--chunk-duration", type=int, default=30)
+    parser.add_argument("--overlap", type=int, default=10)
+    parser.add_argument("--chunk-batch-size", type=int, default=8)
+    parser.add_argument("--vad-model", type=str, default=None, help="silero_vad.onnx path")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", type=str, default=None, help="Earlier report to compare with")
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
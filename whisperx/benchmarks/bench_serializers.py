@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass transcript serializers vs per-format rendering
+
+Builds a synthetic transcript (100k words by default) and times rendering
+word SRT, segment SRT and TXT with the previous three-pass implementation
+against transcript_formats.render_transcript, then times encoding the full
+response with the stdlib json module, orjson and msgpack (when installed).
+
+Usage:
+    python3 benchmarks/bench_serializers.py --words 100000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import transcript_formats  # noqa: E402
+from transcript_formats import encode_json, render_transcript  # noqa: E402
+
+
+def make_segments(num_words: int, seed: int) -> list:
+    """Segments of 5-30 words with aligned word timings and scores."""
+    rng = np.random.default_rng(seed)
+    segments = []
+    t = 0.0
+    remaining = num_words
+    while remaining > 0:
+        count = min(remaining, int(rng.integers(5, 31)))
+        words = []
+        for i in range(count):
+            start = round(t, 3)
+            t += float(rng.uniform(0.15, 0.6))
+            words.append(
+                {
+                    "word": f"word{len(segments)}_{i}",
+                    "start": start,
+                    "end": round(t, 3),
+                    "score": round(float(rng.uniform(0.5, 1)), 3),
+                    "speaker": "SPEAKER_00",
+                }
+            )
+            t += 0.05
+        segments.append(
+            {
+                "start": words[0]["start"],
+                "end": words[-1]["end"],
+                "text": " " + " ".join(w["word"] for w in words),
+                "words": words,
+                "speaker": "SPEAKER_00",
+            }
+        )
+        remaining -= count
+        t += float(rng.uniform(0.2, 2))
+    return segments
+
+
+# Previous implementation (one pass per format, float-modulo timestamps)
+def legacy_timestamp(seconds: float) -> str:
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+    millis = int((seconds % 1) * 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def legacy_render(segments: list) -> dict:
+    srt_lines = []
+    counter = 1
+    for segment in segments:
+        for word_obj in segment.get("words", []):
+            word_text = word_obj.get("word", "").strip()
+            start = word_obj.get("start")
+            end = word_obj.get("end")
+            if not word_text or start is None or end is None:
+                continue
+            srt_lines.append(f"{counter}")
+            srt_lines.append(f"{legacy_timestamp(start)} --> {legacy_timestamp(end)}")
+            srt_lines.append(word_text)
+            srt_lines.append("")
+            counter += 1
+
+    segment_lines = []
+    counter = 1
+    for segment in segments:
+        text = segment.get("text", "").strip()
+        start = segment.get("start")
+        end = segment.get("end")
+        if not text or start is None or end is None:
+            continue
+        segment_lines.append(f"{counter}")
+        segment_lines.append(f"{legacy_timestamp(start)} --> {legacy_timestamp(end)}")
+        segment_lines.append(text)
+        segment_lines.append("")
+        counter += 1
+
+    texts = [s.get("text", "").strip() for s in segments]
+    return {
+        "srt": "\n".join(srt_lines),
+        "segments_srt": "\n".join(segment_lines),
+        "txt": " ".join(t for t in texts if t),
+    }
+
+
+def best_of(fn, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def run(args) -> dict:
+    segments = make_segments(args.words, args.seed)
+    report = {
+        "benchmark": "serializers",
+        "words": args.words,
+        "segments": len(segments),
+        "repeats": args.repeats,
+    }
+
+    legacy_time = best_of(lambda: legacy_render(segments), args.repeats)
+    single_time = best_of(lambda: render_transcript(segments), args.repeats)
+    rendered = render_transcript(segments)
+    report["render"] = {
+        "legacy": round(legacy_time, 4),
+        "single_pass": round(single_time, 4),
+        "speedup": round(legacy_time / single_time, 2) if single_time else None,
+        "srt_bytes": len(rendered["srt"]),
+    }
+
+    response = {
+        "segments": segments,
+        "srt": rendered["srt"],
+        "segments_srt": rendered["segments_srt"],
+        "txt": rendered["txt"],
+    }
+    encode = {
+        # What FastAPI's JSONResponse does
+        "json": lambda: json.dumps(
+            response, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8"),
+    }
+    if transcript_formats.orjson is not None:
+        encode["orjson"] = lambda: encode_json(response)
+    if transcript_formats.msgpack is not None:
+        encode["msgpack"] = lambda: transcript_formats.msgpack.packb(response)
+
+    report["encode"] = {}
+    for name, fn in encode.items():
+        report["encode"][name] = {
+            "time": round(best_of(fn, args.repeats), 4),
+            "bytes": len(fn()),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--words", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: NumPy silence detection vs ffmpeg silencedetect
+
+Generates a recording of noise-floor pauses between loud passages, writes
+it to a WAV file, then times silence_detector.detect_silence on the decoded
+samples against FFmpegProcessor.detect_silence on the file, and checks the
+two agree on the silence periods (within --tolerance seconds).
+
+Usage:
+    python3 benchmarks/bench_silence.py --minutes 60
+    python3 benchmarks/bench_silence.py --minutes 60 --skip-ffmpeg
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from silence_detector import detect_silence  # noqa: E402
+
+SR = 16000
+
+
+def make_audio(minutes: float, seed: int) -> np.ndarray:
+    """Loud passages (5-60s) separated by pauses (0.5-6s) at a -70dB noise floor."""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SR)
+    audio = (rng.standard_normal(total) * 10 ** (-70 / 20)).astype(np.float32)
+
+    pos = 0
+    while pos < total:
+        end = min(total, pos + int(rng.uniform(5, 60) * SR))
+        audio[pos:end] += (rng.standard_normal(end - pos) * 0.1).astype(np.float32)
+        pos = end + int(rng.uniform(0.5, 6) * SR)
+    return audio
+
+
+def write_wav(path: Path, audio: np.ndarray):
+    pcm = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SR)
+        f.writeframes(pcm.tobytes())
+
+
+def agreement(a, b, tolerance: float) -> float:
+    """Fraction of periods in a with a matching period in b."""
+    if not a:
+        return 1.0 if not b else 0.0
+    matched = sum(
+        any(abs(s1 - s2) <= tolerance and abs(e1 - e2) <= tolerance for s2, e2 in b)
+        for s1, e1 in a
+    )
+    return matched / len(a)
+
+
+def run(args) -> dict:
+    audio = make_audio(args.minutes, args.seed)
+    report = {
+        "benchmark": "silence_detection",
+        "audio_seconds": len(audio) / SR,
+        "min_silence_duration": args.min_silence,
+        "threshold": args.threshold,
+    }
+
+    t0 = time.perf_counter()
+    silences = detect_silence(audio, SR, args.min_silence, args.threshold)
+    numpy_time = time.perf_counter() - t0
+    report["numpy"] = {"time": round(numpy_time, 4), "silences": len(silences)}
+
+    if args.skip_ffmpeg or not shutil.which("ffmpeg"):
+        report["ffmpeg"] = None
+        return report
+
+    from ffmpeg_processor import FFmpegProcessor
+
+    with tempfile.TemporaryDirectory() as tmp:
+        wav_path = Path(tmp) / "bench.wav"
+        write_wav(wav_path, audio)
+
+        t0 = time.perf_counter()
+        reference = FFmpegProcessor().detect_silence(
+            str(wav_path), args.min_silence, args.threshold
+        )
+        ffmpeg_time = time.perf_counter() - t0
+
+    report["ffmpeg"] = {"time": round(ffmpeg_time, 4), "silences": len(reference)}
+    report["speedup"] = round(ffmpeg_time / numpy_time, 1) if numpy_time else None
+    report["agreement"] = round(agreement(reference, silences, args.tolerance), 4)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--min-silence", type=float, default=2.0)
+    parser.add_argument("--threshold", type=str, default="-50dB")
+    parser.add_argument("--tolerance", type=float, default=0.05)
+    parser.add_argument("--skip-ffmpeg", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Silero VAD engines (torch.hub vs batched ONNX Runtime)
+
+Runs VideoSegmenter.detect_speech_segments with each engine over the same
+audio (1h by default) and reports wall time, realtime factor, number of
+speech segments and how closely the engines agree (speech-time IoU).
+
+Without --audio, a synthetic recording is generated: speech-like bursts
+(syllable-rate modulated harmonics) separated by pauses over low noise.
+Real recordings give more meaningful agreement numbers.
+
+Usage:
+    python3 benchmarks/bench_vad.py --minutes 60 --threads 4 --batch-size 64
+    python3 benchmarks/bench_vad.py --audio talk.mp4 --engines onnx
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from video_segmenter import VideoSegmenter  # noqa: E402
+
+SR = 16000
+
+
+def make_audio(minutes: float, seed: int) -> np.ndarray:
+    """Alternating speech-like bursts (1-8s) and pauses (0.3-3s)."""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SR)
+    audio = (rng.standard_normal(total) * 0.003).astype(np.float32)
+
+    pos = 0
+    while pos < total:
+        length = int(rng.uniform(1, 8) * SR)
+        end = min(total, pos + length)
+        t = np.arange(end - pos) / SR
+        pitch = rng.uniform(90, 220)
+        voice = sum(
+            np.sin(2 * np.pi * pitch * h * t) / h for h in range(1, 6)
+        ) * (0.5 + 0.5 * np.sin(2 * np.pi * rng.uniform(3, 6) * t))
+        audio[pos:end] += (0.2 * voice).astype(np.float32)
+        pos = end + int(rng.uniform(0.3, 3) * SR)
+    return audio
+
+
+def load_audio(path: str) -> np.ndarray:
+    """Decode a media file to 16kHz mono float32 via ffmpeg."""
+    from audio_buffer import AudioBuffer
+    from ffmpeg_processor import FFmpegProcessor
+
+    buffer = AudioBuffer.decode(path, None, FFmpegProcessor())
+    return np.array(buffer.samples)
+
+
+def speech_mask(segments, num_samples: int) -> np.ndarray:
+    mask = np.zeros(num_samples // 160 + 1, dtype=bool)  # 10ms resolution
+    for start, end in segments:
+        mask[int(start * 100) : int(end * 100)] = True
+    return mask
+
+
+def run(args) -> dict:
+    if args.audio:
+        audio = load_audio(args.audio)
+    else:
+        audio = make_audio(args.minutes, args.seed)
+    duration = len(audio) / SR
+    report = {
+        "benchmark": "vad",
+        "audio": args.audio or "synthetic",
+        "audio_seconds": round(duration, 1),
+        "threads": args.threads,
+        "batch_size": args.batch_size,
+        "engines": {},
+    }
+
+    masks = {}
+    for engine in args.engines:
+        segmenter = VideoSegmenter(
+            vad_engine=engine,
+            vad_onnx_path=args.model,
+            vad_threads=args.threads,
+            vad_batch_size=args.batch_size,
+        )
+        t0 = time.perf_counter()
+        segmenter.load_vad_model()
+        load_time = time.perf_counter() - t0
+        loaded = type(segmenter.vad_model).__name__ if segmenter.vad_model else None
+
+        t0 = time.perf_counter()
+        segments = segmenter.detect_speech_segments(None, samples=audio)
+        vad_time = time.perf_counter() - t0
+
+        masks[engine] = speech_mask(segments, len(audio))
+        report["engines"][engine] = {
+            "model": loaded,
+            "load_time": round(load_time, 3),
+            "vad_time": round(vad_time, 3),
+            "realtime_factor": round(duration / vad_time, 1) if vad_time else None,
+            "segments": len(segments),
+            "speech_seconds": round(sum(e - s for s, e in segments), 1),
+        }
+
+    if len(masks) == 2:
+        a, b = masks.values()
+        union = np.logical_or(a, b).sum()
+        overlap = np.logical_and(a, b).sum()
+        report["speech_iou"] = round(float(overlap / union), 4) if union else 1.0
+        times = [report["engines"][e]["vad_time"] for e in args.engines]
+        if times[1]:
+            report["speedup"] = round(times[0] / times[1], 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument(
+        "--audio", type=str, default=None, help="Benchmark a real recording"
+    )
+    parser.add_argument(
+        "--engines", nargs="+", default=["torch", "onnx"], choices=["torch", "onnx"]
+    )
+    parser.add_argument("--model", type=str, default=None, help="silero_vad.onnx path")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
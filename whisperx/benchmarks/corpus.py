@@ -0,0 +1,116 @@
+"""
+Synthetic audio corpus for WhisperX benchmarks
+
+Deterministic speech-like recordings: harmonic tones with syllable-rate
+amplitude modulation, separated by pauses over a low noise floor. The pause
+pattern mixes short gaps (within a sentence), medium pauses and occasional
+long silences, so VAD, silence detection and chunking all have realistic
+boundaries to find. Each recording comes with its ground truth (speech
+regions and timed words) for a stubbed ASR model to "transcribe".
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+SR = 16000
+
+VOCAB = (
+    "the a we you they said really think going know about just like time "
+    "people work today because first other could would right there"
+).split()
+
+# (probability, min seconds, max seconds) of the pause after a speech burst
+PAUSES = ((0.6, 0.15, 0.6), (0.3, 0.6, 2.0), (0.1, 2.5, 6.0))
+
+
+class Recording:
+    """One synthetic recording with its ground truth."""
+
+    def __init__(
+        self,
+        name: str,
+        samples: np.ndarray,
+        regions: List[Tuple[float, float]],
+        words: List[dict],
+    ):
+        self.name = name
+        self.samples = samples
+        self.regions = regions
+        self.words = words
+        self._starts = np.array([w["start"] for w in words])
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / SR
+
+    def words_between(self, start: float, end: float) -> List[dict]:
+        """Ground-truth words starting in [start, end)."""
+        lo, hi = np.searchsorted(self._starts, [start, end])
+        return self.words[lo:hi]
+
+
+def _pause(rng: np.random.Generator) -> float:
+    pick = rng.random()
+    for probability, low, high in PAUSES:
+        if pick < probability:
+            return float(rng.uniform(low, high))
+        pick -= probability
+    return float(rng.uniform(PAUSES[-1][1], PAUSES[-1][2]))
+
+
+def make_recording(minutes: float, seed: int = 0, noise_db: float = -60.0) -> Recording:
+    """
+    Generate a speech-like recording.
+
+    Args:
+        minutes: Length of the recording
+        seed: Random seed (same seed, same audio and ground truth)
+        noise_db: Level of the background noise floor in dBFS
+
+    Returns:
+        Recording with samples, speech regions and timed words
+    """
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SR)
+    samples = (rng.standard_normal(total) * 10 ** (noise_db / 20)).astype(np.float32)
+
+    regions: List[Tuple[float, float]] = []
+    words: List[dict] = []
+    pos = int(rng.uniform(0.2, 1.0) * SR)
+    while pos < total:
+        end = min(total, pos + int(rng.uniform(1.0, 8.0) * SR))
+        t = np.arange(end - pos, dtype=np.float32) / SR
+        pitch = rng.uniform(90, 220)
+        syllable_rate = rng.uniform(3, 6)
+        voice = sum(np.sin(2 * np.pi * pitch * h * t) / h for h in range(1, 6))
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * syllable_rate * t)
+        samples[pos:end] += (0.2 * voice * envelope).astype(np.float32)
+
+        start_s, end_s = pos / SR, end / SR
+        regions.append((round(start_s, 3), round(end_s, 3)))
+
+        # ~2.5 words/s inside the burst
+        w = start_s
+        while True:
+            length = float(rng.uniform(0.15, 0.45))
+            if w + length > end_s:
+                break
+            words.append(
+                {
+                    "word": VOCAB[int(rng.integers(len(VOCAB)))],
+                    "start": round(w, 3),
+                    "end": round(w + length, 3),
+                    "score": round(float(rng.uniform(0.6, 1.0)), 3),
+                }
+            )
+            w += length + float(rng.uniform(0.02, 0.15))
+
+        pos = end + int(_pause(rng) * SR)
+
+    return Recording(f"synthetic_{minutes:g}min_seed{seed}", samples, regions, words)
+
+
+def make_corpus(lengths_minutes: List[float], seed: int = 0) -> List[Recording]:
+    """One recording per requested length (seeds offset so files differ)."""
+    return [make_recording(minutes, seed + i) for i, minutes in enumerate(lengths_minutes)]
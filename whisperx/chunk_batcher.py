@@ -0,0 +1,200 @@
+"""
+Chunk Batcher for WhisperX Large-File Mode
+Packs several VAD chunks into one batched inference call
+
+Short 30s chunks transcribed one at a time leave most of the GPU batch
+empty. The batcher groups chunks up to an audio-seconds budget, splits each
+chunk into Whisper-sized (<=30s) windows at the quietest point near the
+limit, and keeps the window -> chunk -> absolute time mapping so results
+can be placed back on the original timeline.
+"""
+
+import logging
+from typing import TYPE_CHECKING, List, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from video_segmenter import AudioSegment
+
+logger = logging.getLogger(__name__)
+
+# Whisper encodes fixed 30-second windows
+WHISPER_WINDOW_SECONDS = 30.0
+
+
+class ChunkWindow:
+    """One Whisper input window inside a chunk, with absolute timing."""
+
+    def __init__(self, chunk: "AudioSegment", start: float, end: float):
+        self.chunk = chunk
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"ChunkWindow(chunk={self.chunk.segment_id}, start={self.start:.2f}, end={self.end:.2f})"
+
+
+def plan_chunk_batches(
+    chunks: List["AudioSegment"],
+    max_chunks: int,
+    max_seconds: float = 0,
+) -> List[List["AudioSegment"]]:
+    """
+    Group consecutive chunks into batches for one inference call each.
+
+    Args:
+        chunks: Chunks in timeline order
+        max_chunks: Maximum chunks per batch
+        max_seconds: Maximum total audio seconds per batch (0 = unlimited)
+
+    Returns:
+        List of chunk batches (every batch has at least one chunk)
+    """
+    max_chunks = max(1, max_chunks)
+    batches: List[List["AudioSegment"]] = []
+    current: List["AudioSegment"] = []
+    current_seconds = 0.0
+
+    for chunk in chunks:
+        over_count = len(current) >= max_chunks
+        over_seconds = max_seconds and current_seconds + chunk.duration > max_seconds
+        if current and (over_count or over_seconds):
+            batches.append(current)
+            current = []
+            current_seconds = 0.0
+
+        current.append(chunk)
+        current_seconds += chunk.duration
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+def split_windows(
+    samples: np.ndarray,
+    sample_rate: int = 16000,
+    max_seconds: float = WHISPER_WINDOW_SECONDS,
+    search_seconds: float = 3.0,
+    frame_ms: int = 20,
+) -> List[Tuple[int, int]]:
+    """
+    Split audio into windows no longer than max_seconds.
+
+    Each cut is placed at the lowest-energy frame within the last
+    search_seconds before the limit, so words are rarely split.
+
+    Args:
+        samples: Mono audio samples
+        sample_rate: Sample rate of samples
+        max_seconds: Maximum window length
+        search_seconds: How far back from the limit to look for a quiet cut
+        frame_ms: Energy frame size in milliseconds
+
+    Returns:
+        List of (start_sample, end_sample) ranges covering the input
+    """
+    total = len(samples)
+    max_len = int(max_seconds * sample_rate)
+    if total <= max_len:
+        return [(0, total)] if total else []
+
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    search = min(int(search_seconds * sample_rate), max_len - frame)
+
+    windows = []
+    pos = 0
+    while total - pos > max_len:
+        limit = pos + max_len
+        region = samples[limit - search : limit]
+        n_frames = len(region) // frame
+
+        cut = limit
+        if n_frames > 0:
+            # Frame energies over a strided view (no copy of the region)
+            frames = region[: n_frames * frame].reshape(n_frames, frame)
+            energy = np.einsum("ij,ij->i", frames, frames)
+            cut = limit - search + int(np.argmin(energy)) * frame
+
+        windows.append((pos, cut))
+        pos = cut
+
+    windows.append((pos, total))
+    return windows
+
+
+def build_batch_windows(
+    audio,
+    batch: List["AudioSegment"],
+    max_seconds: float = WHISPER_WINDOW_SECONDS,
+) -> Tuple[List[np.ndarray], List[ChunkWindow]]:
+    """
+    Cut every chunk of a batch into Whisper windows.
+
+    Args:
+        audio: AudioBuffer for the job
+        batch: Chunks in this batch
+        max_seconds: Maximum window length
+
+    Returns:
+        (window sample views, window metadata) in matching order
+    """
+    inputs: List[np.ndarray] = []
+    windows: List[ChunkWindow] = []
+    sample_rate = audio.sample_rate
+
+    for chunk in batch:
+        chunk_audio = audio.slice(chunk.start, chunk.end)
+        chunk_offset = int(chunk.start * sample_rate) / sample_rate
+        for start_sample, end_sample in split_windows(
+            chunk_audio, sample_rate=sample_rate, max_seconds=max_seconds
+        ):
+            inputs.append(chunk_audio[start_sample:end_sample])
+            windows.append(
+                ChunkWindow(
+                    chunk,
+                    chunk_offset + start_sample / sample_rate,
+                    chunk_offset + end_sample / sample_rate,
+                )
+            )
+
+    return inputs, windows
+
+
+def group_window_results(
+    windows: List[ChunkWindow], texts: List[str]
+) -> List[dict]:
+    """
+    Map batched window transcripts back to per-chunk results.
+
+    Args:
+        windows: Window metadata from build_batch_windows
+        texts: Transcribed text per window (same order)
+
+    Returns:
+        Per-chunk result dicts with absolute segment timestamps, in chunk order
+    """
+    results = {}
+    for window, text in zip(windows, texts):
+        chunk = window.chunk
+        entry = results.setdefault(
+            chunk.segment_id,
+            {
+                "segment_id": chunk.segment_id,
+                "start": chunk.start,
+                "end": chunk.end,
+                "segments": [],
+            },
+        )
+        if text and text.strip():
+            entry["segments"].append(
+                {
+                    "text": text,
+                    "start": round(window.start, 3),
+                    "end": round(window.end, 3),
+                }
+            )
+
+    return [results[key] for key in sorted(results)]
@@ -6,13 +6,83 @@ Based on 2025 best practices for audio extraction and enhancement
 
 import subprocess
 import os
+import tempfile
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
 
 logger = logging.getLogger(__name__)
 
+# The ffmpeg binary only needs verifying once per process, however many
+# FFmpegProcessor instances are created
+_ffmpeg_verified = False
+_verify_lock = threading.Lock()
+
+
+class ProbeCache:
+    """
+    Process-wide cache of ffprobe results.
+
+    Keyed by resolved path + mtime + size, so a file is probed once no matter
+    how many components ask for its metadata, and a replaced or modified
+    file is probed again.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(path: str) -> Optional[Tuple]:
+        """Cache key for a file (None if it cannot be stat'ed)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+
+    def get(self, key: Optional[Tuple]) -> Optional[Dict]:
+        if key is None:
+            return None
+        with self._lock:
+            info = self._entries.get(key)
+            if info is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(info)
+
+    def put(self, key: Optional[Tuple], info: Dict):
+        if key is None or not info:
+            return
+        with self._lock:
+            self._entries[key] = dict(info)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+probe_cache = ProbeCache()
+
 
 class FFmpegProcessor:
     """
@@ -39,26 +109,64 @@ class FFmpegProcessor:
         self._verify_ffmpeg()
 
     def _verify_ffmpeg(self):
-        """Verify FFmpeg is installed and accessible."""
-        try:
-            subprocess.run(
-                ["ffmpeg", "-version"], capture_output=True, text=True, check=True
-            )
-            logger.info("FFmpeg verified successfully")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg verification failed: {e}")
-            raise RuntimeError("FFmpeg not found or not working")
+        """Verify FFmpeg is installed and accessible (once per process)."""
+        global _ffmpeg_verified
+
+        if _ffmpeg_verified:
+            return
+        with _verify_lock:
+            if _ffmpeg_verified:
+                return
+            try:
+                subprocess.run(
+                    ["ffmpeg", "-version"], capture_output=True, text=True, check=True
+                )
+                logger.info("FFmpeg verified successfully")
+            except (subprocess.CalledProcessError, FileNotFoundError) as e:
+                logger.error(f"FFmpeg verification failed: {e}")
+                raise RuntimeError("FFmpeg not found or not working")
+            _ffmpeg_verified = True
+
+    def _speech_filters(self) -> List[str]:
+        """Audio filter chain for speech enhancement (empty if disabled)."""
+        filters = []
+
+        if self.enhance_speech:
+            # High-pass filter: remove frequencies below 100Hz (removes rumble)
+            filters.append("highpass=f=100")
+
+            # Low-pass filter: remove frequencies above 10kHz (speech is <10kHz)
+            filters.append("lowpass=f=10000")
+
+            # Dynamic audio normalization (better than simple volume)
+            filters.append("dynaudnorm")
+
+        return filters
 
     def get_video_info(self, video_path: str) -> Dict:
         """
         Extract video metadata using ffprobe.
 
+        Results are cached process-wide by path + mtime + size, so repeated
+        lookups for the same file do not spawn ffprobe again.
+
         Args:
             video_path: Path to video file
 
         Returns:
             Dictionary with video metadata
         """
+        key = probe_cache.key(video_path)
+        info = probe_cache.get(key)
+        if info is not None:
+            return info
+
+        info = self._probe(video_path)
+        probe_cache.put(key, info)
+        return info
+
+    def _probe(self, video_path: str) -> Dict:
+        """Run ffprobe and extract the metadata used by the pipeline."""
         cmd = [
             "ffprobe",
             "-v",
@@ -140,17 +248,7 @@ class FFmpegProcessor:
         cmd.extend(["-i", video_path])
 
         # Audio filters for speech enhancement
-        filters = []
-
-        if self.enhance_speech:
-            # High-pass filter: remove frequencies below 100Hz (removes rumble)
-            filters.append("highpass=f=100")
-
-            # Low-pass filter: remove frequencies above 10kHz (speech is <10kHz)
-            filters.append("lowpass=f=10000")
-
-            # Dynamic audio normalization (better than simple volume)
-            filters.append("dynaudnorm")
+        filters = self._speech_filters()
 
         # Apply filters if any
         if filters:
@@ -179,6 +277,79 @@ class FFmpegProcessor:
             logger.error(f"FFmpeg extraction failed: {e.stderr}")
             raise RuntimeError(f"Audio extraction failed: {e.stderr}")
 
+    def stream_pcm(
+        self,
+        input_path: str,
+        sample_rate: int = 16000,
+        enhance: bool = False,
+        chunk_bytes: int = 1024 * 1024,
+    ) -> Iterator[bytes]:
+        """
+        Decode audio to raw mono float32 PCM (f32le) streamed from ffmpeg's stdout.
+
+        Produces the same samples as whisperx.load_audio (16kHz mono, [-1, 1])
+        without writing an intermediate WAV, so video extraction, probing and
+        decoding collapse into one ffmpeg run and no temp file touches the
+        shared volume.
+
+        Args:
+            input_path: Input audio or video file
+            sample_rate: Audio sample rate (default 16000 Hz)
+            enhance: Apply the speech enhancement filters (as extract_audio_optimized)
+            chunk_bytes: Bytes read from the pipe per chunk
+
+        Yields:
+            Raw f32le PCM byte chunks
+
+        Raises:
+            RuntimeError: If ffmpeg exits with an error
+        """
+        cmd = ["ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0"]
+        cmd.extend(["-i", input_path, "-vn"])
+
+        filters = self._speech_filters() if enhance else []
+        if filters:
+            cmd.extend(["-af", ",".join(filters)])
+
+        cmd.extend(
+            [
+                "-f",
+                "f32le",
+                "-acodec",
+                "pcm_f32le",
+                "-ac",
+                "1",
+                "-ar",
+                str(sample_rate),
+                "pipe:1",
+            ]
+        )
+
+        # stderr goes to a temp file so a chatty ffmpeg can never block the pipe
+        errors = tempfile.TemporaryFile()
+        process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=errors, stdin=subprocess.DEVNULL
+        )
+        try:
+            while True:
+                chunk = process.stdout.read(chunk_bytes)
+                if not chunk:
+                    break
+                yield chunk
+
+            if process.wait() != 0:
+                errors.seek(0)
+                stderr = errors.read().decode("utf-8", errors="replace")
+                logger.error(f"FFmpeg PCM stream failed: {stderr}")
+                raise RuntimeError(f"Audio decode failed: {stderr}")
+        finally:
+            # Consumer stopped early or failed: don't leave ffmpeg running
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            errors.close()
+
     def detect_silence(
         self,
         audio_path: str,
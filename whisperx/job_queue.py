@@ -0,0 +1,377 @@
+"""
+GPU Job Queue for WhisperX
+Bounded priority queue drained by a dedicated GPU worker thread
+
+Transcription is blocking torch/ffmpeg work. Running it directly inside
+`async def` endpoints stalls the event loop (including /health) for the
+whole job. Instead, endpoints submit jobs here and a single worker thread
+runs them one at a time on the GPU, so concurrent n8n workflows queue up
+with backpressure instead of timing out.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from progress_events import EventStream
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a queued job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class QueueFullError(Exception):
+    """Raised when the queue is at capacity (maps to HTTP 429)."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job when cancellation was requested."""
+
+
+class Job:
+    """A unit of GPU work with status, progress and result."""
+
+    def __init__(
+        self,
+        fn: Callable[["Job"], Any],
+        kind: str,
+        priority: int = 5,
+        params: Optional[Dict] = None,
+        cleanup: Optional[Callable[[], None]] = None,
+    ):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.priority = priority
+        self.params = params or {}
+        self.status = JobStatus.QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.progress = 0
+        self.stage = "queued"
+        self.message = ""
+        self.result: Any = None
+        # Result and event log were handed to the awaiting request, not kept
+        self.released = False
+        self.error: Optional[str] = None
+        self.future: Future = Future()
+        self.events = EventStream()
+
+        self._fn = fn
+        self._cleanup = cleanup
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Raise JobCancelled if cancellation was requested (call between stages)."""
+        if self._cancel_event.is_set():
+            raise JobCancelled(f"Job {self.id} cancelled")
+
+    def update(self, progress: int, stage: str, message: str = ""):
+        """Record progress of a running job (also published to its event stream)."""
+        self.progress = progress
+        self.stage = stage
+        self.message = message
+        self.events.publish(
+            "progress", {"progress": progress, "stage": stage, "message": message}
+        )
+
+    def release(self):
+        """Drop the result and event log of a finished job, keeping its status."""
+        self.result = None
+        self.released = True
+        self.events.discard()
+
+    def to_dict(self) -> Dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "priority": self.priority,
+            "status": self.status.value,
+            "progress": self.progress,
+            "stage": self.stage,
+            "message": self.message,
+            "error": self.error,
+            "released": self.released,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "params": self.params,
+        }
+
+
+class JobQueue:
+    """
+    Bounded priority queue with one worker thread.
+
+    Higher priority runs first; equal priorities run in submission order.
+    """
+
+    def __init__(self, max_size: int = 16, history_size: int = 200):
+        """
+        Initialize job queue.
+
+        Args:
+            max_size: Maximum number of queued (not yet running) jobs
+            history_size: Finished jobs kept for status/result lookups
+        """
+        self.max_size = max_size
+        self.history_size = history_size
+
+        self._heap: List = []
+        self._counter = itertools.count()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queued = 0
+        self._current: Optional[Job] = None
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._stopping = False
+
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    def start(self):
+        """Start the GPU worker thread."""
+        if self._worker is not None:
+            return
+        self._stopping = False
+        self._worker = threading.Thread(
+            target=self._run, name="gpu-worker", daemon=True
+        )
+        self._worker.start()
+        logger.info(f"GPU worker started (queue size {self.max_size})")
+
+    def stop(self):
+        """Stop the worker after the current job."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._worker = None
+
+    def submit(
+        self,
+        fn: Callable[[Job], Any],
+        kind: str,
+        priority: int = 5,
+        params: Optional[Dict] = None,
+        cleanup: Optional[Callable[[], None]] = None,
+    ) -> Job:
+        """
+        Enqueue a job.
+
+        Args:
+            fn: Callable run on the worker thread; receives the Job
+            kind: Job type label (e.g. 'transcribe-large')
+            priority: 1 (low) to 10 (high)
+            params: Request parameters echoed in job status
+            cleanup: Callable always run once the job is finished or discarded
+
+        Returns:
+            Queued Job
+
+        Raises:
+            QueueFullError: If max_size jobs are already waiting
+        """
+        job = Job(fn, kind, priority=priority, params=params, cleanup=cleanup)
+        with self._cond:
+            if self._queued >= self.max_size:
+                self.rejected += 1
+                raise QueueFullError(
+                    f"Job queue full ({self._queued}/{self.max_size} waiting)"
+                )
+            heapq.heappush(self._heap, (-priority, next(self._counter), job))
+            self._jobs[job.id] = job
+            self._queued += 1
+            self._trim_history_locked()
+            self._cond.notify()
+
+        logger.info(f"Queued job {job.id} ({kind}, priority {priority})")
+        return job
+
+    async def run(
+        self,
+        fn: Callable[[Job], Any],
+        kind: str,
+        priority: int = 5,
+        params: Optional[Dict] = None,
+        cleanup: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """
+        Submit a job and await its result without blocking the event loop.
+
+        If the awaiting request is cancelled (client disconnect), the job is
+        cancelled too. Once finished, the job stays in history with its status
+        only; the result belongs to the awaiting request and is not kept.
+        """
+        job = self.submit(fn, kind, priority=priority, params=params, cleanup=cleanup)
+        try:
+            return await asyncio.wrap_future(job.future)
+        except asyncio.CancelledError:
+            self.cancel(job.id)
+            raise
+        finally:
+            if job.future.done():
+                job.release()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by id."""
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position of a queued job in run order (None if not queued)."""
+        with self._cond:
+            ordered = sorted(
+                (entry for entry in self._heap if entry[2].status == JobStatus.QUEUED),
+                key=lambda entry: entry[:2],
+            )
+            for index, entry in enumerate(ordered):
+                if entry[2].id == job_id:
+                    return index + 1
+        return None
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job.
+
+        Queued jobs are removed immediately; running jobs are flagged and stop
+        at their next check_cancelled() call.
+
+        Returns:
+            True if the job existed and was not already finished
+        """
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in (JobStatus.QUEUED, JobStatus.RUNNING):
+                return False
+
+            job._cancel_event.set()
+            if job.status == JobStatus.QUEUED:
+                self._queued -= 1
+                self._finish_locked(job, JobStatus.CANCELLED, error="Cancelled")
+                self._heap = [entry for entry in self._heap if entry[2] is not job]
+                heapq.heapify(self._heap)
+
+        logger.info(f"Cancellation requested for job {job_id}")
+        return True
+
+    def list_jobs(self) -> List[Dict]:
+        """Status of all tracked jobs, newest first."""
+        with self._cond:
+            return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "queued": self._queued,
+                "max_size": self.max_size,
+                "running": self._current.id if self._current else None,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "rejected": self.rejected,
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+                self._queued -= 1
+                job.status = JobStatus.RUNNING
+                job.started_at = time.time()
+                job.stage = "running"
+                self._current = job
+            job.events.publish("status", {"status": job.status.value})
+
+            logger.info(f"Running job {job.id} ({job.kind})")
+            try:
+                job.check_cancelled()
+                result = job._fn(job)
+            except JobCancelled:
+                with self._cond:
+                    self._finish_locked(job, JobStatus.CANCELLED, error="Cancelled")
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {e}", exc_info=True)
+                with self._cond:
+                    self._finish_locked(job, JobStatus.FAILED, error=str(e), exc=e)
+            else:
+                with self._cond:
+                    self._finish_locked(job, JobStatus.COMPLETED, result=result)
+            finally:
+                with self._cond:
+                    self._current = None
+
+    def _finish_locked(
+        self,
+        job: Job,
+        status: JobStatus,
+        result: Any = None,
+        error: Optional[str] = None,
+        exc: Optional[BaseException] = None,
+    ):
+        job.status = status
+        job.finished_at = time.time()
+        job.result = result
+        job.error = error
+        job.stage = status.value
+        if status == JobStatus.COMPLETED:
+            job.progress = 100
+            self.completed += 1
+        elif status == JobStatus.FAILED:
+            self.failed += 1
+        else:
+            self.cancelled += 1
+
+        if job._cleanup:
+            try:
+                job._cleanup()
+            except Exception as e:
+                logger.warning(f"Cleanup for job {job.id} failed: {e}")
+
+        if status == JobStatus.COMPLETED:
+            job.events.publish("result", result)
+        else:
+            job.events.publish("error", {"status": status.value, "error": error})
+        job.events.close()
+
+        if not job.future.done():
+            if status == JobStatus.COMPLETED:
+                job.future.set_result(result)
+            elif status == JobStatus.CANCELLED:
+                job.future.set_exception(JobCancelled(error or "Cancelled"))
+            else:
+                job.future.set_exception(exc or RuntimeError(error))
+
+    def _trim_history_locked(self):
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.status not in (JobStatus.QUEUED, JobStatus.RUNNING)
+        ]
+        for job_id in finished[: max(0, len(self._jobs) - self.history_size)]:
+            del self._jobs[job_id]
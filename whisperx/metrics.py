@@ -0,0 +1,228 @@
+"""
+Stage Metrics for WhisperX
+Resource sampling and Prometheus text-format histograms
+
+ResourceMonitor samples process RSS (and CUDA memory when a probe is given)
+on a background thread while any stage is being tracked, so each stage gets
+the peak memory reached while it was busy, not just a reading at its end.
+MetricsRegistry holds labelled histograms and callback gauges and renders
+them in the Prometheus text exposition format for GET /metrics, without
+needing prometheus_client.
+"""
+
+import bisect
+import logging
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Stage wall time buckets (seconds): sub-second units up to hour-long jobs
+SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+# Memory buckets (bytes): 256MB .. 64GB
+BYTES_BUCKETS = tuple(2**i * 256 * 1024**2 for i in range(9))
+
+
+def process_rss_bytes() -> int:
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        # No procfs: fall back to the lifetime peak (KB on Linux)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ResourceMonitor:
+    """
+    Tracks peak resource usage over (possibly concurrent) time windows.
+
+    Probes are only sampled while at least one window is open.
+    """
+
+    def __init__(
+        self,
+        probes: Optional[Dict[str, Callable[[], float]]] = None,
+        interval: float = 0.05,
+    ):
+        """
+        Initialize monitor.
+
+        Args:
+            probes: Name -> callable returning the current value (default: RSS bytes)
+            interval: Sampling period in seconds
+        """
+        self.probes = probes if probes is not None else {"rss_bytes": process_rss_bytes}
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._windows: List[Dict[str, float]] = []
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> Dict[str, float]:
+        """Read every probe once and raise the peaks of all open windows."""
+        values = {}
+        for name, probe in self.probes.items():
+            try:
+                values[name] = float(probe())
+            except Exception as e:
+                logger.debug(f"Resource probe {name} failed: {e}")
+        with self._lock:
+            for window in self._windows:
+                for name, value in values.items():
+                    if value > window.get(name, float("-inf")):
+                        window[name] = value
+        return values
+
+    @contextmanager
+    def track(self):
+        """
+        Track peaks while the block runs.
+
+        Yields:
+            Dict filled with the peak value of each probe when the block ends
+        """
+        window: Dict[str, float] = {}
+        with self._lock:
+            self._windows.append(window)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="resource-monitor", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+        self.sample()
+        try:
+            yield window
+        finally:
+            self.sample()
+            with self._lock:
+                self._windows.remove(window)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                idle = not self._windows
+                if idle:
+                    self._wake.clear()
+            if idle:
+                continue
+            self.sample()
+            time.sleep(self.interval)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with labels (Prometheus semantics).
+    """
+
+    def __init__(self, name: str, help: str, buckets: Iterable[float], labelnames=()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        """Record one observation."""
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict]:
+        """Per-label-set cumulative bucket counts, sum and count."""
+        with self._lock:
+            result = {}
+            for key, (counts, total, count) in self._series.items():
+                cumulative, running = [], 0
+                for bucket_count in counts:
+                    running += bucket_count
+                    cumulative.append(running)
+                result[key] = {"buckets": cumulative, "sum": total, "count": count}
+            return result
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        bounds = self.buckets + (float("inf"),)
+        for key, series in sorted(self.snapshot().items()):
+            labels = list(zip(self.labelnames, key))
+            for bound, count in zip(bounds, series["buckets"]):
+                le = _format_labels(labels + [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{le} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {series['sum']}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Histograms plus gauges/counters read from callbacks at scrape time.
+    """
+
+    def __init__(self):
+        self._histograms: List[Histogram] = []
+        self._callbacks: List[Tuple[str, str, str, Callable]] = []
+
+    def histogram(
+        self, name: str, help: str, buckets: Iterable[float], labelnames=()
+    ) -> Histogram:
+        histogram = Histogram(name, help, buckets, labelnames)
+        self._histograms.append(histogram)
+        return histogram
+
+    def gauge(self, name: str, help: str, fn: Callable, kind: str = "gauge"):
+        """
+        Register a value computed at scrape time.
+
+        fn returns a number, or a dict mapping label tuples ((name, value), ...)
+        to numbers for labelled series.
+        """
+        self._callbacks.append((name, help, kind, fn))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+        for name, help, kind, fn in self._callbacks:
+            try:
+                value = fn()
+            except Exception as e:
+                logger.warning(f"Metric {name} failed: {e}")
+                continue
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            series = value if isinstance(value, dict) else {(): value}
+            for labels, number in series.items():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(number)}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,339 @@
+"""
+Resident Model Pool for WhisperX
+Keeps loaded models in memory across requests instead of loading per request
+
+Models are keyed (e.g. model name x compute type x language) and evicted in
+least-recently-used order when a memory budget, an entry limit, or an idle
+TTL is exceeded. Hit/miss/eviction counters show how much load time the pool
+saves under steady traffic.
+"""
+
+import gc
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Held around loads whose size is measured from the device memory delta, so
+# concurrent loads (of any pool on the device) are not counted in each other
+_measure_lock = threading.Lock()
+
+
+class PoolEntry:
+    """A resident model with its accounting metadata."""
+
+    def __init__(self, key: Hashable, value: Any, size_mb: float, load_time: float):
+        self.key = key
+        self.value = value
+        self.size_mb = size_mb
+        self.load_time = load_time
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        self.hits = 0
+
+    def to_dict(self) -> Dict:
+        now = time.time()
+        return {
+            "key": list(self.key) if isinstance(self.key, tuple) else self.key,
+            "size_mb": round(self.size_mb, 1),
+            "load_time": round(self.load_time, 3),
+            "hits": self.hits,
+            "age_seconds": round(now - self.loaded_at, 1),
+            "idle_seconds": round(now - self.last_used, 1),
+        }
+
+
+class ModelPool:
+    """
+    Thread-safe LRU pool of loaded models.
+
+    Features:
+    - Keyed lookup with lazy loading through a caller-supplied loader
+    - LRU eviction against a memory budget and a maximum entry count
+    - Idle TTL eviction (on access and from an optional background reaper)
+    - Hit/miss/eviction counters and total load time saved
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_memory_mb: float = 0,
+        max_entries: int = 0,
+        idle_ttl: float = 0,
+        memory_probe: Optional[Callable[[], float]] = None,
+        on_evict: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Initialize model pool.
+
+        Args:
+            name: Pool name used in logs and stats
+            max_memory_mb: Memory budget in MB (0 = unlimited)
+            max_entries: Maximum number of resident models (0 = unlimited)
+            idle_ttl: Evict models unused for this many seconds (0 = never)
+            memory_probe: Callable returning current device memory use in MB,
+                used to measure a model's footprint when no size is given
+            on_evict: Callable invoked after an entry is dropped (e.g. to
+                release cached CUDA blocks)
+        """
+        self.name = name
+        self.max_memory_mb = max_memory_mb
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self.memory_probe = memory_probe
+        self.on_evict = on_evict
+
+        self._entries: "OrderedDict[Hashable, PoolEntry]" = OrderedDict()
+        # Keys being loaded -> event set when the load finishes or fails
+        self._loading: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.RLock()
+        self._reaper: Optional[threading.Thread] = None
+        self._stop_reaper = threading.Event()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_time_total = 0.0
+        self.load_time_saved = 0.0
+
+    @property
+    def used_mb(self) -> float:
+        """Total accounted memory of resident models in MB."""
+        with self._lock:
+            return sum(entry.size_mb for entry in self._entries.values())
+
+    def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        size_mb: Optional[float] = None,
+    ) -> Any:
+        """
+        Return the resident model for key, loading it on a miss.
+
+        The loader runs without the pool lock held; concurrent lookups of a
+        key that is being loaded wait for that load instead of starting another.
+        Loads measured through memory_probe run one at a time across all pools.
+
+        Args:
+            key: Pool key (e.g. (model, compute_type, language))
+            loader: Zero-argument callable that loads the model
+            size_mb: Known model footprint in MB (measured via memory_probe if None)
+
+        Returns:
+            Loaded model instance
+        """
+        while True:
+            with self._lock:
+                self._evict_idle_locked()
+
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    entry.last_used = time.time()
+                    entry.hits += 1
+                    self.hits += 1
+                    self.load_time_saved += entry.load_time
+                    logger.info(f"[{self.name} pool] hit {key}")
+                    return entry.value
+
+                loading = self._loading.get(key)
+                if loading is None:
+                    self.misses += 1
+                    logger.info(f"[{self.name} pool] miss {key}, loading...")
+
+                    # Make room before loading so the new model does not overshoot the budget
+                    self._make_room_locked(size_mb or 0)
+                    loading = self._loading[key] = threading.Event()
+                    break
+
+            # Another thread is loading this key; use its model (or retry if it failed)
+            loading.wait()
+
+        # Load outside the lock so lookups, stats and evictions of other keys
+        # are not blocked for the length of a model load
+        try:
+            if size_mb is None and self.memory_probe:
+                with _measure_lock:
+                    before_mb = self.memory_probe()
+                    value, load_time = self._timed_load(loader)
+                    size_mb = max(0.0, self.memory_probe() - before_mb)
+            else:
+                value, load_time = self._timed_load(loader)
+                size_mb = size_mb or 0.0
+        except BaseException:
+            with self._lock:
+                self._loading.pop(key).set()
+            raise
+
+        with self._lock:
+            self._entries[key] = PoolEntry(key, value, size_mb, load_time)
+            self.load_time_total += load_time
+            logger.info(
+                f"[{self.name} pool] loaded {key} in {load_time:.1f}s ({size_mb:.0f}MB)"
+            )
+
+            # Measured size may exceed the budget now; trim older entries
+            self._make_room_locked(0, protect=key)
+            self._loading.pop(key).set()
+        return value
+
+    @staticmethod
+    def _timed_load(loader: Callable[[], Any]):
+        load_start = time.time()
+        value = loader()
+        return value, time.time() - load_start
+
+    def evict(self, key: Hashable) -> bool:
+        """
+        Evict a single entry.
+
+        Args:
+            key: Pool key (a list, as shown by entries(), matches the tuple key)
+
+        Returns:
+            True if the entry was resident
+        """
+        if isinstance(key, list):
+            key = tuple(key)
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._drop_locked(key, reason="manual")
+        self._release()
+        return True
+
+    def evict_idle(self) -> int:
+        """
+        Evict entries idle longer than the TTL.
+
+        Returns:
+            Number of evicted entries
+        """
+        with self._lock:
+            count = self._evict_idle_locked()
+        if count:
+            self._release()
+        return count
+
+    def clear(self) -> int:
+        """
+        Evict all entries.
+
+        Returns:
+            Number of evicted entries
+        """
+        with self._lock:
+            keys = list(self._entries.keys())
+            for key in keys:
+                self._drop_locked(key, reason="clear")
+        if keys:
+            self._release()
+        return len(keys)
+
+    def start_reaper(self, interval: float = 30.0):
+        """
+        Start a daemon thread that evicts idle entries periodically.
+
+        Args:
+            interval: Seconds between idle sweeps
+        """
+        if not self.idle_ttl or self._reaper is not None:
+            return
+
+        def _run():
+            while not self._stop_reaper.wait(interval):
+                try:
+                    self.evict_idle()
+                except Exception as e:
+                    logger.warning(f"[{self.name} pool] idle sweep failed: {e}")
+
+        self._reaper = threading.Thread(
+            target=_run, name=f"{self.name}-pool-reaper", daemon=True
+        )
+        self._reaper.start()
+
+    def stop_reaper(self):
+        """Stop the idle reaper thread."""
+        self._stop_reaper.set()
+        self._reaper = None
+
+    def entries(self) -> List[Dict]:
+        """List resident entries, least recently used first."""
+        with self._lock:
+            return [entry.to_dict() for entry in self._entries.values()]
+
+    def stats(self) -> Dict:
+        """Pool counters and configuration."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "resident": len(self._entries),
+                "used_mb": round(self.used_mb, 1),
+                "max_memory_mb": self.max_memory_mb,
+                "max_entries": self.max_entries,
+                "idle_ttl": self.idle_ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "load_time_total": round(self.load_time_total, 2),
+                "load_time_saved": round(self.load_time_saved, 2),
+            }
+
+    def _make_room_locked(self, incoming_mb: float, protect: Hashable = None):
+        """Evict LRU entries until the budget and entry limit allow incoming_mb."""
+        evicted = False
+        while self._entries:
+            over_count = (
+                self.max_entries
+                and len(self._entries) + (0 if protect is not None else 1)
+                > self.max_entries
+            )
+            over_memory = (
+                self.max_memory_mb
+                and self.used_mb + incoming_mb > self.max_memory_mb
+            )
+            if not over_count and not over_memory:
+                break
+
+            victim = next(iter(self._entries))
+            if victim == protect:
+                # Only the protected entry is left; it stays even if over budget
+                if len(self._entries) == 1:
+                    break
+                victim = list(self._entries.keys())[1]
+            self._drop_locked(victim, reason="lru")
+            evicted = True
+
+        if evicted:
+            self._release()
+
+    def _evict_idle_locked(self) -> int:
+        if not self.idle_ttl:
+            return 0
+        cutoff = time.time() - self.idle_ttl
+        stale = [k for k, e in self._entries.items() if e.last_used < cutoff]
+        for key in stale:
+            self._drop_locked(key, reason="idle")
+        return len(stale)
+
+    def _drop_locked(self, key: Hashable, reason: str):
+        entry = self._entries.pop(key)
+        self.evictions += 1
+        logger.info(
+            f"[{self.name} pool] evicted {key} ({reason}, {entry.size_mb:.0f}MB, {entry.hits} hits)"
+        )
+        del entry
+
+    def _release(self):
+        gc.collect()
+        if self.on_evict:
+            try:
+                self.on_evict()
+            except Exception as e:
+                logger.warning(f"[{self.name} pool] release hook failed: {e}")
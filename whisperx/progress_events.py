@@ -0,0 +1,244 @@
+"""
+Progress Events for WhisperX Jobs
+Per-job event streams and non-blocking progress callbacks
+
+A job publishes progress updates, finalized segments and its final result
+to an EventStream from the GPU worker thread. HTTP clients subscribe from
+the event loop (SSE or NDJSON) and receive everything published so far
+followed by live events, so the first minutes of a long file can be used
+while the rest is still being transcribed.
+
+Progress callbacks (callback_url) are posted by a background sender thread
+instead of blocking the GPU worker on an HTTP round trip before every chunk.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EventStream:
+    """
+    Append-only, replayable event log for one job.
+
+    publish() may be called from any thread; subscribe() is consumed from an
+    asyncio event loop. Each event gets an increasing id so clients can
+    resume after a reconnect (SSE Last-Event-ID).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events: List[Dict] = []
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self.closed = False
+
+    def publish(self, event: str, data: Dict) -> Optional[Dict]:
+        """
+        Append an event and wake up subscribers.
+
+        Returns:
+            The stored event, or None if the stream is already closed
+        """
+        with self._lock:
+            if self.closed:
+                return None
+            entry = {"id": len(self._events) + 1, "event": event, "data": data}
+            self._events.append(entry)
+            subscribers = list(self._subscribers)
+
+        for loop, q in subscribers:
+            try:
+                loop.call_soon_threadsafe(q.put_nowait, entry)
+            except RuntimeError:
+                # Subscriber's event loop is gone
+                pass
+        return entry
+
+    def close(self):
+        """Mark the stream finished; subscribers drain and stop."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            subscribers = list(self._subscribers)
+
+        for loop, q in subscribers:
+            try:
+                loop.call_soon_threadsafe(q.put_nowait, None)
+            except RuntimeError:
+                pass
+
+    def discard(self):
+        """Close the stream and drop its replay log (later subscribers get nothing)."""
+        self.close()
+        with self._lock:
+            self._events = []
+
+    def events(self, after: int = 0) -> List[Dict]:
+        """Events published so far with id > after."""
+        with self._lock:
+            return self._events[after:]
+
+    async def subscribe(
+        self, after: int = 0, heartbeat: Optional[float] = None
+    ) -> AsyncIterator[Optional[Dict]]:
+        """
+        Replay events with id > after, then follow live events until closed.
+
+        Args:
+            after: Last event id the client already has
+            heartbeat: Yield None after this many idle seconds (keep-alive)
+
+        Yields:
+            Event dicts ({"id", "event", "data"}), or None as a heartbeat
+        """
+        loop = asyncio.get_running_loop()
+        q: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            backlog = self._events[after:]
+            closed = self.closed
+            if not closed:
+                self._subscribers.append((loop, q))
+
+        try:
+            for entry in backlog:
+                yield entry
+            if closed:
+                return
+
+            while True:
+                try:
+                    entry = await asyncio.wait_for(q.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if entry is None:
+                    return
+                yield entry
+        finally:
+            with self._lock:
+                if (loop, q) in self._subscribers:
+                    self._subscribers.remove((loop, q))
+
+
+def format_sse(entry: Optional[Dict]) -> str:
+    """Server-Sent Events frame for an event (None = keep-alive comment)."""
+    if entry is None:
+        return ": keep-alive\n\n"
+    data = json.dumps(entry["data"], default=str)
+    return f"id: {entry['id']}\nevent: {entry['event']}\ndata: {data}\n\n"
+
+
+def format_ndjson(entry: Optional[Dict]) -> str:
+    """One NDJSON line for an event (None = heartbeat line)."""
+    if entry is None:
+        return json.dumps({"event": "heartbeat"}) + "\n"
+    return json.dumps(entry, default=str) + "\n"
+
+
+class ProgressCallbackSender:
+    """
+    Posts progress callbacks from a background thread.
+
+    send() never blocks. If a callback endpoint is slower than the job,
+    pending updates for the same job are coalesced so only the latest
+    progress is delivered.
+    """
+
+    def __init__(self, timeout: float = 5.0, post: Optional[Callable] = None):
+        """
+        Initialize callback sender.
+
+        Args:
+            timeout: HTTP timeout per callback in seconds
+            post: requests.post-compatible callable (defaults to requests.post)
+        """
+        if post is None:
+            import requests
+
+            post = requests.post
+
+        self.timeout = timeout
+        self._post = post
+        self._pending: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._stopping = False
+
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+
+    def start(self):
+        """Start the sender thread."""
+        if self._worker is not None:
+            return
+        self._stopping = False
+        self._worker = threading.Thread(
+            target=self._run, name="progress-callbacks", daemon=True
+        )
+        self._worker.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Deliver what is pending (up to timeout) and stop the thread."""
+        worker = self._worker
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if worker:
+            worker.join(timeout)
+        self._worker = None
+
+    def send(self, callback_url: str, payload: Dict):
+        """Queue a payload for callback_url, replacing an undelivered one for the same job."""
+        key = (callback_url, str(payload.get("job_id")))
+        with self._cond:
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = payload
+            self._cond.notify()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "sent": self.sent,
+                "failed": self.failed,
+                "coalesced": self.coalesced,
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                (callback_url, _), payload = self._pending.popitem(last=False)
+
+            try:
+                response = self._post(callback_url, json=payload, timeout=self.timeout)
+                if response.status_code == 200:
+                    logger.debug(
+                        f"Progress callback sent: {payload.get('progress')}% - {payload.get('message')}"
+                    )
+                    ok = True
+                else:
+                    logger.warning(
+                        f"Progress callback failed with status {response.status_code}"
+                    )
+                    ok = False
+            except Exception as e:
+                logger.warning(f"Failed to send progress callback: {e}")
+                ok = False
+
+            with self._cond:
+                if ok:
+                    self.sent += 1
+                else:
+                    self.failed += 1
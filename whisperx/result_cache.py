@@ -0,0 +1,211 @@
+"""
+Content-Addressed Result Cache for WhisperX
+On-disk cache of pipeline stage outputs with size-based LRU eviction
+
+Workflow retries often re-upload the same media. Stage outputs (raw ASR,
+aligned segments, diarized segments) are stored under a key derived from the
+audio content hash plus every parameter that affects that stage, so a repeat
+request is served from disk and a request that only changes later-stage
+settings (e.g. diarization) reuses the earlier stages.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
+
+
+def hash_file(path: Path, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """SHA-256 hex digest of a file, read in chunks."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def make_key(*parts, **params) -> str:
+    """
+    Build a cache key from positional parts and keyword parameters.
+
+    Parameter order does not matter; values must be JSON-serializable.
+    """
+    payload = json.dumps([parts, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Stage-keyed JSON result cache with a total size limit.
+
+    Entries live at <cache_dir>/<stage>/<key>.json. Least recently used
+    entries are evicted once the total exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 0):
+        """
+        Initialize result cache.
+
+        Args:
+            cache_dir: Directory holding cached entries
+            max_bytes: Total size limit in bytes (0 = cache disabled)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[Path, int]" = OrderedDict()
+        self._bytes = 0
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.evictions = 0
+
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._load_index()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, stage: str, key: Optional[str]) -> Optional[dict]:
+        """
+        Look up a cached stage result.
+
+        Args:
+            stage: Stage name (e.g. 'asr', 'aligned', 'diarized')
+            key: Cache key (None = caching disabled for this request)
+
+        Returns:
+            Cached dict, or None on miss
+        """
+        if key is None or not self.enabled:
+            return None
+
+        path = self._path(stage, key)
+        with self._lock:
+            known = path in self._index
+            if known:
+                self._index.move_to_end(path)
+
+        value = None
+        if known:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    value = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable cache entry {path.name}: {e}")
+                self._remove(path)
+
+        with self._lock:
+            counter = self.hits if value is not None else self.misses
+            counter[stage] = counter.get(stage, 0) + 1
+
+        if value is not None:
+            logger.info(f"Result cache hit: {stage} {key[:12]}")
+        return value
+
+    def put(self, stage: str, key: Optional[str], value: dict):
+        """Store a stage result (atomic write), then evict down to max_bytes."""
+        if key is None or not self.enabled:
+            return
+
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(value, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to cache {stage} result: {e}")
+            tmp.unlink(missing_ok=True)
+            return
+
+        size = path.stat().st_size
+        with self._lock:
+            self._bytes -= self._index.pop(path, 0)
+            self._index[path] = size
+            self._bytes += size
+            victims = self._evict_locked()
+
+        for victim in victims:
+            victim.unlink(missing_ok=True)
+
+    def clear(self) -> int:
+        """Remove all entries. Returns the number removed."""
+        with self._lock:
+            paths = list(self._index)
+            self._index.clear()
+            self._bytes = 0
+
+        for path in paths:
+            path.unlink(missing_ok=True)
+        return len(paths)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._index),
+                "size_mb": round(self._bytes / (1024 * 1024), 1),
+                "max_mb": round(self.max_bytes / (1024 * 1024), 1),
+                "hits": dict(self.hits),
+                "misses": dict(self.misses),
+                "evictions": self.evictions,
+            }
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.cache_dir / stage / f"{key}.json"
+
+    def _load_index(self):
+        # Rebuild LRU order from modification times (touched on every hit)
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+
+        for _, path, size in sorted(entries):
+            self._index[path] = size
+            self._bytes += size
+
+        with self._lock:
+            victims = self._evict_locked()
+        for victim in victims:
+            victim.unlink(missing_ok=True)
+
+        if self._index:
+            logger.info(
+                f"Result cache: {len(self._index)} entries, {self._bytes / 1e6:.1f}MB"
+            )
+
+    def _evict_locked(self):
+        victims = []
+        while self._bytes > self.max_bytes and self._index:
+            path, size = self._index.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            victims.append(path)
+        return victims
+
+    def _remove(self, path: Path):
+        with self._lock:
+            self._bytes -= self._index.pop(path, 0)
+        path.unlink(missing_ok=True)
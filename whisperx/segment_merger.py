@@ -0,0 +1,420 @@
+"""
+Overlap-Aware Segment Merger for WhisperX Large-File Mode
+Deduplicates speech transcribed twice in overlapping chunk windows
+
+VAD and time-based chunks overlap by up to `overlap_duration` seconds on
+each side, so the same speech is transcribed by two neighbouring chunks.
+At each boundary the merger picks a cut in the middle of the overlap,
+keeps each chunk's side of it, and reconciles the segments that straddle
+the cut:
+- With word timestamps: words are split at the cut and near-duplicate
+  words (same text, overlapping time) keep the higher-confidence copy
+- Without word timestamps (raw ASR output, before alignment): the repeated
+  word run is found by sequence matching and removed from the later chunk,
+  with segment bounds re-estimated so alignment only sees each word once.
+  Word times are estimated from character offsets; a run only counts as
+  repeated when it lies inside the time overlap of the two segments at
+  about the same time in both, so common phrases elsewhere are kept
+"""
+
+import logging
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_NORMALIZE_RE = re.compile(r"[^\w']+")
+
+
+def _normalize(word: str) -> str:
+    return _NORMALIZE_RE.sub("", word.lower())
+
+
+def _words_have_timing(segment: dict) -> bool:
+    words = segment.get("words")
+    return bool(words) and all(
+        w.get("start") is not None and w.get("end") is not None for w in words
+    )
+
+
+def _estimate_token_times(segment: dict, tokens: List[str]) -> List[Tuple[float, float]]:
+    """(start, end) of each token, spread over the segment by character offset."""
+    start = segment["start"]
+    duration = segment["end"] - start
+    total = max(1, len(" ".join(tokens)))
+    times = []
+    offset = 0
+    for token in tokens:
+        times.append(
+            (start + duration * offset / total, start + duration * (offset + len(token)) / total)
+        )
+        offset += len(token) + 1
+    return times
+
+
+def _rebuild_from_words(segment: dict, words: List[dict]) -> Optional[dict]:
+    """Return a copy of segment restricted to words (None if no words left)."""
+    if not words:
+        return None
+    segment = dict(segment)
+    segment["words"] = words
+    segment["text"] = " " + " ".join(w.get("word", "").strip() for w in words)
+    segment["start"] = min(w["start"] for w in words)
+    segment["end"] = max(w["end"] for w in words)
+    return segment
+
+
+class MergeStats:
+    """Counters describing how much duplicated output the merge removed."""
+
+    def __init__(self):
+        self.boundaries = 0
+        self.segments_dropped = 0
+        self.words_removed = 0
+        self.duplicate_seconds = 0.0
+        self.chars_before = 0
+        self.chars_after = 0
+
+    def to_dict(self) -> Dict:
+        reduction = (
+            1 - self.chars_after / self.chars_before if self.chars_before else 0.0
+        )
+        return {
+            "boundaries": self.boundaries,
+            "segments_dropped": self.segments_dropped,
+            "words_removed": self.words_removed,
+            "duplicate_seconds": round(self.duplicate_seconds, 3),
+            "chars_before": self.chars_before,
+            "chars_after": self.chars_after,
+            "size_reduction": round(reduction, 4),
+        }
+
+
+class OverlapMerger:
+    """
+    Incremental merger for per-chunk transcription results.
+
+    Chunks are added in timeline order; segments are returned as soon as
+    the boundary after them is resolved, so callers can stream or align
+    finished segments while later chunks are still being transcribed.
+    """
+
+    def __init__(
+        self,
+        min_match_words: int = 2,
+        word_time_tolerance: float = 0.3,
+        text_time_tolerance: float = 3.0,
+    ):
+        """
+        Initialize merger.
+
+        Args:
+            min_match_words: Minimum repeated word run treated as duplicate text
+            word_time_tolerance: Max start-time difference (s) for duplicate words
+            text_time_tolerance: Max difference (s) between the estimated times of
+                a repeated run in the two segments (no word timing)
+        """
+        self.min_match_words = min_match_words
+        self.word_time_tolerance = word_time_tolerance
+        self.text_time_tolerance = text_time_tolerance
+        self.stats = MergeStats()
+        self._pending: List[dict] = []
+        self._pending_end: Optional[float] = None
+
+    def add(self, chunk_result: dict) -> List[dict]:
+        """
+        Add the next chunk's result.
+
+        Args:
+            chunk_result: Dict with 'start', 'end' (chunk bounds) and 'segments'
+
+        Returns:
+            Segments finalized by this call (timeline order)
+        """
+        segments = sorted(
+            (dict(s) for s in chunk_result.get("segments", [])),
+            key=lambda s: s.get("start", 0),
+        )
+        self.stats.chars_before += sum(len(s.get("text", "")) for s in segments)
+
+        chunk_start = chunk_result.get("start", segments[0]["start"] if segments else 0)
+        chunk_end = chunk_result.get("end", segments[-1]["end"] if segments else 0)
+
+        if self._pending_end is not None and chunk_start < self._pending_end:
+            self.stats.boundaries += 1
+            cut = (chunk_start + self._pending_end) / 2
+            self._pending, segments = self._resolve_boundary(
+                self._pending, segments, cut
+            )
+
+        finalized = self._pending
+        self._pending = segments
+        self._pending_end = chunk_end
+        return self._finalize(finalized)
+
+    def flush(self) -> List[dict]:
+        """
+        Return the remaining segments of the last chunk.
+
+        Returns:
+            Remaining finalized segments
+        """
+        finalized = self._pending
+        self._pending = []
+        self._pending_end = None
+        return self._finalize(finalized)
+
+    def _finalize(self, segments: List[dict]) -> List[dict]:
+        self.stats.chars_after += sum(len(s.get("text", "")) for s in segments)
+        return segments
+
+    def _resolve_boundary(
+        self, prev: List[dict], nxt: List[dict], cut: float
+    ) -> Tuple[List[dict], List[dict]]:
+        """Keep prev before the cut and nxt after it, reconciling straddlers."""
+        kept_prev, prev_straddler = [], None
+        for seg in prev:
+            if seg["end"] <= cut:
+                kept_prev.append(seg)
+            elif seg["start"] < cut:
+                prev_straddler = seg
+            else:
+                self._drop(seg)
+
+        kept_next, next_straddler = [], None
+        for seg in nxt:
+            if seg["start"] >= cut:
+                kept_next.append(seg)
+            elif seg["end"] > cut:
+                next_straddler = seg
+            else:
+                self._drop(seg)
+
+        # A straddler's far side duplicates the neighbour's nearest segment; when
+        # only one side straddles, reconcile it against that nearest segment
+        if prev_straddler is None and next_straddler is not None and kept_prev:
+            prev_straddler = kept_prev.pop()
+        if next_straddler is None and prev_straddler is not None and kept_next:
+            next_straddler = kept_next.pop(0)
+
+        if prev_straddler and next_straddler:
+            if _words_have_timing(prev_straddler) and _words_have_timing(
+                next_straddler
+            ):
+                prev_straddler, next_straddler = self._merge_words(
+                    prev_straddler, next_straddler, cut
+                )
+            else:
+                prev_straddler, next_straddler = self._merge_text(
+                    prev_straddler, next_straddler
+                )
+
+        if prev_straddler:
+            kept_prev.append(prev_straddler)
+        if next_straddler:
+            kept_next.insert(0, next_straddler)
+        return kept_prev, kept_next
+
+    def _drop(self, segment: dict):
+        self.stats.segments_dropped += 1
+        self.stats.words_removed += len(segment.get("text", "").split())
+        self.stats.duplicate_seconds += max(0.0, segment["end"] - segment["start"])
+
+    def _merge_words(
+        self, prev: dict, nxt: dict, cut: float
+    ) -> Tuple[Optional[dict], Optional[dict]]:
+        """Split timed words at the cut and keep the better copy of duplicates."""
+        prev_words = [w for w in prev["words"] if (w["start"] + w["end"]) / 2 < cut]
+        next_words = [w for w in nxt["words"] if (w["start"] + w["end"]) / 2 >= cut]
+        removed = len(prev["words"]) - len(prev_words)
+        removed += len(nxt["words"]) - len(next_words)
+
+        # The same word can land on both sides of the cut when the two chunks
+        # disagree slightly on its timing; keep the higher-confidence copy
+        while prev_words and next_words:
+            a, b = prev_words[-1], next_words[0]
+            same_text = _normalize(a.get("word", "")) == _normalize(b.get("word", ""))
+            close = abs(a["start"] - b["start"]) <= self.word_time_tolerance
+            if not (same_text and close):
+                break
+            if a.get("score", 0) >= b.get("score", 0):
+                next_words.pop(0)
+            else:
+                prev_words.pop()
+            removed += 1
+
+        self.stats.words_removed += removed
+        self.stats.duplicate_seconds += max(0.0, prev["end"] - cut) + max(
+            0.0, cut - nxt["start"]
+        )
+
+        if len(prev_words) != len(prev["words"]):
+            prev = _rebuild_from_words(prev, prev_words)
+        if len(next_words) != len(nxt["words"]):
+            nxt = _rebuild_from_words(nxt, next_words)
+        if prev is None:
+            self.stats.segments_dropped += 1
+        if nxt is None:
+            self.stats.segments_dropped += 1
+        return prev, nxt
+
+    def _merge_text(
+        self, prev: dict, nxt: dict
+    ) -> Tuple[Optional[dict], Optional[dict]]:
+        """Remove the repeated word run from the later segment (no word timing)."""
+        # Only speech inside the time overlap of the two segments can be repeated
+        overlap_start = max(prev["start"], nxt["start"])
+        overlap_end = min(prev["end"], nxt["end"])
+        if overlap_end <= overlap_start:
+            return prev, nxt
+
+        prev_tokens = prev.get("text", "").split()
+        next_tokens = nxt.get("text", "").split()
+        prev_times = _estimate_token_times(prev, prev_tokens)
+        next_times = _estimate_token_times(nxt, next_tokens)
+
+        # Search prev's tail and nxt's head that fall in the overlap; what is
+        # dropped (prev after the run, nxt before it) then lies in it as well
+        tolerance = self.text_time_tolerance
+        prev_from = next(
+            (i for i, (_, end) in enumerate(prev_times) if end >= overlap_start - tolerance),
+            len(prev_tokens),
+        )
+        next_to = sum(1 for start, _ in next_times if start <= overlap_end + tolerance)
+
+        matcher = SequenceMatcher(
+            None,
+            [_normalize(t) for t in prev_tokens],
+            [_normalize(t) for t in next_tokens],
+            autojunk=False,
+        )
+        match = matcher.find_longest_match(prev_from, len(prev_tokens), 0, next_to)
+        if match.size < min(self.min_match_words, len(next_tokens)) or match.size == 0:
+            # No reliable repeat; keep both rather than risk losing speech
+            return prev, nxt
+        if abs(prev_times[match.a][0] - next_times[match.b][0]) > tolerance:
+            # Same words at different times: a common phrase, not a repeat
+            return prev, nxt
+
+        # prev keeps everything through the repeated run, nxt keeps what follows it
+        keep_prev = prev_tokens[: match.a + match.size]
+        keep_next = next_tokens[match.b + match.size :]
+        removed_prev = len(prev_tokens) - len(keep_prev)
+        removed_next = match.b + match.size
+        self.stats.words_removed += removed_prev + removed_next
+
+        prev_duration = prev["end"] - prev["start"]
+        prev_chars = max(1, len(" ".join(prev_tokens)))
+        split_time = prev["start"] + prev_duration * (
+            len(" ".join(keep_prev)) / prev_chars
+        )
+
+        new_prev = dict(prev)
+        new_prev["text"] = " " + " ".join(keep_prev)
+        new_prev["end"] = round(split_time, 3)
+        self.stats.duplicate_seconds += max(0.0, prev["end"] - new_prev["end"])
+
+        if not keep_next:
+            self.stats.segments_dropped += 1
+            self.stats.duplicate_seconds += max(0.0, nxt["end"] - nxt["start"])
+            return new_prev, None
+
+        new_next = dict(nxt)
+        new_next["text"] = " " + " ".join(keep_next)
+        new_next["start"] = round(min(max(nxt["start"], split_time), nxt["end"]), 3)
+        self.stats.duplicate_seconds += max(0.0, new_next["start"] - nxt["start"])
+        return new_prev, new_next
+
+
+def merge_chunk_results(
+    chunk_results: List[dict], merger: Optional[OverlapMerger] = None
+) -> Tuple[List[dict], Dict]:
+    """
+    Merge per-chunk results into one deduplicated segment list.
+
+    Args:
+        chunk_results: Per-chunk dicts with 'start', 'end', 'segments'
+        merger: Optional merger instance (for custom thresholds)
+
+    Returns:
+        (merged segments, merge stats dict)
+    """
+    merger = merger or OverlapMerger()
+    merged: List[dict] = []
+    for result in sorted(chunk_results, key=lambda r: r.get("start", 0)):
+        merged.extend(merger.add(result))
+    merged.extend(merger.flush())
+
+    stats = merger.stats.to_dict()
+    if stats["boundaries"]:
+        logger.info(
+            f"Overlap merge: {stats['words_removed']} duplicate words, "
+            f"{stats['duplicate_seconds']:.1f}s duplicate audio removed "
+            f"across {stats['boundaries']} boundaries"
+        )
+    return merged, stats
+
+
+def dedupe_overlapping_words(
+    segments: List[dict], time_tolerance: float = 0.3
+) -> Tuple[List[dict], int]:
+    """
+    Remove duplicate timed words left between adjacent segments.
+
+    Runs after alignment as a safety net: words with the same text whose
+    start times are within time_tolerance keep only the higher-scoring copy.
+
+    Args:
+        segments: Aligned segments (timeline order)
+        time_tolerance: Max start-time difference (s) for duplicates
+
+    Returns:
+        (segments without duplicates, number of words removed)
+    """
+    result: List[dict] = []
+    removed = 0
+
+    for seg in segments:
+        if (
+            not result
+            or not _words_have_timing(seg)
+            or not _words_have_timing(result[-1])
+        ):
+            result.append(seg)
+            continue
+
+        prev = result[-1]
+        if seg["start"] >= prev["end"]:
+            result.append(seg)
+            continue
+
+        prev_words = list(prev["words"])
+        next_words = list(seg["words"])
+        # Compare the touching ends of the two segments word by word
+        while prev_words and next_words:
+            a, b = prev_words[-1], next_words[0]
+            same = _normalize(a.get("word", "")) == _normalize(b.get("word", ""))
+            if not (same and abs(a["start"] - b["start"]) <= time_tolerance):
+                break
+            if a.get("score", 0) >= b.get("score", 0):
+                next_words.pop(0)
+            else:
+                prev_words.pop()
+            removed += 1
+
+        if len(prev_words) == len(prev["words"]) and len(next_words) == len(
+            seg["words"]
+        ):
+            result.append(seg)
+            continue
+
+        new_prev = _rebuild_from_words(prev, prev_words)
+        new_next = _rebuild_from_words(seg, next_words)
+        result.pop()
+        if new_prev:
+            result.append(new_prev)
+        if new_next:
+            result.append(new_next)
+
+    return result, removed
@@ -0,0 +1,106 @@
+"""
+Vectorized Silence Detection for WhisperX
+Energy-based silence detection on already-decoded audio
+
+Replaces an extra ffmpeg silencedetect decode (plus stderr parsing) with
+framewise RMS levels computed on the job's 16kHz buffer. Frames are strided
+views into the samples, and silence runs are found with vectorized
+run-length logic, so an hour of audio takes well under a second and needs
+no process spawn.
+"""
+
+import logging
+from typing import List, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Frames per block when computing frame energies
+BLOCK_FRAMES = 65536
+
+
+def parse_db(threshold: Union[str, float]) -> float:
+    """Accept ffmpeg-style '-50dB' strings as well as plain numbers."""
+    if isinstance(threshold, str):
+        return float(threshold.strip().lower().removesuffix("db"))
+    return float(threshold)
+
+
+def frame_levels_db(samples: np.ndarray, frame_length: int = 160) -> np.ndarray:
+    """
+    RMS level of each non-overlapping frame in dBFS.
+
+    Args:
+        samples: Mono float32 samples
+        frame_length: Samples per frame (160 = 10ms at 16kHz)
+
+    Returns:
+        float32 array with one level per frame (a trailing partial frame included)
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    full = len(samples) // frame_length
+    partial = 1 if len(samples) % frame_length else 0
+    levels = np.empty(full + partial, dtype=np.float32)
+
+    # Zero-copy (frames, frame_length) view; einsum sums squares without a temp copy
+    frames = samples[: full * frame_length].reshape(full, frame_length)
+    for start in range(0, full, BLOCK_FRAMES):
+        block = frames[start : start + BLOCK_FRAMES]
+        levels[start : start + len(block)] = np.einsum("ij,ij->i", block, block)
+    levels[:full] /= frame_length
+
+    if len(levels) > full:
+        tail = samples[full * frame_length :]
+        levels[full] = np.dot(tail, tail) / len(tail)
+
+    return 10 * np.log10(np.maximum(levels, 1e-12))
+
+
+def detect_silence(
+    samples: np.ndarray,
+    sample_rate: int = 16000,
+    min_silence_duration: float = 2.0,
+    silence_threshold: Union[str, float] = "-50dB",
+    frame_ms: float = 10.0,
+) -> List[Tuple[float, float]]:
+    """
+    Detect silence periods in decoded audio.
+
+    Same contract as FFmpegProcessor.detect_silence: (start, end) seconds of
+    every run quieter than the threshold lasting at least
+    min_silence_duration, including a run reaching the end of the audio.
+
+    Args:
+        samples: Mono float32 samples
+        sample_rate: Sample rate of samples
+        min_silence_duration: Minimum silence duration in seconds
+        silence_threshold: Level below which a frame is silent (e.g. '-50dB' or -50)
+        frame_ms: Frame length in milliseconds (time resolution)
+
+    Returns:
+        List of silence periods as (start, end) tuples
+    """
+    if len(samples) == 0:
+        return []
+
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    silent = frame_levels_db(samples, frame_length) < parse_db(silence_threshold)
+
+    # Run boundaries: +1 where silence starts, -1 where it ends
+    edges = np.diff(np.concatenate(([0], silent.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    min_frames = min_silence_duration * sample_rate / frame_length
+    keep = (ends - starts) >= min_frames
+
+    duration = len(samples) / sample_rate
+    frame_seconds = frame_length / sample_rate
+    silences = [
+        (round(start * frame_seconds, 3), round(min(end * frame_seconds, duration), 3))
+        for start, end in zip(starts[keep], ends[keep])
+    ]
+
+    logger.info(f"Detected {len(silences)} silence periods")
+    return silences
@@ -0,0 +1,231 @@
+"""
+Silero VAD on ONNX Runtime for WhisperX
+Offline, batched voice activity detection from a bundled ONNX model
+
+The torch.hub Silero path downloads the model on a cold cache and runs one
+512-sample window per call. This engine loads a local silero_vad.onnx (v5)
+and splits the audio into parallel streams that run as one batch, so an
+hour of audio takes a few thousand ONNX calls instead of ~110k.
+
+Each stream starts a little early and discards those probabilities, so the
+recurrent state is warmed up on real audio at every stream boundary.
+"""
+
+import logging
+import math
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+WINDOW = 512  # samples per Silero window at 16kHz
+CONTEXT = 64  # trailing samples of the previous window fed with each window
+STATE_SIZE = 128
+
+# Model shipped in the image (see Dockerfile); override with VAD_ONNX_MODEL
+DEFAULT_MODEL_PATH = "/app/models/silero_vad.onnx"
+
+
+def probs_to_segments(
+    probs: np.ndarray,
+    num_samples: int,
+    threshold: float = 0.5,
+    min_speech_duration_ms: int = 250,
+    min_silence_duration_ms: int = 100,
+    speech_pad_ms: int = 30,
+    sample_rate: int = SAMPLE_RATE,
+    window: int = WINDOW,
+) -> List[Tuple[int, int]]:
+    """
+    Turn per-window speech probabilities into speech regions.
+
+    Same hysteresis, minimum durations and padding as Silero's
+    get_speech_timestamps, so both engines produce comparable segments.
+
+    Args:
+        probs: Speech probability per window
+        num_samples: Length of the audio in samples
+        threshold: Probability that starts speech (ends below threshold - 0.15)
+        min_speech_duration_ms: Drop speech shorter than this
+        min_silence_duration_ms: Silence needed to end speech
+        speech_pad_ms: Padding added around each region
+        sample_rate: Sample rate of the audio
+        window: Samples per probability
+
+    Returns:
+        (start, end) sample offsets of speech regions
+    """
+    neg_threshold = max(threshold - 0.15, 0.01)
+    min_speech = sample_rate * min_speech_duration_ms / 1000
+    min_silence = sample_rate * min_silence_duration_ms / 1000
+    pad = int(sample_rate * speech_pad_ms / 1000)
+
+    speeches: List[List[int]] = []
+    triggered = False
+    start = temp_end = 0
+
+    # Only windows that change state matter; walk those instead of every window
+    above = probs >= threshold
+    below = probs < neg_threshold
+    candidates = np.flatnonzero(above | below)
+
+    for i in candidates:
+        pos = int(i) * window
+        if above[i]:
+            temp_end = 0
+            if not triggered:
+                triggered = True
+                start = pos
+            continue
+
+        if triggered:
+            if not temp_end:
+                temp_end = pos
+            if pos - temp_end < min_silence:
+                continue
+            if temp_end - start > min_speech:
+                speeches.append([start, temp_end])
+            triggered = False
+            temp_end = 0
+
+    if triggered and num_samples - start > min_speech:
+        speeches.append([start, num_samples])
+
+    # Pad regions, splitting short gaps between neighbours evenly
+    for i, speech in enumerate(speeches):
+        if i == 0:
+            speech[0] = max(0, speech[0] - pad)
+        if i != len(speeches) - 1:
+            silence = speeches[i + 1][0] - speech[1]
+            if silence < 2 * pad:
+                speech[1] += silence // 2
+                speeches[i + 1][0] = max(0, speeches[i + 1][0] - silence // 2)
+            else:
+                speech[1] = min(num_samples, speech[1] + pad)
+                speeches[i + 1][0] = max(0, speeches[i + 1][0] - pad)
+        else:
+            speech[1] = min(num_samples, speech[1] + pad)
+
+    return [(s, e) for s, e in speeches]
+
+
+class SileroOnnxVAD:
+    """
+    Silero VAD v5 running in onnxruntime with stream-batched inference.
+    """
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        threads: int = 4,
+        batch_size: int = 64,
+        min_stream_seconds: float = 10.0,
+        warmup_windows: int = 16,
+        session=None,
+    ):
+        """
+        Load the ONNX model.
+
+        Args:
+            model_path: Path to silero_vad.onnx (v5); defaults to the bundled model
+            threads: onnxruntime intra-op threads
+            batch_size: Maximum number of parallel streams per call
+            min_stream_seconds: Don't split audio into streams shorter than this
+            warmup_windows: Windows run before each stream start to warm up state
+            session: Pre-built inference session (for tests)
+        """
+        self.model_path = model_path or DEFAULT_MODEL_PATH
+        self.threads = threads
+        self.batch_size = max(1, batch_size)
+        self.min_stream_windows = max(1, int(min_stream_seconds * SAMPLE_RATE / WINDOW))
+        self.warmup_windows = warmup_windows
+
+        if session is None:
+            import onnxruntime
+
+            if not os.path.exists(self.model_path):
+                raise FileNotFoundError(f"Silero ONNX model not found: {self.model_path}")
+
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+            session = onnxruntime.InferenceSession(
+                self.model_path,
+                sess_options=options,
+                providers=["CPUExecutionProvider"],
+            )
+            logger.info(
+                f"Loaded Silero ONNX VAD from {self.model_path} ({threads} threads)"
+            )
+        self.session = session
+
+    def speech_probs(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Speech probability for every 512-sample window.
+
+        Args:
+            samples: 16kHz mono float32 samples
+
+        Returns:
+            float32 array with one probability per window
+        """
+        samples = np.asarray(samples, dtype=np.float32)
+        num_windows = math.ceil(len(samples) / WINDOW)
+        if num_windows == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        streams = max(1, min(self.batch_size, num_windows // self.min_stream_windows))
+        stream_windows = math.ceil(num_windows / streams)
+        warmup = self.warmup_windows if streams > 1 else 0
+        steps = stream_windows + warmup
+
+        # Stream b covers windows [b*L, (b+1)*L) and starts `warmup` windows
+        # early; each step gathers one window (plus context) per stream
+        starts = (np.arange(streams) * stream_windows - warmup) * WINDOW - CONTEXT
+        offsets = np.arange(CONTEXT + WINDOW)
+
+        state = np.zeros((2, streams, STATE_SIZE), dtype=np.float32)
+        sr = np.array(SAMPLE_RATE, dtype=np.int64)
+        probs = np.empty((streams, steps), dtype=np.float32)
+
+        for step in range(steps):
+            index = (starts + step * WINDOW)[:, None] + offsets
+            valid = (index >= 0) & (index < len(samples))
+            x = np.where(valid, samples[np.clip(index, 0, len(samples) - 1)], 0.0)
+            out, state = self.session.run(
+                None, {"input": x.astype(np.float32), "state": state, "sr": sr}
+            )
+            probs[:, step] = np.asarray(out).reshape(streams)
+
+        return probs[:, warmup:].reshape(-1)[:num_windows]
+
+    def speech_timestamps(
+        self,
+        samples: np.ndarray,
+        threshold: float = 0.5,
+        min_speech_duration_ms: int = 250,
+        min_silence_duration_ms: int = 100,
+    ) -> List[Tuple[float, float]]:
+        """
+        Speech regions of the audio in seconds.
+
+        Args:
+            samples: 16kHz mono float32 samples
+            threshold: Speech probability threshold
+            min_speech_duration_ms: Drop speech shorter than this
+            min_silence_duration_ms: Silence needed to end speech
+
+        Returns:
+            List of (start, end) tuples in seconds
+        """
+        regions = probs_to_segments(
+            self.speech_probs(samples),
+            len(samples),
+            threshold=threshold,
+            min_speech_duration_ms=min_speech_duration_ms,
+            min_silence_duration_ms=min_silence_duration_ms,
+        )
+        return [(start / SAMPLE_RATE, end / SAMPLE_RATE) for start, end in regions]
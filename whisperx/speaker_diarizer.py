@@ -0,0 +1,369 @@
+"""
+Region-Based Speaker Diarization for WhisperX
+Speaker embeddings on VAD speech regions, clustered per request
+
+The full pyannote pipeline runs its own segmentation over the whole file.
+This mode reuses the speech regions VAD already found for chunking: each
+region is cut into short overlapping windows, and a speaker embedding is
+extracted for every window in fixed-size batches (silence is never embedded).
+
+Embeddings are summarized into a SpeakerProfile: a few dozen fine-grained
+centroids plus the centroid each window belongs to. The profile is what gets
+cached per audio file, so diarizing the same audio again with different
+min_speakers/max_speakers only re-runs the clustering of those centroids,
+which takes milliseconds.
+"""
+
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (batch, samples) waveforms and (batch, samples) masks -> (batch, dim) embeddings
+EmbedFn = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def embedding_windows(
+    regions: Iterable[Tuple[float, float]],
+    window: float = 2.0,
+    step: float = 1.0,
+    min_duration: float = 0.5,
+) -> np.ndarray:
+    """
+    Cut speech regions into overlapping embedding windows.
+
+    Regions shorter than window get one window covering them; longer regions
+    get windows every step seconds, the last one ending at the region end.
+
+    Args:
+        regions: (start, end) speech regions in seconds, in timeline order
+        window: Window length in seconds
+        step: Hop between window starts in seconds
+        min_duration: Regions shorter than this are not embedded
+
+    Returns:
+        (n, 2) array of window (start, end) times
+    """
+    windows = []
+    for start, end in regions:
+        length = end - start
+        if length < min_duration:
+            continue
+        if length <= window:
+            windows.append((start, end))
+            continue
+        starts = np.arange(start, end - window, step)
+        windows.extend((s, s + window) for s in starts)
+        windows.append((end - window, end))
+    return np.array(windows, dtype=np.float64).reshape(-1, 2)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def summarize_embeddings(
+    embeddings: np.ndarray, threshold: float = 0.8, max_centroids: int = 64
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reduce window embeddings to fine-grained centroids.
+
+    One leader-clustering pass in timeline order (join the most similar
+    centroid if it is at least threshold similar, else start a new one, up
+    to max_centroids), then one k-means refinement step.
+
+    Args:
+        embeddings: (n, dim) embeddings
+        threshold: Cosine similarity needed to join an existing centroid
+        max_centroids: Upper bound on the number of centroids
+
+    Returns:
+        (centroids (k, dim) unit vectors, weights (k,) window counts,
+        assignment (n,) centroid index per window)
+    """
+    embeddings = _normalize(np.asarray(embeddings, dtype=np.float32))
+    if not len(embeddings):
+        dim = embeddings.shape[1] if embeddings.ndim == 2 else 0
+        return np.zeros((0, dim), np.float32), np.zeros(0, np.int64), np.zeros(0, np.int64)
+
+    max_centroids = max(1, max_centroids)
+    sums = np.zeros((max_centroids, embeddings.shape[1]), np.float32)
+    units = np.zeros_like(sums)
+    sums[0] = units[0] = embeddings[0]
+    count = 1
+    for vector in embeddings[1:]:
+        similarity = units[:count] @ vector
+        best = int(np.argmax(similarity))
+        if similarity[best] < threshold and count < max_centroids:
+            best = count
+            count += 1
+        sums[best] += vector
+        units[best] = _normalize(sums[best])
+
+    centroids = units[:count]
+    assignment = np.argmax(embeddings @ centroids.T, axis=1)
+
+    # Refine: recompute from the final assignment, dropping emptied centroids
+    used = np.unique(assignment)
+    remap = np.full(len(centroids), -1)
+    remap[used] = np.arange(len(used))
+    assignment = remap[assignment]
+    weights = np.bincount(assignment, minlength=len(used))
+    centroids = np.zeros((len(used), embeddings.shape[1]), np.float32)
+    np.add.at(centroids, assignment, embeddings)
+    return _normalize(centroids), weights, assignment
+
+
+def cluster_centroids(
+    centroids: np.ndarray,
+    weights: np.ndarray,
+    min_speakers: Optional[int] = None,
+    max_speakers: Optional[int] = None,
+    threshold: float = 0.6,
+) -> np.ndarray:
+    """
+    Agglomerative clustering of centroids into speakers.
+
+    The two most similar clusters (cosine similarity of their weighted mean
+    directions) are merged while that similarity is at least threshold, and
+    regardless of it while there are more than max_speakers clusters.
+    Merging never goes below min_speakers.
+
+    Args:
+        centroids: (k, dim) unit vectors
+        weights: (k,) window count per centroid
+        min_speakers: Lower bound on speakers (None = 1)
+        max_speakers: Upper bound on speakers (None = unbounded)
+        threshold: Cosine similarity above which clusters are the same speaker
+
+    Returns:
+        (k,) speaker index per centroid (0..speakers-1)
+    """
+    k = len(centroids)
+    labels = np.arange(k)
+    if k == 0:
+        return labels
+
+    lower = max(1, min_speakers or 1)
+    upper = max(lower, max_speakers) if max_speakers else k
+
+    sums = np.asarray(centroids, np.float64) * np.asarray(weights, np.float64)[:, None]
+    active = list(range(k))
+    while len(active) > lower:
+        unit = _normalize(sums[active])
+        similarity = unit @ unit.T
+        np.fill_diagonal(similarity, -np.inf)
+        i, j = np.unravel_index(int(np.argmax(similarity)), similarity.shape)
+        if similarity[i, j] < threshold and len(active) <= upper:
+            break
+        keep, drop = active[min(i, j)], active[max(i, j)]
+        sums[keep] += sums[drop]
+        labels[labels == drop] = keep
+        active.remove(drop)
+
+    _, labels = np.unique(labels, return_inverse=True)
+    return labels
+
+
+def speaker_turns(windows: np.ndarray, labels: np.ndarray) -> List[Dict]:
+    """
+    Turn labelled windows into speaker turns.
+
+    Overlapping windows split their shared span at the midpoint between
+    their centers; adjacent spans with the same speaker are merged. Speakers
+    are named SPEAKER_00, SPEAKER_01, ... in order of first appearance.
+
+    Args:
+        windows: (n, 2) window times in timeline order
+        labels: (n,) speaker index per window
+
+    Returns:
+        List of {'start', 'end', 'speaker'} dicts
+    """
+    turns: List[Dict] = []
+    names: Dict[int, str] = {}
+    n = len(windows)
+    for i in range(n):
+        start, end = float(windows[i][0]), float(windows[i][1])
+        if i > 0 and windows[i - 1][1] > start:
+            start = float(windows[i - 1].sum() + windows[i].sum()) / 4
+        if i + 1 < n and windows[i + 1][0] < end:
+            end = float(windows[i].sum() + windows[i + 1].sum()) / 4
+        if end <= start:
+            continue
+
+        label = int(labels[i])
+        speaker = names.setdefault(label, f"SPEAKER_{len(names):02d}")
+        if turns and turns[-1]["speaker"] == speaker and turns[-1]["end"] >= start - 1e-3:
+            turns[-1]["end"] = round(end, 3)
+        else:
+            turns.append({"start": round(start, 3), "end": round(end, 3), "speaker": speaker})
+    return turns
+
+
+class SpeakerProfile:
+    """
+    Cached per-audio speaker summary: windows, fine centroids and assignment.
+    """
+
+    def __init__(
+        self,
+        windows: np.ndarray,
+        centroids: np.ndarray,
+        weights: np.ndarray,
+        assignment: np.ndarray,
+    ):
+        self.windows = np.asarray(windows, np.float64).reshape(-1, 2)
+        self.centroids = np.asarray(centroids, np.float32)
+        self.weights = np.asarray(weights, np.int64)
+        self.assignment = np.asarray(assignment, np.int64)
+
+    def diarize(
+        self,
+        min_speakers: Optional[int] = None,
+        max_speakers: Optional[int] = None,
+        threshold: float = 0.6,
+    ) -> List[Dict]:
+        """
+        Cluster the centroids and return speaker turns.
+
+        Args:
+            min_speakers: Lower bound on speakers
+            max_speakers: Upper bound on speakers
+            threshold: Cosine similarity above which clusters are the same speaker
+
+        Returns:
+            List of {'start', 'end', 'speaker'} dicts
+        """
+        labels = cluster_centroids(
+            self.centroids, self.weights, min_speakers, max_speakers, threshold
+        )
+        return speaker_turns(self.windows, labels[self.assignment])
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form for the result cache."""
+        return {
+            "windows": np.round(self.windows, 3).tolist(),
+            "centroids": np.round(self.centroids, 6).tolist(),
+            "weights": self.weights.tolist(),
+            "assignment": self.assignment.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SpeakerProfile":
+        return cls(data["windows"], data["centroids"], data["weights"], data["assignment"])
+
+
+class SpeakerEmbedder:
+    """
+    Extracts speaker embeddings for speech-region windows in batches.
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        window: float = 2.0,
+        step: float = 1.0,
+        min_duration: float = 0.5,
+        batch_size: int = 32,
+        sample_rate: int = 16000,
+    ):
+        """
+        Initialize embedder.
+
+        Args:
+            embed_fn: Maps (batch, samples) float32 waveforms and (batch, samples)
+                masks of valid samples to (batch, dim) embeddings
+            window: Window length in seconds
+            step: Hop between windows of one region in seconds
+            min_duration: Speech regions shorter than this are skipped
+            batch_size: Windows per embed_fn call
+            sample_rate: Sample rate of the audio
+        """
+        self.embed_fn = embed_fn
+        self.window = window
+        self.step = step
+        self.min_duration = min_duration
+        self.batch_size = max(1, batch_size)
+        self.sample_rate = sample_rate
+
+    def extract(
+        self, samples: np.ndarray, regions: Iterable[Tuple[float, float]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Embed every window of the speech regions.
+
+        regions may be a lazy iterator (e.g. fed by a running VAD stage):
+        a batch is embedded as soon as enough windows are known.
+
+        Args:
+            samples: Decoded mono samples
+            regions: (start, end) speech regions in seconds, in timeline order
+
+        Returns:
+            (windows (n, 2), embeddings (n, dim)); windows whose embedding
+            is not finite are dropped
+        """
+        windows: List[np.ndarray] = []
+        embeddings: List[np.ndarray] = []
+        pending = np.zeros((0, 2))
+
+        for region in regions:
+            found = embedding_windows([region], self.window, self.step, self.min_duration)
+            pending = np.concatenate([pending, found])
+            while len(pending) >= self.batch_size:
+                self._embed_batch(samples, pending[: self.batch_size], windows, embeddings)
+                pending = pending[self.batch_size :]
+        if len(pending):
+            self._embed_batch(samples, pending, windows, embeddings)
+
+        if not windows:
+            return np.zeros((0, 2)), np.zeros((0, 0), np.float32)
+        return np.concatenate(windows), np.concatenate(embeddings)
+
+    def _embed_batch(self, samples, batch, windows, embeddings):
+        length = int(round(self.window * self.sample_rate))
+        waveforms = np.zeros((len(batch), length), np.float32)
+        masks = np.zeros((len(batch), length), np.float32)
+        for row, (start, end) in enumerate(batch):
+            piece = samples[int(start * self.sample_rate) : int(end * self.sample_rate)][:length]
+            waveforms[row, : len(piece)] = piece
+            masks[row, : len(piece)] = 1.0
+
+        result = np.asarray(self.embed_fn(waveforms, masks), np.float32)
+        valid = np.isfinite(result).all(axis=1)
+        if not valid.all():
+            logger.debug(f"Dropped {int((~valid).sum())} windows without a valid embedding")
+        windows.append(batch[valid])
+        embeddings.append(result[valid])
+
+    def profile(
+        self,
+        samples: np.ndarray,
+        regions: Iterable[Tuple[float, float]],
+        threshold: float = 0.8,
+        max_centroids: int = 64,
+    ) -> SpeakerProfile:
+        """
+        Embed the speech regions and summarize them into a SpeakerProfile.
+
+        Args:
+            samples: Decoded mono samples
+            regions: (start, end) speech regions in seconds
+            threshold: Similarity for joining a fine centroid (see summarize_embeddings)
+            max_centroids: Upper bound on fine centroids
+
+        Returns:
+            SpeakerProfile ready for clustering and caching
+        """
+        windows, embeddings = self.extract(samples, regions)
+        centroids, weights, assignment = summarize_embeddings(
+            embeddings, threshold, max_centroids
+        )
+        logger.info(
+            f"Embedded {len(windows)} speech windows into {len(centroids)} speaker centroids"
+        )
+        return SpeakerProfile(windows, centroids, weights, assignment)
@@ -0,0 +1,154 @@
+"""
+Stage Pipeline Helpers for WhisperX Large-File Mode
+Threads, end-of-stream marker and timing for overlapping pipeline stages
+
+transcribe-large runs VAD, ASR and alignment as producer/consumer stages
+connected by queues. StageThread runs one stage and hands its exception
+back to the caller; StageTimer records when each stage was busy so the
+response can show how much the stages overlapped, and (with a resource
+monitor) the peak memory reached while each stage ran.
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Optional
+
+# Queue marker: the producing stage has finished
+END = object()
+
+
+class StageTimer:
+    """
+    Per-stage busy time and first-start/last-end offsets for one job.
+
+    busy() may be entered many times per stage and from several threads.
+    """
+
+    def __init__(
+        self,
+        monitor=None,
+        on_stage: Optional[Callable[[str, float, Dict[str, float]], None]] = None,
+    ):
+        """
+        Args:
+            monitor: Optional ResourceMonitor; peak values per stage are reported
+            on_stage: Called with (stage, seconds, peaks) after every unit of work
+        """
+        self.t0 = time.time()
+        self.monitor = monitor
+        self.on_stage = on_stage
+        self._lock = threading.Lock()
+        self._stages: Dict[str, list] = {}
+        self._peaks: Dict[str, Dict[str, float]] = {}
+        self._marks: Dict[str, float] = {}
+
+    @contextmanager
+    def busy(self, stage: str):
+        """Time a unit of work belonging to a stage."""
+        tracking = self.monitor.track() if self.monitor else nullcontext({})
+        peaks: Dict[str, float] = {}
+        start = time.time()
+        try:
+            with tracking as peaks:
+                yield
+        finally:
+            end = time.time()
+            with self._lock:
+                entry = self._stages.setdefault(stage, [start, end, 0.0, 0])
+                entry[0] = min(entry[0], start)
+                entry[1] = max(entry[1], end)
+                entry[2] += end - start
+                entry[3] += 1
+                stage_peaks = self._peaks.setdefault(stage, {})
+                for name, value in peaks.items():
+                    stage_peaks[name] = max(stage_peaks.get(name, value), value)
+            if self.on_stage:
+                self.on_stage(stage, end - start, peaks)
+
+    def mark(self, name: str):
+        """Record the first time an event happened (e.g. first aligned segment)."""
+        with self._lock:
+            self._marks.setdefault(name, time.time())
+
+    def busy_seconds(self, stage: str) -> float:
+        with self._lock:
+            entry = self._stages.get(stage)
+            return entry[2] if entry else 0.0
+
+    def report(self) -> Dict:
+        """
+        Stage timing relative to job start.
+
+        Returns:
+            Dict with per-stage start/end/busy/calls (plus peak_<probe> values
+            with a monitor), event marks, wall time,
+            summed busy time and overlap (busy time that ran concurrently)
+        """
+        with self._lock:
+            stages = {
+                name: {
+                    "start": round(start - self.t0, 3),
+                    "end": round(end - self.t0, 3),
+                    "busy": round(busy, 3),
+                    "calls": calls,
+                    **{
+                        f"peak_{key}": int(value)
+                        for key, value in self._peaks.get(name, {}).items()
+                    },
+                }
+                for name, (start, end, busy, calls) in self._stages.items()
+            }
+            marks = {name: round(at - self.t0, 3) for name, at in self._marks.items()}
+            busy_total = sum(entry[2] for entry in self._stages.values())
+            if self._stages:
+                span = max(e[1] for e in self._stages.values()) - min(
+                    e[0] for e in self._stages.values()
+                )
+            else:
+                span = 0.0
+
+        return {
+            "stages": stages,
+            "marks": marks,
+            "wall": round(time.time() - self.t0, 3),
+            "busy_total": round(busy_total, 3),
+            "overlap": round(max(0.0, busy_total - span), 3),
+        }
+
+
+class StageThread(threading.Thread):
+    """
+    Runs one pipeline stage on its own thread.
+
+    on_exit always runs when the stage ends (typically to put END on the
+    downstream queue), and wait() re-raises the stage's exception.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        target: Callable[[], object],
+        on_exit: Optional[Callable[[], None]] = None,
+    ):
+        super().__init__(name=f"stage-{name}", daemon=True)
+        self._fn = target
+        self._on_exit = on_exit
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+    def run(self):
+        try:
+            self.result = self._fn()
+        except BaseException as e:
+            self.error = e
+        finally:
+            if self._on_exit:
+                self._on_exit()
+
+    def wait(self, timeout: Optional[float] = None):
+        """Join the stage and return its result (raises the stage's exception)."""
+        self.join(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.result
@@ -0,0 +1,62 @@
+"""Tests for the transcript artifact store."""
+
+import json
+import os
+import time
+
+import pytest
+
+from artifact_store import ArtifactStore
+
+CONTENT = {
+    "filename": "talk.mp4",
+    "language": "en",
+    "segments": [{"start": 0.0, "end": 1.0, "text": "Hi"}],
+    "srt": "1\n00:00:00,000 --> 00:00:01,000\nHi\n",
+    "segments_srt": "1\n00:00:00,000 --> 00:00:01,000\nHi\n",
+    "txt": "Hi",
+}
+
+
+def test_store_writes_selected_formats(tmp_path) -> None:
+    """Test only requested formats are written and replaced by a manifest."""
+    store = ArtifactStore(tmp_path, base_url="http://whisperx:8000/artifacts")
+
+    response = store.store(CONTENT, ("segments", "txt"), artifact_id="job1")
+
+    assert response["filename"] == "talk.mp4"
+    assert "segments" not in response and "srt" not in response
+    assert set(response["artifacts"]) == {"segments", "txt"}
+    txt = response["artifacts"]["txt"]
+    assert txt["url"] == "http://whisperx:8000/artifacts/job1/transcript.txt"
+    assert open(txt["path"]).read() == "Hi"
+    assert txt["bytes"] == 2
+    segments_path = store.path("job1", "segments.json")
+    assert json.loads(segments_path.read_bytes()) == CONTENT["segments"]
+    assert store.path("job1", "words.srt") is None
+
+
+def test_path_rejects_traversal(tmp_path) -> None:
+    """Test artifact lookups only resolve known files in valid id directories."""
+    store = ArtifactStore(tmp_path)
+    store.store(CONTENT, artifact_id="job1")
+
+    assert store.path("job1", "transcript.txt") is not None
+    assert store.path("..", "transcript.txt") is None
+    assert store.path("job1", "../job1/transcript.txt") is None
+    with pytest.raises(ValueError):
+        store.store(CONTENT, artifact_id="../escape")
+
+
+def test_prune_removes_expired_artifacts(tmp_path) -> None:
+    """Test directories older than the TTL are removed on the next store."""
+    store = ArtifactStore(tmp_path, ttl_seconds=60)
+    store.store(CONTENT, artifact_id="old")
+    old = time.time() - 120
+    os.utime(tmp_path / "old", (old, old))
+
+    store.store(CONTENT, artifact_id="new")
+
+    assert not (tmp_path / "old").exists()
+    assert (tmp_path / "new").exists()
+    assert store.stats()["pruned"] == 1
@@ -0,0 +1,124 @@
+"""Tests for the shared memory-mapped audio buffer."""
+
+import os
+
+import numpy as np
+import pytest
+
+from audio_buffer import AudioBuffer
+
+
+def _write_pcm(path, seconds: float, sample_rate: int = 16000) -> np.ndarray:
+    samples = np.linspace(-1, 1, int(seconds * sample_rate), dtype=np.float32)
+    samples.tofile(path)
+    return samples
+
+
+def test_buffer_duration_from_pcm_file(tmp_path) -> None:
+    """Test duration is derived from the number of mapped samples."""
+    path = tmp_path / "audio.f32"
+    _write_pcm(path, 2.5)
+
+    buffer = AudioBuffer(str(path))
+
+    assert buffer.duration == 2.5
+    assert buffer.samples.dtype == np.float32
+
+
+def test_buffer_slice_is_zero_copy_view(tmp_path) -> None:
+    """Test slices share memory with the mapping instead of copying."""
+    path = tmp_path / "audio.f32"
+    expected = _write_pcm(path, 3.0)
+
+    buffer = AudioBuffer(str(path))
+    chunk = buffer.slice(1.0, 2.0)
+
+    assert len(chunk) == 16000
+    assert np.shares_memory(chunk, buffer.samples)
+    np.testing.assert_array_equal(chunk, expected[16000:32000])
+
+
+def test_buffer_slice_clamps_to_bounds(tmp_path) -> None:
+    """Test slices past the end are clamped rather than failing."""
+    path = tmp_path / "audio.f32"
+    _write_pcm(path, 1.0)
+
+    buffer = AudioBuffer(str(path))
+
+    assert len(buffer.slice(0.5, 10.0)) == 8000
+    assert len(buffer.slice(-1.0, 0.25)) == 4000
+
+
+def test_buffer_close_removes_backing_file(tmp_path) -> None:
+    """Test close() deletes the PCM file."""
+    path = tmp_path / "audio.f32"
+    _write_pcm(path, 1.0)
+
+    with AudioBuffer(str(path)) as buffer:
+        assert buffer.duration == 1.0
+
+    assert not os.path.exists(path)
+
+
+def test_empty_buffer(tmp_path) -> None:
+    """Test an empty decode produces an empty buffer."""
+    path = tmp_path / "empty.f32"
+    path.write_bytes(b"")
+
+    buffer = AudioBuffer(str(path))
+
+    assert buffer.duration == 0
+    assert len(buffer.slice(0, 1)) == 0
+
+
+class FakeStreamProcessor:
+    """FFmpegProcessor stand-in that streams PCM bytes in small chunks."""
+
+    def __init__(self, samples: np.ndarray, chunk_bytes: int = 1000):
+        self.data = samples.tobytes()
+        self.chunk_bytes = chunk_bytes
+        self.calls = []
+
+    def stream_pcm(self, media_path, sample_rate=16000, enhance=False):
+        self.calls.append((media_path, sample_rate, enhance))
+        for i in range(0, len(self.data), self.chunk_bytes):
+            yield self.data[i : i + self.chunk_bytes]
+
+
+def test_decode_streams_pipe_into_mapped_file(tmp_path) -> None:
+    """Test decode() writes streamed PCM to the buffer dir and maps it."""
+    expected = np.linspace(-1, 1, 24000, dtype=np.float32)
+    processor = FakeStreamProcessor(expected)
+
+    buffer = AudioBuffer.decode("video.mp4", str(tmp_path), processor, enhance=True)
+
+    assert processor.calls == [("video.mp4", 16000, True)]
+    assert buffer.duration == 1.5
+    assert isinstance(buffer.samples, np.memmap)
+    np.testing.assert_array_equal(buffer.samples, expected)
+    buffer.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_in_memory_stream_buffer_is_writable() -> None:
+    """Test buffer_dir=None keeps samples in RAM as a writable array."""
+    expected = np.arange(16000, dtype=np.float32)
+
+    buffer = AudioBuffer.from_stream(FakeStreamProcessor(expected).stream_pcm("a.wav"))
+
+    assert buffer.path is None
+    assert buffer.samples.flags.writeable
+    np.testing.assert_array_equal(buffer.slice(0.5, 1.0), expected[8000:])
+
+
+def test_failed_stream_leaves_no_partial_file(tmp_path) -> None:
+    """Test a decode error mid-stream removes the partial PCM file."""
+
+    def broken():
+        yield b"\x00" * 400
+        raise RuntimeError("Audio decode failed")
+
+    with pytest.raises(RuntimeError):
+        AudioBuffer.from_stream(broken(), str(tmp_path))
+
+    assert list(tmp_path.iterdir()) == []
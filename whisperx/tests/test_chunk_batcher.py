@@ -0,0 +1,77 @@
+"""Tests for batched multi-chunk inference planning."""
+
+import numpy as np
+
+from audio_buffer import AudioBuffer
+from chunk_batcher import (
+    build_batch_windows,
+    group_window_results,
+    plan_chunk_batches,
+    split_windows,
+)
+
+
+class Chunk:
+    """Minimal stand-in for video_segmenter.AudioSegment."""
+
+    def __init__(self, start: float, end: float, segment_id: int):
+        self.start = start
+        self.end = end
+        self.duration = end - start
+        self.segment_id = segment_id
+
+
+def test_plan_batches_respects_chunk_limit() -> None:
+    """Test batches never exceed max_chunks."""
+    chunks = [Chunk(i * 30, (i + 1) * 30, i) for i in range(10)]
+
+    batches = plan_chunk_batches(chunks, max_chunks=4)
+
+    assert [len(b) for b in batches] == [4, 4, 2]
+
+
+def test_plan_batches_respects_seconds_budget() -> None:
+    """Test batches are closed when the audio-seconds budget is reached."""
+    chunks = [Chunk(i * 30, (i + 1) * 30, i) for i in range(5)]
+
+    batches = plan_chunk_batches(chunks, max_chunks=10, max_seconds=60)
+
+    assert [len(b) for b in batches] == [2, 2, 1]
+
+
+def test_split_windows_short_audio_is_single_window() -> None:
+    """Test audio under 30s is not split."""
+    samples = np.ones(16000 * 20, dtype=np.float32)
+
+    assert split_windows(samples) == [(0, 16000 * 20)]
+
+
+def test_split_windows_cuts_at_quiet_point() -> None:
+    """Test long audio is cut at the quietest frame before the limit."""
+    samples = np.ones(16000 * 50, dtype=np.float32)
+    quiet = 16000 * 28
+    samples[quiet : quiet + 320] = 0.0
+
+    windows = split_windows(samples)
+
+    assert windows[0] == (0, quiet)
+    assert windows[-1][1] == len(samples)
+    assert all(end - start <= 16000 * 30 for start, end in windows)
+
+
+def test_batch_windows_map_back_to_absolute_time(tmp_path) -> None:
+    """Test window transcripts are regrouped per chunk with absolute timestamps."""
+    path = tmp_path / "audio.f32"
+    np.ones(16000 * 120, dtype=np.float32).tofile(path)
+    audio = AudioBuffer(str(path))
+    batch = [Chunk(10.0, 25.0, 3), Chunk(60.0, 100.0, 4)]
+
+    inputs, windows = build_batch_windows(audio, batch)
+    results = group_window_results(windows, [f" text {i}" for i in range(len(inputs))])
+
+    assert len(inputs) == 3  # 15s chunk + 40s chunk split in two
+    assert [r["segment_id"] for r in results] == [3, 4]
+    assert results[0]["segments"][0]["start"] == 10.0
+    assert results[0]["segments"][0]["end"] == 25.0
+    assert results[1]["segments"][0]["start"] == 60.0
+    assert results[1]["segments"][-1]["end"] == 100.0
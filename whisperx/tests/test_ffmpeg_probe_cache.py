@@ -0,0 +1,73 @@
+"""Tests for the process-wide ffprobe cache and one-time ffmpeg verification."""
+
+import json
+import os
+import subprocess
+
+import pytest
+
+import ffmpeg_processor
+from ffmpeg_processor import FFmpegProcessor, probe_cache
+
+PROBE_OUTPUT = json.dumps(
+    {
+        "format": {"duration": "12.5", "size": "1000", "format_name": "wav"},
+        "streams": [
+            {"codec_type": "audio", "codec_name": "pcm_s16le", "sample_rate": "16000"}
+        ],
+    }
+)
+
+
+@pytest.fixture
+def spawned(monkeypatch):
+    """Record spawned commands instead of running ffmpeg/ffprobe."""
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd[0])
+        return subprocess.CompletedProcess(cmd, 0, stdout=PROBE_OUTPUT, stderr="")
+
+    monkeypatch.setattr(ffmpeg_processor.subprocess, "run", fake_run)
+    monkeypatch.setattr(ffmpeg_processor, "_ffmpeg_verified", False)
+    probe_cache.clear()
+    yield calls
+    probe_cache.clear()
+
+
+def test_ffmpeg_verified_once_per_process(spawned) -> None:
+    """Test constructing many processors runs `ffmpeg -version` only once."""
+    for _ in range(3):
+        FFmpegProcessor()
+
+    assert spawned == ["ffmpeg"]
+
+
+def test_repeated_probes_hit_cache(spawned, tmp_path) -> None:
+    """Test the same unchanged file is probed once across processors."""
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"\x00" * 100)
+
+    first = FFmpegProcessor().get_video_info(str(path))
+    second = FFmpegProcessor().get_video_info(str(path))
+    first["duration"] = 0  # callers get copies
+
+    assert spawned.count("ffprobe") == 1
+    assert second["duration"] == 12.5
+    assert FFmpegProcessor().get_video_info(str(path))["duration"] == 12.5
+    assert probe_cache.stats()["hits"] == 2
+
+
+def test_modified_file_is_probed_again(spawned, tmp_path) -> None:
+    """Test a changed size or mtime invalidates the cached metadata."""
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"\x00" * 100)
+    processor = FFmpegProcessor()
+
+    processor.get_video_info(str(path))
+    path.write_bytes(b"\x00" * 200)
+    processor.get_video_info(str(path))
+    os.utime(path, ns=(0, 0))
+    processor.get_video_info(str(path))
+
+    assert spawned.count("ffprobe") == 3
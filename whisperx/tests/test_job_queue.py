@@ -0,0 +1,140 @@
+"""Tests for the GPU job queue."""
+
+import asyncio
+import threading
+
+import pytest
+
+from job_queue import JobCancelled, JobQueue, JobStatus, QueueFullError
+
+
+def blocker():
+    """Job function that holds the worker until released."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def run(job):
+        started.set()
+        release.wait(5)
+        job.check_cancelled()
+        return "blocked"
+
+    return run, started, release
+
+
+def test_jobs_run_by_priority_then_submission_order() -> None:
+    """Test higher priority jobs run first and ties keep FIFO order."""
+    queue = JobQueue(max_size=10)
+    order = []
+    run, started, release = blocker()
+
+    queue.start()
+    first = queue.submit(run, "block")
+    started.wait(5)
+
+    jobs = [
+        queue.submit(lambda job, n=n: order.append(n), "t", priority=p)
+        for n, p in [("low", 1), ("high-a", 9), ("mid", 5), ("high-b", 9)]
+    ]
+    assert queue.position(jobs[1].id) == 1
+    assert queue.position(jobs[0].id) == 4
+
+    release.set()
+    for job in jobs:
+        job.future.result(5)
+    queue.stop()
+
+    assert first.status == JobStatus.COMPLETED
+    assert first.result == "blocked"
+    assert order == ["high-a", "high-b", "mid", "low"]
+
+
+def test_full_queue_rejects_submissions() -> None:
+    """Test backpressure once max_size jobs are waiting."""
+    queue = JobQueue(max_size=2)
+    queue.submit(lambda job: None, "t")
+    queue.submit(lambda job: None, "t")
+
+    with pytest.raises(QueueFullError):
+        queue.submit(lambda job: None, "t")
+    assert queue.stats()["rejected"] == 1
+
+
+def test_cancel_queued_job_runs_cleanup() -> None:
+    """Test a queued job is dropped without running and its cleanup fires."""
+    queue = JobQueue(max_size=4)
+    cleaned = []
+    ran = []
+    job = queue.submit(lambda j: ran.append(1), "t", cleanup=lambda: cleaned.append(1))
+
+    assert queue.cancel(job.id)
+    assert job.status == JobStatus.CANCELLED
+    assert cleaned == [1]
+    assert queue.stats()["queued"] == 0
+    with pytest.raises(JobCancelled):
+        job.future.result(1)
+
+    queue.start()
+    queue.submit(lambda j: None, "t").future.result(5)
+    queue.stop()
+    assert ran == []
+    assert not queue.cancel(job.id)
+
+
+def test_cancel_running_job_stops_at_checkpoint() -> None:
+    """Test cooperative cancellation of the running job."""
+    queue = JobQueue()
+    run, started, release = blocker()
+    queue.start()
+    job = queue.submit(run, "block")
+    started.wait(5)
+
+    assert queue.cancel(job.id)
+    release.set()
+    with pytest.raises(JobCancelled):
+        job.future.result(5)
+    queue.stop()
+
+    assert job.status == JobStatus.CANCELLED
+
+
+def test_failed_job_records_error_and_async_run_awaits_result() -> None:
+    """Test failures are captured and run() awaits results without blocking."""
+    queue = JobQueue()
+    queue.start()
+
+    def fail(job):
+        raise ValueError("bad audio")
+
+    failed = queue.submit(fail, "t")
+    with pytest.raises(ValueError):
+        failed.future.result(5)
+    assert failed.status == JobStatus.FAILED
+    assert failed.error == "bad audio"
+
+    def progress(job):
+        job.update(50, "transcription", "half way")
+        return job.progress
+
+    assert asyncio.run(queue.run(progress, "t")) == 50
+    queue.stop()
+
+
+def test_async_run_does_not_keep_result_in_history() -> None:
+    """Test a run() job keeps its status but drops its result and event log."""
+    queue = JobQueue()
+    queue.start()
+
+    def transcribe(job):
+        job.update(50, "transcription")
+        return {"segments": ["x" * 1000]}
+
+    assert asyncio.run(queue.run(transcribe, "t")) == {"segments": ["x" * 1000]}
+    queue.stop()
+
+    job = queue.list_jobs()[0]
+    assert job["status"] == "completed"
+    assert job["released"] is True
+    kept = queue.get(job["job_id"])
+    assert kept.result is None
+    assert kept.events.events() == []
@@ -0,0 +1,200 @@
+"""Tests for the large-file pipeline wiring in the API server.
+
+They import api_server and therefore need the service image (torch and
+whisperx installed); elsewhere they are skipped. Model calls are replaced
+by fakes, so no model is loaded.
+"""
+
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("whisperx")
+
+import api_server  # noqa: E402
+from audio_buffer import AudioBuffer  # noqa: E402
+from result_cache import ResultCache  # noqa: E402
+
+ASR_SEGMENTS = [{"start": 0.0, "end": 1.0, "text": " hello world"}]
+ALIGNED_SEGMENTS = [
+    {
+        "start": 0.0,
+        "end": 1.0,
+        "text": " hello world",
+        "words": [
+            {"word": "hello", "start": 0.0, "end": 0.4},
+            {"word": "world", "start": 0.5, "end": 1.0},
+        ],
+    }
+]
+
+
+class FakeAudio:
+    samples = np.zeros(16000, dtype=np.float32)
+    duration = 1.0
+
+    def close(self):
+        pass
+
+
+def asr_result() -> dict:
+    return {
+        "language": "en",
+        "duration": 1.0,
+        "num_chunks": 1,
+        "chunks_per_second": 1.0,
+        "segments": [dict(seg) for seg in ASR_SEGMENTS],
+        "merge_stats": {},
+    }
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    """Pipeline with a fresh result cache and faked ASR/alignment stages."""
+    monkeypatch.setattr(api_server, "result_cache", ResultCache(tmp_path / "cache", 1 << 20))
+    monkeypatch.setattr(api_server.AudioBuffer, "decode", lambda *args, **kwargs: FakeAudio())
+
+    def run_pipelined_asr(*args, on_segments=None, **kwargs):
+        # Streams its own segments as they are finalized, like the real stages;
+        # alignment fails here, so the ASR stage is cached without an aligned one
+        asr = asr_result()
+        on_segments(asr["segments"])
+        return asr, None
+
+    monkeypatch.setattr(api_server, "run_pipelined_asr", run_pipelined_asr)
+    monkeypatch.setattr(
+        api_server,
+        "align_all_segments",
+        lambda *args: {"segments": [dict(seg) for seg in ALIGNED_SEGMENTS], "merge_stats": {}},
+    )
+
+    path = tmp_path / "talk.wav"
+    path.write_bytes(b"RIFF" + bytes(1000))
+
+    def run():
+        published = []
+        response = api_server.run_large_transcription(
+            path,
+            "talk.wav",
+            enable_diarization=False,
+            on_segments=published.append,
+        )
+        return response, published
+
+    return run
+
+
+def test_segments_published_on_every_cache_path(pipeline) -> None:
+    """Test on_segments sees the transcript on a miss, an ASR-only hit and a full hit."""
+    run = pipeline
+
+    # Full miss: published by the pipeline stages themselves
+    response, published = run()
+    assert response["cache"] == {"asr": "miss", "alignment": "miss"}
+    assert published == [ASR_SEGMENTS]
+
+    # ASR hit, alignment miss: aligned in one pass and published
+    response, published = run()
+    assert response["cache"] == {"asr": "hit", "alignment": "miss"}
+    assert published == [ALIGNED_SEGMENTS]
+
+    # Both hit
+    response, published = run()
+    assert response["cache"] == {"asr": "hit", "alignment": "hit"}
+    assert published == [ALIGNED_SEGMENTS]
+    assert response["segments"] == ALIGNED_SEGMENTS
+
+
+class Chunk:
+    """Minimal stand-in for video_segmenter.AudioSegment."""
+
+    def __init__(self, start: float, end: float, segment_id: int):
+        self.start = start
+        self.end = end
+        self.duration = end - start
+        self.segment_id = segment_id
+
+
+class FakeWhisperPipeline:
+    """
+    Behaves like whisperx's FasterWhisperPipeline loaded without a language:
+    transcribe() detects one and drops the tokenizer again afterwards, and a
+    direct batched call fails without a tokenizer.
+    """
+
+    def __init__(self, vad_done: threading.Event):
+        self.vad_done = vad_done
+        self.tokenizer = None
+        self.model = SimpleNamespace(
+            hf_tokenizer=object(), model=SimpleNamespace(is_multilingual=True)
+        )
+        self.transcribed = 0
+        self.batched_calls = []
+
+    def transcribe(self, audio, batch_size=None, language=None):
+        # Let VAD find every chunk, so the next call can pack all of them
+        self.vad_done.wait(5)
+        self.transcribed += 1
+        return {
+            "segments": [{"text": " first", "start": 0.0, "end": len(audio) / 16000}],
+            "language": language or "de",
+        }
+
+    def __call__(self, inputs, batch_size=None, num_workers=0):
+        if self.tokenizer is None:
+            raise AttributeError("'NoneType' object has no attribute 'sot_sequence'")
+        inputs = list(inputs)
+        self.batched_calls.append((len(inputs), self.tokenizer.language))
+        for _ in inputs:
+            yield {"text": " text" if batch_size not in (0, 1, None) else [" text"]}
+
+
+class FakeTokenizer:
+    def __init__(self, hf_tokenizer, multilingual, task=None, language=None):
+        self.task = task
+        self.language = self.language_code = language
+
+
+def test_auto_detected_language_still_packs_batches(tmp_path, monkeypatch) -> None:
+    """Test chunks after language detection go through one packed call, not per-chunk transcribe."""
+    path = tmp_path / "audio.f32"
+    np.ones(16000 * 40, dtype=np.float32).tofile(path)
+    audio = AudioBuffer(str(path))
+    chunks = [Chunk(i * 10.0, (i + 1) * 10.0, i) for i in range(4)]
+    vad_done = threading.Event()
+
+    def iter_chunks(*args, **kwargs):
+        yield from chunks
+        vad_done.set()
+
+    pipeline = FakeWhisperPipeline(vad_done)
+    monkeypatch.setattr(api_server.video_segmenter, "iter_chunks", iter_chunks)
+    monkeypatch.setattr(api_server, "get_whisper_model", lambda *args: pipeline)
+    monkeypatch.setattr(api_server, "Tokenizer", FakeTokenizer)
+
+    def no_alignment(language):
+        raise RuntimeError("no alignment model in tests")
+
+    monkeypatch.setattr(api_server, "get_align_model", no_alignment)
+
+    asr, aligned = api_server.run_pipelined_asr(
+        path,
+        audio,
+        model="large-v3",
+        language=None,
+        chunking_strategy="vad",
+        chunk_batch_size=8,
+        merge_overlaps=False,
+        timer=api_server.new_stage_timer(),
+    )
+    audio.close()
+
+    assert pipeline.transcribed == 1
+    assert pipeline.batched_calls == [(3, "de")]
+    assert pipeline.tokenizer is None
+    assert asr["language"] == "de"
+    assert asr["num_chunks"] == 4
+    assert aligned is None
@@ -0,0 +1,64 @@
+"""Tests for stage metrics: resource sampling and Prometheus rendering."""
+
+import time
+
+from metrics import Histogram, MetricsRegistry, ResourceMonitor
+from stage_pipeline import StageTimer
+
+
+def test_histogram_cumulative_buckets() -> None:
+    """Test observations land in cumulative buckets with sum and count."""
+    histogram = Histogram("h", "help", [1, 5], ["stage"])
+    for value in (0.5, 1, 3, 10):
+        histogram.observe(value, stage="asr")
+
+    series = histogram.snapshot()[("asr",)]
+    assert series["buckets"] == [2, 3, 4]
+    assert series["sum"] == 14.5
+    assert series["count"] == 4
+
+
+def test_registry_renders_prometheus_text() -> None:
+    """Test histograms and callback gauges render in exposition format."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("whisperx_stage_seconds", "Stage time", [1], ["stage"])
+    histogram.observe(0.25, stage='vad "onnx"')
+    registry.gauge("queue_jobs", "Jobs", lambda: {(("state", "queued"),): 2})
+    registry.gauge("broken", "Raises", lambda: 1 / 0)
+
+    text = registry.render()
+
+    assert "# TYPE whisperx_stage_seconds histogram" in text
+    assert 'whisperx_stage_seconds_bucket{stage="vad \\"onnx\\"",le="1"} 1' in text
+    assert 'whisperx_stage_seconds_bucket{stage="vad \\"onnx\\"",le="+Inf"} 1' in text
+    assert 'whisperx_stage_seconds_count{stage="vad \\"onnx\\""} 1' in text
+    assert 'queue_jobs{state="queued"} 2' in text
+    assert "broken" not in text
+
+
+def test_monitor_reports_peak_within_window() -> None:
+    """Test the sampler catches a peak between the start and end readings."""
+    level = {"value": 1.0}
+    monitor = ResourceMonitor({"mem": lambda: level["value"]}, interval=0.005)
+
+    with monitor.track() as peaks:
+        level["value"] = 50.0
+        time.sleep(0.05)
+        level["value"] = 2.0
+
+    assert peaks["mem"] == 50.0
+
+
+def test_timer_records_peaks_and_notifies() -> None:
+    """Test StageTimer reports per-stage peaks and calls on_stage per unit."""
+    observed = []
+    monitor = ResourceMonitor({"rss_bytes": lambda: 1024.0})
+    timer = StageTimer(monitor=monitor, on_stage=lambda *args: observed.append(args))
+
+    with timer.busy("decode"):
+        pass
+
+    stage = timer.report()["stages"]["decode"]
+    assert stage["peak_rss_bytes"] == 1024
+    assert observed[0][0] == "decode"
+    assert observed[0][2] == {"rss_bytes": 1024.0}
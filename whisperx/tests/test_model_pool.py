@@ -0,0 +1,191 @@
+"""Tests for the resident model pool."""
+
+import threading
+import time
+
+import pytest
+
+from model_pool import ModelPool
+
+
+def _loader(value):
+    calls = []
+
+    def load():
+        calls.append(value)
+        return value
+
+    return load, calls
+
+
+def test_pool_hit_reuses_loaded_model() -> None:
+    """Test a second lookup with the same key does not reload."""
+    pool = ModelPool(name="test")
+    load, calls = _loader("model-a")
+
+    assert pool.get(("large-v3", "float16", "en"), load, size_mb=100) == "model-a"
+    assert pool.get(("large-v3", "float16", "en"), load, size_mb=100) == "model-a"
+
+    stats = pool.stats()
+    assert len(calls) == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_pool_evicts_lru_over_entry_limit() -> None:
+    """Test the least recently used model is evicted at max_entries."""
+    pool = ModelPool(name="test", max_entries=2)
+    pool.get("a", lambda: "A", size_mb=1)
+    pool.get("b", lambda: "B", size_mb=1)
+    pool.get("a", lambda: "A", size_mb=1)  # touch a, b becomes LRU
+    pool.get("c", lambda: "C", size_mb=1)
+
+    keys = [entry["key"] for entry in pool.entries()]
+    assert keys == ["a", "c"]
+    assert pool.stats()["evictions"] == 1
+
+
+def test_pool_respects_memory_budget() -> None:
+    """Test entries are evicted to keep within max_memory_mb."""
+    pool = ModelPool(name="test", max_memory_mb=1000)
+    pool.get("small", lambda: "S", size_mb=400)
+    pool.get("medium", lambda: "M", size_mb=500)
+    pool.get("large", lambda: "L", size_mb=600)
+
+    assert pool.used_mb <= 1000
+    assert [entry["key"] for entry in pool.entries()] == ["large"]
+
+
+def test_pool_measures_size_with_memory_probe() -> None:
+    """Test model size is measured from the memory probe delta."""
+    usage = {"mb": 1000.0}
+
+    def load():
+        usage["mb"] += 250.0
+        return "model"
+
+    pool = ModelPool(name="test", memory_probe=lambda: usage["mb"])
+    pool.get("key", load)
+
+    assert pool.entries()[0]["size_mb"] == 250.0
+
+
+def test_pool_evicts_idle_entries() -> None:
+    """Test entries idle longer than the TTL are evicted."""
+    pool = ModelPool(name="test", idle_ttl=0.01)
+    pool.get("a", lambda: "A", size_mb=1)
+    time.sleep(0.02)
+
+    assert pool.evict_idle() == 1
+    assert pool.entries() == []
+
+
+def test_pool_manual_evict_calls_release_hook() -> None:
+    """Test manual eviction runs the release hook."""
+    released = []
+    pool = ModelPool(name="test", on_evict=lambda: released.append(True))
+    pool.get("a", lambda: "A", size_mb=1)
+
+    assert pool.evict("a") is True
+    assert pool.evict("a") is False
+    assert released == [True]
+
+
+def test_pool_evicts_by_listed_key() -> None:
+    """Test keys as listed by entries() (lists) evict the tuple-keyed model."""
+    pool = ModelPool(name="alignment")
+    pool.get(("en", "cuda"), lambda: "wav2vec2-en", size_mb=360)
+    pool.get(("de", "cuda"), lambda: "wav2vec2-de", size_mb=360)
+
+    listed = pool.entries()[0]["key"]
+
+    assert listed == ["en", "cuda"]
+    assert pool.evict(listed)
+    assert [entry["key"] for entry in pool.entries()] == [["de", "cuda"]]
+    assert pool.used_mb == 360
+
+
+def test_pool_stats_not_blocked_by_loading_model() -> None:
+    """Test stats() answers while a loader runs and concurrent lookups share one load."""
+    pool = ModelPool(name="test")
+    started = threading.Event()
+    finish = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        finish.wait(5)
+        return "model"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(pool.get("a", load, size_mb=10)))
+        for _ in range(2)
+    ]
+    threads[0].start()
+    assert started.wait(5)
+    threads[1].start()
+
+    stats = {}
+    reader = threading.Thread(target=lambda: stats.update(pool.stats()))
+    reader.start()
+    reader.join(1)
+    assert not reader.is_alive()
+    assert stats["resident"] == 0
+
+    finish.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["model", "model"]
+    assert len(calls) == 1
+    assert pool.stats()["misses"] == 1
+    assert pool.stats()["hits"] == 1
+
+
+def test_pool_failed_load_lets_next_lookup_retry() -> None:
+    """Test a loader error releases the key so a later lookup loads again."""
+    pool = ModelPool(name="test")
+
+    def fail():
+        raise RuntimeError("out of memory")
+
+    with pytest.raises(RuntimeError):
+        pool.get("a", fail, size_mb=10)
+
+    assert pool.get("a", lambda: "model", size_mb=10) == "model"
+    assert pool.stats()["resident"] == 1
+
+
+def test_concurrent_measured_loads_do_not_count_each_other() -> None:
+    """Test sizes measured from the probe delta exclude another pool's concurrent load."""
+    usage = {"mb": 0.0}
+    first_loading = threading.Event()
+
+    def load(mb, wait=None):
+        def run():
+            if wait is not None:
+                first_loading.set()
+                wait.wait(0.5)
+            usage["mb"] += mb
+            return mb
+
+        return run
+
+    whisper = ModelPool(name="whisper", memory_probe=lambda: usage["mb"])
+    align = ModelPool(name="align", memory_probe=lambda: usage["mb"])
+    second_done = threading.Event()
+
+    first = threading.Thread(target=whisper.get, args=("large-v3", load(3000, second_done)))
+    first.start()
+    assert first_loading.wait(5)
+    second = threading.Thread(
+        target=lambda: (align.get("en", load(400)), second_done.set())
+    )
+    second.start()
+    first.join(5)
+    second.join(5)
+
+    assert whisper.entries()[0]["size_mb"] == 3000
+    assert align.entries()[0]["size_mb"] == 400
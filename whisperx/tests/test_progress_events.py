@@ -0,0 +1,113 @@
+"""Tests for job event streams and the background progress callback sender."""
+
+import asyncio
+import threading
+
+from job_queue import JobQueue
+from progress_events import EventStream, ProgressCallbackSender, format_sse
+
+
+async def _collect(stream: EventStream, after: int = 0):
+    return [entry async for entry in stream.subscribe(after=after)]
+
+
+def test_subscriber_gets_backlog_then_live_events() -> None:
+    """Test a late subscriber replays earlier events and follows new ones."""
+    stream = EventStream()
+    stream.publish("progress", {"progress": 10})
+
+    async def main():
+        task = asyncio.create_task(_collect(stream))
+        await asyncio.sleep(0.01)
+        # Publish from another thread like the GPU worker does
+        worker = threading.Thread(
+            target=lambda: (stream.publish("segments", {"offset": 0}), stream.close())
+        )
+        worker.start()
+        worker.join()
+        return await asyncio.wait_for(task, 5)
+
+    events = asyncio.run(main())
+
+    assert [e["event"] for e in events] == ["progress", "segments"]
+    assert [e["id"] for e in events] == [1, 2]
+
+
+def test_resume_after_last_event_id_on_closed_stream() -> None:
+    """Test reconnecting with a last event id only replays newer events."""
+    stream = EventStream()
+    for n in range(3):
+        stream.publish("progress", {"progress": n})
+    stream.close()
+
+    events = asyncio.run(_collect(stream, after=2))
+
+    assert [e["data"] for e in events] == [{"progress": 2}]
+    assert stream.publish("progress", {}) is None
+
+
+def test_heartbeat_while_idle() -> None:
+    """Test subscribe() yields None after the idle timeout."""
+    stream = EventStream()
+
+    async def first():
+        async for entry in stream.subscribe(heartbeat=0.01):
+            return entry
+
+    assert asyncio.run(first()) is None
+
+
+def test_format_sse_frame() -> None:
+    """Test SSE frames carry id, event name and JSON data."""
+    frame = format_sse({"id": 7, "event": "segments", "data": {"txt": "hi"}})
+
+    assert frame == 'id: 7\nevent: segments\ndata: {"txt": "hi"}\n\n'
+    assert format_sse(None).startswith(":")
+
+
+def test_job_publishes_progress_and_result() -> None:
+    """Test queued jobs stream progress and end with their result."""
+    queue = JobQueue()
+    queue.start()
+
+    def run(job):
+        job.update(50, "transcription", "halfway")
+        return {"txt": "done"}
+
+    job = queue.submit(run, "t")
+    job.future.result(5)
+    queue.stop()
+
+    events = job.events.events()
+    assert [e["event"] for e in events] == ["status", "progress", "result"]
+    assert events[-1]["data"] == {"txt": "done"}
+    assert job.events.closed
+
+
+def test_callback_sender_coalesces_pending_updates() -> None:
+    """Test a slow callback endpoint only receives the latest pending progress."""
+    posted = []
+    first_posted = threading.Event()
+    release = threading.Event()
+
+    class Response:
+        status_code = 200
+
+    def fake_post(url, json=None, timeout=None):
+        posted.append(json["progress"])
+        first_posted.set()
+        release.wait(5)
+        return Response()
+
+    sender = ProgressCallbackSender(post=fake_post)
+    sender.start()
+
+    sender.send("http://n8n/hook", {"job_id": "a", "progress": 10})
+    first_posted.wait(5)
+    for progress in (20, 30, 40):
+        sender.send("http://n8n/hook", {"job_id": "a", "progress": progress})
+    release.set()
+    sender.stop()
+
+    assert posted == [10, 40]
+    assert sender.stats() == {"pending": 0, "sent": 2, "failed": 0, "coalesced": 2}
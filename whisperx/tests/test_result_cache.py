@@ -0,0 +1,73 @@
+"""Tests for the content-addressed result cache."""
+
+import hashlib
+import os
+
+from result_cache import ResultCache, hash_file, make_key
+
+
+def test_make_key_is_order_independent_and_param_sensitive() -> None:
+    """Test keys ignore parameter order but change with any parameter."""
+    a = make_key("asr", "abc", model="large-v3", language=None)
+    b = make_key("asr", "abc", language=None, model="large-v3")
+    c = make_key("asr", "abc", model="large-v3", language="en")
+
+    assert a == b
+    assert a != c
+    assert make_key("aligned", a) != make_key("aligned", c)
+
+
+def test_hash_file_matches_sha256(tmp_path) -> None:
+    """Test chunked file hashing matches a one-shot digest."""
+    data = os.urandom(100_000)
+    path = tmp_path / "audio.wav"
+    path.write_bytes(data)
+
+    assert hash_file(path, chunk_size=4096) == hashlib.sha256(data).hexdigest()
+
+
+def test_put_get_roundtrip_and_counters(tmp_path) -> None:
+    """Test stored stage results come back and hits/misses are counted."""
+    cache = ResultCache(tmp_path, max_bytes=1024 * 1024)
+    key = make_key("asr", "abc")
+
+    assert cache.get("asr", key) is None
+    cache.put("asr", key, {"language": "en", "segments": [{"text": "hi"}]})
+
+    assert cache.get("asr", key) == {"language": "en", "segments": [{"text": "hi"}]}
+    assert cache.get("aligned", key) is None
+    stats = cache.stats()
+    assert stats["hits"] == {"asr": 1}
+    assert stats["misses"] == {"asr": 1, "aligned": 1}
+
+
+def test_lru_eviction_by_total_size(tmp_path) -> None:
+    """Test least recently used entries go first once over max_bytes."""
+    value = {"segments": ["x" * 400]}
+    cache = ResultCache(tmp_path, max_bytes=1000)
+
+    cache.put("asr", "a", value)
+    cache.put("asr", "b", value)
+    cache.get("asr", "a")  # a is now most recently used
+    cache.put("asr", "c", value)
+
+    assert cache.get("asr", "b") is None
+    assert cache.get("asr", "a") == value
+    assert cache.get("asr", "c") == value
+    assert cache.size_bytes <= 1000
+    assert not (tmp_path / "asr" / "b.json").exists()
+
+
+def test_index_survives_restart_and_disabled_cache_is_noop(tmp_path) -> None:
+    """Test entries are rediscovered on startup; max_bytes=0 disables caching."""
+    ResultCache(tmp_path, max_bytes=10_000).put("diarized", "k", {"segments": []})
+
+    reopened = ResultCache(tmp_path, max_bytes=10_000)
+    assert reopened.stats()["entries"] == 1
+    assert reopened.get("diarized", "k") == {"segments": []}
+
+    disabled = ResultCache(tmp_path / "off", max_bytes=0)
+    disabled.put("asr", "k", {"segments": []})
+    assert disabled.get("asr", "k") is None
+    assert not (tmp_path / "off").exists()
+    assert reopened.get("asr", None) is None
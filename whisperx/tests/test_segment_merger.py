@@ -0,0 +1,158 @@
+"""Tests for overlap-aware segment merging."""
+
+from segment_merger import (
+    OverlapMerger,
+    dedupe_overlapping_words,
+    merge_chunk_results,
+)
+
+
+def _word(text, start, end, score=0.9):
+    return {"word": text, "start": start, "end": end, "score": score}
+
+
+def _segment(words):
+    return {
+        "text": " " + " ".join(w["word"] for w in words),
+        "start": words[0]["start"],
+        "end": words[-1]["end"],
+        "words": words,
+    }
+
+
+def test_non_overlapping_chunks_are_concatenated() -> None:
+    """Test chunks without overlap pass through unchanged."""
+    chunks = [
+        {"start": 0, "end": 10, "segments": [{"text": " one", "start": 1, "end": 2}]},
+        {"start": 10, "end": 20, "segments": [{"text": " two", "start": 11, "end": 12}]},
+    ]
+
+    merged, stats = merge_chunk_results(chunks)
+
+    assert [s["text"] for s in merged] == [" one", " two"]
+    assert stats["boundaries"] == 0
+
+
+def test_text_merge_removes_repeated_words_before_alignment() -> None:
+    """Test repeated text in the overlap is kept only once (no word timing)."""
+    chunks = [
+        {
+            "start": 0,
+            "end": 30,
+            "segments": [
+                {"text": " hello there my friend how are you", "start": 15, "end": 30}
+            ],
+        },
+        {
+            "start": 20,
+            "end": 50,
+            "segments": [
+                {"text": " friend how are you doing today", "start": 20, "end": 35}
+            ],
+        },
+    ]
+
+    merged, stats = merge_chunk_results(chunks)
+    text = " ".join(s["text"].strip() for s in merged)
+
+    assert text == "hello there my friend how are you doing today"
+    assert stats["words_removed"] == 4
+    assert merged[0]["end"] <= merged[1]["start"]
+
+
+def test_text_merge_keeps_both_without_reliable_match() -> None:
+    """Test unrelated straddling text is not discarded."""
+    chunks = [
+        {"start": 0, "end": 30, "segments": [{"text": " alpha beta", "start": 20, "end": 28}]},
+        {"start": 20, "end": 50, "segments": [{"text": " gamma delta", "start": 22, "end": 30}]},
+    ]
+
+    merged, _ = merge_chunk_results(chunks)
+
+    assert len(merged) == 2
+
+
+def test_text_merge_keeps_adjacent_segments_sharing_a_phrase() -> None:
+    """Test segments that do not overlap in time are unchanged despite a common bigram."""
+    prev = {"text": " we went to the store and then we bought some milk", "start": 18, "end": 27}
+    nxt = {"text": " after the store closed she drove home to the farm", "start": 27.5, "end": 35}
+    chunks = [
+        {"start": 0, "end": 30, "segments": [dict(prev)]},
+        {"start": 20, "end": 50, "segments": [dict(nxt)]},
+    ]
+
+    merged, stats = merge_chunk_results(chunks)
+
+    assert merged == [prev, nxt]
+    assert stats["words_removed"] == 0
+
+
+def test_text_merge_ignores_phrase_repeated_outside_the_overlap() -> None:
+    """Test a shared bigram far from the overlap window is not treated as a repeat."""
+    prev = {"text": " we went to the store and then we bought some milk", "start": 10, "end": 28}
+    nxt = {"text": " after the store closed she drove home to the farm", "start": 24, "end": 40}
+    chunks = [
+        {"start": 0, "end": 30, "segments": [dict(prev)]},
+        {"start": 20, "end": 50, "segments": [dict(nxt)]},
+    ]
+
+    merged, stats = merge_chunk_results(chunks)
+
+    assert [s["text"] for s in merged] == [prev["text"], nxt["text"]]
+    assert stats["words_removed"] == 0
+
+
+def test_word_merge_splits_at_cut_and_keeps_higher_score() -> None:
+    """Test timed words are split at the overlap midpoint without duplicates."""
+    prev_words = [
+        _word("we", 20.0, 20.3),
+        _word("are", 24.0, 24.3),
+        _word("going", 24.9, 25.2, score=0.5),
+        _word("home", 27.0, 27.4),
+    ]
+    next_words = [
+        _word("are", 24.0, 24.3),
+        _word("going", 25.0, 25.3, score=0.95),
+        _word("home", 27.0, 27.4),
+        _word("now", 31.0, 31.3),
+    ]
+    chunks = [
+        {"start": 0, "end": 30, "segments": [_segment(prev_words)]},
+        {"start": 20, "end": 50, "segments": [_segment(next_words)]},
+    ]
+
+    merged, _ = merge_chunk_results(chunks)
+    words = [w for s in merged for w in s["words"]]
+
+    assert [w["word"] for w in words] == ["we", "are", "going", "home", "now"]
+    assert [w["score"] for w in words if w["word"] == "going"] == [0.95]
+
+
+def test_incremental_merger_emits_segments_after_boundary() -> None:
+    """Test segments are released once the following boundary is resolved."""
+    merger = OverlapMerger()
+
+    first = merger.add(
+        {"start": 0, "end": 10, "segments": [{"text": " a", "start": 1, "end": 2}]}
+    )
+    second = merger.add(
+        {"start": 10, "end": 20, "segments": [{"text": " b", "start": 11, "end": 12}]}
+    )
+
+    assert first == []
+    assert [s["text"] for s in second] == [" a"]
+    assert [s["text"] for s in merger.flush()] == [" b"]
+
+
+def test_dedupe_overlapping_words_after_alignment() -> None:
+    """Test the post-alignment pass drops duplicated boundary words."""
+    segments = [
+        _segment([_word("so", 1.0, 1.2), _word("then", 1.3, 1.6, score=0.4)]),
+        _segment([_word("then", 1.35, 1.6, score=0.8), _word("we", 1.7, 1.9)]),
+    ]
+
+    result, removed = dedupe_overlapping_words(segments)
+    words = [w["word"] for s in result for w in s["words"]]
+
+    assert removed == 1
+    assert words == ["so", "then", "we"]
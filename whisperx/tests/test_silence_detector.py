@@ -0,0 +1,51 @@
+"""Tests for the vectorized energy-based silence detector."""
+
+import numpy as np
+
+from silence_detector import detect_silence, frame_levels_db, parse_db
+
+SR = 16000
+
+
+def _audio(seconds: float, loud_regions) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(int(seconds * SR)) * 1e-4).astype(np.float32)
+    for start, end in loud_regions:
+        audio[int(start * SR) : int(end * SR)] = 0.3
+    return audio
+
+
+def test_frame_levels_match_direct_rms() -> None:
+    """Test blocked strided levels equal a straightforward RMS per frame."""
+    audio = np.random.default_rng(1).standard_normal(16050).astype(np.float32)
+
+    levels = frame_levels_db(audio, frame_length=160)
+
+    assert len(levels) == 101  # 100 full frames + 50-sample tail
+    direct = [np.sqrt(np.mean(audio[i : i + 160] ** 2)) for i in range(0, 16050, 160)]
+    np.testing.assert_allclose(levels, 20 * np.log10(direct), rtol=1e-4)
+
+
+def test_detects_long_silences_only() -> None:
+    """Test silences shorter than min_silence_duration are ignored."""
+    audio = _audio(20, [(0, 3), (4, 8), (11, 20)])
+
+    silences = detect_silence(audio, SR, min_silence_duration=2.0)
+
+    assert silences == [(8.0, 11.0)]
+
+
+def test_leading_and_trailing_silence() -> None:
+    """Test silence at the very start and running to the end is reported."""
+    audio = _audio(12, [(3, 8)])
+
+    silences = detect_silence(audio, SR, min_silence_duration=2.0, silence_threshold=-50)
+
+    assert silences == [(0.0, 3.0), (8.0, 12.0)]
+
+
+def test_threshold_parsing_and_empty_audio() -> None:
+    """Test '-50dB' strings parse and empty input returns no silences."""
+    assert parse_db("-50dB") == -50.0
+    assert parse_db(-35) == -35.0
+    assert detect_silence(np.zeros(0, dtype=np.float32)) == []
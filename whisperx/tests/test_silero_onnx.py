@@ -0,0 +1,89 @@
+"""Tests for the batched ONNX Silero VAD engine (with a stand-in session)."""
+
+import numpy as np
+
+from silero_onnx import CONTEXT, WINDOW, SileroOnnxVAD, probs_to_segments
+
+SR = 16000
+
+
+class EnergySession:
+    """onnxruntime session stand-in: speech probability from window energy."""
+
+    def __init__(self):
+        self.calls = 0
+        self.batch_sizes = []
+
+    def run(self, outputs, feeds):
+        x, state = feeds["input"], feeds["state"]
+        assert x.shape[1] == CONTEXT + WINDOW
+        assert state.shape == (2, x.shape[0], 128)
+        self.calls += 1
+        self.batch_sizes.append(x.shape[0])
+        energy = np.abs(x[:, CONTEXT:]).mean(axis=1, keepdims=True)
+        return [np.where(energy > 0.1, 0.9, 0.05).astype(np.float32), state]
+
+
+def _speech_audio(seconds: float, regions) -> np.ndarray:
+    audio = np.zeros(int(seconds * SR), dtype=np.float32)
+    for start, end in regions:
+        audio[int(start * SR) : int(end * SR)] = 0.5
+    return audio
+
+
+def test_batched_probs_match_window_by_window() -> None:
+    """Test stream batching returns one probability per window, in order."""
+    audio = _speech_audio(95.3, [(3, 10), (40.2, 41), (90, 95)])
+    session = EnergySession()
+    vad = SileroOnnxVAD(session=session, batch_size=8, min_stream_seconds=5)
+
+    probs = vad.speech_probs(audio)
+
+    windows = -(-len(audio) // WINDOW)
+    padded = np.zeros(windows * WINDOW, dtype=np.float32)
+    padded[: len(audio)] = audio
+    energy = np.abs(padded.reshape(-1, WINDOW)).mean(axis=1)
+    expected = np.where(energy > 0.1, 0.9, 0.05)
+
+    assert len(probs) == windows
+    np.testing.assert_allclose(probs, expected)
+    assert set(session.batch_sizes) == {8}
+    assert session.calls < windows / 4
+
+
+def test_speech_timestamps_in_seconds() -> None:
+    """Test detected regions line up with the speech bursts (plus padding)."""
+    audio = _speech_audio(60, [(5, 12), (30, 31.5)])
+    vad = SileroOnnxVAD(session=EnergySession(), batch_size=4, min_stream_seconds=10)
+
+    segments = vad.speech_timestamps(audio)
+
+    assert len(segments) == 2
+    for (start, end), (exp_start, exp_end) in zip(segments, [(5, 12), (30, 31.5)]):
+        assert abs(start - exp_start) < 0.1
+        assert abs(end - exp_end) < 0.1
+
+
+def test_short_gaps_and_short_speech() -> None:
+    """Test gaps under min_silence are bridged and blips under min_speech dropped."""
+    probs = np.array(
+        [0.9] * 10 + [0.0] * 2 + [0.9] * 10 + [0.0] * 20 + [0.9] * 3 + [0.0] * 20
+    )
+
+    regions = probs_to_segments(
+        probs,
+        len(probs) * WINDOW,
+        min_speech_duration_ms=250,
+        min_silence_duration_ms=100,
+        speech_pad_ms=0,
+    )
+
+    assert regions == [(0, 22 * WINDOW)]
+
+
+def test_empty_audio() -> None:
+    """Test empty input yields no probabilities and no speech."""
+    vad = SileroOnnxVAD(session=EnergySession())
+
+    assert len(vad.speech_probs(np.zeros(0, dtype=np.float32))) == 0
+    assert vad.speech_timestamps(np.zeros(0, dtype=np.float32)) == []
@@ -0,0 +1,132 @@
+"""Tests for region-based speaker diarization."""
+
+import json
+
+import numpy as np
+
+from speaker_diarizer import (
+    SpeakerEmbedder,
+    SpeakerProfile,
+    cluster_centroids,
+    embedding_windows,
+    speaker_turns,
+    summarize_embeddings,
+)
+
+SR = 16000
+DIM = 16
+
+
+def speaker_audio(turns):
+    """Audio whose samples encode the speaker (1-based) of each turn; 0 elsewhere."""
+    samples = np.zeros(int(max(end for _, end, _ in turns) * SR) + SR, np.float32)
+    for start, end, speaker in turns:
+        samples[int(start * SR) : int(end * SR)] = speaker
+    return samples
+
+
+def make_embed_fn(calls):
+    """Embedding stub: a noisy fixed direction per speaker value found in the window."""
+    rng = np.random.default_rng(0)
+    directions = rng.standard_normal((4, DIM)).astype(np.float32)
+
+    def embed(waveforms, masks):
+        calls.append(waveforms.shape)
+        speakers = [
+            int(np.bincount(w[m > 0].astype(int)).argmax()) for w, m in zip(waveforms, masks)
+        ]
+        noise = rng.standard_normal((len(waveforms), DIM)).astype(np.float32) * 0.05
+        return directions[speakers] + noise
+
+    return embed
+
+
+def test_embedding_windows_cover_regions() -> None:
+    """Test long regions get overlapping windows and short ones are skipped or kept whole."""
+    windows = embedding_windows([(0.0, 0.3), (1.0, 2.5), (3.0, 7.5)], window=2.0, step=1.0)
+
+    assert windows.tolist() == [
+        [1.0, 2.5],
+        [3.0, 5.0],
+        [4.0, 6.0],
+        [5.0, 7.0],
+        [5.5, 7.5],
+    ]
+
+
+def test_summarize_and_cluster_recovers_speakers() -> None:
+    """Test fine centroids cluster back into the generating speakers."""
+    rng = np.random.default_rng(1)
+    directions = rng.standard_normal((3, DIM))
+    truth = rng.integers(0, 3, 300)
+    embeddings = directions[truth] + rng.standard_normal((300, DIM)) * 0.1
+
+    centroids, weights, assignment = summarize_embeddings(embeddings, threshold=0.95)
+    labels = cluster_centroids(centroids, weights, threshold=0.6)[assignment]
+
+    assert weights.sum() == 300
+    assert len(set(labels)) == 3
+    # Same partition as the ground truth (labels may be permuted)
+    assert len(set(zip(labels.tolist(), truth.tolist()))) == 3
+
+
+def test_cluster_respects_speaker_bounds() -> None:
+    """Test max_speakers forces merges and min_speakers stops them."""
+    centroids = np.eye(4, dtype=np.float32)
+    weights = np.array([10, 5, 3, 1])
+
+    assert len(set(cluster_centroids(centroids, weights, threshold=0.6))) == 4
+    assert len(set(cluster_centroids(centroids, weights, max_speakers=2))) == 2
+
+    same = np.tile(np.eye(1, 4, dtype=np.float32), (4, 1))
+    assert len(set(cluster_centroids(same, weights))) == 1
+    assert len(set(cluster_centroids(same, weights, min_speakers=3))) == 3
+
+
+def test_speaker_turns_split_overlaps_and_merge() -> None:
+    """Test overlapping windows split at the midpoint and same-speaker spans merge."""
+    windows = np.array([[0.0, 2.0], [1.0, 3.0], [2.0, 4.0], [6.0, 7.0]])
+    turns = speaker_turns(windows, np.array([5, 5, 2, 5]))
+
+    assert turns == [
+        {"start": 0.0, "end": 2.5, "speaker": "SPEAKER_00"},
+        {"start": 2.5, "end": 4.0, "speaker": "SPEAKER_01"},
+        {"start": 6.0, "end": 7.0, "speaker": "SPEAKER_00"},
+    ]
+
+
+def test_embedder_batches_speech_regions_only() -> None:
+    """Test only speech windows are embedded, in fixed-size batches, from a lazy iterator."""
+    turns = [(0.0, 6.0, 1), (8.0, 14.0, 2), (16.0, 20.0, 1)]
+    samples = speaker_audio(turns)
+    calls = []
+    embedder = SpeakerEmbedder(make_embed_fn(calls), batch_size=4)
+
+    regions = ((start, end) for start, end, _ in turns)
+    windows, embeddings = embedder.extract(samples, regions)
+
+    assert len(windows) == len(embeddings) == 5 + 5 + 3
+    assert [shape[0] for shape in calls] == [4, 4, 4, 1]
+    assert all(shape[1] == 2 * SR for shape in calls)
+    # No window reaches into the silence between regions
+    assert not ((windows[:, 0] < 8.0) & (windows[:, 1] > 6.0)).any()
+
+
+def test_profile_reclusters_without_embedding() -> None:
+    """Test a cached profile re-diarizes with new speaker bounds and no embedding calls."""
+    turns = [(0.0, 6.0, 1), (6.5, 12.0, 2), (13.0, 18.0, 3), (18.5, 22.0, 1)]
+    samples = speaker_audio(turns)
+    calls = []
+    embedder = SpeakerEmbedder(make_embed_fn(calls), batch_size=8)
+    profile = embedder.profile(samples, [(start, end) for start, end, _ in turns])
+
+    cached = SpeakerProfile.from_dict(json.loads(json.dumps(profile.to_dict())))
+    embed_calls = len(calls)
+
+    free = cached.diarize()
+    assert [t["speaker"] for t in free] == ["SPEAKER_00", "SPEAKER_01", "SPEAKER_02", "SPEAKER_00"]
+    assert free[0]["start"] == 0.0 and free[-1]["end"] == 22.0
+
+    bounded = cached.diarize(max_speakers=2)
+    assert len({t["speaker"] for t in bounded}) == 2
+    assert len(calls) == embed_calls
@@ -0,0 +1,84 @@
+"""Tests for the pipeline stage threads and timer."""
+
+import queue
+import time
+
+import pytest
+
+from stage_pipeline import END, StageThread, StageTimer
+
+
+def test_timer_accumulates_busy_time_and_calls() -> None:
+    """Test repeated busy() blocks add up per stage."""
+    timer = StageTimer()
+
+    for _ in range(3):
+        with timer.busy("asr"):
+            time.sleep(0.01)
+
+    report = timer.report()
+    assert report["stages"]["asr"]["calls"] == 3
+    assert report["stages"]["asr"]["busy"] >= 0.03
+    assert timer.busy_seconds("asr") >= 0.03
+    assert timer.busy_seconds("alignment") == 0.0
+
+
+def test_timer_reports_overlap_of_concurrent_stages() -> None:
+    """Test stages running at the same time show up as overlap."""
+    timer = StageTimer()
+
+    def work():
+        with timer.busy("alignment"):
+            time.sleep(0.05)
+
+    stage = StageThread("alignment", work)
+    stage.start()
+    with timer.busy("asr"):
+        time.sleep(0.05)
+    stage.wait()
+
+    report = timer.report()
+    assert report["overlap"] > 0.02
+    assert report["busy_total"] >= 0.1
+
+
+def test_timer_mark_keeps_first_occurrence() -> None:
+    """Test marks record when an event first happened."""
+    timer = StageTimer()
+    timer.mark("first_segment")
+    first = timer.report()["marks"]["first_segment"]
+    time.sleep(0.01)
+    timer.mark("first_segment")
+
+    assert timer.report()["marks"]["first_segment"] == first
+
+
+def test_stage_thread_returns_result_and_runs_on_exit() -> None:
+    """Test wait() returns the stage result and on_exit signals END."""
+    out = queue.Queue()
+
+    def produce():
+        for i in range(3):
+            out.put(i)
+        return "done"
+
+    stage = StageThread("vad", produce, on_exit=lambda: out.put(END))
+    stage.start()
+
+    assert stage.wait() == "done"
+    assert [out.get() for _ in range(4)] == [0, 1, 2, END]
+
+
+def test_stage_thread_reraises_and_still_signals_end() -> None:
+    """Test a failing stage unblocks consumers and surfaces its error."""
+    out = queue.Queue()
+
+    def fail():
+        raise RuntimeError("VAD failed")
+
+    stage = StageThread("vad", fail, on_exit=lambda: out.put(END))
+    stage.start()
+
+    assert out.get(timeout=1) is END
+    with pytest.raises(RuntimeError, match="VAD failed"):
+        stage.wait()
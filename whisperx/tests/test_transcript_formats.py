@@ -0,0 +1,160 @@
+"""Tests for the single-pass transcript serializers."""
+
+import gzip
+import json
+
+import pytest
+
+import transcript_formats
+from transcript_formats import (
+    OUTPUT_FORMATS,
+    IncrementalTranscript,
+    compress_body,
+    encode_response,
+    format_timestamp,
+    parse_outputs,
+    render_transcript,
+    select_outputs,
+)
+
+SEGMENTS = [
+    {
+        "start": 0.0,
+        "end": 2.5,
+        "text": " Hello world ",
+        "words": [
+            {"word": "Hello", "start": 0.0, "end": 0.48},
+            {"word": " world", "start": 0.5, "end": 2.5},
+            {"word": "", "start": 2.5, "end": 2.5},
+        ],
+    },
+    {"start": 3.0, "end": 4.0, "text": "   ", "words": []},
+    {
+        "start": 3725.25,
+        "end": 3726.125,
+        "text": "Later",
+        "words": [{"word": "Later", "start": 3725.25}],
+    },
+    {"start": None, "end": 5.0, "text": "no start"},
+]
+
+
+def _legacy_srt(entries, start_index=1):
+    lines = []
+    for counter, (start, end, text) in enumerate(entries, start_index):
+        lines += [str(counter), f"{start} --> {end}", text, ""]
+    return "\n".join(lines)
+
+
+def test_format_timestamp() -> None:
+    """Test HH:MM:SS,mmm formatting, including hour rollover and rounding."""
+    assert format_timestamp(0) == "00:00:00,000"
+    assert format_timestamp(3725.25) == "01:02:05,250"
+    assert format_timestamp(1.001) == "00:00:01,001"
+    assert format_timestamp(59.9996) == "00:01:00,000"
+    assert format_timestamp(-0.2) == "00:00:00,000"
+
+
+def test_render_matches_separate_renderers() -> None:
+    """Test one pass yields the same SRT/TXT as the per-format layout."""
+    rendered = render_transcript(SEGMENTS)
+
+    assert rendered["srt"] == _legacy_srt(
+        [
+            ("00:00:00,000", "00:00:00,480", "Hello"),
+            ("00:00:00,500", "00:00:02,500", "world"),
+        ]
+    )
+    assert rendered["segments_srt"] == _legacy_srt(
+        [
+            ("00:00:00,000", "00:00:02,500", "Hello world"),
+            ("01:02:05,250", "01:02:06,125", "Later"),
+        ]
+    )
+    assert rendered["txt"] == "Hello world Later no start"
+    assert rendered["word_cues"] == 2
+    assert rendered["segment_cues"] == 2
+
+
+def test_incremental_fragments_concatenate_to_full_render() -> None:
+    """Test fragments published in batches join into exactly the full render."""
+    more = [
+        {
+            "start": 6.0,
+            "end": 7.0,
+            "text": "And more",
+            "words": [
+                {"word": "And", "start": 6.0, "end": 6.4},
+                {"word": "more", "start": 6.5, "end": 7.0},
+            ],
+        }
+    ]
+    segments = SEGMENTS + more
+    # Includes a batch that renders nothing for every format
+    batches = [segments[:1], [SEGMENTS[1]], segments[2:4], more]
+
+    transcript = IncrementalTranscript()
+    fragments = [transcript.render(batch) for batch in batches]
+    full = render_transcript(segments)
+
+    for name in ("srt", "segments_srt", "txt"):
+        assert "".join(f[name] for f in fragments) == full[name]
+    assert fragments[1] == {"srt": "", "segments_srt": "", "txt": ""}
+
+
+def test_render_continues_numbering_and_selects_formats() -> None:
+    """Test start indices offset numbering and only requested formats are built."""
+    rendered = render_transcript(
+        SEGMENTS[:1], ("srt",), word_start_index=7, segment_start_index=3
+    )
+
+    assert rendered["srt"].startswith("7\n")
+    assert "\n8\n" in rendered["srt"]
+    assert "segments_srt" not in rendered and "txt" not in rendered
+    assert render_transcript([])["srt"] == ""
+
+
+def test_encode_response_json_roundtrip() -> None:
+    """Test JSON encoding is compact UTF-8 that decodes to the same content."""
+    content = {"text": "héllo", "segments": SEGMENTS}
+
+    body, media_type = encode_response(content)
+
+    assert media_type == "application/json"
+    assert json.loads(body) == content
+    assert "héllo".encode("utf-8") in body
+
+
+def test_encode_response_msgpack_falls_back_without_package(monkeypatch) -> None:
+    """Test a msgpack Accept header still gets JSON when msgpack is missing."""
+    monkeypatch.setattr(transcript_formats, "msgpack", None)
+
+    body, media_type = encode_response({"a": 1}, "application/msgpack")
+
+    assert media_type == "application/json"
+    assert json.loads(body) == {"a": 1}
+
+
+def test_parse_and_select_outputs() -> None:
+    """Test outputs= parsing and dropping of unrequested formats."""
+    assert parse_outputs(None) == OUTPUT_FORMATS
+    assert parse_outputs("all") == OUTPUT_FORMATS
+    assert parse_outputs(" TXT, srt ") == ("srt", "txt")
+    with pytest.raises(ValueError):
+        parse_outputs("srt,vtt")
+
+    selected = select_outputs({"filename": "a.wav", "srt": "x", "txt": "y"}, ("txt",))
+    assert selected == {"filename": "a.wav", "txt": "y"}
+
+
+def test_compress_body() -> None:
+    """Test gzip is applied per Accept-Encoding and small bodies are left alone."""
+    body = b"00:00:01,000 --> 00:00:02,000\n" * 100
+
+    compressed, encoding = compress_body(body, "gzip, deflate")
+    assert encoding == "gzip"
+    assert gzip.decompress(compressed) == body
+
+    assert compress_body(body, None) == (body, None)
+    assert compress_body(body, "gzip;q=0, br") == (body, None)
+    assert compress_body(b"{}", "gzip") == (b"{}", None)
@@ -0,0 +1,54 @@
+"""Tests for streaming upload writes."""
+
+import asyncio
+import hashlib
+
+import pytest
+from fastapi import HTTPException
+
+from upload_stream import save_upload_streaming
+
+
+class FakeUpload:
+    """UploadFile stand-in that records read sizes."""
+
+    def __init__(self, data: bytes):
+        self._data = data
+        self._pos = 0
+        self.read_sizes = []
+
+    async def read(self, size: int = -1) -> bytes:
+        self.read_sizes.append(size)
+        if size < 0:
+            size = len(self._data) - self._pos
+        chunk = self._data[self._pos : self._pos + size]
+        self._pos += len(chunk)
+        return chunk
+
+
+def test_upload_is_streamed_in_chunks_and_hashed(tmp_path) -> None:
+    """Test the file is written chunk by chunk with a matching SHA-256."""
+    data = b"x" * 10_000 + b"y" * 5_000
+    upload = FakeUpload(data)
+    dest = tmp_path / "video.mp4"
+
+    size, digest = asyncio.run(save_upload_streaming(upload, dest, chunk_size=4096))
+
+    assert size == len(data)
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert dest.read_bytes() == data
+    assert all(s == 4096 for s in upload.read_sizes)
+
+
+def test_upload_over_size_cap_is_rejected_and_removed(tmp_path) -> None:
+    """Test oversize uploads raise 413 and leave no partial file."""
+    upload = FakeUpload(b"z" * 10_000)
+    dest = tmp_path / "big.mp4"
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(
+            save_upload_streaming(upload, dest, max_bytes=5_000, chunk_size=1024)
+        )
+
+    assert exc_info.value.status_code == 413
+    assert not dest.exists()
@@ -0,0 +1,67 @@
+"""Tests for the warm-start preloader."""
+
+import threading
+
+from warmup import Preloader, parse_preload_list
+
+
+def test_parse_preload_list() -> None:
+    """Test 'name' and 'name:language' entries; blanks are ignored."""
+    assert parse_preload_list("large-v3:en, medium,,") == [
+        ("large-v3", "en"),
+        ("medium", None),
+    ]
+    assert parse_preload_list(None) == []
+
+
+def test_not_ready_until_all_models_loaded() -> None:
+    """Test readiness flips only after the last model finished loading."""
+    release = threading.Event()
+    loaded = []
+    preloader = Preloader()
+    preloader.add("whisper", "large-v3", lambda: loaded.append("large-v3"))
+    preloader.add("alignment", "en", lambda: release.wait(5))
+
+    preloader.start()
+    status = preloader.status()
+    assert not status["ready"]
+    assert status["status"] == "starting"
+
+    release.set()
+    assert preloader.wait(5)
+
+    status = preloader.status()
+    assert status["ready"]
+    assert status["status"] == "ready"
+    assert loaded == ["large-v3"]
+    assert [m["state"] for m in status["models"]] == ["ready", "ready"]
+    assert all(m["load_seconds"] is not None for m in status["models"])
+
+
+def test_failed_preload_reports_degraded() -> None:
+    """Test a failing loader is recorded without blocking readiness."""
+
+    def fail():
+        raise RuntimeError("no HF token")
+
+    preloader = Preloader()
+    preloader.add("diarization", "pyannote", fail)
+    preloader.add("vad", "silero", lambda: None)
+    preloader.start()
+    preloader.wait(5)
+
+    status = preloader.status()
+    assert status["ready"]
+    assert status["status"] == "degraded"
+    assert status["models"][0]["error"] == "no HF token"
+    assert status["models"][1]["state"] == "ready"
+
+
+def test_empty_preload_list_is_ready_immediately() -> None:
+    """Test nothing to preload means ready as soon as started."""
+    preloader = Preloader()
+    assert preloader.status()["status"] == "not_started"
+
+    preloader.start()
+
+    assert preloader.ready
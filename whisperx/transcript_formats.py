@@ -0,0 +1,287 @@
+"""
+Transcript Serializers for WhisperX
+Single-pass SRT/TXT rendering and fast JSON/msgpack response encoding
+
+Word-level SRT, segment-level SRT and plain text are rendered together in
+one walk over the segments, with each subtitle built as one string and
+each format joined once. Timestamps are formatted from integer
+milliseconds with cached prefixes instead of float modulo arithmetic.
+
+Responses are encoded with orjson (or msgpack when the client asks for
+it) when those packages are installed, and fall back to the standard
+library json module otherwise. Clients can request a subset of the
+transcript formats and a gzip/zstd compressed body.
+"""
+
+import gzip
+import json
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+ALL_TEXT_FORMATS = ("srt", "segments_srt", "txt")
+
+# Response fields that carry the transcript (selectable with outputs=)
+OUTPUT_FORMATS = ("segments",) + ALL_TEXT_FORMATS
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+_MILLIS = tuple(f"{ms:03d}" for ms in range(1000))
+_PREFIXES: Dict[int, str] = {}
+
+
+def format_timestamp(seconds: float) -> str:
+    """
+    Convert seconds to SRT timestamp format (HH:MM:SS,mmm).
+
+    Rounds to the nearest millisecond (float truncation could drop one).
+
+    Args:
+        seconds: Time in seconds
+
+    Returns:
+        Formatted timestamp string
+    """
+    total_ms = int(seconds * 1000 + 0.5) if seconds > 0 else 0
+    whole, ms = divmod(total_ms, 1000)
+    prefix = _PREFIXES.get(whole)
+    if prefix is None:
+        minutes, secs = divmod(whole, 60)
+        hours, minutes = divmod(minutes, 60)
+        prefix = _PREFIXES[whole] = f"{hours:02d}:{minutes:02d}:{secs:02d},"
+    return prefix + _MILLIS[ms]
+
+
+def render_transcript(
+    segments: Iterable[dict],
+    formats: Iterable[str] = ALL_TEXT_FORMATS,
+    word_start_index: int = 1,
+    segment_start_index: int = 1,
+) -> Dict[str, Any]:
+    """
+    Render SRT/TXT outputs for segments in a single pass.
+
+    Output is identical to rendering each format separately: word-level SRT
+    (one word per subtitle), segment-level SRT and space-joined plain text.
+
+    Args:
+        segments: Segment dicts with 'start', 'end', 'text' and optional 'words'
+        formats: Any of 'srt', 'segments_srt', 'txt'
+        word_start_index: Number of the first word subtitle
+        segment_start_index: Number of the first segment subtitle
+
+    Returns:
+        Dict with the requested formats plus 'word_cues' and 'segment_cues'
+        (number of subtitles emitted, for continuing numbering)
+    """
+    formats = set(formats)
+    want_words = "srt" in formats
+    want_segments = "segments_srt" in formats
+    want_txt = "txt" in formats
+
+    word_entries = []
+    segment_entries = []
+    texts = []
+    word_counter = word_start_index
+    segment_counter = segment_start_index
+    fmt = format_timestamp
+
+    for segment in segments:
+        if want_words:
+            for word_obj in segment.get("words") or ():
+                word_text = word_obj.get("word", "").strip()
+                start = word_obj.get("start")
+                end = word_obj.get("end")
+                if not word_text or start is None or end is None:
+                    continue
+                word_entries.append(
+                    f"{word_counter}\n{fmt(start)} --> {fmt(end)}\n{word_text}\n"
+                )
+                word_counter += 1
+
+        if want_segments or want_txt:
+            text = segment.get("text", "").strip()
+            if not text:
+                continue
+            if want_txt:
+                texts.append(text)
+            if want_segments:
+                start = segment.get("start")
+                end = segment.get("end")
+                if start is None or end is None:
+                    continue
+                segment_entries.append(
+                    f"{segment_counter}\n{fmt(start)} --> {fmt(end)}\n{text}\n"
+                )
+                segment_counter += 1
+
+    rendered: Dict[str, Any] = {
+        "word_cues": word_counter - word_start_index,
+        "segment_cues": segment_counter - segment_start_index,
+    }
+    if want_words:
+        rendered["srt"] = "\n".join(word_entries)
+    if want_segments:
+        rendered["segments_srt"] = "\n".join(segment_entries)
+    if want_txt:
+        rendered["txt"] = " ".join(texts)
+    return rendered
+
+
+# Text between two non-empty fragments of a format, as render_transcript joins them
+_FRAGMENT_SEPARATORS = {"srt": "\n", "segments_srt": "\n", "txt": " "}
+
+
+class IncrementalTranscript:
+    """
+    Render SRT/TXT fragments for segments published in batches.
+
+    Subtitle numbering continues across calls, and each non-empty fragment
+    after the first starts with the separator render_transcript puts between
+    entries, so concatenating the fragments of a format equals rendering all
+    segments at once.
+    """
+
+    def __init__(self):
+        self._words = 1
+        self._segments = 1
+        self._started = {name: False for name in _FRAGMENT_SEPARATORS}
+
+    def render(self, segments: Iterable[dict]) -> Dict[str, str]:
+        """Fragments ('srt', 'segments_srt', 'txt') for the next batch of segments."""
+        rendered = render_transcript(
+            segments,
+            word_start_index=self._words,
+            segment_start_index=self._segments,
+        )
+        self._words += rendered["word_cues"]
+        self._segments += rendered["segment_cues"]
+
+        fragments = {}
+        for name, separator in _FRAGMENT_SEPARATORS.items():
+            fragment = rendered[name]
+            if fragment and self._started[name]:
+                fragment = separator + fragment
+            self._started[name] = self._started[name] or bool(fragment)
+            fragments[name] = fragment
+        return fragments
+
+
+def _json_default(value):
+    # numpy scalars/arrays that slipped into a result
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def encode_json(content: Any) -> bytes:
+    """Compact UTF-8 JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(
+            content, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=_json_default,
+    ).encode("utf-8")
+
+
+def encode_response(content: Any, accept: Optional[str] = None) -> Tuple[bytes, str]:
+    """
+    Encode a response body according to the Accept header.
+
+    msgpack is used when the client accepts application/msgpack and the
+    package is installed; otherwise JSON.
+
+    Returns:
+        (body bytes, media type)
+    """
+    if accept and MSGPACK_MEDIA_TYPE in accept and msgpack is not None:
+        return (
+            msgpack.packb(content, default=_json_default, use_bin_type=True),
+            MSGPACK_MEDIA_TYPE,
+        )
+    return encode_json(content), "application/json"
+
+
+def parse_outputs(value: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse an outputs= parameter ('srt,txt'); empty or 'all' selects every format.
+
+    Raises:
+        ValueError: For unknown format names
+    """
+    if not value or value.strip().lower() == "all":
+        return OUTPUT_FORMATS
+    requested = [name.strip().lower() for name in value.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(OUTPUT_FORMATS))
+    if unknown:
+        raise ValueError(
+            f"Unknown output format(s) {unknown}, expected any of {list(OUTPUT_FORMATS)}"
+        )
+    return tuple(name for name in OUTPUT_FORMATS if name in requested)
+
+
+def select_outputs(content: dict, outputs: Iterable[str]) -> dict:
+    """Shallow copy of a response without the transcript formats not in outputs."""
+    outputs = set(outputs)
+    return {
+        key: value
+        for key, value in content.items()
+        if key not in OUTPUT_FORMATS or key in outputs
+    }
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    return accepted
+
+
+def compress_body(
+    body: bytes,
+    accept_encoding: Optional[str],
+    min_bytes: int = 1024,
+    gzip_level: int = 5,
+    zstd_level: int = 3,
+) -> Tuple[bytes, Optional[str]]:
+    """
+    Compress a response body for the client's Accept-Encoding.
+
+    zstd is preferred when accepted and the zstandard package is installed,
+    then gzip. Bodies smaller than min_bytes are sent as-is.
+
+    Returns:
+        (body bytes, Content-Encoding or None)
+    """
+    if not accept_encoding or len(body) < min_bytes:
+        return body, None
+
+    accepted = _accepted_encodings(accept_encoding)
+    if "zstd" in accepted and zstandard is not None:
+        return zstandard.ZstdCompressor(level=zstd_level).compress(body), "zstd"
+    if "gzip" in accepted or "*" in accepted:
+        return gzip.compress(body, compresslevel=gzip_level), "gzip"
+    return body, None
@@ -0,0 +1,69 @@
+"""
+Streaming Upload Writer for WhisperX
+Writes multipart uploads to disk in fixed-size chunks
+
+Multi-GB videos are copied chunk by chunk instead of being read fully into
+memory, with a size cap enforced while streaming and a SHA-256 content hash
+computed on the fly (no second pass over the file).
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Tuple
+
+from fastapi import HTTPException, UploadFile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
+
+
+async def save_upload_streaming(
+    upload: UploadFile,
+    dest: Path,
+    max_bytes: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[int, str]:
+    """
+    Stream an uploaded file to disk with a size cap and hashing.
+
+    Args:
+        upload: FastAPI UploadFile
+        dest: Destination path
+        max_bytes: Maximum accepted size in bytes (0 = unlimited)
+        chunk_size: Bytes read and written per iteration
+
+    Returns:
+        (size in bytes, SHA-256 hex digest)
+
+    Raises:
+        HTTPException: 413 if the upload exceeds max_bytes
+    """
+    hasher = hashlib.sha256()
+    size = 0
+
+    try:
+        with open(dest, "wb") as f:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Upload exceeds maximum size of {max_bytes / 1e9:.1f}GB",
+                    )
+
+                hasher.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        # Never leave a partial upload behind
+        Path(dest).unlink(missing_ok=True)
+        raise
+
+    digest = hasher.hexdigest()
+    logger.info(f"Saved upload {dest.name} ({size / 1e6:.1f}MB, sha256={digest[:12]})")
+    return size, digest
@@ -10,13 +10,21 @@ Based on 2025 best practices:
 """
 
 import logging
-from typing import List, Tuple, Optional
-import torch
+from typing import Callable, Iterable, Iterator, List, Tuple, Optional
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+def _observed(
+    segments: Iterable[Tuple[float, float]], callback: Callable[[Tuple[float, float]], None]
+) -> Iterator[Tuple[float, float]]:
+    """Pass segments through, calling callback with each one."""
+    for segment in segments:
+        callback(segment)
+        yield segment
+
+
 class AudioSegment:
     """Represents a segment of audio with metadata."""
 
@@ -53,6 +61,10 @@ class VideoSegmenter:
         chunk_duration: int = 30,
         overlap_duration: int = 10,
         vad_threshold: float = 0.5,
+        vad_engine: str = "torch",
+        vad_onnx_path: Optional[str] = None,
+        vad_threads: int = 4,
+        vad_batch_size: int = 64,
     ):
         """
         Initialize video segmenter.
@@ -61,20 +73,55 @@ class VideoSegmenter:
             chunk_duration: Target chunk length in seconds (default 30, optimal per research)
             overlap_duration: Overlap between chunks in seconds (default 10)
             vad_threshold: VAD confidence threshold (0.0-1.0)
+            vad_engine: 'torch' (Silero via torch.hub) or 'onnx' (bundled model,
+                onnxruntime, batched; works offline)
+            vad_onnx_path: Silero ONNX model path (defaults to the bundled model)
+            vad_threads: onnxruntime threads for the ONNX engine
+            vad_batch_size: Parallel audio streams per ONNX call
         """
         self.chunk_duration = chunk_duration
         self.overlap_duration = overlap_duration
         self.vad_threshold = vad_threshold
+        self.vad_engine = vad_engine
+        self.vad_onnx_path = vad_onnx_path
+        self.vad_threads = vad_threads
+        self.vad_batch_size = vad_batch_size
         self.vad_model = None
+        self._ffmpeg = None
+
+    def _ffmpeg_processor(self):
+        """FFmpegProcessor for probing/silence detection, created on first use."""
+        if self._ffmpeg is None:
+            from ffmpeg_processor import FFmpegProcessor
+
+            self._ffmpeg = FFmpegProcessor()
+        return self._ffmpeg
 
     def load_vad_model(self):
         """
         Load Silero VAD model for voice activity detection.
 
-        Silero VAD is lightweight, accurate, and runs on GPU.
+        Silero VAD is lightweight, accurate, and runs on GPU. The ONNX engine
+        loads the bundled model without network access; if it cannot be
+        loaded, the torch.hub model is used instead.
         """
+        if self.vad_model is None and self.vad_engine == "onnx":
+            try:
+                from silero_onnx import SileroOnnxVAD
+
+                self.vad_model = SileroOnnxVAD(
+                    self.vad_onnx_path,
+                    threads=self.vad_threads,
+                    batch_size=self.vad_batch_size,
+                )
+                return
+            except Exception as e:
+                logger.warning(f"ONNX VAD unavailable ({e}), falling back to torch.hub")
+
         try:
             if self.vad_model is None:
+                import torch
+
                 logger.info("Loading Silero VAD model...")
                 model, utils = torch.hub.load(
                     repo_or_dir="snakers4/silero-vad",
@@ -95,6 +142,7 @@ class VideoSegmenter:
         audio_path: str,
         min_speech_duration: float = 0.25,
         min_silence_duration: float = 0.1,
+        samples: Optional[np.ndarray] = None,
     ) -> List[Tuple[float, float]]:
         """
         Detect speech segments using VAD.
@@ -103,6 +151,7 @@ class VideoSegmenter:
             audio_path: Path to audio file (WAV format)
             min_speech_duration: Minimum speech segment duration in seconds
             min_silence_duration: Minimum silence duration to split on
+            samples: Already-decoded 16kHz mono samples (skips reading audio_path)
 
         Returns:
             List of (start, end) tuples for speech segments
@@ -117,33 +166,52 @@ class VideoSegmenter:
             return []
 
         try:
-            import torchaudio
-
-            # Load audio
-            wav, sr = torchaudio.load(audio_path)
-
-            # Resample to 16kHz if needed (VAD expects 16kHz)
-            if sr != 16000:
-                resampler = torchaudio.transforms.Resample(sr, 16000)
-                wav = resampler(wav)
+            if samples is not None:
+                # Decoded job buffer: no file read, no resampling
+                wav = np.asarray(samples)
                 sr = 16000
+            else:
+                import torchaudio
+
+                # Load audio
+                wav, sr = torchaudio.load(audio_path)
+
+                # Resample to 16kHz if needed (VAD expects 16kHz)
+                if sr != 16000:
+                    resampler = torchaudio.transforms.Resample(sr, 16000)
+                    wav = resampler(wav)
+                    sr = 16000
+
+                # Ensure mono
+                if wav.shape[0] > 1:
+                    wav = wav.mean(dim=0, keepdim=True)
+                wav = wav.reshape(-1).numpy()
+
+            if hasattr(self.vad_model, "speech_timestamps"):
+                # ONNX engine: batched windows over the numpy samples
+                segments = self.vad_model.speech_timestamps(
+                    wav,
+                    threshold=self.vad_threshold,
+                    min_speech_duration_ms=int(min_speech_duration * 1000),
+                    min_silence_duration_ms=int(min_silence_duration * 1000),
+                )
+            else:
+                import torch
+
+                # Get speech timestamps using VAD
+                speech_timestamps = self.vad_utils[0](
+                    torch.from_numpy(wav),
+                    self.vad_model,
+                    sampling_rate=sr,
+                    threshold=self.vad_threshold,
+                    min_speech_duration_ms=int(min_speech_duration * 1000),
+                    min_silence_duration_ms=int(min_silence_duration * 1000),
+                )
 
-            # Ensure mono
-            if wav.shape[0] > 1:
-                wav = wav.mean(dim=0, keepdim=True)
-
-            # Get speech timestamps using VAD
-            speech_timestamps = self.vad_utils[0](
-                wav,
-                self.vad_model,
-                sampling_rate=sr,
-                threshold=self.vad_threshold,
-                min_speech_duration_ms=int(min_speech_duration * 1000),
-                min_silence_duration_ms=int(min_silence_duration * 1000),
-            )
-
-            # Convert to seconds
-            segments = [(ts["start"] / sr, ts["end"] / sr) for ts in speech_timestamps]
+                # Convert to seconds
+                segments = [
+                    (ts["start"] / sr, ts["end"] / sr) for ts in speech_timestamps
+                ]
 
             logger.info(f"Detected {len(segments)} speech segments")
             return segments
@@ -153,7 +221,11 @@ class VideoSegmenter:
             return []
 
     def create_vad_chunks(
-        self, audio_path: str, target_duration: int = None, overlap: int = None
+        self,
+        audio_path: str,
+        target_duration: int = None,
+        overlap: int = None,
+        audio=None,
     ) -> List[AudioSegment]:
         """
         Create chunks using VAD with Cut & Merge strategy.
@@ -168,6 +240,7 @@ class VideoSegmenter:
             audio_path: Path to audio file
             target_duration: Target chunk duration (uses self.chunk_duration if None)
             overlap: Overlap duration (uses self.overlap_duration if None)
+            audio: Decoded AudioBuffer for the file (VAD runs on it directly)
 
         Returns:
             List of AudioSegment objects
@@ -178,35 +251,62 @@ class VideoSegmenter:
             overlap = self.overlap_duration
 
         # Detect speech segments
-        speech_segments = self.detect_speech_segments(audio_path)
+        speech_segments = self.detect_speech_segments(
+            audio_path, samples=audio.samples if audio is not None else None
+        )
 
         if not speech_segments:
             # Fallback to time-based chunking
             logger.warning("No speech detected, using time-based chunking")
-            return self.create_time_based_chunks(audio_path, target_duration, overlap)
+            return self.create_time_based_chunks(
+                audio_path,
+                target_duration,
+                overlap,
+                duration=audio.duration if audio is not None else None,
+            )
 
         # Merge segments using Cut & Merge strategy
-        chunks = []
-        current_start = speech_segments[0][0]
-        current_end = speech_segments[0][1]
-        chunk_id = 0
+        chunks = list(self.cut_and_merge(speech_segments, target_duration, overlap))
 
-        for i in range(1, len(speech_segments)):
-            seg_start, seg_end = speech_segments[i]
+        logger.info(f"Created {len(chunks)} VAD-based chunks")
+        return chunks
+
+    def cut_and_merge(
+        self,
+        speech_segments: Iterable[Tuple[float, float]],
+        target_duration: int,
+        overlap: int,
+    ) -> Iterator[AudioSegment]:
+        """
+        Merge speech segments into chunks, yielding each chunk once it is closed.
+
+        Works on a lazy stream of speech segments, so chunks can be consumed
+        (transcribed) while VAD is still running on later audio.
+
+        Args:
+            speech_segments: (start, end) speech segments in timeline order
+            target_duration: Target chunk duration
+            overlap: Overlap added around each chunk
+
+        Yields:
+            AudioSegment chunks in timeline order
+        """
+        chunk_id = 0
+        current_start = current_end = None
 
+        for seg_start, seg_end in speech_segments:
+            if current_start is None:
+                current_start, current_end = seg_start, seg_end
             # Check if adding this segment would exceed target duration
-            if (seg_end - current_start) <= target_duration:
+            elif (seg_end - current_start) <= target_duration:
                 # Merge segment
                 current_end = seg_end
             else:
-                # Save current chunk with overlap
-                chunk_end = current_end + overlap
-                chunks.append(
-                    AudioSegment(
-                        start=max(0, current_start - overlap),
-                        end=chunk_end,
-                        segment_id=chunk_id,
-                    )
+                # Emit current chunk with overlap
+                yield AudioSegment(
+                    start=max(0, current_start - overlap),
+                    end=current_end + overlap,
+                    segment_id=chunk_id,
                 )
                 chunk_id += 1
 
@@ -214,21 +314,129 @@ class VideoSegmenter:
                 current_start = seg_start
                 current_end = seg_end
 
-        # Add final chunk
-        if current_start < current_end:
-            chunks.append(
-                AudioSegment(
-                    start=max(0, current_start - overlap),
-                    end=current_end,
-                    segment_id=chunk_id,
-                )
+        # Final chunk
+        if current_start is not None and current_start < current_end:
+            yield AudioSegment(
+                start=max(0, current_start - overlap),
+                end=current_end,
+                segment_id=chunk_id,
             )
 
-        logger.info(f"Created {len(chunks)} VAD-based chunks")
-        return chunks
+    def iter_speech_segments(
+        self,
+        samples: np.ndarray,
+        block_seconds: float = 300.0,
+        sample_rate: int = 16000,
+        join_gap: float = 0.1,
+    ) -> Iterator[Tuple[float, float]]:
+        """
+        Run VAD block by block over decoded samples, yielding speech as it is found.
+
+        Speech cut by a block boundary is stitched back together, so the
+        output matches one VAD pass over the whole file closely while the
+        first segments are available after the first block.
+
+        Args:
+            samples: Decoded 16kHz mono samples
+            block_seconds: Audio processed per VAD call
+            sample_rate: Sample rate of samples
+            join_gap: Max gap (s) around a block boundary treated as continuous speech
+
+        Yields:
+            (start, end) speech segments in seconds, in timeline order
+        """
+        block = int(block_seconds * sample_rate)
+        pending = None
+
+        for offset in range(0, len(samples), block):
+            block_start = offset / sample_rate
+            found = [
+                (start + block_start, end + block_start)
+                for start, end in self.detect_speech_segments(
+                    None, samples=samples[offset : offset + block]
+                )
+            ]
+
+            if (
+                pending
+                and found
+                and pending[1] >= block_start - join_gap
+                and found[0][0] <= block_start + join_gap
+            ):
+                found[0] = (pending[0], found[0][1])
+                pending = None
+
+            if pending:
+                yield pending
+                pending = None
+            if found:
+                yield from found[:-1]
+                pending = found[-1]
+
+        if pending:
+            yield pending
+
+    def iter_chunks(
+        self,
+        audio_path: str,
+        strategy: str = "auto",
+        audio=None,
+        on_speech: Optional[Callable[[Tuple[float, float]], None]] = None,
+    ) -> Iterator[AudioSegment]:
+        """
+        Yield chunks as they become available.
+
+        With a decoded buffer and the VAD strategy, chunks are produced while
+        VAD is still scanning later audio; other strategies are cheap and
+        computed up front.
+
+        Args:
+            audio_path: Path to audio or video file
+            strategy: 'auto', 'vad', 'time', 'silence', or 'none'
+            audio: Decoded AudioBuffer for the file
+            on_speech: Called with each VAD speech region (start, end) as it
+                is found (VAD strategy only)
+
+        Yields:
+            AudioSegment chunks in timeline order
+        """
+        if audio is None:
+            yield from self.segment_audio(audio_path, strategy)
+            return
+
+        if strategy == "auto":
+            strategy = self.get_optimal_strategy(audio.duration)
+            logger.info(f"Auto-selected strategy: {strategy}")
+
+        if strategy in ("none", "time", "silence"):
+            yield from self.segment_audio(audio_path, strategy, audio=audio)
+            return
+
+        speech = self.iter_speech_segments(audio.samples, sample_rate=audio.sample_rate)
+        if on_speech:
+            speech = _observed(speech, on_speech)
+
+        count = 0
+        for chunk in self.cut_and_merge(
+            speech,
+            self.chunk_duration,
+            self.overlap_duration,
+        ):
+            count += 1
+            yield chunk
+
+        if count:
+            logger.info(f"Streamed {count} VAD-based chunks")
+        else:
+            logger.warning("No speech detected, using time-based chunking")
+            yield from self.create_time_based_chunks(audio_path, duration=audio.duration)
 
     def create_time_based_chunks(
-        self, audio_path: str, chunk_duration: int = None, overlap: int = None
+        self,
+        audio_path: str,
+        chunk_duration: int = None,
+        overlap: int = None,
+        duration: Optional[float] = None,
     ) -> List[AudioSegment]:
         """
         Create fixed-duration chunks with overlap.
@@ -239,26 +447,25 @@ class VideoSegmenter:
             audio_path: Path to audio file
             chunk_duration: Chunk duration in seconds
             overlap: Overlap duration in seconds
+            duration: Known audio duration in seconds (skips probing audio_path)
 
         Returns:
             List of AudioSegment objects
         """
-        from ffmpeg_processor import FFmpegProcessor
-
         if chunk_duration is None:
             chunk_duration = self.chunk_duration
         if overlap is None:
             overlap = self.overlap_duration
 
         # Get audio duration
-        processor = FFmpegProcessor()
-        try:
-            # For audio files, use ffprobe directly on the audio
-            info = processor.get_video_info(audio_path)
-            duration = info.get("duration", 0)
-        except Exception as e:
-            logger.error(f"Could not determine audio duration: {e}")
-            return []
+        if duration is None:
+            try:
+                # For audio files, use ffprobe directly on the audio
+                info = self._ffmpeg_processor().get_video_info(audio_path)
+                duration = info.get("duration", 0)
+            except Exception as e:
+                logger.error(f"Could not determine audio duration: {e}")
+                return []
 
         chunks = []
         chunk_id = 0
@@ -286,6 +493,8 @@ class VideoSegmenter:
         audio_path: str,
         min_silence_duration: float = 2.0,
         max_chunk_duration: int = None,
+        duration: Optional[float] = None,
+        audio=None,
     ) -> List[AudioSegment]:
         """
         Create chunks based on silence detection.
@@ -296,21 +505,31 @@ class VideoSegmenter:
             audio_path: Path to audio file
             min_silence_duration: Minimum silence duration to split on
             max_chunk_duration: Maximum chunk duration (splits long segments)
+            duration: Known audio duration in seconds (skips probing audio_path)
+            audio: Decoded AudioBuffer for the file; silence is detected on it
+                in-process instead of running ffmpeg silencedetect
 
         Returns:
             List of AudioSegment objects
         """
-        from ffmpeg_processor import FFmpegProcessor
-
         if max_chunk_duration is None:
             max_chunk_duration = self.chunk_duration * 2  # Allow chunks up to 2x target
 
-        processor = FFmpegProcessor()
-        silences = processor.detect_silence(audio_path, min_silence_duration)
+        if audio is not None:
+            from silence_detector import detect_silence
+
+            duration = audio.duration
+            silences = detect_silence(
+                audio.samples, audio.sample_rate, min_silence_duration
+            )
+        else:
+            silences = self._ffmpeg_processor().detect_silence(
+                audio_path, min_silence_duration
+            )
 
         if not silences:
             logger.warning("No silence detected, using time-based chunking")
-            return self.create_time_based_chunks(audio_path)
+            return self.create_time_based_chunks(audio_path, duration=duration)
 
         # Create chunks between silence periods
         chunks = []
@@ -342,8 +561,9 @@ class VideoSegmenter:
             prev_end = silence_end
 
         # Add final chunk if needed
-        info = processor.get_video_info(audio_path)
-        duration = info.get("duration", prev_end)
+        if duration is None:
+            info = self._ffmpeg_processor().get_video_info(audio_path)
+            duration = info.get("duration", prev_end)
         if prev_end < duration:
             chunks.append(
                 AudioSegment(start=prev_end, end=duration, segment_id=chunk_id)
@@ -375,23 +595,25 @@ class VideoSegmenter:
             return "vad"  # VAD with longer chunks for efficiency
 
     def segment_audio(
-        self, audio_path: str, strategy: str = "auto"
+        self, audio_path: str, strategy: str = "auto", audio=None
     ) -> List[AudioSegment]:
         """
         Segment audio using specified strategy.
 
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio or video file
             strategy: 'auto', 'vad', 'time', 'silence', or 'none'
+            audio: Decoded AudioBuffer for the file; when given, duration and
+                VAD come from the buffer instead of probing/re-reading the file
 
         Returns:
             List of AudioSegment objects
         """
-        from ffmpeg_processor import FFmpegProcessor
-
-        processor = FFmpegProcessor()
-        info = processor.get_video_info(audio_path)
-        duration = info.get("duration", 0)
+        if audio is not None:
+            duration = audio.duration
+        else:
+            info = self._ffmpeg_processor().get_video_info(audio_path)
+            duration = info.get("duration", 0)
 
         logger.info(f"Segmenting audio: {duration:.1f}s using '{strategy}' strategy")
 
@@ -406,14 +628,16 @@ class VideoSegmenter:
 
         # Apply selected strategy
         if strategy == "vad":
-            return self.create_vad_chunks(audio_path)
+            return self.create_vad_chunks(audio_path, audio=audio)
         elif strategy == "time":
-            return self.create_time_based_chunks(audio_path)
+            return self.create_time_based_chunks(audio_path, duration=duration)
         elif strategy == "silence":
-            return self.create_silence_based_chunks(audio_path)
+            return self.create_silence_based_chunks(
+                audio_path, duration=duration, audio=audio
+            )
         else:
             logger.warning(f"Unknown strategy '{strategy}', using VAD")
-            return self.create_vad_chunks(audio_path)
+            return self.create_vad_chunks(audio_path, audio=audio)
 
 
 if __name__ == "__main__":
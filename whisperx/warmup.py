@@ -0,0 +1,157 @@
+"""
+Warm-Start Preloader for WhisperX
+Loads configured models in the background at startup and tracks readiness
+
+Models are otherwise loaded lazily by the first request that needs them,
+so the first job after a container restart pays for every model load.
+The preloader loads a configured list (Whisper models, alignment
+languages, VAD, diarization) on a background thread and records per-model
+state and load duration for the /ready endpoint.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+def parse_preload_list(value: Optional[str]) -> List[Tuple[str, Optional[str]]]:
+    """
+    Parse a comma-separated preload list.
+
+    Entries are 'name' or 'name:language' (e.g. 'large-v3:en,medium').
+
+    Returns:
+        List of (name, language or None)
+    """
+    items = []
+    for entry in (value or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, language = entry.partition(":")
+        items.append((name.strip(), language.strip() or None))
+    return items
+
+
+class PreloadItem:
+    """One model to preload and its load state."""
+
+    def __init__(self, kind: str, name: str, loader: Callable[[], Any]):
+        self.kind = kind
+        self.name = name
+        self.loader = loader
+        self.state = PENDING
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "state": self.state,
+            "load_seconds": (
+                round(self.load_seconds, 2) if self.load_seconds is not None else None
+            ),
+            "error": self.error,
+        }
+
+
+class Preloader:
+    """
+    Loads registered models sequentially on a daemon thread.
+
+    The server is ready once every item has finished loading. Failed items
+    do not block readiness (the model is still loaded lazily on first use)
+    but are reported as degraded.
+    """
+
+    def __init__(self):
+        self._items: List[PreloadItem] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._done = threading.Event()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def add(self, kind: str, name: str, loader: Callable[[], Any]):
+        """
+        Register a model to preload.
+
+        Args:
+            kind: Model kind ('whisper', 'alignment', 'vad', 'diarization')
+            name: Display name (e.g. 'large-v3:en')
+            loader: Zero-argument callable that loads the model into its pool
+        """
+        with self._lock:
+            self._items.append(PreloadItem(kind, name, loader))
+
+    def start(self):
+        """Start loading in the background (returns immediately)."""
+        if self._thread is not None:
+            return
+        self.started_at = time.time()
+        if not self._items:
+            self.finished_at = self.started_at
+            self._done.set()
+            return
+        self._thread = threading.Thread(target=self._run, name="preload", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until preloading has finished; returns False on timeout."""
+        return self._done.wait(timeout)
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def status(self) -> Dict:
+        """Overall readiness and per-model load state."""
+        with self._lock:
+            items = [item.to_dict() for item in self._items]
+
+        if not self._done.is_set():
+            state = "starting" if self.started_at else "not_started"
+        elif any(item["state"] == FAILED for item in items):
+            state = "degraded"
+        else:
+            state = "ready"
+
+        end = self.finished_at or time.time()
+        return {
+            "ready": self._done.is_set(),
+            "status": state,
+            "preload_seconds": (
+                round(end - self.started_at, 2) if self.started_at else None
+            ),
+            "models": items,
+        }
+
+    def _run(self):
+        for item in list(self._items):
+            item.state = LOADING
+            logger.info(f"Preloading {item.kind} model {item.name}...")
+            start = time.time()
+            try:
+                item.loader()
+            except Exception as e:
+                item.state = FAILED
+                item.error = str(e)
+                logger.warning(f"Preloading {item.kind} model {item.name} failed: {e}")
+            else:
+                item.state = READY
+                logger.info(f"Preloaded {item.kind} model {item.name}")
+            finally:
+                item.load_seconds = time.time() - start
+
+        self.finished_at = time.time()
+        self._done.set()
+        logger.info(f"Preload finished in {self.finished_at - self.started_at:.1f}s")